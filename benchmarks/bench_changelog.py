@@ -0,0 +1,132 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Compare the changelog tools on a packaging repository with a long history.
+
+Builds a throwaway git repository with ``--commits`` commits and a
+``debian/changelog`` of ``--entries`` entries, then times one
+``update_changelog`` call per tool on a fresh copy of the changelog. Tools
+whose executables are not installed (``gbp``, ``dch``) are skipped.
+
+Usage:
+    python benchmarks/bench_changelog.py [--commits N] [--entries N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from packastack.debpkg.changelog import CHANGELOG_TOOLS, format_changelog_entry, update_changelog
+
+PACKAGE = "python-oslo.config"
+MAINTAINER = "Bench Maintainer <bench@example.com>"
+DATE = "Mon, 01 Jan 2024 00:00:00 +0000"
+
+_EXECUTABLES = {"native": None, "gbp": "gbp", "dch": "dch"}
+
+
+def make_changelog(entries: int) -> str:
+    text = "".join(
+        format_changelog_entry(
+            PACKAGE, f"{n}.0.0-0ubuntu1", "noble", [f"Release {n}."], MAINTAINER, date=DATE
+        )
+        for n in range(entries, 0, -1)
+    )
+    return text.rstrip("\n") + "\n"
+
+
+def make_repo(path: Path, commits: int, changelog: str) -> None:
+    """Create a repository whose history is written by one git fast-import.
+
+    Commits to the same branch in a fast-import stream continue from the
+    previous one, so no ``from`` lines are needed.
+    """
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    stream = []
+    for i in range(commits):
+        data = f"line {i}\n".encode()
+        message = f"Change {i}\n".encode()
+        stream.append(b"commit refs/heads/master\n")
+        stream.append(f"committer Bench <bench@example.com> {1700000000 + i} +0000\n".encode())
+        stream.append(b"data %d\n%s" % (len(message), message))
+        stream.append(b"M 644 inline debian/notes\ndata %d\n%s\n" % (len(data), data))
+    content = changelog.encode()
+    message = b"Add changelog\n"
+    stream.append(b"commit refs/heads/master\n")
+    stream.append(f"committer Bench <bench@example.com> {1700000000 + commits} +0000\n".encode())
+    stream.append(b"data %d\n%s" % (len(message), message))
+    stream.append(b"M 644 inline debian/changelog\ndata %d\n%s\n" % (len(content), content))
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream), check=True)
+    subprocess.run(["git", "checkout", "-q", "-f", "master"], cwd=path, check=True)
+
+
+def time_tool(repo: Path, changelog: str, tool: str, repeat: int) -> float:
+    path = repo / "debian" / "changelog"
+    best = float("inf")
+    for n in range(max(repeat, 1)):
+        path.write_text(changelog, encoding="utf-8")
+        start = time.perf_counter()
+        ok, error = update_changelog(
+            path,
+            PACKAGE,
+            f"99.0.{n}-0ubuntu1",
+            "noble",
+            ["New upstream release."],
+            MAINTAINER,
+            tool=tool,
+        )
+        best = min(best, time.perf_counter() - start)
+        if not ok:
+            raise RuntimeError(f"{tool}: {error}")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commits", type=int, default=5000, help="commits in the repository history"
+    )
+    parser.add_argument("--entries", type=int, default=2000, help="entries in debian/changelog")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per tool; the best is reported"
+    )
+    args = parser.parse_args()
+
+    changelog = make_changelog(args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / "repo"
+        make_repo(repo, args.commits, changelog)
+
+        print(f"{args.commits} commits, {args.entries} changelog entries")
+        print(f"{'tool':<10}{'ms':>12}")
+        for tool in CHANGELOG_TOOLS:
+            executable = _EXECUTABLES[tool]
+            if executable and shutil.which(executable) is None:
+                print(f"{tool:<10}{'skipped':>12}")
+                continue
+            print(f"{tool:<10}{time_tool(repo, changelog, tool, args.repeat) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
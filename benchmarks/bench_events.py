@@ -0,0 +1,91 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Measure the caller-side cost of logging a run event.
+
+Compares the previous behaviour of ``RunContext.log_event`` (serialise,
+write and flush every event on the calling thread) with the buffered
+:class:`~packastack.core.events.EventSink`.
+
+Usage:
+    python benchmarks/bench_events.py [--events N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from packastack.core.events import EventSink
+
+
+def _event(i: int) -> dict:
+    return {"event": "fetch.progress", "package": "python-oslo.config", "index": i, "bytes": i * 512}
+
+
+def bench_unbuffered(path: Path, count: int) -> float:
+    with path.open("a", encoding="utf-8") as f:
+        start = time.perf_counter()
+        for i in range(count):
+            payload = {"timestamp": datetime.datetime.now(datetime.UTC).isoformat(), **_event(i)}
+            f.write(json.dumps(payload, default=str) + "\n")
+            f.flush()
+        return time.perf_counter() - start
+
+
+def bench_sink(path: Path, count: int, **kwargs: object) -> tuple[float, float]:
+    sink = EventSink(path, **kwargs)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    for i in range(count):
+        sink.emit(_event(i))
+    emitted = time.perf_counter() - start
+    sink.close()
+    return emitted, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.events
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        rows = [("write+flush per event", bench_unbuffered(tmp_path / "a.jsonl", n), None)]
+        for label, name, kwargs in (
+            ("EventSink", "b.jsonl", {}),
+            ("EventSink, gzip", "c.jsonl.gz", {"compress": True}),
+            ("EventSink, sample 1/10", "d.jsonl", {"sample": {"fetch.*": 10}}),
+        ):
+            emitted, total = bench_sink(tmp_path / name, n, **kwargs)
+            rows.append((label, emitted, total))
+
+        print(f"{n} events")
+        print(f"{'':<26}{'per event (caller)':>20}{'total incl. drain':>20}")
+        for label, caller, total in rows:
+            drained = f"{total:>19.3f}s" if total is not None else f"{caller:>19.3f}s"
+            print(f"{label:<26}{caller / n * 1e6:>18.2f}us{drained}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Measure cold-start import time of the CLI and each subcommand.
+
+Every measurement runs in a fresh interpreter with ``python -X importtime``
+and resolves one command through the lazy command group, exactly as
+``packastack <command>`` does before running it. The reported time is the
+sum of the cumulative import times of the top-level imports.
+
+With ``--budget`` the script exits non-zero if any command is slower than
+the given number of milliseconds, so it can guard against regressions.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--budget MS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+
+from packastack.cli import COMMANDS
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_RESOLVE = """\
+from typer.main import get_command
+from packastack.cli import app
+group = get_command(app)
+{resolve}
+"""
+
+
+def import_time_us(command: str | None) -> int:
+    """Return the total import time in microseconds to resolve a command."""
+    resolve = f"group.get_command(None, {command!r})" if command else ""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RESOLVE.format(resolve=resolve)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # Only top-level imports: their cumulative time includes children
+        if match and len(match.group(3)) == 1:
+            total += int(match.group(2))
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per command; the best is reported")
+    parser.add_argument("--budget", type=float, default=0.0, help="fail if any command exceeds this many ms")
+    args = parser.parse_args()
+
+    rows = []
+    for command in [None, *sorted(COMMANDS)]:
+        best = min(import_time_us(command) for _ in range(max(args.repeat, 1)))
+        rows.append((command or "(cli only)", best / 1000))
+
+    print(f"{'command':<14}{'import ms':>12}")
+    for label, ms in rows:
+        print(f"{label:<14}{ms:>12.1f}")
+
+    if args.budget:
+        over = [label for label, ms in rows if ms > args.budget]
+        if over:
+            print(f"over {args.budget:.0f}ms budget: {', '.join(over)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
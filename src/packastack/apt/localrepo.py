@@ -21,18 +21,41 @@
 Provides functionality to publish built artifacts into a local APT repository
 and regenerate Packages/Packages.gz indexes. This allows subsequently built
 packages to depend on previously built packages from the same build run.
+
+All writers serialize on an flock'd lock file at the repository root, and
+every file is written to a temporary name and renamed into place, so a
+concurrent reader (e.g. ``apt-get update`` inside sbuild) never sees a
+partially written pool file or index. Indexes are also published under
+``by-hash/SHA256`` and listed in a generated ``dists/local/Release``.
+
+Artifacts live in the Debian pool layout ``pool/main/<prefix>/<source>/``.
+Each source has a manifest shard (``manifests/<source>.json``) holding its
+parsed index entries, so publishing one source only re-reads that source's
+files and index regeneration merges shards instead of re-extracting every
+package in the pool. The shards also record the size of every pool file,
+which serves as the repository's space ledger for garbage collection.
 """
 
 from __future__ import annotations
 
 import contextlib
+import fcntl
 import gzip
 import hashlib
+import json
 import logging
+import os
+import re
 import shutil
 import subprocess
+import tempfile
+import threading
 import warnings
-from dataclasses import dataclass, field
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from email.utils import format_datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -42,11 +65,40 @@ with warnings.catch_warnings():
     warnings.filterwarnings("ignore", message=".*apt_pkg.*")
     from debian.debian_support import Version
 
+from packastack.core.slots import clear_holder, record_holder
+from packastack.core.spans import command_span
+
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Writer lock shared by every process publishing to a repository
+LOCK_FILE = ".packastack-repo.lock"
+LOCK_NAME = "publish"
+
+# Index files listed in the Release file, relative to dists/local/main/<dir>
+INDEX_NAMES = ("Packages", "Packages.gz", "Sources", "Sources.gz")
+
+# Superseded by-hash index files kept for clients mid-update
+BY_HASH_KEEP = 3
+
+# Per-source manifest shards, relative to the repository root
+MANIFEST_DIR = "manifests"
+
+# Binary package types listed in Packages indexes
+BINARY_SUFFIXES = (".deb", ".udeb")
+
+# Files that are Debian binary packages (including debug symbols)
+_DEB_SUFFIXES = (".deb", ".ddeb", ".udeb")
+
+# FICLONE ioctl from linux/fs.h, used for reflink copies
+_FICLONE = 0x40049409
+
+_process_locks: dict[Path, threading.RLock] = {}
+_process_locks_guard = threading.Lock()
+_lock_depth: dict[Path, int] = {}
+
 
 @dataclass
 class DebPackageInfo:
@@ -90,6 +142,15 @@ class SourcePackageInfo:
     directory: str = ""
 
 
+@dataclass
+class FileChecksums:
+    """Checksums already computed for an artifact (e.g. during collection)."""
+
+    md5sum: str
+    sha256: str
+    size: int
+
+
 @dataclass
 class PublishResult:
     """Result of publishing artifacts to the local repo."""
@@ -143,12 +204,13 @@ def extract_deb_control(deb_path: Path) -> DebPackageInfo | None:
         DebPackageInfo with extracted fields, or None on failure.
     """
     try:
-        result = subprocess.run(
-            ["dpkg-deb", "--info", str(deb_path), "control"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        with command_span(["dpkg-deb", "--info"]):
+            result = subprocess.run(
+                ["dpkg-deb", "--info", str(deb_path), "control"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
         if result.returncode != 0:
             return None
 
@@ -226,11 +288,12 @@ def _set_field(info: DebPackageInfo, field_name: str, value: str) -> None:
             setattr(info, attr, value)
 
 
-def extract_dsc_info(dsc_path: Path) -> SourcePackageInfo | None:
+def extract_dsc_info(dsc_path: Path, repo_root: Path | None = None) -> SourcePackageInfo | None:
     """Extract information from a .dsc file.
 
     Args:
         dsc_path: Path to the .dsc file.
+        repo_root: Repository root, used to set the pool Directory.
 
     Returns:
         SourcePackageInfo with extracted fields, or None on failure.
@@ -274,7 +337,7 @@ def extract_dsc_info(dsc_path: Path) -> SourcePackageInfo | None:
 
         # Compute file entries from the .dsc location
         pool_dir = dsc_path.parent
-        info.directory = "pool/main"
+        info.directory = pool_dir.relative_to(repo_root).as_posix() if repo_root else "pool/main"
 
         # Find associated files based on Files: section or by naming convention
         base_name = dsc_path.stem  # e.g., "nova_29.0.0-0ubuntu1"
@@ -413,31 +476,643 @@ def format_sources_entry(info: SourcePackageInfo) -> str:
     return "\n".join(lines) + "\n"
 
 
+@contextlib.contextmanager
+def repo_lock(repo_root: Path) -> Iterator[None]:
+    """Hold the exclusive writer lock for a local repository.
+
+    The lock is an flock on ``repo_root/.packastack-repo.lock``, so it
+    serializes every packastack process publishing to the repository. It is
+    reentrant within a process, allowing locked helpers to call each other.
+    The lock file names its holder while held (see ``packastack status
+    --slots``).
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+    """
+    key = repo_root.resolve()
+    with _process_locks_guard:
+        rlock = _process_locks.setdefault(key, threading.RLock())
+
+    with rlock:
+        if _lock_depth.get(key, 0):
+            _lock_depth[key] += 1
+            try:
+                yield
+            finally:
+                _lock_depth[key] -= 1
+            return
+
+        repo_root.mkdir(parents=True, exist_ok=True)
+        # Opened without truncating, so waiting does not erase the holder record
+        with os.fdopen(os.open(repo_root / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644), "r+") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            record_holder(lock_file.fileno(), LOCK_NAME, label=str(repo_root))
+            _lock_depth[key] = 1
+            try:
+                yield
+            finally:
+                _lock_depth[key] = 0
+                clear_holder(lock_file.fileno())
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _temp_path(dest: Path) -> Path:
+    """Return an unused temporary path next to dest (never matches *.deb)."""
+    fd, name = tempfile.mkstemp(prefix=f".{dest.name}.", suffix=".tmp", dir=dest.parent)
+    os.close(fd)
+    return Path(name)
+
+
+def _atomic_write_bytes(dest: Path, data: bytes) -> None:
+    """Write data to dest via a temporary file and rename."""
+    tmp = _temp_path(dest)
+    try:
+        tmp.write_bytes(data)
+        tmp.chmod(0o644)
+        tmp.replace(dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def link_or_reflink(src: Path, dest: Path) -> bool:
+    """Create dest sharing the data of src without copying it.
+
+    Tries a hard link, then a reflink (FICLONE). dest must not exist.
+
+    Returns:
+        True if dest was created, False if neither is possible (for example
+        across filesystems); dest is then left absent.
+    """
+    try:
+        os.link(src, dest)
+        return True
+    except OSError:
+        pass
+
+    try:
+        with src.open("rb") as fsrc, dest.open("wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        shutil.copystat(src, dest)
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+    return False
+
+
+def clone_file(src: Path, dest: Path) -> None:
+    """Create dest with the content of src as cheaply as possible.
+
+    Tries a hard link, then a reflink and finally a full copy. dest must
+    not exist.
+    """
+    if not link_or_reflink(src, dest):
+        shutil.copy2(src, dest)
+
+
+def _publish_index(dest: Path, data: bytes) -> None:
+    """Atomically write an index file and its by-hash copy."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    by_hash_dir = dest.parent / "by-hash" / "SHA256"
+    by_hash_dir.mkdir(parents=True, exist_ok=True)
+    by_hash = by_hash_dir / sha256
+    if not by_hash.exists():
+        _atomic_write_bytes(by_hash, data)
+
+    tmp = _temp_path(dest)
+    try:
+        tmp.unlink()
+        clone_file(by_hash, tmp)
+        tmp.replace(dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _prune_by_hash(dists_dir: Path) -> None:
+    """Drop by-hash files no longer referenced, keeping a few recent ones."""
+    for by_hash_dir in dists_dir.glob("*/by-hash/SHA256"):
+        current = {
+            compute_file_hashes(by_hash_dir.parent.parent / name)[1]
+            for name in INDEX_NAMES
+            if (by_hash_dir.parent.parent / name).exists()
+        }
+        stale = sorted(
+            (p for p in by_hash_dir.iterdir() if p.name not in current and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in stale[BY_HASH_KEEP:]:
+            path.unlink(missing_ok=True)
+
+
+def write_release_file(repo_root: Path) -> Path:
+    """Generate dists/local/Release listing every index with its hashes.
+
+    The Release file is unsigned; the chroot sources entry uses
+    ``[trusted=yes]``. ``Acquire-By-Hash: yes`` lets apt fetch indexes by
+    content hash, so an unchanged index is never downloaded again.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+
+    Returns:
+        Path to the Release file.
+    """
+    suite_dir = repo_root / "dists" / "local"
+    main_dir = suite_dir / "main"
+    entries: list[tuple[str, str, str, int]] = []
+    architectures: set[str] = set()
+
+    with repo_lock(repo_root):
+        if main_dir.exists():
+            for index_dir in sorted(p for p in main_dir.iterdir() if p.is_dir()):
+                if index_dir.name.startswith("binary-"):
+                    architectures.add(index_dir.name.removeprefix("binary-"))
+                for name in INDEX_NAMES:
+                    path = index_dir / name
+                    if path.is_file():
+                        md5, sha256 = compute_file_hashes(path)
+                        rel = path.relative_to(suite_dir).as_posix()
+                        entries.append((rel, md5, sha256, path.stat().st_size))
+            _prune_by_hash(main_dir)
+
+        lines = [
+            "Origin: Packastack",
+            "Label: Packastack",
+            "Suite: local",
+            "Codename: local",
+            f"Date: {format_datetime(datetime.now(UTC), usegmt=True)}",
+            f"Architectures: {' '.join(sorted(architectures))}",
+            "Components: main",
+            "Description: Packastack local build repository",
+            "Acquire-By-Hash: yes",
+            "MD5Sum:",
+        ]
+        lines.extend(f" {md5} {size:>16} {rel}" for rel, md5, _sha, size in entries)
+        lines.append("SHA256:")
+        lines.extend(f" {sha} {size:>16} {rel}" for rel, _md5, sha, size in entries)
+
+        release_path = suite_dir / "Release"
+        suite_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(release_path, ("\n".join(lines) + "\n").encode("utf-8"))
+    return release_path
+
+
+def pool_prefix(source: str) -> str:
+    """Return the Debian pool prefix for a source package.
+
+    ``libfoo`` lives under ``libf``; everything else under its first letter.
+    """
+    if source.startswith("lib") and len(source) > 3:
+        return source[:4]
+    return source[:1]
+
+
+def source_pool_dir(repo_root: Path, source: str) -> Path:
+    """Return ``pool/main/<prefix>/<source>`` for a source package."""
+    return repo_root / "pool" / "main" / pool_prefix(source) / source
+
+
+def artifact_source(artifact: Path) -> str:
+    """Return the source package an artifact belongs to (best effort).
+
+    Binary packages use their control ``Source`` field, falling back to the
+    package name; other artifacts are named ``<source>_<version>...``.
+    """
+    if artifact.suffix in _DEB_SUFFIXES:
+        info = extract_deb_control(artifact)
+        if info is not None:
+            return info.source.split(" ", 1)[0] if info.source else info.package
+    return artifact.name.split("_", 1)[0]
+
+
+@dataclass
+class SourceManifest:
+    """Parsed index entries for one source package's pool directory.
+
+    Entries are keyed by pool file name. ``stamps`` holds the size, mtime
+    and inode of every file in the directory, so unchanged files are never
+    re-read and space can be accounted without a walk; ``dir_mtime_ns``
+    detects files added or removed behind Packastack's back.
+    """
+
+    source: str
+    dir_mtime_ns: int = 0
+    binaries: dict[str, DebPackageInfo] = field(default_factory=dict)
+    sources: dict[str, SourcePackageInfo] = field(default_factory=dict)
+    stamps: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SourceManifest:
+        """Create a manifest from its JSON form."""
+        return cls(
+            source=data["source"],
+            dir_mtime_ns=data.get("dir_mtime_ns", 0),
+            binaries={name: DebPackageInfo(**info) for name, info in data.get("binaries", {}).items()},
+            sources={
+                name: SourcePackageInfo(**{**info, "files": [tuple(f) for f in info.get("files", [])]})
+                for name, info in data.get("sources", {}).items()
+            },
+            stamps=data.get("stamps", {}),
+        )
+
+
+def manifest_path(repo_root: Path, source: str) -> Path:
+    """Return the manifest shard path for a source package."""
+    return repo_root / MANIFEST_DIR / f"{source}.json"
+
+
+def load_source_manifest(repo_root: Path, source: str) -> SourceManifest | None:
+    """Load a source's manifest shard, or None if missing or unreadable."""
+    try:
+        data = json.loads(manifest_path(repo_root, source).read_text(encoding="utf-8"))
+        return SourceManifest.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _file_stamp(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _index_deb(
+    repo_root: Path, deb_path: Path, known: FileChecksums | None = None
+) -> DebPackageInfo | None:
+    """Build the Packages entry data for a pool .deb.
+
+    Known checksums are trusted when the size still matches, so the file is
+    not read a second time just to hash it.
+    """
+    info = extract_deb_control(deb_path)
+    if info is None:
+        return None
+    info.size = deb_path.stat().st_size
+    if known is not None and known.size == info.size and known.md5sum and known.sha256:
+        info.md5sum, info.sha256 = known.md5sum, known.sha256
+    else:
+        info.md5sum, info.sha256 = compute_file_hashes(deb_path)
+    info.filename = deb_path.relative_to(repo_root).as_posix()
+    return info
+
+
+def update_source_manifest(
+    repo_root: Path, source: str, checksums: dict[str, FileChecksums] | None = None
+) -> SourceManifest:
+    """Rebuild the manifest shard for one source from its pool directory.
+
+    Only files whose stamp changed since the previous shard are read.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+        source: Source package name.
+        checksums: Already computed checksums, by file name.
+
+    Returns:
+        The updated manifest (the shard is removed if the directory is gone).
+    """
+    with repo_lock(repo_root):
+        pool_dir = source_pool_dir(repo_root, source)
+        previous = load_source_manifest(repo_root, source) or SourceManifest(source=source)
+        manifest = SourceManifest(source=source)
+
+        if not pool_dir.is_dir():
+            manifest_path(repo_root, source).unlink(missing_ok=True)
+            return manifest
+
+        manifest.dir_mtime_ns = pool_dir.stat().st_mtime_ns
+        for path in sorted(pool_dir.iterdir()):
+            if path.name.startswith(".") or not path.is_file():
+                continue
+
+            stamp = _file_stamp(path)
+            manifest.stamps[path.name] = stamp
+            unchanged = previous.stamps.get(path.name) == stamp
+
+            if path.suffix not in (*BINARY_SUFFIXES, ".dsc"):
+                continue
+            if path.suffix == ".dsc":
+                if unchanged and path.name in previous.sources:
+                    manifest.sources[path.name] = previous.sources[path.name]
+                elif not unchanged and (src_info := extract_dsc_info(path, repo_root)) is not None:
+                    manifest.sources[path.name] = src_info
+            elif unchanged and path.name in previous.binaries:
+                manifest.binaries[path.name] = previous.binaries[path.name]
+            elif not unchanged and (deb_info := _index_deb(repo_root, path, (checksums or {}).get(path.name))) is not None:
+                manifest.binaries[path.name] = deb_info
+
+        shard = manifest_path(repo_root, source)
+        shard.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(shard, json.dumps(asdict(manifest), indent=1, sort_keys=True).encode("utf-8"))
+        return manifest
+
+
+def load_pool_manifests(repo_root: Path) -> list[SourceManifest]:
+    """Load the manifest shard of every source directory in the pool.
+
+    Only directories are listed; a shard is rebuilt when it is missing or
+    its source directory changed since it was written.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+
+    Returns:
+        Manifests sorted by source name.
+    """
+    pool_main = repo_root / "pool" / "main"
+    if not pool_main.is_dir():
+        return []
+
+    manifests: list[SourceManifest] = []
+    with repo_lock(repo_root):
+        for prefix_dir in sorted(p for p in pool_main.iterdir() if p.is_dir()):
+            for source_dir in sorted(p for p in prefix_dir.iterdir() if p.is_dir()):
+                if source_pool_dir(repo_root, source_dir.name) != source_dir:
+                    continue
+                manifest = load_source_manifest(repo_root, source_dir.name)
+                if manifest is None or manifest.dir_mtime_ns != source_dir.stat().st_mtime_ns:
+                    manifest = update_source_manifest(repo_root, source_dir.name)
+                manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m.source)
+
+
+def _legacy_pool_files(repo_root: Path, suffixes: tuple[str, ...] | None = None) -> list[Path]:
+    """Return files left directly in a pre-layout flat ``pool/main``.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+        suffixes: Only return files with these suffixes (default: all).
+    """
+    pool_main = repo_root / "pool" / "main"
+    if not pool_main.is_dir():
+        return []
+    return sorted(
+        p
+        for p in pool_main.iterdir()
+        if (suffixes is None or p.suffix in suffixes) and p.is_file() and not p.name.startswith(".")
+    )
+
+
+@dataclass
+class PoolMigrationResult:
+    """Result of migrating a flat pool to the per-source layout."""
+
+    success: bool
+    moved: list[tuple[Path, Path]] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+def migrate_pool_layout(repo_root: Path, dry_run: bool = False) -> PoolMigrationResult:
+    """Move files from a flat ``pool/main`` into ``pool/main/<prefix>/<source>/``.
+
+    Writes the manifest shard of every migrated source and regenerates the
+    indexes for each architecture already present. Safe to re-run.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+        dry_run: Only report what would be moved.
+
+    Returns:
+        PoolMigrationResult listing the planned or completed moves.
+    """
+    result = PoolMigrationResult(success=True)
+    pool_main = repo_root / "pool" / "main"
+    if not pool_main.is_dir():
+        return result
+
+    try:
+        with repo_lock(repo_root):
+            files = sorted(p for p in pool_main.iterdir() if p.is_file() and not p.name.startswith("."))
+            for path in files:
+                result.moved.append((path, source_pool_dir(repo_root, artifact_source(path)) / path.name))
+            result.sources = sorted({dest.parent.name for _, dest in result.moved})
+
+            if dry_run or not result.moved:
+                return result
+
+            for path, dest in result.moved:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                path.replace(dest)
+            for source in result.sources:
+                update_source_manifest(repo_root, source)
+            _regenerate_existing_indexes_locked(repo_root)
+
+    except Exception as e:
+        result.success = False
+        result.error = str(e)
+
+    return result
+
+
+def _regenerate_existing_indexes_locked(repo_root: Path) -> None:
+    """Regenerate Sources and every binary-<arch> index already present."""
+    binary_dirs = (repo_root / "dists" / "local" / "main").glob("binary-*")
+    _regenerate_arch_indexes_locked(repo_root, sorted(d.name.removeprefix("binary-") for d in binary_dirs))
+    _regenerate_source_indexes_locked(repo_root)
+
+
+# =============================================================================
+# Garbage collection
+# =============================================================================
+
+# Suffixes after the version in files without an architecture component
+_SOURCE_FILE_SUFFIX = re.compile(r"\.(dsc|diff\.gz|debian\.tar\.\w+|orig(-[\w-]+)?\.tar\.\w+(\.asc)?|tar\.\w+)$")
+
+
+def pool_size(repo_root: Path) -> int:
+    """Return the total size of the pool in bytes from the manifest ledger.
+
+    Only files left in a legacy flat pool are stat'ed.
+    """
+    total = sum(stamp[0] for manifest in load_pool_manifests(repo_root) for stamp in manifest.stamps.values())
+    for path in _legacy_pool_files(repo_root):
+        with contextlib.suppress(OSError):
+            total += path.stat().st_size
+    return total
+
+
+def pool_file_version(filename: str) -> tuple[str, bool]:
+    """Return the (epoch-less) version in a pool file name.
+
+    Returns:
+        Tuple of (version, is_orig). ``is_orig`` marks upstream tarballs,
+        whose version is the upstream version shared by several revisions.
+        The version is empty if the name does not follow ``name_version``.
+    """
+    parts = filename.split("_")
+    if len(parts) < 2:
+        return "", False
+    version = parts[1]
+    if len(parts) == 2:
+        match = _SOURCE_FILE_SUFFIX.search(version)
+        if match:
+            return version[: match.start()], match.group(1).startswith("orig")
+    return version, False
+
+
+def _upstream_of(version: str) -> str:
+    try:
+        return Version(version).upstream_version or version
+    except ValueError:
+        return version
+
+
+def _version_sort_key(version: str) -> Version:
+    try:
+        return Version(version)
+    except ValueError:
+        return Version("0")
+
+
+def _strip_epoch(version: str) -> str:
+    return version.split(":", 1)[1] if ":" in version else version
+
+
+@dataclass
+class GarbageCollectResult:
+    """Result of garbage collecting superseded versions from the pool."""
+
+    success: bool
+    removed: list[Path] = field(default_factory=list)
+    reclaimed_bytes: int = 0
+    size_before: int = 0
+    sources: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+def plan_garbage_collection(
+    manifest: SourceManifest,
+    keep: int,
+    protected: set[str] | None = None,
+) -> list[str]:
+    """Return the pool files of one source that fall outside the retention policy.
+
+    The newest ``keep`` versions and every protected version are retained,
+    along with the upstream tarballs they share. Files without a
+    recognisable version are never removed.
+
+    Args:
+        manifest: Manifest of the source.
+        keep: Number of newest versions to keep.
+        protected: Versions that must be kept (epochs are ignored).
+
+    Returns:
+        Names of files to remove.
+    """
+    parsed = {name: pool_file_version(name) for name in manifest.stamps}
+    versions = {version for version, is_orig in parsed.values() if version and not is_orig}
+    newest = sorted(versions, key=_version_sort_key, reverse=True)
+    kept = set(newest[: max(keep, 1)]) | {_strip_epoch(v) for v in protected or ()}
+    kept_upstreams = {_upstream_of(v) for v in kept}
+
+    doomed = []
+    for name, (version, is_orig) in sorted(parsed.items()):
+        if not version:
+            continue
+        if (is_orig and version not in kept_upstreams) or (not is_orig and version not in kept):
+            doomed.append(name)
+    return doomed
+
+
+def collect_garbage(
+    repo_root: Path,
+    keep: int = 2,
+    protected: dict[str, set[str]] | None = None,
+    dry_run: bool = False,
+) -> GarbageCollectResult:
+    """Remove superseded versions from the pool in one locked pass.
+
+    Space is accounted from the manifest ledger rather than by walking the
+    pool. Only the shards of affected sources are rebuilt before the
+    indexes are regenerated.
+
+    Args:
+        repo_root: Root directory of the local APT repository.
+        keep: Number of newest versions to keep per source.
+        protected: Versions to keep regardless of age, by source package.
+        dry_run: Only report what would be removed.
+
+    Returns:
+        GarbageCollectResult with the removed files and reclaimed space.
+    """
+    result = GarbageCollectResult(success=True)
+    protected = protected or {}
+
+    try:
+        with repo_lock(repo_root):
+            manifests = load_pool_manifests(repo_root)
+            result.size_before = sum(stamp[0] for m in manifests for stamp in m.stamps.values())
+
+            for manifest in manifests:
+                doomed = plan_garbage_collection(manifest, keep, protected.get(manifest.source))
+                if not doomed:
+                    continue
+                pool_dir = source_pool_dir(repo_root, manifest.source)
+                result.sources.append(manifest.source)
+                for name in doomed:
+                    result.removed.append(pool_dir / name)
+                    result.reclaimed_bytes += manifest.stamps[name][0]
+
+            if dry_run or not result.removed:
+                return result
+
+            for path in result.removed:
+                path.unlink(missing_ok=True)
+            for source in result.sources:
+                pool_dir = source_pool_dir(repo_root, source)
+                with contextlib.suppress(OSError):
+                    pool_dir.rmdir()
+                    pool_dir.parent.rmdir()
+                update_source_manifest(repo_root, source)
+            _regenerate_existing_indexes_locked(repo_root)
+
+    except Exception as e:
+        result.success = False
+        result.error = str(e)
+
+    return result
+
+
 def publish_artifacts(
     artifact_paths: list[Path],
     repo_root: Path,
     arch: str = "amd64",
+    source: str = "",
+    checksums: dict[str, FileChecksums] | None = None,
 ) -> PublishResult:
     """Publish build artifacts to the local APT repository.
 
-    Copies .deb files into the pool directory structure and .dsc/.changes
-    files into the source pool.
+    Places artifacts into ``pool/main/<prefix>/<source>/`` and refreshes
+    that source's manifest shard. Files are hard-linked (or reflinked) when
+    possible and copied otherwise. All artifacts are staged under temporary
+    names first and renamed into place under the repository lock, so a
+    failure publishes nothing.
 
     Args:
         artifact_paths: List of paths to artifacts (.deb, .dsc, .changes, etc.).
         repo_root: Root directory of the local APT repository.
-        arch: Target architecture (used for pool subdirectory).
+        arch: Target architecture.
+        source: Source package name; inferred from a .dsc/.changes in the
+            artifacts, or per artifact, when empty.
+        checksums: Checksums computed when the artifacts were collected, by
+            file name; reused for the index instead of re-reading the files.
 
     Returns:
         PublishResult with published paths.
     """
     published: list[Path] = []
+    staged: list[tuple[Path, Path]] = []
+    created: list[Path] = []
 
-    try:
-        # Create pool directories
-        pool_main = repo_root / "pool" / "main"
-        pool_main.mkdir(parents=True, exist_ok=True)
+    if not source:
+        source = next(
+            (a.name.split("_", 1)[0] for a in artifact_paths if a.suffix in (".dsc", ".changes")),
+            "",
+        )
 
+    try:
         for artifact in artifact_paths:
             if not artifact.exists():
                 continue
@@ -448,33 +1123,39 @@ def publish_artifacts(
                 logger.debug("Skipping non-file artifact: %s", artifact)
                 continue
 
-            # Determine destination based on file type
-            if artifact.suffix in (".deb", ".ddeb", ".udeb"):
-                # Binary packages go to pool/main/<first-letter>/<source>/
-                # For simplicity, we'll use pool/main/
-                dest = pool_main / artifact.name
-            elif artifact.suffix in (".dsc", ".changes", ".tar.gz", ".tar.xz", ".diff.gz", ".buildinfo"):
-                # Source packages and metadata also go to pool/main/
-                dest = pool_main / artifact.name
-            else:
-                # Other files also copied
-                dest = pool_main / artifact.name
+            dest_dir = source_pool_dir(repo_root, source or artifact_source(artifact))
+            created.extend(d for d in (dest_dir.parent, dest_dir) if not d.exists())
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            dest = dest_dir / artifact.name
 
-            # Copy file
-            shutil.copy2(artifact, dest)
-            published.append(dest)
+            tmp = _temp_path(dest)
+            staged.append((tmp, dest))
+            tmp.unlink()
+            clone_file(artifact, tmp)
+
+        with repo_lock(repo_root):
+            for tmp, dest in staged:
+                tmp.replace(dest)
+                published.append(dest)
+            for touched in sorted({dest.parent.name for _, dest in staged}):
+                update_source_manifest(repo_root, touched, checksums)
 
         return PublishResult(success=True, published_paths=published)
 
     except Exception as e:
+        for tmp, _dest in staged:
+            tmp.unlink(missing_ok=True)
+        for directory in reversed(created):
+            with contextlib.suppress(OSError):
+                directory.rmdir()
         return PublishResult(success=False, error=str(e))
 
 
 def regenerate_indexes(repo_root: Path, arch: str = "amd64") -> IndexResult:
     """Regenerate Packages and Packages.gz indexes for the local repository.
 
-    Scans the pool directory for .deb files, extracts their control
-    information, and generates the index files.
+    Merges the per-source manifest shards (plus any files left in a legacy
+    flat pool) and generates the index files.
 
     Args:
         repo_root: Root directory of the local APT repository.
@@ -484,65 +1165,111 @@ def regenerate_indexes(repo_root: Path, arch: str = "amd64") -> IndexResult:
         IndexResult with generated file paths.
     """
     try:
-        # Create the dists directory structure
-        dists_dir = repo_root / "dists" / "local" / "main" / f"binary-{arch}"
-        dists_dir.mkdir(parents=True, exist_ok=True)
+        with repo_lock(repo_root):
+            return _regenerate_indexes_locked(repo_root, arch)
+    except Exception as e:
+        return IndexResult(success=False, error=str(e))
 
-        pool_dir = repo_root / "pool" / "main"
-        if not pool_dir.exists():
-            # No packages yet, create empty index
-            packages_path = dists_dir / "Packages"
-            packages_gz_path = dists_dir / "Packages.gz"
-            packages_path.write_text("")
-            with gzip.open(packages_gz_path, "wt", encoding="utf-8") as f:
-                f.write("")
-            return IndexResult(
-                success=True,
-                packages_file=packages_path,
-                packages_gz_file=packages_gz_path,
-                package_count=0,
-            )
 
-        # Collect all .deb and .udeb files (use set to avoid duplicates)
-        deb_files_set = set(pool_dir.glob("**/*.deb")) | set(pool_dir.glob("**/*.udeb"))
-        deb_files = list(deb_files_set)
-        entries: list[str] = []
+def regenerate_arch_indexes(repo_root: Path, architectures: Sequence[str]) -> dict[str, IndexResult]:
+    """Regenerate the binary indexes of several architectures together.
 
-        for deb_path in deb_files:
-            info = extract_deb_control(deb_path)
-            if info is None:
-                continue
+    The pool is read once; each architecture's index is then rendered,
+    compressed and published on its own thread, and the Release file is
+    rewritten once at the end.
 
-            # Skip if architecture doesn't match (allow 'all')
-            if info.architecture not in (arch, "all"):
-                continue
+    Args:
+        repo_root: Root directory of the local APT repository.
+        architectures: Architectures to generate indexes for.
+
+    Returns:
+        IndexResult per architecture.
+    """
+    try:
+        with repo_lock(repo_root):
+            return _regenerate_arch_indexes_locked(repo_root, architectures)
+    except Exception as e:
+        return {arch: IndexResult(success=False, error=str(e)) for arch in architectures}
 
-            # Compute hashes and size
-            info.md5sum, info.sha256 = compute_file_hashes(deb_path)
-            info.size = deb_path.stat().st_size
-            info.filename = f"pool/main/{deb_path.name}"
 
-            entries.append(format_packages_entry(info))
+def _write_index_pair(
+    repo_root: Path, index_dir: Path, name: str, content: str, release: bool = True
+) -> tuple[Path, Path]:
+    """Publish <name> and <name>.gz atomically and refresh the Release file.
 
-        # Write Packages file
-        packages_content = "\n".join(entries)
-        packages_path = dists_dir / "Packages"
-        packages_path.write_text(packages_content, encoding="utf-8")
+    Pass ``release=False`` when publishing from a worker thread; the
+    Release file takes the repository lock, which only the caller holds.
+    """
+    data = content.encode("utf-8")
+    plain_path = index_dir / name
+    gz_path = index_dir / f"{name}.gz"
+    # mtime=0 keeps unchanged indexes byte-identical, so by-hash stays stable
+    _publish_index(gz_path, gzip.compress(data, mtime=0))
+    _publish_index(plain_path, data)
+    if release:
+        write_release_file(repo_root)
+    return plain_path, gz_path
+
+
+def _pool_binary_infos(repo_root: Path) -> list[DebPackageInfo]:
+    """Return the index entries of every binary in the pool; caller holds the lock."""
+    # Shards and their entries are sorted, so an unchanged pool yields a
+    # byte-identical index
+    infos = [
+        info for manifest in load_pool_manifests(repo_root) for _name, info in sorted(manifest.binaries.items())
+    ]
+    for deb_path in _legacy_pool_files(repo_root, BINARY_SUFFIXES):
+        info = _index_deb(repo_root, deb_path)
+        if info is not None:
+            infos.append(info)
+    return infos
 
-        # Write Packages.gz
-        packages_gz_path = dists_dir / "Packages.gz"
-        with gzip.open(packages_gz_path, "wt", encoding="utf-8") as f:
-            f.write(packages_content)
 
-        return IndexResult(
-            success=True,
-            packages_file=packages_path,
-            packages_gz_file=packages_gz_path,
-            package_count=len(entries),
-        )
+def _write_arch_index(
+    repo_root: Path, arch: str, infos: list[DebPackageInfo], release: bool = True
+) -> IndexResult:
+    """Write the binary index of one architecture from the pool entries."""
+    # Create the dists directory structure
+    dists_dir = repo_root / "dists" / "local" / "main" / f"binary-{arch}"
+    dists_dir.mkdir(parents=True, exist_ok=True)
 
-    except Exception as e:
-        return IndexResult(success=False, error=str(e))
+    # Skip if architecture doesn't match (allow 'all')
+    entries = [format_packages_entry(info) for info in infos if info.architecture in (arch, "all")]
+
+    packages_path, packages_gz_path = _write_index_pair(
+        repo_root, dists_dir, "Packages", "\n".join(entries), release=release
+    )
+
+    return IndexResult(
+        success=True,
+        packages_file=packages_path,
+        packages_gz_file=packages_gz_path,
+        package_count=len(entries),
+    )
+
+
+def _regenerate_indexes_locked(repo_root: Path, arch: str) -> IndexResult:
+    """Regenerate the binary index for one architecture; caller holds the lock."""
+    return _write_arch_index(repo_root, arch, _pool_binary_infos(repo_root))
+
+
+def _regenerate_arch_indexes_locked(repo_root: Path, architectures: Sequence[str]) -> dict[str, IndexResult]:
+    """Regenerate several binary indexes in parallel; caller holds the lock."""
+    arches = list(dict.fromkeys(architectures))
+    if not arches:
+        return {}
+    infos = _pool_binary_infos(repo_root)
+
+    def write(arch: str) -> IndexResult:
+        try:
+            return _write_arch_index(repo_root, arch, infos, release=False)
+        except Exception as e:
+            return IndexResult(success=False, error=str(e))
+
+    with ThreadPoolExecutor(max_workers=len(arches), thread_name_prefix="index") as pool:
+        results = dict(zip(arches, pool.map(write, arches), strict=True))
+    write_release_file(repo_root)
+    return results
 
 
 @dataclass
@@ -559,8 +1286,8 @@ class SourceIndexResult:
 def regenerate_source_indexes(repo_root: Path) -> SourceIndexResult:
     """Regenerate Sources and Sources.gz indexes for the local repository.
 
-    Scans the pool directory for .dsc files, extracts their information,
-    and generates the source index files.
+    Merges the per-source manifest shards (plus any .dsc files left in a
+    legacy flat pool) and generates the source index files.
 
     Args:
         repo_root: Root directory of the local APT repository.
@@ -569,55 +1296,35 @@ def regenerate_source_indexes(repo_root: Path) -> SourceIndexResult:
         SourceIndexResult with generated file paths.
     """
     try:
-        # Create the dists directory structure for source
-        dists_dir = repo_root / "dists" / "local" / "main" / "source"
-        dists_dir.mkdir(parents=True, exist_ok=True)
-
-        pool_dir = repo_root / "pool" / "main"
-        if not pool_dir.exists():
-            # No packages yet, create empty index
-            sources_path = dists_dir / "Sources"
-            sources_gz_path = dists_dir / "Sources.gz"
-            sources_path.write_text("")
-            with gzip.open(sources_gz_path, "wt", encoding="utf-8") as f:
-                f.write("")
-            return SourceIndexResult(
-                success=True,
-                sources_file=sources_path,
-                sources_gz_file=sources_gz_path,
-                source_count=0,
-            )
-
-        # Collect all .dsc files
-        dsc_files = list(pool_dir.glob("**/*.dsc"))
-        entries: list[str] = []
-
-        for dsc_path in dsc_files:
-            info = extract_dsc_info(dsc_path)
-            if info is None:
-                continue
+        with repo_lock(repo_root):
+            return _regenerate_source_indexes_locked(repo_root)
+    except Exception as e:
+        return SourceIndexResult(success=False, error=str(e))
 
-            entries.append(format_sources_entry(info))
 
-        # Write Sources file
-        sources_content = "\n".join(entries)
-        sources_path = dists_dir / "Sources"
-        sources_path.write_text(sources_content, encoding="utf-8")
+def _regenerate_source_indexes_locked(repo_root: Path) -> SourceIndexResult:
+    """Regenerate the Sources index; caller holds the lock."""
+    # Create the dists directory structure for source
+    dists_dir = repo_root / "dists" / "local" / "main" / "source"
+    dists_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write Sources.gz
-        sources_gz_path = dists_dir / "Sources.gz"
-        with gzip.open(sources_gz_path, "wt", encoding="utf-8") as f:
-            f.write(sources_content)
+    infos = [
+        info for manifest in load_pool_manifests(repo_root) for _name, info in sorted(manifest.sources.items())
+    ]
+    for dsc_path in _legacy_pool_files(repo_root, (".dsc",)):
+        info = extract_dsc_info(dsc_path, repo_root)
+        if info is not None:
+            infos.append(info)
 
-        return SourceIndexResult(
-            success=True,
-            sources_file=sources_path,
-            sources_gz_file=sources_gz_path,
-            source_count=len(entries),
-        )
+    entries = [format_sources_entry(info) for info in infos]
+    sources_path, sources_gz_path = _write_index_pair(repo_root, dists_dir, "Sources", "\n".join(entries))
 
-    except Exception as e:
-        return SourceIndexResult(success=False, error=str(e))
+    return SourceIndexResult(
+        success=True,
+        sources_file=sources_path,
+        sources_gz_file=sources_gz_path,
+        source_count=len(entries),
+    )
 
 
 def regenerate_all_indexes(repo_root: Path, arch: str = "amd64") -> tuple[IndexResult, SourceIndexResult]:
@@ -653,6 +1360,7 @@ def ensure_repo_initialized(repo_root: Path, arch: str = "amd64") -> bool:
         # Create the pool directory
         pool_dir = repo_root / "pool" / "main"
         pool_dir.mkdir(parents=True, exist_ok=True)
+        release_file = repo_root / "dists" / "local" / "Release"
 
         # Check if indexes already exist for the given arch
         binary_packages_gz = repo_root / "dists" / "local" / "main" / f"binary-{arch}" / "Packages.gz"
@@ -678,6 +1386,9 @@ def ensure_repo_initialized(repo_root: Path, arch: str = "amd64") -> bool:
             if not source_result.success:
                 logger.warning("Failed to initialize source indexes: %s", source_result.error)
                 # Source index failure is not fatal
+        elif not release_file.exists():
+            # Repository published before Release files were generated
+            write_release_file(repo_root)
 
         return True
 
@@ -801,8 +1512,12 @@ def get_source_versions(repo_root: Path, source_name: str) -> list[str]:
     if not pool_dir.exists():
         return versions
 
-    # Look for .dsc files matching the source name
-    for dsc_file in pool_dir.glob(f"{source_name}_*.dsc"):
+    # Look for .dsc files in the source's pool directory and a legacy flat pool
+    dsc_files = [
+        *source_pool_dir(repo_root, source_name).glob(f"{source_name}_*.dsc"),
+        *pool_dir.glob(f"{source_name}_*.dsc"),
+    ]
+    for dsc_file in dsc_files:
         # Extract version from filename: name_version.dsc
         name = dsc_file.stem  # e.g., "nova_29.0.0-0ubuntu1"
         parts = name.split("_", 1)
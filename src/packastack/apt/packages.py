@@ -52,6 +52,7 @@ class BinaryPackage:
     provides: list[str] = field(default_factory=list)
     component: str = ""  # main, universe, etc.
     pocket: str = ""  # release, updates, security
+    sha256: str = ""  # .deb checksum from the Packages index
 
 
 def compare_versions(v1: str, v2: str) -> int:
@@ -140,6 +141,7 @@ def iter_packages(packages_gz_path: Path) -> Iterator[BinaryPackage]:
                 depends=depends,
                 pre_depends=pre_depends,
                 provides=provides,
+                sha256=pkg.get("SHA256", ""),
             )
 
 
@@ -20,110 +20,91 @@
 
 Provides functionality for building Debian packages using sbuild,
 including artifact collection and sbuild configuration parsing.
-"""
-
-# Types for build state management
-# Error handling and exit codes
-from packastack.build.errors import (
-    EXIT_ALL_BUILD_FAILED,
-    EXIT_BUILD_FAILED,
-    EXIT_CONFIG_ERROR,
-    EXIT_CYCLE_DETECTED,
-    EXIT_DISCOVERY_FAILED,
-    EXIT_FETCH_FAILED,
-    EXIT_GRAPH_ERROR,
-    EXIT_MISSING_PACKAGES,
-    EXIT_PATCH_FAILED,
-    EXIT_POLICY_BLOCKED,
-    EXIT_REGISTRY_ERROR,
-    EXIT_RESUME_ERROR,
-    EXIT_RETIRED_PROJECT,
-    EXIT_SUCCESS,
-    EXIT_TOOL_MISSING,
-    log_phase_event,
-    phase_error,
-    phase_warning,
-)
 
-# Git helpers
-from packastack.build.git_helpers import (
-    GitCommitError,
-    ensure_no_merge_paths,
-    extract_upstream_version,
-    get_git_author_env,
-    git_commit,
-    maybe_disable_gpg_sign,
-    maybe_enable_sphinxdoc,
-    no_gpg_sign_enabled,
-)
-
-# Local repo helpers
-from packastack.build.localrepo_helpers import (
-    _refresh_local_repo_indexes,
-    refresh_local_repo_indexes,
-)
+The names re-exported here are resolved lazily (PEP 562), so that
+``import packastack.build.errors`` and friends stay cheap.
+"""
 
-# Phase functions
-from packastack.build.phases import (
-    PackageIndexes,
-    PolicyCheckResult,
-    RegistryResolutionResult,
-    RetirementCheckResult,
-    SchrootSetupResult,
-    ToolCheckResult,
-    check_policy,
-    check_retirement_status,
-    check_tools,
-    ensure_schroot_ready,
-    load_package_indexes,
-    resolve_upstream_registry,
-)
+from __future__ import annotations
 
-# Single build phases
-from packastack.build.single_build import (
-    BuildResult as SingleBuildResult,
-)
-from packastack.build.single_build import (
-    FetchResult,
-    PrepareResult,
-    SetupInputs,
-    SingleBuildContext,
-    SingleBuildOutcome,
-    ValidateDepsResult,
-    build_packages,
-    build_single_package,
-    fetch_packaging_repo,
-    import_and_patch,
-    prepare_upstream_source,
-    setup_build_context,
-    validate_and_build_deps,
-    verify_and_publish,
-)
-from packastack.build.single_build import (
-    PhaseResult as SinglePhaseResult,
-)
+import importlib
+from typing import Any
 
-# Tarball acquisition
-from packastack.build.tarball import (
-    # Backwards compatibility aliases
-    _download_github_release_tarball,
-    _download_pypi_tarball,
-    _fetch_release_tarball,
-    _run_uscan,
-    download_github_release_tarball,
-    download_pypi_tarball,
-    fetch_release_tarball,
-    run_uscan,
-)
-from packastack.build.types import (
-    BuildInputs,
-    BuildOutcome,
-    PhaseResult,
-    RegistryResolution,
-    ResolvedTargets,
-    TarballAcquisitionResult,
-    WorkspacePaths,
-)
+# Public name -> (module, attribute). Imported on first access so that
+# importing one build submodule does not load all of them.
+_EXPORTS: dict[str, tuple[str, str]] = {
+    "EXIT_ALL_BUILD_FAILED": ("packastack.build.errors", "EXIT_ALL_BUILD_FAILED"),
+    "EXIT_BUILD_FAILED": ("packastack.build.errors", "EXIT_BUILD_FAILED"),
+    "EXIT_CONFIG_ERROR": ("packastack.build.errors", "EXIT_CONFIG_ERROR"),
+    "EXIT_CYCLE_DETECTED": ("packastack.build.errors", "EXIT_CYCLE_DETECTED"),
+    "EXIT_DISCOVERY_FAILED": ("packastack.build.errors", "EXIT_DISCOVERY_FAILED"),
+    "EXIT_FETCH_FAILED": ("packastack.build.errors", "EXIT_FETCH_FAILED"),
+    "EXIT_GRAPH_ERROR": ("packastack.build.errors", "EXIT_GRAPH_ERROR"),
+    "EXIT_MISSING_PACKAGES": ("packastack.build.errors", "EXIT_MISSING_PACKAGES"),
+    "EXIT_PATCH_FAILED": ("packastack.build.errors", "EXIT_PATCH_FAILED"),
+    "EXIT_POLICY_BLOCKED": ("packastack.build.errors", "EXIT_POLICY_BLOCKED"),
+    "EXIT_REGISTRY_ERROR": ("packastack.build.errors", "EXIT_REGISTRY_ERROR"),
+    "EXIT_RESUME_ERROR": ("packastack.build.errors", "EXIT_RESUME_ERROR"),
+    "EXIT_RETIRED_PROJECT": ("packastack.build.errors", "EXIT_RETIRED_PROJECT"),
+    "EXIT_SUCCESS": ("packastack.build.errors", "EXIT_SUCCESS"),
+    "EXIT_TOOL_MISSING": ("packastack.build.errors", "EXIT_TOOL_MISSING"),
+    "log_phase_event": ("packastack.build.errors", "log_phase_event"),
+    "phase_error": ("packastack.build.errors", "phase_error"),
+    "phase_warning": ("packastack.build.errors", "phase_warning"),
+    "GitCommitError": ("packastack.build.git_helpers", "GitCommitError"),
+    "ensure_no_merge_paths": ("packastack.build.git_helpers", "ensure_no_merge_paths"),
+    "extract_upstream_version": ("packastack.build.git_helpers", "extract_upstream_version"),
+    "get_git_author_env": ("packastack.build.git_helpers", "get_git_author_env"),
+    "git_commit": ("packastack.build.git_helpers", "git_commit"),
+    "maybe_disable_gpg_sign": ("packastack.build.git_helpers", "maybe_disable_gpg_sign"),
+    "maybe_enable_sphinxdoc": ("packastack.build.git_helpers", "maybe_enable_sphinxdoc"),
+    "no_gpg_sign_enabled": ("packastack.build.git_helpers", "no_gpg_sign_enabled"),
+    "_refresh_local_repo_indexes": ("packastack.build.localrepo_helpers", "_refresh_local_repo_indexes"),
+    "refresh_local_repo_indexes": ("packastack.build.localrepo_helpers", "refresh_local_repo_indexes"),
+    "PackageIndexes": ("packastack.build.phases", "PackageIndexes"),
+    "PolicyCheckResult": ("packastack.build.phases", "PolicyCheckResult"),
+    "RegistryResolutionResult": ("packastack.build.phases", "RegistryResolutionResult"),
+    "RetirementCheckResult": ("packastack.build.phases", "RetirementCheckResult"),
+    "SchrootSetupResult": ("packastack.build.phases", "SchrootSetupResult"),
+    "ToolCheckResult": ("packastack.build.phases", "ToolCheckResult"),
+    "check_policy": ("packastack.build.phases", "check_policy"),
+    "check_retirement_status": ("packastack.build.phases", "check_retirement_status"),
+    "check_tools": ("packastack.build.phases", "check_tools"),
+    "ensure_schroot_ready": ("packastack.build.phases", "ensure_schroot_ready"),
+    "load_package_indexes": ("packastack.build.phases", "load_package_indexes"),
+    "resolve_upstream_registry": ("packastack.build.phases", "resolve_upstream_registry"),
+    "SingleBuildResult": ("packastack.build.single_build", "BuildResult"),
+    "FetchResult": ("packastack.build.single_build", "FetchResult"),
+    "PrepareResult": ("packastack.build.single_build", "PrepareResult"),
+    "SetupInputs": ("packastack.build.single_build", "SetupInputs"),
+    "SingleBuildContext": ("packastack.build.single_build", "SingleBuildContext"),
+    "SingleBuildOutcome": ("packastack.build.single_build", "SingleBuildOutcome"),
+    "ValidateDepsResult": ("packastack.build.single_build", "ValidateDepsResult"),
+    "build_packages": ("packastack.build.single_build", "build_packages"),
+    "build_single_package": ("packastack.build.single_build", "build_single_package"),
+    "fetch_packaging_repo": ("packastack.build.single_build", "fetch_packaging_repo"),
+    "import_and_patch": ("packastack.build.single_build", "import_and_patch"),
+    "prepare_upstream_source": ("packastack.build.single_build", "prepare_upstream_source"),
+    "setup_build_context": ("packastack.build.single_build", "setup_build_context"),
+    "validate_and_build_deps": ("packastack.build.single_build", "validate_and_build_deps"),
+    "verify_and_publish": ("packastack.build.single_build", "verify_and_publish"),
+    "SinglePhaseResult": ("packastack.build.single_build", "PhaseResult"),
+    "_download_github_release_tarball": ("packastack.build.tarball", "_download_github_release_tarball"),
+    "_download_pypi_tarball": ("packastack.build.tarball", "_download_pypi_tarball"),
+    "_fetch_release_tarball": ("packastack.build.tarball", "_fetch_release_tarball"),
+    "_run_uscan": ("packastack.build.tarball", "_run_uscan"),
+    "download_github_release_tarball": ("packastack.build.tarball", "download_github_release_tarball"),
+    "download_pypi_tarball": ("packastack.build.tarball", "download_pypi_tarball"),
+    "fetch_release_tarball": ("packastack.build.tarball", "fetch_release_tarball"),
+    "run_uscan": ("packastack.build.tarball", "run_uscan"),
+    "BuildInputs": ("packastack.build.types", "BuildInputs"),
+    "BuildOutcome": ("packastack.build.types", "BuildOutcome"),
+    "PhaseResult": ("packastack.build.types", "PhaseResult"),
+    "RegistryResolution": ("packastack.build.types", "RegistryResolution"),
+    "ResolvedTargets": ("packastack.build.types", "ResolvedTargets"),
+    "TarballAcquisitionResult": ("packastack.build.types", "TarballAcquisitionResult"),
+    "WorkspacePaths": ("packastack.build.types", "WorkspacePaths"),
+}
 
 __all__ = [
     "EXIT_ALL_BUILD_FAILED",
@@ -200,3 +181,22 @@ __all__ = [
     "verify_and_publish",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        # Submodules not imported yet (e.g. packastack.build.phases)
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS})
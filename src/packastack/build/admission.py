@@ -0,0 +1,423 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Resource-aware admission of parallel build-all builds.
+
+The ``--parallel`` worker count caps how many builds run at once; the
+:class:`AdmissionController` decides when each of them may actually start.
+It holds a budget of CPUs, memory and disk, and admits a build only while
+the build's expected peak memory and disk use still fit. Expectations come
+from a :class:`ResourceHistory` of what each package used in earlier runs
+(child builds report it on the progress stream); unknown packages are
+assumed to need the configured defaults. Memory is recorded per CPU the
+build was given and scaled by the CPUs it will get, since parallel
+compilers are what multiply a build's footprint.
+
+Every admitted build reserves CPUs for ``DEB_BUILD_OPTIONS=parallel=N``,
+an equal share of the CPU budget among the builds the batch can run at
+once, so a batch of two builds on a large host gets wide builds and a
+batch of twenty gets narrow ones.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import resource
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+HISTORY_FILE = "resource-history.json"
+
+# Observations kept per package; the largest one is the estimate
+HISTORY_SAMPLES = 5
+
+MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    """Peak memory and disk used by one build, in bytes."""
+
+    memory: int = 0
+    disk: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+def directory_size(path: Path) -> int:
+    """Return the bytes used by the files under a directory.
+
+    Hard-linked files (e.g. artifacts linked into the build cache) are
+    counted once.
+    """
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(OSError):
+                st = (Path(root) / name).lstat()
+                if (st.st_dev, st.st_ino) not in seen:
+                    seen.add((st.st_dev, st.st_ino))
+                    total += st.st_size
+    return total
+
+
+def process_tree_rss(pid: int) -> int:
+    """Return the summed RSS of a process and all its descendants, in bytes."""
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        with contextlib.suppress(OSError, ValueError, IndexError):
+            # The command name may contain spaces; the ppid follows its ")"
+            stat = (entry / "stat").read_text()
+            children.setdefault(int(stat.rsplit(")", 1)[1].split()[1]), []).append(int(entry.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        with contextlib.suppress(OSError, ValueError, IndexError):
+            total += int(Path(f"/proc/{current}/statm").read_text().split()[1]) * page_size
+        pending.extend(children.get(current, []))
+    return total
+
+
+class ProcessTreeSampler:
+    """Track the peak memory of this process and everything it runs.
+
+    Samples the summed RSS of the process tree (sbuild, and the compilers
+    and test runners in its chroot) from a background thread while used as
+    a context manager.
+
+    Args:
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        """Take one sample."""
+        with contextlib.suppress(OSError):
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> ProcessTreeSampler:
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+
+
+def measure_build_usage(workspace: Path | None, tree_peak: int = 0) -> ResourceUsage:
+    """Measure the resources used by this build process so far.
+
+    Memory is the sampled peak of the whole process tree (see
+    :class:`ProcessTreeSampler`), or at least the peak RSS of this process
+    plus that of its largest finished subprocess. Disk is the size of the
+    build workspace; the sbuild chroot's overlay and build tree are not on
+    the workspace filesystem and are not counted.
+
+    Args:
+        workspace: Build workspace.
+        tree_peak: Peak memory of the process tree, in bytes, if sampled.
+    """
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    disk = directory_size(workspace) if workspace is not None and workspace.is_dir() else 0
+    return ResourceUsage(memory=max(peak * 1024, tree_peak), disk=disk)
+
+
+class ResourceHistory:
+    """Per-package resource use recorded by previous builds.
+
+    Args:
+        path: JSON file holding the history.
+        samples: Recorded observations, by package.
+    """
+
+    def __init__(self, path: Path, samples: dict[str, list[dict[str, Any]]] | None = None) -> None:
+        self.path = path
+        self.samples = samples or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> ResourceHistory:
+        """Read the history; a missing or unreadable file gives an empty one."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        packages = data.get("packages", {}) if isinstance(data, dict) else {}
+        return cls(path, {name: list(s) for name, s in packages.items() if isinstance(s, list)})
+
+    def estimate(self, package: str) -> ResourceUsage | None:
+        """Return the largest recorded use of a package, or None if unknown.
+
+        Memory is per CPU the build was given.
+        """
+        with self._lock:
+            samples = self.samples.get(package)
+            if not samples:
+                return None
+            return ResourceUsage(
+                memory=max(int(s.get("memory", 0)) // max(int(s.get("jobs", 1)), 1) for s in samples),
+                disk=max(int(s.get("disk", 0)) for s in samples),
+            )
+
+    def record(self, package: str, usage: ResourceUsage, jobs: int = 1) -> None:
+        """Add an observation of a build given jobs CPUs, keeping the most recent ones."""
+        sample = {**usage.to_dict(), "jobs": max(jobs, 1), "recorded_at": datetime.now(UTC).isoformat()}
+        with self._lock:
+            self.samples[package] = [*self.samples.get(package, []), sample][-HISTORY_SAMPLES:]
+
+    def save(self) -> None:
+        """Write the history atomically."""
+        with self._lock:
+            payload = json.dumps({"packages": self.samples}, indent=2, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        tmp = Path(name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            tmp.replace(self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+def available_memory() -> int:
+    """Return the memory available for new work, in bytes."""
+    with contextlib.suppress(OSError, ValueError):
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+@dataclass(frozen=True)
+class ResourceBudget:
+    """CPUs, and bytes of memory and disk, that builds may use together."""
+
+    cpus: int
+    memory: int
+    disk: int
+
+    @classmethod
+    def from_host(cls, disk_path: Path, memory_reserve: int = 0, disk_reserve: int = 0) -> ResourceBudget:
+        """Measure the budget of this host.
+
+        Args:
+            disk_path: Directory builds write to; its filesystem's free
+                space is the disk budget.
+            memory_reserve: Bytes of available memory left to the system.
+            disk_reserve: Bytes of free disk left unused.
+        """
+        probe = disk_path
+        while not probe.exists() and probe != probe.parent:
+            probe = probe.parent
+        return cls(
+            cpus=os.cpu_count() or 1,
+            memory=max(available_memory() - memory_reserve, 0),
+            disk=max(shutil.disk_usage(probe).free - disk_reserve, 0),
+        )
+
+
+@dataclass(frozen=True)
+class Admission:
+    """A build admitted by the controller.
+
+    Attributes:
+        package: Package being built.
+        jobs: CPUs reserved for the build (``parallel=N``).
+        usage: Memory and disk reserved for the build.
+    """
+
+    package: str
+    jobs: int
+    usage: ResourceUsage
+
+
+class AdmissionController:
+    """Admits builds while their expected resource use fits the budget.
+
+    A build that does not fit waits until running builds release enough
+    memory or disk. When nothing is running, the next build is always
+    admitted, so a package larger than the whole budget still gets built,
+    alone. CPUs are shared out rather than waited for: once they are all
+    reserved, further builds get one each. A package's recorded memory use
+    is scaled by the CPUs its build gets; the default use is not.
+
+    Args:
+        budget: Resources the builds share.
+        history: Recorded use of previous builds.
+        default_usage: Expected use of packages without history.
+    """
+
+    def __init__(
+        self,
+        budget: ResourceBudget,
+        history: ResourceHistory | None = None,
+        default_usage: ResourceUsage | None = None,
+    ) -> None:
+        self.budget = budget
+        self.history = history
+        self.default_usage = default_usage or ResourceUsage()
+        self.running = 0
+        self._cpus = budget.cpus
+        self._memory = budget.memory
+        self._disk = budget.disk
+        self._cond = threading.Condition()
+
+    def estimate(self, package: str, jobs: int = 1) -> ResourceUsage:
+        """Return the expected resource use of a package's build with jobs CPUs."""
+        recorded = self.history.estimate(package) if self.history is not None else None
+        if recorded is None:
+            return self.default_usage
+        return ResourceUsage(memory=recorded.memory * max(jobs, 1), disk=recorded.disk)
+
+    def _fits(self, usage: ResourceUsage) -> bool:
+        if self.running == 0:
+            return True
+        return usage.memory <= self._memory and usage.disk <= self._disk
+
+    def acquire(self, package: str, share: int = 1) -> Admission:
+        """Wait until a build fits the budget and reserve its resources.
+
+        Args:
+            package: Package to build.
+            share: Builds expected to run side by side; the build gets this
+                fraction of the CPU budget (at least one CPU, at most what
+                is free).
+
+        Returns:
+            The admission, to be released when the build finishes.
+        """
+        with self._cond:
+            while True:
+                jobs = max(1, min(self._cpus, self.budget.cpus // max(share, 1)))
+                usage = self.estimate(package, jobs)
+                if self._fits(usage):
+                    break
+                self._cond.wait()
+            self._cpus -= jobs
+            self._memory -= usage.memory
+            self._disk -= usage.disk
+            self.running += 1
+            return Admission(package=package, jobs=jobs, usage=usage)
+
+    def release(self, admission: Admission) -> None:
+        """Return an admitted build's resources to the budget."""
+        with self._cond:
+            self._cpus += admission.jobs
+            self._memory += admission.usage.memory
+            self._disk += admission.usage.disk
+            self.running -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def admit(self, package: str, share: int = 1) -> Iterator[Admission]:
+        """Hold an admission for the duration of a build."""
+        admission = self.acquire(package, share)
+        try:
+            yield admission
+        finally:
+            self.release(admission)
+
+    def record(self, package: str, usage: dict[str, Any]) -> None:
+        """Record the use a finished build reported, if any."""
+        if self.history is None or not usage:
+            return
+        with contextlib.suppress(TypeError, ValueError):
+            self.history.record(
+                package,
+                ResourceUsage(memory=int(usage.get("memory", 0)), disk=int(usage.get("disk", 0))),
+                jobs=int(usage.get("jobs", 1)),
+            )
+
+    def save(self) -> None:
+        """Persist the recorded history for later runs."""
+        if self.history is not None:
+            self.history.save()
+
+
+def deb_build_options(jobs: int, current: str = "") -> str:
+    """Return DEB_BUILD_OPTIONS with ``parallel=`` set to jobs.
+
+    Other options in ``current`` are kept.
+    """
+    options = [opt for opt in current.split() if not opt.startswith("parallel=")]
+    return " ".join([*options, f"parallel={jobs}"])
+
+
+def build_jobs(options: str) -> int:
+    """Return the ``parallel=`` CPU count in DEB_BUILD_OPTIONS, or 1."""
+    for opt in options.split():
+        if opt.startswith("parallel="):
+            with contextlib.suppress(ValueError):
+                return max(int(opt.partition("=")[2]), 1)
+    return 1
+
+
+def create_admission_controller(cfg: dict[str, Any], paths: dict[str, Path]) -> AdmissionController | None:
+    """Build the controller for a build-all run from the admission config.
+
+    Returns:
+        The controller, or None if admission control is disabled.
+    """
+    admission_cfg = cfg.get("admission", {})
+    if not admission_cfg.get("enabled", True):
+        return None
+    build_root = paths.get("build_root", paths["cache_root"] / "build")
+    budget = ResourceBudget.from_host(
+        build_root,
+        memory_reserve=int(admission_cfg.get("memory_reserve_mb", 1024)) * MIB,
+        disk_reserve=int(admission_cfg.get("disk_reserve_mb", 4096)) * MIB,
+    )
+    return AdmissionController(
+        budget,
+        ResourceHistory.load(paths["cache_root"] / HISTORY_FILE),
+        ResourceUsage(
+            memory=int(admission_cfg.get("default_memory_mb", 2048)) * MIB,
+            disk=int(admission_cfg.get("default_disk_mb", 2048)) * MIB,
+        ),
+    )
@@ -29,7 +29,10 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from packastack.apt.packages import PackageIndex
+from packastack.build.admission import deb_build_options
+from packastack.build.progress import PROGRESS_FILE, PROGRESS_FILE_ENV, PROGRESS_PACKAGE_ENV
 from packastack.core.run import RunContext, activity
+from packastack.core.spans import TRACE_DIR_ENV
 
 if TYPE_CHECKING:
     from packastack.planning.build_all_state import FailureType
@@ -138,6 +141,7 @@ def filter_retired_packages(
         project_config_path=project_config_path,
         releases_path=releases_repo,
         target_series=openstack_target,
+        run=run,
     )
 
     retired = retirement_checker.get_retired_packages(packages)
@@ -213,6 +217,11 @@ def run_single_build(
     force: bool,
     run_dir: Path,
     ppa_upload: bool = False,
+    prefetched: bool = False,
+    apt_proxy: str = "",
+    build_cache: bool = True,
+    profile: bool = False,
+    jobs: int = 0,
 ) -> tuple[bool, FailureType | None, str, str]:
     """Run a single package build as a subprocess.
 
@@ -226,6 +235,12 @@ def run_single_build(
         force: Force through warnings.
         run_dir: Directory for logs.
         ppa_upload: Whether to upload to PPA after build.
+        prefetched: Whether build inputs were prefetched by the coordinator.
+        apt_proxy: Caching apt proxy URL run by the coordinator.
+        build_cache: Whether the build may reuse a cached build result.
+        profile: Profile the build's phases (--profile).
+        jobs: CPUs the build may use (DEB_BUILD_OPTIONS parallel=N); 0
+            leaves DEB_BUILD_OPTIONS alone.
 
     Returns:
         Tuple of (success, failure_type, message, log_path).
@@ -269,14 +284,30 @@ def run_single_build(
     if force:
         cmd.append("--force")
 
+    if not build_cache:
+        cmd.append("--no-build-cache")
+
+    if profile:
+        cmd.append("--profile")
+
     # Set env to prevent recursive build-deps
     env = os.environ.copy()
     env["PACKASTACK_BUILD_DEPTH"] = "10"  # Prevent auto-build-deps
     env["PACKASTACK_NO_GPG_SIGN"] = "1"  # Don't require GPG signing
+    if prefetched:
+        env["PACKASTACK_PREFETCHED"] = "1"  # Build from the warmed caches
+    if apt_proxy:
+        env["PACKASTACK_APT_PROXY"] = apt_proxy  # Share the coordinator's apt cache
+    if jobs > 0:
+        # sbuild passes DEB_BUILD_OPTIONS through to the build
+        env["DEB_BUILD_OPTIONS"] = deb_build_options(jobs, env.get("DEB_BUILD_OPTIONS", ""))
 
     log_dir = run_dir / "logs" / package
     log_dir.mkdir(parents=True, exist_ok=True)
     log_file = log_dir / "build.log"
+    env[TRACE_DIR_ENV] = str(log_dir)  # Child writes its trace.json next to the log
+    env[PROGRESS_FILE_ENV] = str(run_dir / PROGRESS_FILE)  # Child reports phases and outcomes
+    env[PROGRESS_PACKAGE_ENV] = package
 
     try:
         with log_file.open("w") as f:
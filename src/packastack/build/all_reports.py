@@ -29,6 +29,15 @@ from collections import defaultdict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packastack.core.spans import (
+    TRACE_FILE,
+    SpanStats,
+    aggregate_spans,
+    chrome_trace_events,
+    load_chrome_trace,
+    write_chrome_trace,
+)
+
 if TYPE_CHECKING:
     from packastack.planning.build_all_state import BuildAllState
 
@@ -53,6 +62,7 @@ def generate_build_all_reports(
         - Creates reports/ directory if needed
         - Writes build-all-summary.json
         - Writes build-all-summary.md
+        - Writes trace.json merging the per-package traces, if any
     """
     from packastack.planning.build_all_state import PackageStatus
 
@@ -77,6 +87,8 @@ def generate_build_all_reports(
 
     total_time = sum(d for _, d in durations)
 
+    time_breakdown = _collect_time_breakdown(state, run_dir, reports_dir)
+
     # Failures by type
     failures_by_type: dict[str, list[str]] = defaultdict(list)
     for p in state.packages.values():
@@ -119,6 +131,12 @@ def generate_build_all_reports(
             for name, dur in top_10_longest
         ],
         "build_order": state.build_order,
+        "prefetch": state.prefetch,
+        "apt_proxy": state.apt_proxy,
+        "time_breakdown": {
+            category: [stats.to_dict() for stats in entries]
+            for category, entries in time_breakdown.items()
+        },
     }
 
     json_path = reports_dir / "build-all-summary.json"
@@ -136,6 +154,7 @@ def generate_build_all_reports(
         failures_by_type=failures_by_type,
         top_10_longest=top_10_longest,
     )
+    md_lines.extend(_time_breakdown_markdown(time_breakdown))
 
     md_path = reports_dir / "build-all-summary.md"
     md_path.write_text("\n".join(md_lines))
@@ -229,6 +248,12 @@ def _generate_markdown_report(
             md_lines.append(f"{i}. {' -> '.join(cycle)}")
         md_lines.append("")
 
+    if state.prefetch:
+        md_lines.extend(_prefetch_markdown(state.prefetch))
+
+    if state.apt_proxy:
+        md_lines.extend(_apt_proxy_markdown(state.apt_proxy))
+
     if top_10_longest:
         md_lines.extend([
             "## Top 10 Longest Builds",
@@ -243,3 +268,144 @@ def _generate_markdown_report(
         md_lines.append("")
 
     return md_lines
+
+
+def _prefetch_markdown(prefetch: dict) -> list[str]:
+    """Generate the Markdown section describing the prefetch stage.
+
+    Args:
+        prefetch: Prefetch report dictionary stored on the build state.
+
+    Returns:
+        List of Markdown lines
+    """
+    mirrors = prefetch.get("mirrors", {})
+    tarballs = prefetch.get("tarballs", {})
+    failed = len(mirrors.get("failed", {})) + len(tarballs.get("failed", {}))
+    md_lines = [
+        "## Prefetch",
+        "",
+        f"**Duration:** {prefetch.get('duration_seconds', 0.0):.1f}s "
+        f"for {prefetch.get('packages', 0)} packages",
+        "",
+        "| Stage | Duration |",
+        "|-------|----------|",
+    ]
+    for stage, seconds in prefetch.get("stage_seconds", {}).items():
+        md_lines.append(f"| {stage} | {seconds:.1f}s |")
+    md_lines.extend([
+        "",
+        f"- Packaging mirrors: {mirrors.get('cloned', 0)} cloned, {mirrors.get('updated', 0)} updated",
+        f"- Tarballs: {tarballs.get('downloaded', 0)} downloaded, {tarballs.get('cached', 0)} cached, "
+        f"{tarballs.get('signatures', 0)} signatures, {tarballs.get('bytes', 0) / 1_048_576:.1f} MiB",
+        f"- Failures: {failed}",
+        "",
+    ])
+    return md_lines
+
+
+def _apt_proxy_markdown(stats: dict) -> list[str]:
+    """Generate the Markdown section describing apt proxy cache usage.
+
+    Args:
+        stats: Apt proxy statistics dictionary stored on the build state.
+
+    Returns:
+        List of Markdown lines
+    """
+    return [
+        "## APT Proxy",
+        "",
+        "| Hits | Misses | Hit Ratio | From Cache | From Mirror |",
+        "|------|--------|-----------|------------|-------------|",
+        f"| {stats.get('hits', 0)} | {stats.get('misses', 0)} | {stats.get('hit_ratio', 0.0):.0%} "
+        f"| {stats.get('bytes_from_cache', 0) / 1_048_576:.1f} MiB "
+        f"| {stats.get('bytes_from_upstream', 0) / 1_048_576:.1f} MiB |",
+        "",
+        f"- Pass-through requests: {stats.get('passthrough', 0)}",
+        f"- Errors: {stats.get('errors', 0)}",
+        "",
+    ]
+
+
+def _collect_time_breakdown(
+    state: BuildAllState,
+    run_dir: Path,
+    reports_dir: Path,
+) -> dict[str, list[SpanStats]]:
+    """Aggregate the spans of every package build by category.
+
+    Each child build writes its spans to ``logs/<package>/trace.json``.
+    The traces are also merged into ``reports/trace.json``, one process per
+    package, for viewing the whole run in Perfetto.
+
+    Args:
+        state: Build state listing the packages.
+        run_dir: Run directory containing per-package logs.
+        reports_dir: Directory for the merged trace.
+
+    Returns:
+        Mapping of span category to aggregated stats, largest total first.
+    """
+    spans = []
+    events = []
+    for pid, name in enumerate(sorted(state.packages), start=1):
+        package_spans = load_chrome_trace(run_dir / "logs" / name / TRACE_FILE)
+        if not package_spans:
+            continue
+        spans.extend(package_spans)
+        events.extend(chrome_trace_events(package_spans, pid=pid, process_name=name))
+
+    if events:
+        write_chrome_trace(reports_dir / TRACE_FILE, events)
+
+    breakdown: dict[str, list[SpanStats]] = defaultdict(list)
+    for stats in aggregate_spans(spans):
+        breakdown[stats.category].append(stats)
+    return dict(breakdown)
+
+
+def _time_breakdown_markdown(breakdown: dict[str, list[SpanStats]]) -> list[str]:
+    """Generate the Markdown section showing where build time was spent.
+
+    Args:
+        breakdown: Aggregated span stats by category.
+
+    Returns:
+        List of Markdown lines
+    """
+    phases = breakdown.get("phase", [])
+    if not phases:
+        return []
+
+    phase_total = sum(stats.total_seconds for stats in phases) or 1.0
+    md_lines = [
+        "## Where Did the Time Go",
+        "",
+        "| Phase | Builds | Total | Share | Mean | Max |",
+        "|-------|--------|-------|-------|------|-----|",
+    ]
+    for stats in phases:
+        md_lines.append(
+            f"| {stats.name} | {stats.count} | {stats.total_seconds:.0f}s "
+            f"| {stats.total_seconds / phase_total:.0%} | {stats.mean_seconds:.1f}s | {stats.max_seconds:.1f}s |"
+        )
+    md_lines.append("")
+
+    for category, title in (("subprocess", "Commands"), ("cache", "Cache Lookups")):
+        entries = breakdown.get(category, [])[:10]
+        if not entries:
+            continue
+        md_lines.extend([
+            f"### {title}",
+            "",
+            "| Name | Calls | Total | Mean | Max |",
+            "|------|-------|-------|------|-----|",
+        ])
+        for stats in entries:
+            md_lines.append(
+                f"| {stats.name} | {stats.count} | {stats.total_seconds:.1f}s "
+                f"| {stats.mean_seconds:.2f}s | {stats.max_seconds:.1f}s |"
+            )
+        md_lines.append("")
+    return md_lines
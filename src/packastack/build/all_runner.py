@@ -39,6 +39,7 @@ from packastack.apt.packages import (
     load_package_index,
     merge_package_indexes,
 )
+from packastack.build.admission import create_admission_controller
 from packastack.build.all_helpers import (
     build_upstream_versions_from_packaging,
     get_parallel_batches,
@@ -53,18 +54,30 @@ from packastack.build.errors import (
     EXIT_SUCCESS,
 )
 from packastack.build.localrepo_helpers import refresh_local_repo_indexes
+from packastack.build.phases import ensure_warm_chroot_ready
+from packastack.build.progress import (
+    MARKER_PPA_UPLOAD,
+    MARKER_PUBLISHED,
+    MARKER_RESOURCES,
+    PROGRESS_FILE,
+    BuildAllProgress,
+)
+from packastack.build.schroot import get_schroot_name, schroot_exists
 from packastack.core.config import load_config
 from packastack.core.context import BuildAllRequest
 from packastack.core.paths import resolve_paths
 from packastack.core.run import RunContext, activity
+from packastack.core.slots import create_host_slots
 from packastack.planning.build_all_state import (
     BuildAllState,
     FailureType,
     PackageStatus,
     create_initial_state,
     load_state,
+    record_transition,
     save_state,
 )
+from packastack.planning.build_manifest import write_run_manifest
 from packastack.planning.cycle_suggestions import suggest_cycle_edge_exclusions
 from packastack.planning.graph import DependencyGraph
 from packastack.planning.package_discovery import (
@@ -75,13 +88,17 @@ from packastack.planning.type_selection import get_default_parallel_workers
 from packastack.reports.plan_graph import PlanGraph, render_waves
 from packastack.target.arch import get_host_arch
 from packastack.target.series import resolve_series
+from packastack.upstream.download import DEFAULT_PREFETCH_WORKERS
 from packastack.upstream.releases import (
     get_current_development_series,
     load_openstack_packages,
 )
 
 if TYPE_CHECKING:
-    pass
+    from collections.abc import Collection
+
+    from packastack.build.admission import AdmissionController
+    from packastack.build.progress import PackageProgress
 
 
 def _run_build_all(
@@ -114,6 +131,8 @@ def _run_build_all(
     force = request.force
     offline = request.offline
     dry_run = request.dry_run
+    build_cache = request.build_cache
+    profile = request.profile
 
     cfg = load_config()
     paths = resolve_paths(cfg)
@@ -160,6 +179,13 @@ def _run_build_all(
             activity("all", f"Resuming run: {state.run_id}")
             activity("all", f"  Previous: {len(state.get_success_packages())} succeeded, {len(state.get_failed_packages())} failed")
 
+            # Builds that were running when the coordinator died never finished
+            interrupted = [p.name for p in state.packages.values() if p.status == PackageStatus.BUILDING]
+            for name in interrupted:
+                state.packages[name].status = PackageStatus.PENDING
+            if interrupted:
+                activity("all", f"  Rebuilding {len(interrupted)} interrupted package(s)")
+
             if retry_failed:
                 # Reset failed packages to pending
                 for pkg_state in state.packages.values():
@@ -171,6 +197,9 @@ def _run_build_all(
             elif skip_failed:
                 activity("all", "  Skipping previously failed packages")
 
+            # Start this run's journal from a snapshot of the resumed state
+            save_state(state, state_dir)
+
     # Discover packages if not resuming
     local_repo = paths.get("local_apt_repo", paths["cache_root"] / "apt-repo")
     if state is None:
@@ -421,42 +450,104 @@ def _run_build_all(
         print(f"\n{waves_output}", file=sys.__stdout__, flush=True)
         return EXIT_SUCCESS
 
+    # Warm packaging mirrors, tarballs and signing keys for the whole plan
+    # before the build waves start, so network latency overlaps itself
+    # instead of serialising with sbuild inside each build slot.
+    prefetched: set[str] = set()
+    if not offline:
+        from packastack.build.prefetch import run_prefetch
+
+        pending_set = set(pending)
+        prefetch_packages = [pkg for pkg in state.build_order if pkg in pending_set]
+        prefetch = run_prefetch(
+            packages=prefetch_packages,
+            paths=paths,
+            openstack_target=openstack_target,
+            build_type=build_type,
+            run=run,
+            max_workers=max(parallel, DEFAULT_PREFETCH_WORKERS),
+            slots=create_host_slots(cfg, paths),
+        )
+        state.prefetch = prefetch.to_dict()
+        save_state(state, state_dir)
+        # Packages whose prefetch failed refresh their own inputs
+        prefetched = prefetch.warmed(prefetch_packages)
+
+    # Seed the warm build chroot once here, where sudo may prompt, so the
+    # child builds only ever reuse the snapshot.
+    if binary:
+        schroot_name = get_schroot_name(resolved_ubuntu, get_host_arch())
+        if schroot_exists(schroot_name):
+            ensure_warm_chroot_ready(
+                schroot_name=schroot_name,
+                resolved_ubuntu=resolved_ubuntu,
+                cfg=cfg,
+                cache_root=paths["cache_root"],
+                local_repo=local_repo,
+                offline=offline,
+                run=run,
+            )
+
     # Execute builds - reconstruct graph if needed
     if graph is None:
         graph = DependencyGraph()
         for pkg in state.build_order:
             graph.add_node(pkg)
 
-    if parallel > 1:
-        _run_parallel_builds(
-            state=state,
-            graph=graph,
-            run_dir=run_dir,
-            state_dir=state_dir,
-            target=openstack_target,
-            ubuntu_series=resolved_ubuntu,
-            cloud_archive=cloud_archive,
-            build_type=build_type,
-            binary=binary,
-            force=force,
-            parallel=parallel,
-            local_repo=local_repo,
-            run=run,
-        )
-    else:
-        _run_sequential_builds(
-            state=state,
-            run_dir=run_dir,
-            state_dir=state_dir,
-            target=openstack_target,
-            ubuntu_series=resolved_ubuntu,
-            cloud_archive=cloud_archive,
-            build_type=build_type,
-            binary=binary,
-            force=force,
-            local_repo=local_repo,
-            run=run,
-        )
+    # One caching apt proxy serves every sbuild in the run, so parallel
+    # builds fetch each Build-Depends .deb from the mirror only once.
+    # Imported here: the proxy pulls in http.server, which only build-all needs.
+    from packastack.build.apt_proxy import managed_apt_proxy
+
+    apt_proxy_cache = paths.get("apt_proxy_cache", paths["cache_root"] / "apt-proxy")
+    proxy_context = managed_apt_proxy(cfg, apt_proxy_cache) if binary else contextlib.nullcontext(("", None))
+    # Source-only builds are too light to be worth admitting
+    admission = create_admission_controller(cfg, paths) if binary else None
+    with proxy_context as (apt_proxy_url, apt_proxy):
+        if parallel > 1:
+            _run_parallel_builds(
+                state=state,
+                graph=graph,
+                run_dir=run_dir,
+                state_dir=state_dir,
+                target=openstack_target,
+                ubuntu_series=resolved_ubuntu,
+                cloud_archive=cloud_archive,
+                build_type=build_type,
+                binary=binary,
+                force=force,
+                parallel=parallel,
+                local_repo=local_repo,
+                run=run,
+                prefetched=prefetched,
+                apt_proxy=apt_proxy_url,
+                build_cache=build_cache,
+                profile=profile,
+                admission=admission,
+            )
+        else:
+            _run_sequential_builds(
+                state=state,
+                run_dir=run_dir,
+                state_dir=state_dir,
+                target=openstack_target,
+                ubuntu_series=resolved_ubuntu,
+                cloud_archive=cloud_archive,
+                build_type=build_type,
+                binary=binary,
+                force=force,
+                local_repo=local_repo,
+                run=run,
+                prefetched=prefetched,
+                apt_proxy=apt_proxy_url,
+                build_cache=build_cache,
+                profile=profile,
+                admission=admission,
+            )
+
+    if apt_proxy is not None:
+        state.apt_proxy = apt_proxy.stats.to_dict()
+        run.log_event({"event": "apt_proxy.stats", **state.apt_proxy})
 
     # Mark completion
     state.completed_at = datetime.now(UTC).isoformat()
@@ -504,6 +595,11 @@ def _run_sequential_builds(
     force: bool,
     local_repo: Path,
     run: RunContext,
+    prefetched: Collection[str] = (),
+    apt_proxy: str = "",
+    build_cache: bool = True,
+    profile: bool = False,
+    admission: AdmissionController | None = None,
 ) -> int:
     """Run builds sequentially in topological order.
 
@@ -519,6 +615,12 @@ def _run_sequential_builds(
         force: Force build despite warnings.
         local_repo: Path to local APT repository.
         run: RunContext for logging.
+        prefetched: Packages whose build inputs the prefetch stage warmed.
+        apt_proxy: Caching apt proxy URL handed to child builds.
+        build_cache: Whether child builds may reuse cached build results.
+        profile: Whether child builds run with --profile.
+        admission: Resource admission control; sets each build's CPU share
+            and records its resource use.
 
     Returns:
         Exit code.
@@ -536,6 +638,7 @@ def _run_sequential_builds(
     built = 0
     failed_set: set[str] = set()
     host_arch = get_host_arch()
+    stream = BuildAllProgress(run_dir / PROGRESS_FILE, total, _count_pending(state), workers=1)
 
     progress_context = contextlib.nullcontext()
     if total:
@@ -576,21 +679,33 @@ def _run_sequential_builds(
             activity("all", f"[{i}/{total}] Building: {pkg}")
 
             state.mark_started(pkg)
-            save_state(state, state_dir)
+            record_transition(state, state_dir, pkg)
+            stream.package_started(pkg, index=i)
+
+            with _admitted(admission, pkg) as slot:
+                success, failure_type, message, log_path = run_single_build(
+                    package=pkg,
+                    target=target,
+                    ubuntu_series=ubuntu_series,
+                    cloud_archive=cloud_archive,
+                    build_type=build_type,
+                    binary=binary,
+                    force=force,
+                    run_dir=run_dir,
+                    prefetched=pkg in prefetched,
+                    apt_proxy=apt_proxy,
+                    build_cache=build_cache,
+                    profile=profile,
+                    jobs=slot.jobs if slot is not None else 0,
+                )
 
-            success, failure_type, message, log_path = run_single_build(
-                package=pkg,
-                target=target,
-                ubuntu_series=ubuntu_series,
-                cloud_archive=cloud_archive,
-                build_type=build_type,
-                binary=binary,
-                force=force,
-                run_dir=run_dir,
+            reported = stream.package_finished(
+                pkg, success, message, failure_type=failure_type.value if failure_type else ""
             )
-
+            if admission is not None:
+                admission.record(pkg, reported.markers.get(MARKER_RESOURCES, {}))
             if success:
-                state.mark_success(pkg, log_path)
+                state.mark_success(pkg, log_path, _published_version(reported))
                 built += 1
                 activity("all", f"[ok]    {pkg} ({pkg_state.duration_seconds:.0f}s)")
                 # Regenerate local repo indexes after each successful build
@@ -602,7 +717,7 @@ def _run_sequential_builds(
                 if log_path:
                     activity("all", f"        Log: {log_path}")
 
-            save_state(state, state_dir)
+            record_transition(state, state_dir, pkg)
 
             if progress and task is not None:
                 progress.advance(task)
@@ -616,6 +731,10 @@ def _run_sequential_builds(
             if i % 10 == 0:
                 activity("all", f"Progress: {built} ok, {len(failed_set)} fail, {total - i} remaining")
 
+    if admission is not None:
+        admission.save()
+    write_run_manifest(run_dir, state.target, _published_versions(state))
+    stream.close("success" if not failed_set else "failed")
     return EXIT_SUCCESS if not failed_set else EXIT_ALL_BUILD_FAILED
 
 
@@ -634,9 +753,18 @@ def _run_parallel_builds(
     local_repo: Path,
     run: RunContext,
     ppa_upload: bool = False,
+    prefetched: Collection[str] = (),
+    apt_proxy: str = "",
+    build_cache: bool = True,
+    profile: bool = False,
+    admission: AdmissionController | None = None,
 ) -> int:
     """Run builds in parallel, respecting dependencies.
 
+    ``parallel`` caps the builds running at once. With admission control,
+    a build starts only once its expected memory and disk use fit the
+    host's budget, and it gets its share of the CPUs as parallel=N.
+
     Args:
         state: Build state tracking progress.
         graph: Dependency graph for batch computation.
@@ -652,6 +780,12 @@ def _run_parallel_builds(
         local_repo: Path to local APT repository.
         run: RunContext for logging.
         ppa_upload: Whether to upload to PPA after build.
+        prefetched: Packages whose build inputs the prefetch stage warmed.
+        apt_proxy: Caching apt proxy URL handed to child builds.
+        build_cache: Whether child builds may reuse cached build results.
+        profile: Whether child builds run with --profile.
+        admission: Resource admission control; None starts builds as soon
+            as a worker is free.
 
     Returns:
         Exit code.
@@ -670,32 +804,34 @@ def _run_parallel_builds(
     failed_set: set[str] = set()
     lock = threading.Lock()
     host_arch = get_host_arch()
+    stream = BuildAllProgress(run_dir / PROGRESS_FILE, total, _count_pending(state), workers=parallel)
 
     def on_complete(pkg: str, success: bool, failure_type: FailureType | None, message: str, log_path: str) -> None:
         nonlocal built
+        # Child builds report outcomes such as PPA uploads on the stream
+        reported = stream.package_finished(
+            pkg, success, message, failure_type=failure_type.value if failure_type else ""
+        )
+        if admission is not None:
+            admission.record(pkg, reported.markers.get(MARKER_RESOURCES, {}))
         with lock:
             if success:
-                state.mark_success(pkg, log_path)
+                state.mark_success(pkg, log_path, _published_version(reported))
                 built += 1
                 activity("all", f"[ok]    {pkg}")
-                if ppa_upload and log_path:
-                    log_text = ""
-                    try:
-                        log_text = Path(log_path).read_text(encoding="utf-8", errors="ignore")
-                    except Exception:
-                        log_text = ""
-
-                    if "Successfully uploaded" in log_text:
+                if ppa_upload:
+                    upload = reported.markers.get(MARKER_PPA_UPLOAD)
+                    if upload is None:
+                        activity("all", f"[ppa]   {pkg}: no upload detected (see log)")
+                    elif upload.get("status") == "success":
                         activity("all", f"[ppa]   {pkg}: upload complete")
-                    elif "PPA upload failed" in log_text or "PPA Rebuild failed" in log_text:
-                        activity("all", f"[ppa]   {pkg}: upload failed (see log)")
                     else:
-                        activity("all", f"[ppa]   {pkg}: no upload detected (see log)")
+                        activity("all", f"[ppa]   {pkg}: upload failed (see log)")
             else:
                 state.mark_failed(pkg, failure_type or FailureType.UNKNOWN, message, log_path)
                 failed_set.add(pkg)
                 activity("all", f"[fail]  {pkg}: {message}")
-            save_state(state, state_dir)
+            record_transition(state, state_dir, pkg)
 
     progress_context = contextlib.nullcontext()
     if total:
@@ -730,22 +866,24 @@ def _run_parallel_builds(
 
             activity("all", f"Batch {batch_num}: {len(batch)} packages (parallel={min(parallel, len(batch))})")
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
-                futures = {}
-
-                for pkg in batch:
-                    pkg_state = state.packages.get(pkg)
-                    if pkg_state is None or pkg_state.status != PackageStatus.PENDING:
-                        continue
+            to_build = [
+                pkg for pkg in batch
+                if (pkg_state := state.packages.get(pkg)) is not None and pkg_state.status == PackageStatus.PENDING
+            ]
+            share = min(parallel, len(to_build))
 
+            def build(pkg: str, batch_num: int = batch_num, share: int = share) -> tuple:
+                # Marked as started only once admitted, so queued builds show as queued
+                with _admitted(admission, pkg, share) as slot:
+                    jobs = slot.jobs if slot is not None else 0
                     if progress and task is not None:
                         progress.update(task, description=f"Building {pkg}")
-
-                    activity("all", f"[start] {pkg}")
-                    state.mark_started(pkg)
-
-                    future = executor.submit(
-                        run_single_build,
+                    activity("all", f"[start] {pkg}" + (f" (parallel={jobs})" if jobs else ""))
+                    with lock:
+                        state.mark_started(pkg)
+                        record_transition(state, state_dir, pkg)
+                    stream.package_started(pkg, batch=batch_num, **({"jobs": jobs} if jobs else {}))
+                    return run_single_build(
                         package=pkg,
                         target=target,
                         ubuntu_series=ubuntu_series,
@@ -755,8 +893,15 @@ def _run_parallel_builds(
                         force=force,
                         run_dir=run_dir,
                         ppa_upload=ppa_upload,
+                        prefetched=pkg in prefetched,
+                        apt_proxy=apt_proxy,
+                        build_cache=build_cache,
+                        profile=profile,
+                        jobs=jobs,
                     )
-                    futures[future] = pkg
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+                futures = {executor.submit(build, pkg): pkg for pkg in to_build}
 
                 # Wait for batch to complete
                 for future in concurrent.futures.as_completed(futures):
@@ -771,6 +916,8 @@ def _run_parallel_builds(
 
             # Regenerate local repo indexes after each batch completes
             refresh_local_repo_indexes(local_repo, host_arch, run, phase="all")
+            if admission is not None:
+                admission.save()
 
             # Check failure policy after each batch
             if state.should_stop():
@@ -779,9 +926,35 @@ def _run_parallel_builds(
 
             activity("all", f"Batch {batch_num} complete: {built} ok, {len(failed_set)} fail total")
 
+    write_run_manifest(run_dir, state.target, _published_versions(state))
+    stream.close("success" if not failed_set else "failed")
     return EXIT_SUCCESS if not failed_set else EXIT_ALL_BUILD_FAILED
 
 
+def _published_version(reported: PackageProgress) -> str:
+    """Return the version a child build reported publishing."""
+    return str(reported.markers.get(MARKER_PUBLISHED, {}).get("version", ""))
+
+
+def _published_versions(state: BuildAllState) -> dict[str, str]:
+    """Return the published version of every package built in the run."""
+    return {name: pkg.version for name, pkg in state.packages.items() if pkg.version}
+
+
+def _admitted(
+    admission: AdmissionController | None, package: str, share: int = 1
+) -> contextlib.AbstractContextManager:
+    """Hold an admission for a build, or nothing without admission control."""
+    return admission.admit(package, share) if admission is not None else contextlib.nullcontext()
+
+
+def _count_pending(state: BuildAllState) -> int:
+    return sum(
+        1 for pkg in state.build_order
+        if pkg in state.packages and state.packages[pkg].status == PackageStatus.PENDING
+    )
+
+
 def _filter_retired_packages(
     packages: list[str],
     project_config_path: Path | None,
@@ -0,0 +1,393 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Local caching apt proxy for sbuild dependency installation.
+
+Every sbuild in a build-all downloads the same Build-Depends .debs from the
+Ubuntu mirror. When ``apt_proxy.enabled`` is set, Packastack runs a small
+in-process HTTP proxy on the loopback interface and points apt inside the
+build chroot at it through ``Acquire::http::Proxy``.
+
+Only immutable archive files are cached: anything under ``pool/`` and
+``by-hash/`` never changes for a given URL. Index files (``InRelease``,
+``Packages``) are passed through so apt always sees the current archive.
+Concurrent requests for the same file are serialised, so parallel builds
+download each .deb once and the others are served from the cache.
+
+The build-all coordinator runs one proxy for the whole run and hands its
+URL to child builds through ``PACKASTACK_APT_PROXY``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+
+from packastack.build.sbuildrc import find_configured_apt_proxy
+from packastack.core.run import activity
+from packastack.upstream.download import DEFAULT_CHUNK_SIZE, DEFAULT_TIMEOUT, get_download_manager
+
+logger = logging.getLogger(__name__)
+
+# Environment variable carrying the proxy URL to child builds
+APT_PROXY_ENV = "PACKASTACK_APT_PROXY"
+
+# Archive path components whose files never change for a given URL
+IMMUTABLE_COMPONENTS = frozenset({"pool", "by-hash"})
+
+# Request headers forwarded upstream for pass-through requests
+_FORWARD_REQUEST_HEADERS = ("If-Modified-Since", "If-None-Match", "Range", "If-Range")
+
+# Response headers relayed back to apt
+_RELAY_RESPONSE_HEADERS = ("Content-Type", "Last-Modified", "ETag", "Content-Range")
+
+
+@dataclass
+class AptProxyStats:
+    """Request counters for the caching apt proxy."""
+
+    hits: int = 0
+    misses: int = 0
+    passthrough: int = 0
+    errors: int = 0
+    bytes_from_cache: int = 0
+    bytes_from_upstream: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of cacheable requests served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 3)}
+
+
+def cache_path_for(cache_dir: Path, url: str) -> Path | None:
+    """Return the cache file for an immutable archive URL.
+
+    Args:
+        cache_dir: Root of the proxy cache.
+        url: Absolute http:// URL requested by apt.
+
+    Returns:
+        Path under cache_dir, or None if the URL must not be cached.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "http" or not parts.hostname or parts.query:
+        return None
+    path = PurePosixPath(parts.path)
+    components = path.parts[1:]
+    if not components or any(c in {"", ".", ".."} for c in components):
+        return None
+    if not IMMUTABLE_COMPONENTS.intersection(components[:-1]):
+        return None
+    return cache_dir.joinpath(parts.hostname, *components)
+
+
+class _ProxyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], proxy: AptCacheProxy) -> None:
+        super().__init__(address, _ProxyHandler)
+        self.proxy = proxy
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """Handles absolute-URI GET/HEAD requests from apt."""
+
+    server: _ProxyServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.proxy.handle(self, send_body=True)
+
+    def do_HEAD(self) -> None:
+        self.server.proxy.handle(self, send_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("apt-proxy: " + format, *args)
+
+
+class AptCacheProxy:
+    """In-process caching HTTP proxy for apt.
+
+    Usable as a context manager; the server runs on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        session: requests.Session | None = None,
+        timeout: int = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.host = host
+        self.port = port
+        self.session = session or get_download_manager().session
+        self.timeout = timeout
+        self._stats = AptProxyStats()
+        self._stats_lock = threading.Lock()
+        self._path_locks: dict[Path, threading.Lock] = {}
+        self._path_locks_guard = threading.Lock()
+        self._server: _ProxyServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """URL apt should use as its HTTP proxy."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Start serving and return the proxy URL."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._server = _ProxyServer((self.host, self.port), self)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.1},
+            name="packastack-apt-proxy",
+            daemon=True,
+        )
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop serving and wait for the server thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> AptCacheProxy:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    @property
+    def stats(self) -> AptProxyStats:
+        """Snapshot of the request counters."""
+        with self._stats_lock:
+            return AptProxyStats(**asdict(self._stats))
+
+    def _count(self, field_name: str, nbytes: int = 0, bytes_field: str = "") -> None:
+        with self._stats_lock:
+            setattr(self._stats, field_name, getattr(self._stats, field_name) + 1)
+            if bytes_field:
+                setattr(self._stats, bytes_field, getattr(self._stats, bytes_field) + nbytes)
+
+    def _lock_for(self, path: Path) -> threading.Lock:
+        with self._path_locks_guard:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def handle(self, handler: BaseHTTPRequestHandler, send_body: bool) -> None:
+        """Serve one proxied request."""
+        url = handler.path
+        if not url.startswith("http://"):
+            handler.send_error(501, "Only absolute http:// URLs are proxied")
+            return
+
+        cached = cache_path_for(self.cache_dir, url)
+        if cached is None or not send_body:
+            if cached is not None and cached.is_file():
+                self._send_cached(handler, cached, send_body=False)
+                return
+            self._passthrough(handler, url, send_body)
+            return
+
+        # One download per file; concurrent requests wait and then hit
+        with self._lock_for(cached):
+            if cached.is_file():
+                self._count("hits", cached.stat().st_size, "bytes_from_cache")
+                self._send_cached(handler, cached, send_body=True)
+                return
+            self._fetch_into_cache(handler, url, cached)
+
+    def _send_cached(self, handler: BaseHTTPRequestHandler, path: Path, send_body: bool) -> None:
+        size = path.stat().st_size
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/octet-stream")
+        handler.send_header("Content-Length", str(size))
+        handler.end_headers()
+        if not send_body:
+            return
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError), path.open("rb") as f:
+            for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
+                handler.wfile.write(chunk)
+
+    def _open_upstream(
+        self, handler: BaseHTTPRequestHandler, url: str, method: str, headers: dict[str, str]
+    ) -> requests.Response | None:
+        try:
+            return self.session.request(
+                method, url, headers=headers, stream=True, timeout=self.timeout, allow_redirects=True
+            )
+        except requests.RequestException as e:
+            self._count("errors")
+            handler.send_error(502, f"Upstream request failed: {e}")
+            return None
+
+    def _send_upstream_headers(self, handler: BaseHTTPRequestHandler, resp: requests.Response) -> None:
+        handler.send_response(resp.status_code)
+        for name in _RELAY_RESPONSE_HEADERS:
+            if name in resp.headers:
+                handler.send_header(name, resp.headers[name])
+        length = resp.headers.get("Content-Length")
+        if length is not None and "Content-Encoding" not in resp.headers:
+            handler.send_header("Content-Length", length)
+        else:
+            # Unknown length: the body ends when the connection closes
+            handler.send_header("Connection", "close")
+            handler.close_connection = True
+        handler.end_headers()
+
+    def _passthrough(self, handler: BaseHTTPRequestHandler, url: str, send_body: bool) -> None:
+        headers = {h: handler.headers[h] for h in _FORWARD_REQUEST_HEADERS if handler.headers.get(h)}
+        resp = self._open_upstream(handler, url, "GET" if send_body else "HEAD", headers)
+        if resp is None:
+            return
+        with resp:
+            self._count("passthrough")
+            self._send_upstream_headers(handler, resp)
+            if not send_body or resp.status_code in {204, 304}:
+                return
+            with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                for chunk in resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                    handler.wfile.write(chunk)
+
+    def _fetch_into_cache(self, handler: BaseHTTPRequestHandler, url: str, cached: Path) -> None:
+        resp = self._open_upstream(handler, url, "GET", {})
+        if resp is None:
+            return
+        with resp:
+            if resp.status_code != 200:
+                self._count("passthrough")
+                handler.send_error(resp.status_code, resp.reason)
+                return
+
+            self._count("misses")
+            self._send_upstream_headers(handler, resp)
+
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            part = cached.with_name(f".{cached.name}.{os.getpid()}.part")
+            expected = resp.headers.get("Content-Length")
+            client_alive = True
+            size = 0
+            try:
+                with part.open("wb") as f:
+                    # Keep filling the cache even if apt hangs up mid-transfer
+                    for chunk in resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+                        if client_alive:
+                            try:
+                                handler.wfile.write(chunk)
+                            except (BrokenPipeError, ConnectionResetError):
+                                client_alive = False
+            except (requests.RequestException, OSError) as e:
+                logger.debug("apt-proxy: failed to cache %s: %s", url, e)
+                self._count("errors")
+                handler.close_connection = True
+                with contextlib.suppress(OSError):
+                    part.unlink()
+                return
+
+        with self._stats_lock:
+            self._stats.bytes_from_upstream += size
+
+        if expected is not None and "Content-Encoding" not in resp.headers and int(expected) != size:
+            with contextlib.suppress(OSError):
+                part.unlink()
+            return
+        part.replace(cached)
+
+
+def apt_proxy_settings(cfg: dict[str, Any] | None) -> dict[str, Any]:
+    """Return the ``apt_proxy`` config section (empty if absent)."""
+    return (cfg or {}).get("apt_proxy", {}) or {}
+
+
+@contextlib.contextmanager
+def managed_apt_proxy(
+    cfg: dict[str, Any] | None,
+    cache_dir: Path,
+) -> Iterator[tuple[str, AptCacheProxy | None]]:
+    """Provide the apt proxy URL for sbuild, starting a local proxy if needed.
+
+    The URL is taken, in order, from PACKASTACK_APT_PROXY (set by build-all
+    for its child builds), from ``apt_proxy.url``, or from a proxy started
+    here for the duration of the context. Nothing is injected when the
+    feature is disabled or sbuild is already configured with an apt proxy.
+
+    Args:
+        cfg: Loaded configuration.
+        cache_dir: Cache directory for a locally started proxy.
+
+    Yields:
+        Tuple of (proxy_url, proxy). proxy is only set when started here;
+        proxy_url is empty when no proxy should be injected.
+    """
+    settings = apt_proxy_settings(cfg)
+    inherited = os.environ.get(APT_PROXY_ENV, "")
+    if inherited:
+        yield inherited, None
+        return
+    if not settings.get("enabled", False):
+        yield "", None
+        return
+    if settings.get("url"):
+        yield str(settings["url"]), None
+        return
+
+    existing, source = find_configured_apt_proxy()
+    if existing:
+        activity("build", f"apt proxy already configured in {source}: {existing}")
+        yield "", None
+        return
+
+    proxy = AptCacheProxy(cache_dir, port=int(settings.get("port", 0) or 0))
+    try:
+        proxy.start()
+    except OSError as e:
+        activity("build", f"Could not start apt proxy, downloading directly: {e}")
+        yield "", None
+        return
+
+    activity("build", f"apt proxy listening on {proxy.url} (cache: {cache_dir})")
+    try:
+        yield proxy.url, proxy
+    finally:
+        proxy.stop()
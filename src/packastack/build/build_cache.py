@@ -0,0 +1,252 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Content-addressed cache of build results.
+
+A build is keyed by a sha256 over everything that determines its output:
+
+- the tree of the packaging repository HEAD (content, not commit id, so
+  re-applied watch/signing-key commits do not invalidate the key)
+- the upstream tarball sha256, or the upstream git sha for snapshots
+- the version and .deb sha256 of every Build-Depends package found in the
+  local repository
+- the build parameters (series, arch, builder, build type, ...)
+
+After a successful build its .dsc/.deb artifacts are copied into
+``<build_cache>/<key[:2]>/<key>/``. When a later build computes the same
+key, the cached artifacts are republished to the local repository instead of
+rebuilding. Because a rebuilt package publishes new .deb hashes, only its
+reverse build-dependencies miss the cache on the next build-all.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import shutil
+import subprocess
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from packastack.core.spans import span
+from packastack.debpkg.control import ControlDocument, parse_control
+
+if TYPE_CHECKING:
+    from packastack.apt.packages import PackageIndex
+
+# Bump when the key inputs change meaning, invalidating all entries
+BUILD_CACHE_VERSION = 1
+
+ENTRY_FILE = "entry.json"
+
+_HASH_CHUNK = 1024 * 1024
+
+
+@dataclass
+class BuildCacheEntry:
+    """A cached build result."""
+
+    key: str
+    package: str
+    version: str
+    run_id: str = ""
+    created_at: str = ""
+    artifacts: list[str] = field(default_factory=list)
+    inputs: dict[str, Any] = field(default_factory=dict)
+    path: Path = field(default_factory=Path)
+
+    def artifact_paths(self) -> list[Path]:
+        """Absolute paths of the cached artifacts."""
+        return [self.path / name for name in self.artifacts]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        data = asdict(self)
+        data.pop("path")
+        return data
+
+
+def hash_file(path: Path) -> str:
+    """Return the sha256 hex digest of a file."""
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def packaging_tree_id(pkg_repo: Path) -> str:
+    """Return the git tree id of the packaging HEAD.
+
+    Returns:
+        Tree sha, or empty string if the repository has uncommitted changes
+        or cannot be read (such builds are never cached).
+    """
+    try:
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=pkg_repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if status.returncode != 0 or status.stdout.strip():
+            return ""
+        tree = subprocess.run(
+            ["git", "rev-parse", "HEAD^{tree}"],
+            cwd=pkg_repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return ""
+    return tree.stdout.strip() if tree.returncode == 0 else ""
+
+
+def local_build_dep_state(
+    control: Path | ControlDocument, local_index: PackageIndex | None
+) -> dict[str, str] | None:
+    """Describe the local repository packages a source build-depends on.
+
+    Args:
+        control: Path to debian/control, or the already loaded document.
+        local_index: Index of the local repository.
+
+    Returns:
+        Mapping of binary package name to "<version> <sha256>" for every
+        Build-Depends(-Indep) alternative present in the local repository,
+        or None if debian/control cannot be parsed.
+    """
+    try:
+        source = control.source if isinstance(control, ControlDocument) else parse_control(control)
+    except (OSError, ValueError):
+        return None
+    if local_index is None:
+        return {}
+
+    state: dict[str, str] = {}
+    for dep in [*source.build_depends, *source.build_depends_indep]:
+        for candidate in [dep, *dep.alternatives]:
+            pkg = local_index.find_package(candidate.name)
+            if pkg is not None:
+                state[candidate.name] = f"{pkg.version} {pkg.sha256}".strip()
+    return dict(sorted(state.items()))
+
+
+def compute_build_cache_key(inputs: dict[str, Any]) -> str:
+    """Return the cache key for a set of build inputs."""
+    payload = json.dumps({"version": BUILD_CACHE_VERSION, **inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_dir(cache_dir: Path, key: str) -> Path:
+    return cache_dir / key[:2] / key
+
+
+def lookup_build_cache(cache_dir: Path, key: str) -> BuildCacheEntry | None:
+    """Return the cached build for a key if all its artifacts are present."""
+    with span("build-cache", "cache") as current:
+        entry = _lookup_build_cache(cache_dir, key)
+        if current is not None:
+            current.attrs["hit"] = entry is not None
+    return entry
+
+
+def _lookup_build_cache(cache_dir: Path, key: str) -> BuildCacheEntry | None:
+    entry_dir = _entry_dir(cache_dir, key)
+    try:
+        data = json.loads((entry_dir / ENTRY_FILE).read_text(encoding="utf-8"))
+        entry = BuildCacheEntry(path=entry_dir, **data)
+    except (OSError, ValueError, TypeError):
+        return None
+    if entry.key != key or not entry.artifacts:
+        return None
+    if not all(p.is_file() for p in entry.artifact_paths()):
+        return None
+    return entry
+
+
+def restore_build_cache(entry: BuildCacheEntry, dest_dir: Path) -> list[Path]:
+    """Copy cached artifacts into a build output directory.
+
+    Returns:
+        Paths of the restored artifacts.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    restored = []
+    for cached in entry.artifact_paths():
+        dest = dest_dir / cached.name
+        shutil.copy2(cached, dest)
+        restored.append(dest)
+    return restored
+
+
+def store_build_cache(
+    cache_dir: Path,
+    key: str,
+    package: str,
+    version: str,
+    artifacts: list[Path],
+    inputs: dict[str, Any],
+    run_id: str = "",
+) -> BuildCacheEntry | None:
+    """Record the artifacts of a successful build under its cache key.
+
+    Artifacts are copied rather than linked so later changes in the build
+    workspace (re-signing, cleanup) cannot alter the cache. The entry is
+    assembled in a temporary directory and renamed into place, so concurrent
+    builds never observe a partial entry.
+
+    Returns:
+        The stored entry, or None if nothing could be stored.
+    """
+    files = [a for a in artifacts if a.is_file()]
+    if not files:
+        return None
+
+    entry_dir = _entry_dir(cache_dir, key)
+    entry = BuildCacheEntry(
+        key=key,
+        package=package,
+        version=version,
+        run_id=run_id,
+        created_at=datetime.now(UTC).isoformat(),
+        artifacts=sorted({a.name for a in files}),
+        inputs=inputs,
+        path=entry_dir,
+    )
+
+    entry_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=entry_dir.parent))
+    try:
+        for artifact in files:
+            shutil.copy2(artifact, staging / artifact.name)
+        (staging / ENTRY_FILE).write_text(json.dumps(entry.to_dict(), indent=2), encoding="utf-8")
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir)
+        staging.rename(entry_dir)
+    except OSError:
+        with contextlib.suppress(OSError):
+            shutil.rmtree(staging)
+        return None
+    return entry
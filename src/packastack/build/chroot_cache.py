@@ -0,0 +1,438 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Pre-warmed sbuild chroot snapshots.
+
+Every sbuild run normally starts from the bare Packastack schroot and
+installs the whole Build-Depends closure from scratch. This module keeps a
+per-series "warm" snapshot next to the base schroot that already contains
+the build-dependency closure shared by most OpenStack packages (debhelper,
+dh-python, python3-all, pbr, the oslo stack).
+
+Snapshots are immutable generations:
+
+- a generation directory is a copy (reflinked where the filesystem allows)
+  of the base schroot directory, seeded once through a temporary
+  non-overlay schroot
+- the warm schroot ``packastack-<series>-<arch>-warm`` points at the
+  current generation with ``union-type=overlay``, so every build session
+  gets a throwaway upper layer and the generation is never modified
+
+A new generation is seeded when the seed list changes or when the snapshot
+is older than ``chroot_cache.max_age``. Packages published to the local
+repository during a run do not invalidate it: every build refreshes the
+local repository's package lists, so newer builds of seed packages are
+installed when a package needs them. The state of the current generation
+is kept in ``<cache_root>/chroots/<name>.json``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from packastack.build.sbuild import (
+    generate_chroot_cleanup_commands,
+    generate_chroot_setup_commands,
+)
+from packastack.build.schroot import (
+    _ensure_sudo_cached,
+    _sudo_credentials_cached,
+    schroot_exists,
+)
+from packastack.core.duration import parse_duration
+
+# Build dependencies shared by most OpenStack source packages
+DEFAULT_SEED_PACKAGES: tuple[str, ...] = (
+    "build-essential",
+    "debhelper",
+    "dh-python",
+    "python3-all",
+    "python3-setuptools",
+    "python3-pbr",
+    "python3-stestr",
+    "python3-oslotest",
+    "python3-oslo.config",
+    "python3-oslo.context",
+    "python3-oslo.i18n",
+    "python3-oslo.log",
+    "python3-oslo.serialization",
+    "python3-oslo.utils",
+)
+
+# Maximum age of a warm snapshot before its archive packages are refreshed
+DEFAULT_MAX_AGE = "24h"
+
+SCHROOT_CHROOT_DIR = Path("/var/lib/schroot/chroots")
+SCHROOT_CONF_DIR = Path("/etc/schroot/chroot.d")
+
+# Seeding a generation can download a few hundred megabytes
+SEED_TIMEOUT = 3600
+
+
+@dataclass(frozen=True)
+class WarmChrootConfig:
+    """Immutable configuration for a warm chroot snapshot.
+
+    Attributes:
+        series: Ubuntu series codename (e.g., "noble").
+        arch: Architecture (e.g., "amd64").
+        base_chroot: Name of the base Packastack schroot to snapshot.
+        state_dir: Host directory for snapshot state and locks.
+        local_repo_root: Optional local APT repository used while seeding.
+        seed_packages: Packages pre-installed into the snapshot.
+        max_age_seconds: Maximum snapshot age before it is re-seeded.
+    """
+
+    series: str
+    arch: str
+    base_chroot: str
+    state_dir: Path
+    local_repo_root: Path | None = None
+    seed_packages: tuple[str, ...] = DEFAULT_SEED_PACKAGES
+    max_age_seconds: int = 86400
+
+    @classmethod
+    def from_settings(
+        cls,
+        cfg: dict[str, Any],
+        series: str,
+        arch: str,
+        base_chroot: str,
+        cache_root: Path,
+        local_repo_root: Path | None,
+    ) -> WarmChrootConfig:
+        """Create a WarmChrootConfig from the ``chroot_cache`` config section."""
+        settings = cfg.get("chroot_cache", {})
+        seed = settings.get("seed_packages") or DEFAULT_SEED_PACKAGES
+        return cls(
+            series=series,
+            arch=arch,
+            base_chroot=base_chroot,
+            state_dir=cache_root / "chroots",
+            local_repo_root=local_repo_root,
+            seed_packages=tuple(seed),
+            max_age_seconds=parse_duration(str(settings.get("max_age", DEFAULT_MAX_AGE))),
+        )
+
+
+@dataclass
+class WarmChrootResult:
+    """Result of ensuring a warm chroot snapshot."""
+
+    name: str
+    ready: bool = False
+    refreshed: bool = False
+    generation: str = ""
+    fingerprint: str = ""
+    error: str = ""
+
+
+def warm_chroot_enabled(cfg: dict[str, Any]) -> bool:
+    """Return True if warm chroot snapshots are enabled in the config."""
+    return bool(cfg.get("chroot_cache", {}).get("enabled", False))
+
+
+def get_warm_chroot_name(series: str, arch: str) -> str:
+    """Return the warm schroot name for a series/arch."""
+    return f"packastack-{series}-{arch}-warm"
+
+
+def compute_seed_fingerprint(config: WarmChrootConfig) -> str:
+    """Fingerprint the inputs that determine a warm snapshot's contents.
+
+    Args:
+        config: Warm chroot configuration.
+
+    Local repository versions are left out on purpose: build-all publishes
+    seed packages (the oslo libraries) while it runs, and re-seeding for
+    each of them would copy the whole chroot again mid-run.
+
+    Returns:
+        sha256 hex digest over the base chroot and the seed list.
+    """
+    payload = {
+        "base": config.base_chroot,
+        "seed": sorted(config.seed_packages),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def render_schroot_config(name: str, directory: Path, description: str, overlay: bool) -> str:
+    """Render a schroot.conf stanza for a directory chroot.
+
+    Args:
+        name: Chroot name.
+        directory: Chroot directory.
+        description: Human readable description.
+        overlay: Use union-type=overlay so sessions never modify the directory.
+
+    Returns:
+        schroot configuration text.
+    """
+    lines = [
+        f"[{name}]",
+        f"description={description}",
+        "type=directory",
+        f"directory={directory}",
+        "groups=root,sbuild",
+        "root-groups=root,sbuild",
+        "profile=sbuild",
+    ]
+    if overlay:
+        lines.append("union-type=overlay")
+    return "\n".join(lines) + "\n"
+
+
+def generate_seed_script(seed_packages: tuple[str, ...], local_repo_root: Path | None) -> str:
+    """Generate the shell script that seeds a snapshot generation.
+
+    Packages missing from the series are skipped rather than failing the
+    whole seed, since the oslo set differs between releases.
+
+    Args:
+        seed_packages: Packages to install.
+        local_repo_root: Optional local repository made visible while seeding.
+
+    Returns:
+        Shell script text.
+    """
+    lines = ["set -e", "export DEBIAN_FRONTEND=noninteractive"]
+    if local_repo_root is not None and local_repo_root.exists():
+        lines.extend(generate_chroot_setup_commands(local_repo_root))
+    lines.extend([
+        "apt-get update",
+        "apt-get -y -o Dpkg::Options::=--force-confold dist-upgrade",
+        'pkgs=""',
+        f"for p in {' '.join(seed_packages)}; do",
+        '  if apt-cache show "$p" >/dev/null 2>&1; then pkgs="$pkgs $p"; fi',
+        "done",
+        '[ -z "$pkgs" ] || apt-get -y --no-install-recommends install $pkgs',
+        "apt-get clean",
+    ])
+    if local_repo_root is not None and local_repo_root.exists():
+        lines.extend(generate_chroot_cleanup_commands())
+    return "\n".join(lines) + "\n"
+
+
+def _run_root(cmd: list[str], input_text: str | None = None, timeout: int | None = None) -> tuple[bool, str]:
+    """Run a command as root, never prompting for a sudo password."""
+    if os.geteuid() != 0:
+        cmd = ["sudo", "-n", *cmd]
+    try:
+        result = subprocess.run(
+            cmd,
+            input=input_text,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return False, f"{cmd[0]} timed out"
+    if result.returncode != 0:
+        return False, result.stderr.strip() or result.stdout.strip() or f"{cmd[0]} failed"
+    return True, ""
+
+
+def _chroot_directory(name: str) -> Path:
+    """Return the directory backing a schroot, as reported by schroot itself."""
+    result = subprocess.run(
+        ["schroot", "--config", "-c", name],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("directory="):
+            return Path(line.split("=", 1)[1].strip())
+    return SCHROOT_CHROOT_DIR / name
+
+
+def _state_path(config: WarmChrootConfig) -> Path:
+    return config.state_dir / f"{get_warm_chroot_name(config.series, config.arch)}.json"
+
+
+def read_warm_state(config: WarmChrootConfig) -> dict[str, Any] | None:
+    """Read the recorded state of the current warm generation, if any."""
+    try:
+        state = json.loads(_state_path(config).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _is_fresh(state: dict[str, Any] | None, fingerprint: str, max_age_seconds: int) -> bool:
+    if not state or state.get("fingerprint") != fingerprint:
+        return False
+    try:
+        created = datetime.fromisoformat(state["created_at"])
+    except (KeyError, ValueError):
+        return False
+    return (datetime.now(UTC) - created).total_seconds() < max_age_seconds
+
+
+def _seed_generation(config: WarmChrootConfig, fingerprint: str) -> tuple[str, str]:
+    """Create, seed and activate a new snapshot generation.
+
+    Returns:
+        Tuple of (generation_name, error). error is empty on success.
+    """
+    name = get_warm_chroot_name(config.series, config.arch)
+    generation = f"{name}-{fingerprint[:12]}-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}"
+    base_dir = _chroot_directory(config.base_chroot)
+    gen_dir = SCHROOT_CHROOT_DIR / generation
+    seed_name = f"{name}-seed"
+    seed_conf = SCHROOT_CONF_DIR / seed_name
+
+    if not base_dir.is_dir():
+        return "", f"base chroot directory not found: {base_dir}"
+
+    steps: list[tuple[list[str], str | None, int | None]] = [
+        (["cp", "-a", "--reflink=auto", str(base_dir), str(gen_dir)], None, None),
+        (
+            ["tee", str(seed_conf)],
+            render_schroot_config(seed_name, gen_dir, f"Packastack {config.series} seeding", overlay=False),
+            None,
+        ),
+        (
+            ["schroot", "-c", seed_name, "-u", "root", "-d", "/", "--", "sh", "-c",
+             generate_seed_script(config.seed_packages, config.local_repo_root)],
+            None,
+            SEED_TIMEOUT,
+        ),
+    ]
+    for cmd, input_text, timeout in steps:
+        ok, err = _run_root(cmd, input_text=input_text, timeout=timeout)
+        if not ok:
+            _run_root(["rm", "-f", str(seed_conf)])
+            _run_root(["rm", "-rf", "--one-file-system", str(gen_dir)])
+            return "", err
+
+    _run_root(["rm", "-f", str(seed_conf)])
+    ok, err = _run_root(
+        ["tee", str(SCHROOT_CONF_DIR / name)],
+        input_text=render_schroot_config(
+            name, gen_dir, f"Packastack {config.series}/{config.arch} pre-seeded build chroot", overlay=True
+        ),
+    )
+    if not ok:
+        return "", err
+    return generation, ""
+
+
+def _prune_generations(config: WarmChrootConfig, keep: set[str]) -> None:
+    """Remove old generation directories, keeping the ones in keep."""
+    name = get_warm_chroot_name(config.series, config.arch)
+    with contextlib.suppress(OSError):
+        for path in SCHROOT_CHROOT_DIR.glob(f"{name}-*"):
+            if path.name not in keep and path.is_dir():
+                _run_root(["rm", "-rf", "--one-file-system", str(path)])
+
+
+def ensure_warm_chroot(
+    config: WarmChrootConfig,
+    offline: bool,
+    interactive: bool = True,
+) -> WarmChrootResult:
+    """Ensure a fresh warm chroot snapshot exists for a series/arch.
+
+    Concurrent callers are serialised with a lock under state_dir; the first
+    one re-seeds a stale snapshot and the others reuse the result.
+
+    Args:
+        config: Warm chroot configuration.
+        offline: If True, never seed; an existing snapshot is used even if stale.
+        interactive: Allow prompting for a sudo password when seeding.
+
+    Returns:
+        WarmChrootResult; ready is False when the base schroot should be used.
+    """
+    name = get_warm_chroot_name(config.series, config.arch)
+    result = WarmChrootResult(name=name)
+
+    if shutil.which("schroot") is None:
+        result.error = "schroot not found"
+        return result
+
+    result.fingerprint = compute_seed_fingerprint(config)
+    state = read_warm_state(config)
+
+    usable = _is_fresh(state, result.fingerprint, config.max_age_seconds) or (offline and state)
+    if usable and schroot_exists(name):
+        result.ready = True
+        result.generation = state.get("generation", "") if state else ""
+        return result
+
+    if offline:
+        result.error = "warm chroot missing; offline mode prevents seeding"
+        return result
+
+    needs_sudo = os.geteuid() != 0
+    if needs_sudo and not _sudo_credentials_cached() and not (interactive and _ensure_sudo_cached()):
+        result.error = "sudo credentials not available for seeding"
+        return result
+
+    config.state_dir.mkdir(parents=True, exist_ok=True)
+    with (config.state_dir / f".{name}.lock").open("w") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            # Another build may have seeded it while we waited for the lock
+            state = read_warm_state(config)
+            if _is_fresh(state, result.fingerprint, config.max_age_seconds) and schroot_exists(name):
+                result.ready = True
+                result.generation = state.get("generation", "") if state else ""
+                return result
+
+            generation, err = _seed_generation(config, result.fingerprint)
+            if err:
+                result.error = err
+                return result
+
+            previous = state.get("generation", "") if state else ""
+            _state_path(config).write_text(
+                json.dumps(
+                    {
+                        "name": name,
+                        "generation": generation,
+                        "fingerprint": result.fingerprint,
+                        "created_at": datetime.now(UTC).isoformat(),
+                        "seed_packages": list(config.seed_packages),
+                    },
+                    indent=2,
+                ),
+                encoding="utf-8",
+            )
+            # Keep the previous generation for sessions that are still running
+            _prune_generations(config, keep={generation, previous})
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    result.ready = True
+    result.refreshed = True
+    result.generation = generation
+    return result
@@ -21,6 +21,10 @@
 Discovers and collects sbuild output artifacts (.deb, .changes, .buildinfo)
 and log files from various candidate directories, supporting user and global
 sbuild configuration.
+
+Artifacts are hard-linked (or reflinked) into the output directory when the
+filesystem allows it, and each file is read exactly once to compute its
+checksums, which are recorded so publishing does not hash it again.
 """
 
 from __future__ import annotations
@@ -34,6 +38,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from packastack.apt.localrepo import FileChecksums, link_or_reflink
 from packastack.build.sbuildrc import (
     CandidateDirectories,
     parse_sbuild_output_for_paths,
@@ -60,6 +65,11 @@ class CollectedFile:
     sha256: str
     size: int
     mtime: float
+    md5sum: str = ""
+
+    def checksums(self) -> FileChecksums:
+        """Checksums for reuse when publishing to the local repo."""
+        return FileChecksums(md5sum=self.md5sum, sha256=self.sha256, size=self.size)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to JSON-serializable dictionary."""
@@ -67,6 +77,7 @@ class CollectedFile:
             "source_path": str(self.source_path),
             "copied_path": str(self.copied_path),
             "sha256": self.sha256,
+            "md5sum": self.md5sum,
             "size": self.size,
             "mtime": self.mtime,
         }
@@ -103,6 +114,58 @@ class CollectionResult:
         """All collected artifacts (binaries + metadata)."""
         return self.binaries + self.metadata
 
+    def validate(self, searched_build_dirs: list[str] | None = None) -> None:
+        """Set success and the validation message from what was collected.
+
+        Args:
+            searched_build_dirs: Directories named in the failure message;
+                defaults to every searched directory.
+        """
+        searched = self.searched_dirs if searched_build_dirs is None else searched_build_dirs
+        self.success = self.deb_count > 0
+        if self.success:
+            self.validation_message = (
+                f"Collected {self.deb_count} binary package(s), "
+                f"{self.changes_count} changes file(s), "
+                f"{self.buildinfo_count} buildinfo file(s)"
+            )
+        elif len(searched) > 3:
+            self.validation_message = (
+                f"No binary packages (.deb/.udeb) found. "
+                f"Searched {len(searched)} directories: "
+                f"{', '.join(searched[:3])}..."
+            )
+        else:
+            self.validation_message = (
+                f"No binary packages (.deb/.udeb) found. "
+                f"Searched directories: {', '.join(searched) or 'none'}"
+            )
+
+    @classmethod
+    def merge(cls, results: list[CollectionResult]) -> CollectionResult:
+        """Combine the collections of several per-architecture builds.
+
+        The merged collection succeeds only if every build produced
+        binaries; files collected by more than one build are listed once.
+        """
+
+        def unique(files: list[CollectedFile]) -> list[CollectedFile]:
+            return list({f.copied_path: f for f in files}.values())
+
+        merged = cls(
+            success=bool(results) and all(r.success for r in results),
+            binaries=unique([f for r in results for f in r.binaries]),
+            metadata=unique([f for r in results for f in r.metadata]),
+            logs=unique([f for r in results for f in r.logs]),
+            searched_dirs=list(dict.fromkeys(d for r in results for d in r.searched_dirs)),
+        )
+        failed = [r.validation_message for r in results if not r.success]
+        if failed:
+            merged.validation_message = "; ".join(failed)
+        else:
+            merged.validate()
+        return merged
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to JSON-serializable dictionary."""
         return {
@@ -134,10 +197,35 @@ class ArtifactReport:
     stdout_path: str
     stderr_path: str
     primary_log_path: str
+    # Set when the package was built for several architectures
+    arch: str = ""
+    arch_reports: list[ArtifactReport] = field(default_factory=list)
+
+    @classmethod
+    def merge(cls, reports: list[ArtifactReport]) -> ArtifactReport:
+        """Combine the reports of per-architecture builds of one package.
+
+        The merged report carries the combined collection and the first
+        non-zero exit code; each build's own report is kept under
+        ``architectures``.
+        """
+        return cls(
+            sbuild_command=[],
+            sbuild_exit_code=next((r.sbuild_exit_code for r in reports if r.sbuild_exit_code), 0),
+            start_timestamp=min((r.start_timestamp for r in reports), default=""),
+            end_timestamp=max((r.end_timestamp for r in reports), default=""),
+            candidate_dirs=list(dict.fromkeys(d for r in reports for d in r.candidate_dirs)),
+            collection=CollectionResult.merge([r.collection for r in reports]),
+            stdout_path="",
+            stderr_path="",
+            primary_log_path="",
+            arch=",".join(r.arch for r in reports),
+            arch_reports=list(reports),
+        )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to JSON-serializable dictionary."""
-        return {
+        data: dict[str, Any] = {
             "sbuild_command": self.sbuild_command,
             "sbuild_exit_code": self.sbuild_exit_code,
             "start_timestamp": self.start_timestamp,
@@ -148,6 +236,11 @@ class ArtifactReport:
             "stderr_path": self.stderr_path,
             "primary_log_path": self.primary_log_path,
         }
+        if self.arch:
+            data["arch"] = self.arch
+        if self.arch_reports:
+            data["architectures"] = [r.to_dict() for r in self.arch_reports]
+        return data
 
     def write_json(self, path: Path) -> None:
         """Write report to JSON file."""
@@ -155,6 +248,9 @@ class ArtifactReport:
         path.write_text(json.dumps(self.to_dict(), indent=2))
 
 
+_CHUNK_SIZE = 1024 * 1024
+
+
 def compute_sha256(path: Path) -> str:
     """Compute SHA256 hash of a file."""
     sha256 = hashlib.sha256()
@@ -164,8 +260,47 @@ def compute_sha256(path: Path) -> str:
     return sha256.hexdigest()
 
 
+def _hash_file(path: Path) -> tuple[str, str]:
+    """Return (md5, sha256) of a file in a single read."""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            md5.update(chunk)
+            sha256.update(chunk)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def _copy_and_hash(source: Path, dest: Path) -> tuple[str, str]:
+    """Copy a file, hashing it on the way through; returns (md5, sha256)."""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    with source.open("rb") as fsrc, dest.open("wb") as fdst:
+        for chunk in iter(lambda: fsrc.read(_CHUNK_SIZE), b""):
+            md5.update(chunk)
+            sha256.update(chunk)
+            fdst.write(chunk)
+    shutil.copystat(source, dest)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def _collected(source: Path, dest: Path, hashes: tuple[str, str]) -> CollectedFile:
+    st = dest.stat()
+    return CollectedFile(
+        source_path=source.resolve(),
+        copied_path=dest.resolve(),
+        sha256=hashes[1],
+        size=st.st_size,
+        mtime=source.stat().st_mtime,
+        md5sum=hashes[0],
+    )
+
+
 def copy_file_with_checksum(source: Path, dest_dir: Path) -> CollectedFile:
-    """Copy a file to destination directory and compute checksum.
+    """Collect a file into the destination directory and compute checksums.
+
+    The file is hard-linked or reflinked when possible and copied otherwise;
+    either way its content is read only once.
 
     Args:
         source: Source file path.
@@ -179,13 +314,7 @@ def copy_file_with_checksum(source: Path, dest_dir: Path) -> CollectedFile:
 
     # If source and dest are already the same file, no copy needed
     if dest.exists() and dest.samefile(source):
-        return CollectedFile(
-            source_path=source.resolve(),
-            copied_path=dest.resolve(),
-            sha256=compute_sha256(dest),
-            size=dest.stat().st_size,
-            mtime=source.stat().st_mtime,
-        )
+        return _collected(source, dest, _hash_file(dest))
 
     # Handle potential name collision
     if dest.exists():
@@ -195,15 +324,9 @@ def copy_file_with_checksum(source: Path, dest_dir: Path) -> CollectedFile:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         dest = dest_dir / f"{stem}_{timestamp}{suffix}"
 
-    shutil.copy2(source, dest)
-
-    return CollectedFile(
-        source_path=source.resolve(),
-        copied_path=dest.resolve(),
-        sha256=compute_sha256(dest),
-        size=dest.stat().st_size,
-        mtime=source.stat().st_mtime,
-    )
+    if link_or_reflink(source, dest):
+        return _collected(source, dest, _hash_file(dest))
+    return _collected(source, dest, _copy_and_hash(source, dest))
 
 
 def matches_package(
@@ -276,12 +399,19 @@ def matches_package(
     return name_matches
 
 
+def artifact_arch(filename: str) -> str:
+    """Return the architecture field of a ``<name>_<version>_<arch>.<ext>`` file name."""
+    parts = Path(filename).stem.split("_")
+    return parts[2] if len(parts) >= 3 else ""
+
+
 def find_artifacts_in_directory(
     directory: Path,
     source_package: str | None = None,
     version: str | None = None,
     start_time: float | None = None,
     extensions: set[str] | None = None,
+    architectures: set[str] | None = None,
 ) -> list[Path]:
     """Find artifact files in a directory.
 
@@ -294,6 +424,8 @@ def find_artifacts_in_directory(
         version: Package version for filtering.
         start_time: Start time (epoch) to filter by mtime (only used if no source_package).
         extensions: Set of file extensions to match.
+        architectures: Only match files built for these architectures, so
+            concurrent builds sharing a build directory keep to their own.
 
     Returns:
         List of matching file paths.
@@ -314,6 +446,9 @@ def find_artifacts_in_directory(
             if path.suffix not in extensions:
                 continue
 
+            if architectures is not None and artifact_arch(path.name) not in architectures:
+                continue
+
             # If source_package is provided, use it as exclusive filter
             if source_package:
                 if matches_package(path.name, source_package, version):
@@ -396,6 +531,7 @@ def collect_artifacts(
     version: str | None = None,
     start_time: float | None = None,
     sbuild_output: str | None = None,
+    architectures: set[str] | None = None,
 ) -> CollectionResult:
     """Collect sbuild artifacts from candidate directories.
 
@@ -410,6 +546,7 @@ def collect_artifacts(
         version: Package version for filtering.
         start_time: Build start time for timestamp filtering.
         sbuild_output: Sbuild stdout/stderr for path hints.
+        architectures: Only collect artifacts built for these architectures.
 
     Returns:
         CollectionResult with collected artifacts and validation status.
@@ -446,6 +583,7 @@ def collect_artifacts(
             version=version,
             start_time=start_time,
             extensions=BINARY_EXTENSIONS,
+            architectures=architectures,
         ):
             if artifact_path.resolve() in seen_artifact_paths:
                 continue
@@ -465,6 +603,7 @@ def collect_artifacts(
             version=version,
             start_time=start_time,
             extensions=METADATA_EXTENSIONS,
+            architectures=architectures,
         ):
             if artifact_path.resolve() in seen_artifact_paths:
                 continue
@@ -504,23 +643,7 @@ def collect_artifacts(
     result.searched_dirs = searched_build_dirs + searched_log_dirs
 
     # Validate that we found binaries
-    if result.deb_count > 0:
-        result.success = True
-        result.validation_message = (
-            f"Collected {result.deb_count} binary package(s), "
-            f"{result.changes_count} changes file(s), "
-            f"{result.buildinfo_count} buildinfo file(s)"
-        )
-    else:
-        result.success = False
-        result.validation_message = (
-            f"No binary packages (.deb/.udeb) found. "
-            f"Searched {len(searched_build_dirs)} directories: "
-            f"{', '.join(searched_build_dirs[:3])}..."
-            if len(searched_build_dirs) > 3
-            else f"No binary packages (.deb/.udeb) found. "
-            f"Searched directories: {', '.join(searched_build_dirs) or 'none'}"
-        )
+    result.validate(searched_build_dirs)
 
     return result
 
@@ -24,6 +24,7 @@ indexes after build operations.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -39,6 +40,7 @@ def refresh_local_repo_indexes(
     arch: str,
     run: RunContext,
     phase: str = "verify",
+    architectures: Sequence[str] = (),
 ) -> tuple[localrepo.IndexResult, localrepo.SourceIndexResult]:
     """Regenerate binary and source indexes for the local APT repository.
 
@@ -50,23 +52,35 @@ def refresh_local_repo_indexes(
         arch: Architecture for binary packages (e.g., "amd64").
         run: RunContext for logging events.
         phase: Phase name for activity logging (default: "verify").
+        architectures: Further architectures built in this run; their
+            indexes are regenerated in parallel with the one for ``arch``.
 
     Returns:
-        Tuple of (IndexResult, SourceIndexResult) with regeneration results.
+        Tuple of (IndexResult, SourceIndexResult) with regeneration results;
+        the IndexResult is the one for ``arch``.
     """
-    index_result = localrepo.regenerate_indexes(local_repo, arch=arch)
-    if index_result.success:
-        activity(phase, f"Regenerated Packages index ({index_result.package_count} packages)")
-        run.log_event(
-            {
+    arches = list(dict.fromkeys([arch, *architectures]))
+    if len(arches) == 1:
+        index_results = {arch: localrepo.regenerate_indexes(local_repo, arch=arch)}
+    else:
+        index_results = localrepo.regenerate_arch_indexes(local_repo, arches)
+
+    for index_arch, index_result in index_results.items():
+        label = f" for {index_arch}" if len(arches) > 1 else ""
+        if index_result.success:
+            activity(phase, f"Regenerated Packages index{label} ({index_result.package_count} packages)")
+            event = {
                 "event": f"{phase}.index",
                 "package_count": index_result.package_count,
                 "packages_file": str(index_result.packages_file) if index_result.packages_file else None,
             }
-        )
-    else:
-        activity(phase, f"Warning: Failed to regenerate binary indexes: {index_result.error}")
-        run.log_event({"event": f"{phase}.index_failed", "error": index_result.error})
+        else:
+            activity(phase, f"Warning: Failed to regenerate binary indexes{label}: {index_result.error}")
+            event = {"event": f"{phase}.index_failed", "error": index_result.error}
+        if len(arches) > 1:
+            event["arch"] = index_arch
+        run.log_event(event)
+    index_result = index_results[arch]
 
     source_index_result = localrepo.regenerate_source_indexes(local_repo)
     if source_index_result.success:
@@ -126,6 +126,7 @@ def check_retirement_status(
         project_config_path=project_config_path,
         releases_path=releases_repo,
         target_series=openstack_target,
+        run=run,
     )
 
     # Infer deliverable name from package for retirement lookup
@@ -651,3 +652,73 @@ def ensure_schroot_ready(
     })
 
     return PhaseResult.ok(), result
+
+
+def ensure_warm_chroot_ready(
+    schroot_name: str,
+    resolved_ubuntu: str,
+    cfg: dict,
+    cache_root: Path,
+    local_repo: Path | None,
+    offline: bool,
+    run: RunContextType,
+    interactive: bool = True,
+) -> str:
+    """Ensure the pre-seeded overlay snapshot of the build schroot is fresh.
+
+    The warm chroot is an optimisation only: when it cannot be prepared the
+    build falls back to the base schroot.
+
+    Args:
+        schroot_name: Name of the base Packastack schroot.
+        resolved_ubuntu: Ubuntu series codename (e.g., 'noble')
+        cfg: Loaded configuration (reads the chroot_cache section)
+        cache_root: Packastack cache root for snapshot state
+        local_repo: Local APT repository used while seeding
+        offline: If True, never seed a new snapshot
+        run: RunContext for logging
+        interactive: Allow prompting for sudo when seeding
+
+    Returns:
+        Warm chroot name to build in, or "" to use the base schroot.
+    """
+    from packastack.build.chroot_cache import (
+        WarmChrootConfig,
+        ensure_warm_chroot,
+        warm_chroot_enabled,
+    )
+    from packastack.target.arch import get_host_arch
+
+    if not schroot_name or not warm_chroot_enabled(cfg):
+        return ""
+
+    warm_config = WarmChrootConfig.from_settings(
+        cfg,
+        series=resolved_ubuntu,
+        arch=get_host_arch(),
+        base_chroot=schroot_name,
+        cache_root=cache_root,
+        local_repo_root=local_repo,
+    )
+
+    # No spinner here: seeding may need to prompt for a sudo password
+    activity("plan", f"Checking warm chroot for {resolved_ubuntu}/{warm_config.arch}")
+    warm = ensure_warm_chroot(warm_config, offline=offline, interactive=interactive)
+
+    if warm.ready:
+        if warm.refreshed:
+            activity("plan", f"Seeded warm chroot: {warm.name} ({warm.generation})")
+    else:
+        activity("plan", f"Warm chroot unavailable, using {schroot_name}: {warm.error}")
+
+    run.log_event({
+        "event": "schroot.warm",
+        "name": warm.name,
+        "ready": warm.ready,
+        "refreshed": warm.refreshed,
+        "generation": warm.generation,
+        "fingerprint": warm.fingerprint,
+        "error": warm.error,
+    })
+
+    return warm.name if warm.ready else ""
@@ -0,0 +1,296 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Prefetch stage for build-all runs.
+
+Before the first build wave starts, the inputs every child build would
+otherwise fetch inside its build slot are warmed for the whole build order:
+
+- packaging repositories are mirrored under ``paths.packaging_mirrors``
+- official release tarballs and their signatures go into the tarball cache,
+  for the packages that will be built from release tarballs
+- the release signing key for the target series is resolved once
+
+Child builds whose prefetch succeeded are started with
+``PACKASTACK_PREFETCHED=1``; they clone from the mirrors without
+refreshing them and reuse the cached tarballs, so network latency no
+longer serialises with sbuild.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import os
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from packastack.build.tarball import PrefetchSummary, prefetch_release_tarballs
+from packastack.core.run import activity
+from packastack.debpkg.watch import find_series_signing_key
+from packastack.planning.type_selection import BuildType, determine_cycle_stage, select_build_type
+from packastack.upstream.download import DEFAULT_PREFETCH_WORKERS
+from packastack.upstream.gitfetch import FetchResult, GitFetcher
+from packastack.upstream.releases import load_openstack_packages, package_to_project_name
+
+if TYPE_CHECKING:
+    from packastack.core.run import RunContext
+    from packastack.core.slots import HostSlots
+
+# Environment variable telling child builds their inputs were prefetched
+PREFETCHED_ENV = "PACKASTACK_PREFETCHED"
+
+
+@dataclass
+class PrefetchReport:
+    """Outcome and timing of the build-all prefetch stage."""
+
+    packages: int = 0
+    duration_seconds: float = 0.0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    mirrors_cloned: list[str] = field(default_factory=list)
+    mirrors_updated: list[str] = field(default_factory=list)
+    mirror_failures: dict[str, str] = field(default_factory=dict)
+    tarballs: PrefetchSummary = field(default_factory=PrefetchSummary)
+    signing_key: str = ""
+
+    def warmed(self, packages: list[str]) -> set[str]:
+        """Return the packages whose prefetch stages all succeeded."""
+        failed = set(self.mirror_failures) | set(self.tarballs.failed)
+        return {pkg for pkg in packages if pkg not in failed}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "packages": self.packages,
+            "duration_seconds": self.duration_seconds,
+            "stage_seconds": self.stage_seconds,
+            "mirrors": {
+                "cloned": len(self.mirrors_cloned),
+                "updated": len(self.mirrors_updated),
+                "failed": self.mirror_failures,
+            },
+            "tarballs": {
+                "downloaded": len(self.tarballs.downloaded),
+                "cached": len(self.tarballs.cached),
+                "skipped": len(self.tarballs.skipped),
+                "signatures": self.tarballs.signatures,
+                "failed": self.tarballs.failed,
+                "bytes": self.tarballs.bytes_downloaded,
+            },
+            "signing_key": self.signing_key,
+        }
+
+
+def inputs_prefetched() -> bool:
+    """Return True if the build-all coordinator already prefetched inputs."""
+    return os.environ.get(PREFETCHED_ENV, "").lower() in {"1", "true", "yes"}
+
+
+def release_build_packages(
+    packages: list[str],
+    releases_repo: Path | None,
+    openstack_target: str,
+    build_type: str,
+) -> list[str]:
+    """Return the packages whose builds will use official release tarballs.
+
+    For ``auto`` the type is selected per package from openstack/releases,
+    as the child build does, so packages that will be built as snapshots
+    do not download a release tarball they never use.
+    """
+    if build_type == BuildType.SNAPSHOT.value:
+        return []
+    if build_type != "auto":
+        return list(packages)
+    if releases_repo is None or not releases_repo.exists():
+        # The child builds fall back to snapshots
+        return []
+
+    cycle_stage = determine_cycle_stage(releases_repo, openstack_target)
+    source_to_project = load_openstack_packages(releases_repo, openstack_target)
+    return [
+        pkg
+        for pkg in packages
+        if select_build_type(
+            releases_repo=releases_repo,
+            series=openstack_target,
+            source_package=pkg,
+            deliverable=package_to_project_name(pkg, source_to_project),
+            cycle_stage=cycle_stage,
+        ).chosen_type
+        == BuildType.RELEASE
+    ]
+
+
+def prefetch_packaging_mirrors(
+    packages: list[str],
+    fetcher: GitFetcher,
+    max_workers: int = DEFAULT_PREFETCH_WORKERS,
+    on_package: Callable[[str], None] | None = None,
+) -> dict[str, FetchResult]:
+    """Create or refresh the packaging mirrors for many packages concurrently.
+
+    Args:
+        packages: Source package names.
+        fetcher: GitFetcher configured with a mirror_dir.
+        max_workers: Maximum number of concurrent git operations.
+        on_package: Optional callback invoked as each package finishes.
+
+    Returns:
+        Mapping of package name to its mirror FetchResult.
+    """
+    results: dict[str, FetchResult] = {}
+    if not packages:
+        return results
+
+    workers = max(1, min(max_workers, len(packages)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetcher.update_mirror, pkg): pkg for pkg in packages}
+        for future in concurrent.futures.as_completed(futures):
+            pkg = futures[future]
+            try:
+                results[pkg] = future.result()
+            except Exception as e:
+                results[pkg] = FetchResult(package=pkg, path=Path(), error=str(e))
+            if on_package:
+                on_package(pkg)
+
+    return results
+
+
+def run_prefetch(
+    packages: list[str],
+    paths: dict[str, Path],
+    openstack_target: str,
+    build_type: str,
+    run: RunContext | None = None,
+    max_workers: int = DEFAULT_PREFETCH_WORKERS,
+    slots: HostSlots | None = None,
+) -> PrefetchReport:
+    """Warm packaging mirrors, tarballs and signing keys for a build order.
+
+    Each stage runs with its own bounded concurrency and advances a shared
+    progress bar. Failures are recorded rather than raised; the affected
+    child build simply falls back to fetching the input itself.
+
+    Args:
+        packages: Source package names in build order.
+        paths: Resolved Packastack paths.
+        openstack_target: OpenStack series being built.
+        build_type: Build type string (release, snapshot or auto).
+        run: Optional RunContext for event logging.
+        max_workers: Maximum concurrent network operations per stage.
+        slots: Optional host slots; mirror fetches hold fetch slots.
+
+    Returns:
+        PrefetchReport with per-stage timings and results.
+    """
+    from rich.console import Console
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        TaskProgressColumn,
+        TextColumn,
+        TimeRemainingColumn,
+    )
+
+    report = PrefetchReport(packages=len(packages))
+    releases_repo = paths.get("openstack_releases_repo")
+    release_packages = release_build_packages(packages, releases_repo, openstack_target, build_type)
+    fetch_tarballs = bool(release_packages)
+    mirror_dir = paths.get("packaging_mirrors", paths["cache_root"] / "packaging-mirrors")
+    started = time.monotonic()
+
+    activity("all", f"Prefetching inputs for {len(packages)} packages (workers={max_workers})")
+
+    progress_context = contextlib.nullcontext()
+    if packages:
+        console = Console(file=sys.__stdout__, force_terminal=True)
+        progress_context = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(bar_width=40),
+            TaskProgressColumn(),
+            TextColumn("{task.completed}/{task.total}"),
+            TimeRemainingColumn(),
+            console=console,
+            transient=True,
+        )
+
+    with progress_context as progress:
+        task = None
+        if progress:
+            task = progress.add_task("Prefetching", total=len(packages) + len(release_packages))
+
+        def advance(pkg: str) -> None:
+            if progress and task is not None:
+                progress.update(task, description=f"Prefetching {pkg}")
+                progress.advance(task)
+
+        # Packaging mirrors
+        stage_start = time.monotonic()
+        fetcher = GitFetcher(mirror_dir=mirror_dir, slots=slots)
+        for pkg, res in prefetch_packaging_mirrors(packages, fetcher, max_workers, advance).items():
+            if res.error:
+                report.mirror_failures[pkg] = res.error
+            elif res.cloned:
+                report.mirrors_cloned.append(pkg)
+            else:
+                report.mirrors_updated.append(pkg)
+        report.stage_seconds["packaging"] = round(time.monotonic() - stage_start, 3)
+
+        # Release tarballs and their detached signatures
+        if fetch_tarballs:
+            stage_start = time.monotonic()
+            report.tarballs = prefetch_release_tarballs(
+                packages=release_packages,
+                releases_repo=releases_repo,
+                openstack_target=openstack_target,
+                cache_base=paths.get("upstream_tarballs", paths["cache_root"] / "upstream-tarballs"),
+                run=run,
+                max_workers=max_workers,
+                on_package=advance,
+            )
+            report.stage_seconds["tarballs"] = round(time.monotonic() - stage_start, 3)
+
+    # The series signing key is shared by every release build
+    if fetch_tarballs and releases_repo:
+        stage_start = time.monotonic()
+        key_path = find_series_signing_key(releases_repo, openstack_target)
+        report.signing_key = str(key_path) if key_path else ""
+        report.stage_seconds["signing_key"] = round(time.monotonic() - stage_start, 3)
+        if not key_path:
+            activity("all", f"Prefetch: no release signing key found for {openstack_target}")
+
+    report.duration_seconds = round(time.monotonic() - started, 3)
+
+    activity(
+        "all",
+        f"Prefetch: {len(report.mirrors_cloned) + len(report.mirrors_updated)} mirrors, "
+        f"{len(report.tarballs.downloaded)} tarballs downloaded, {len(report.tarballs.cached)} cached, "
+        f"{len(report.mirror_failures) + len(report.tarballs.failed)} failed "
+        f"({report.duration_seconds:.1f}s)",
+    )
+    if run is not None:
+        run.log_event({"event": "prefetch.complete", **report.to_dict()})
+
+    return report
@@ -0,0 +1,309 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Machine-readable progress stream for build-all.
+
+The build-all coordinator and its child builds append JSON lines to
+``<run>/progress.jsonl``:
+
+- ``run.start`` / ``run.end``: totals and the final status
+- ``package.start`` / ``package.done``: per package, with elapsed time
+- ``package.phase``: a child build entering a phase (fetch, build, ...)
+- ``package.marker``: an outcome reported by a child (e.g. ``ppa.upload``)
+- ``snapshot``: queue depth and worker utilisation after each change
+
+Each event is written with a single ``write()`` to a file opened with
+``O_APPEND``, so lines from concurrent processes never interleave.
+:class:`ProgressReader` reads only what was appended since its last read,
+which lets ``packastack status`` and the coordinator follow the stream
+without rescanning it or the build logs.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+PROGRESS_FILE = "progress.jsonl"
+
+# Set by build-all for child builds
+PROGRESS_FILE_ENV = "PACKASTACK_PROGRESS_FILE"
+PROGRESS_PACKAGE_ENV = "PACKASTACK_PROGRESS_PACKAGE"
+
+# Marker names reported by child builds
+MARKER_PPA_UPLOAD = "ppa.upload"
+MARKER_RESOURCES = "resources"
+MARKER_PUBLISHED = "published"
+
+
+class ProgressStream:
+    """Appends progress events to a JSONL file.
+
+    Args:
+        path: Progress file, created if missing.
+        package: Package added to events that do not name one.
+    """
+
+    def __init__(self, path: Path, package: str = "") -> None:
+        self.path = path
+        self.package = package
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd: int | None = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Append one event."""
+        if self._fd is None:
+            return
+        record = {"ts": round(time.time(), 3), "event": event, **fields}
+        if self.package:
+            record.setdefault("package", self.package)
+        line = json.dumps(record, default=str) + "\n"
+        with contextlib.suppress(OSError):
+            os.write(self._fd, line.encode("utf-8"))
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._fd is not None:
+            with contextlib.suppress(OSError):
+                os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> ProgressStream:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+_child_stream: ProgressStream | None = None
+
+
+def report_progress(event: str, **fields: Any) -> None:
+    """Append an event to the build-all progress stream, if there is one.
+
+    Child builds started by build-all inherit the stream path and their
+    package name through the environment; otherwise this does nothing.
+    """
+    global _child_stream
+    if _child_stream is None:
+        path = os.environ.get(PROGRESS_FILE_ENV)
+        if not path:
+            return
+        try:
+            _child_stream = ProgressStream(Path(path), os.environ.get(PROGRESS_PACKAGE_ENV, ""))
+        except OSError:
+            return
+    _child_stream.emit(event, **fields)
+
+
+class ProgressReader:
+    """Incrementally reads a progress stream.
+
+    Only complete lines are returned; a line still being written is picked
+    up by the next call.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offset = 0
+        self._partial = b""
+
+    def read_new(self) -> list[dict[str, Any]]:
+        """Return the events appended since the previous call."""
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except OSError:
+            return []
+        self.offset += len(data)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        events = []
+        for line in lines:
+            with contextlib.suppress(ValueError):
+                events.append(json.loads(line))
+        return events
+
+
+@dataclass
+class PackageProgress:
+    """Progress of one package as seen in the stream."""
+
+    name: str
+    status: str = "running"  # running, success, failed
+    phase: str = ""
+    started: float = 0.0
+    elapsed: float = 0.0
+    message: str = ""
+    markers: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def elapsed_at(self, now: float) -> float:
+        """Seconds spent so far (or in total, once done)."""
+        if self.status == "running" and self.started:
+            return max(now - self.started, 0.0)
+        return self.elapsed
+
+
+@dataclass
+class ProgressState:
+    """Current state of a build-all run, folded from its progress events."""
+
+    total: int = 0
+    workers: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+    status: str = ""
+    queued: int = 0
+    running: int = 0
+    utilisation: float = 0.0
+    packages: dict[str, PackageProgress] = field(default_factory=dict)
+
+    def package(self, name: str) -> PackageProgress:
+        """Return the progress of a package, adding it if unseen."""
+        if name not in self.packages:
+            self.packages[name] = PackageProgress(name=name)
+        return self.packages[name]
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Update the state with one event."""
+        kind = event.get("event")
+        ts = float(event.get("ts", 0.0))
+        name = str(event.get("package", ""))
+        if kind == "run.start":
+            self.total = int(event.get("total", 0))
+            self.workers = int(event.get("workers", 0))
+            self.started = ts
+        elif kind == "run.end":
+            self.finished = ts
+            self.status = str(event.get("status", ""))
+        elif kind == "snapshot":
+            self.queued = int(event.get("queued", 0))
+            self.running = int(event.get("running", 0))
+            self.utilisation = float(event.get("utilisation", 0.0))
+        elif kind == "package.start" and name:
+            pkg = self.package(name)
+            pkg.status, pkg.started, pkg.phase = "running", ts, ""
+        elif kind == "package.phase" and name:
+            self.package(name).phase = str(event.get("phase", ""))
+        elif kind == "package.marker" and name:
+            marker = {k: v for k, v in event.items() if k not in ("event", "package", "marker")}
+            self.package(name).markers[str(event.get("marker", ""))] = marker
+        elif kind == "package.done" and name:
+            pkg = self.package(name)
+            pkg.status = str(event.get("status", ""))
+            pkg.elapsed = float(event.get("elapsed", 0.0))
+            pkg.message = str(event.get("message", ""))
+
+    @property
+    def done(self) -> list[PackageProgress]:
+        """Finished packages."""
+        return [p for p in self.packages.values() if p.status != "running"]
+
+    @property
+    def in_flight(self) -> list[PackageProgress]:
+        """Packages currently building."""
+        return [p for p in self.packages.values() if p.status == "running"]
+
+    def count(self, status: str) -> int:
+        """Number of packages with a status."""
+        return sum(1 for p in self.packages.values() if p.status == status)
+
+
+class BuildAllProgress:
+    """Coordinator side of the progress stream.
+
+    Publishes run, package and snapshot events, and follows the stream to
+    pick up the markers child builds report.
+
+    Args:
+        path: Progress file of the run.
+        total: Packages in the build order.
+        pending: Packages that will be built by this invocation.
+        workers: Parallel build workers.
+    """
+
+    def __init__(self, path: Path, total: int, pending: int, workers: int) -> None:
+        self.stream = ProgressStream(path)
+        self.reader = ProgressReader(path)
+        self.state = ProgressState()
+        self.pending = pending
+        self.workers = max(workers, 1)
+        self._started: dict[str, float] = {}
+        self._finished = 0
+        self._lock = threading.Lock()
+        self.stream.emit("run.start", total=total, pending=pending, workers=self.workers)
+
+    def _snapshot(self) -> None:
+        running = len(self._started) - self._finished
+        self.stream.emit(
+            "snapshot",
+            queued=max(self.pending - len(self._started), 0),
+            running=running,
+            finished=self._finished,
+            utilisation=round(running / self.workers, 3),
+        )
+
+    def package_started(self, package: str, **fields: Any) -> None:
+        """Record that a package build was started."""
+        with self._lock:
+            self._started[package] = time.monotonic()
+            self.stream.emit("package.start", package=package, **fields)
+            self._snapshot()
+
+    def package_finished(self, package: str, success: bool, message: str = "", **fields: Any) -> PackageProgress:
+        """Record that a package build finished.
+
+        Returns:
+            The package's progress, including the markers its build reported.
+        """
+        with self._lock:
+            started = self._started.get(package, time.monotonic())
+            self._finished += 1
+            self.stream.emit(
+                "package.done",
+                package=package,
+                status="success" if success else "failed",
+                elapsed=round(time.monotonic() - started, 3),
+                message=message,
+                **fields,
+            )
+            self._snapshot()
+            for event in self.reader.read_new():
+                self.state.apply(event)
+            return self.state.package(package)
+
+    def close(self, status: str) -> None:
+        """Record the end of the run and close the stream."""
+        with self._lock:
+            self.stream.emit("run.end", status=status, finished=self._finished)
+            self.stream.close()
+
+
+def load_progress(path: Path) -> ProgressState:
+    """Fold a whole progress stream into its current state."""
+    state = ProgressState()
+    for event in ProgressReader(path).read_new():
+        state.apply(event)
+    return state
@@ -84,6 +84,16 @@ class WatchMismatchProvenance:
     message: str = ""
 
 
+@dataclass
+class BuildCacheProvenance:
+    """Provenance information about build result caching."""
+
+    key: str = ""
+    hit: bool = False
+    source_run_id: str = ""  # run that produced the reused artifacts
+    inputs: dict[str, Any] = field(default_factory=dict)
+
+
 @dataclass
 class BuildProvenance:
     """Complete provenance record for a build.
@@ -128,6 +138,9 @@ class BuildProvenance:
     # Build type
     build_type: str = ""  # release, snapshot
 
+    # Build result cache
+    build_cache: BuildCacheProvenance = field(default_factory=BuildCacheProvenance)
+
 
 def create_provenance(
     source_package: str,
@@ -215,6 +228,7 @@ def _from_dict(data: dict[str, Any]) -> BuildProvenance:
     tarball = TarballProvenance(**data.get("tarball", {}))
     verification = VerificationProvenance(**data.get("verification", {}))
     watch_mismatch = WatchMismatchProvenance(**data.get("watch_mismatch", {}))
+    build_cache = BuildCacheProvenance(**data.get("build_cache", {}))
 
     return BuildProvenance(
         source_package=data.get("source_package", ""),
@@ -231,6 +245,7 @@ def _from_dict(data: dict[str, Any]) -> BuildProvenance:
         registry_override_path=data.get("registry_override_path", ""),
         watch_mismatch=watch_mismatch,
         build_type=data.get("build_type", ""),
+        build_cache=build_cache,
     )
 
 
@@ -252,4 +267,5 @@ def summarize_provenance(provenance: BuildProvenance) -> dict[str, Any]:
         "verification_result": provenance.verification.result,
         "watch_mismatch": provenance.watch_mismatch.detected,
         "build_type": provenance.build_type,
+        "build_cache_hit": provenance.build_cache.hit,
     }
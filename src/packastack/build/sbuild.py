@@ -31,6 +31,8 @@ This module also handles:
 - Discovering artifacts from user/global sbuild config directories
 - Collecting logs from sbuild's configured log directory
 - Generating detailed artifact reports
+- Building several architectures of one package concurrently, with
+  Architecture: all packages built by exactly one of the builds
 """
 
 from __future__ import annotations
@@ -38,7 +40,8 @@ from __future__ import annotations
 import shutil
 import subprocess
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -51,13 +54,18 @@ from packastack.build.collector import (
     create_primary_log_symlink,
 )
 from packastack.build.sbuildrc import discover_candidate_directories
+from packastack.core.slots import SLOT_SBUILD, host_slot
+from packastack.core.spans import command_span
 
 if TYPE_CHECKING:
-    pass
+    from packastack.core.slots import HostSlots
 
 # Mount point inside chroot for PackaStack local repo
 CHROOT_REPO_MOUNT = "/srv/packastack-apt"
 CHROOT_SOURCES_LIST = "/etc/apt/sources.list.d/packastack-local.list"
+CHROOT_APT_PROXY_CONF = "/etc/apt/apt.conf.d/99packastack-proxy"
+
+REPORT_FILE = "sbuild-artifacts.json"
 
 
 @dataclass
@@ -82,6 +90,10 @@ class SbuildResult:
     validation_message: str = ""
     report_path: Path | None = None
     command: list[str] = field(default_factory=list)
+    arch: str = ""
+    report: ArtifactReport | None = None
+    # Per-architecture results when the package was built for several
+    arch_results: list[SbuildResult] = field(default_factory=list)
 
 
 @dataclass
@@ -101,6 +113,13 @@ class SbuildConfig:
     version: str | None = None
     # Lintian options to suppress expected warnings/errors
     lintian_suppress_tags: list[str] = field(default_factory=list)
+    # Pre-seeded overlay chroot (see build/chroot_cache.py); empty to use the base chroot
+    warm_chroot: str = ""
+    # Caching apt proxy URL (see build/apt_proxy.py); empty to download directly
+    apt_proxy: str = ""
+    # Build Architecture: all packages (--arch-all / --no-arch-all); None
+    # leaves it to the sbuild configuration
+    arch_all: bool | None = None
 
 
 def is_sbuild_available() -> bool:
@@ -108,24 +127,39 @@ def is_sbuild_available() -> bool:
     return shutil.which("sbuild") is not None
 
 
-def generate_chroot_setup_commands(local_repo_root: Path) -> list[str]:
+def generate_apt_proxy_setup_commands(apt_proxy: str) -> list[str]:
+    """Generate chroot setup commands pointing apt at a caching proxy.
+
+    Args:
+        apt_proxy: Proxy URL (e.g., http://127.0.0.1:3142).
+
+    Returns:
+        List of shell commands to run in the chroot during setup.
+    """
+    return [f"echo 'Acquire::http::Proxy \"{apt_proxy}\";' > {CHROOT_APT_PROXY_CONF}"]
+
+
+def generate_chroot_setup_commands(local_repo_root: Path, apt_proxy: str = "") -> list[str]:
     """Generate chroot setup commands for sbuild.
 
     These commands:
-    1. Create mount point directory
-    2. Bind-mount the host's local repo into the chroot
-    3. Write apt sources list entry for the local repo
-    4. Run apt-get update to refresh package lists
+    1. Point apt at the caching proxy, if one is given
+    2. Create mount point directory
+    3. Bind-mount the host's local repo into the chroot
+    4. Write apt sources list entry for the local repo
+    5. Run apt-get update to refresh package lists
 
     Args:
         local_repo_root: Host path to the PackaStack local APT repository.
+        apt_proxy: Optional caching apt proxy URL.
 
     Returns:
         List of shell commands to run in the chroot during setup.
     """
     repo_path = str(local_repo_root.resolve())
 
-    commands = [
+    commands = generate_apt_proxy_setup_commands(apt_proxy) if apt_proxy else []
+    commands += [
         f"mkdir -p {CHROOT_REPO_MOUNT}",
         f"mount --bind {repo_path} {CHROOT_REPO_MOUNT}",
         f"mount -o remount,ro,bind {CHROOT_REPO_MOUNT}",
@@ -140,14 +174,14 @@ def generate_chroot_cleanup_commands() -> list[str]:
     """Generate chroot cleanup commands for sbuild.
 
     These commands:
-    1. Remove the apt sources list entry
+    1. Remove the apt sources list entry and proxy configuration
     2. Unmount the bind-mounted repo
 
     Returns:
         List of shell commands to run in the chroot during cleanup.
     """
     return [
-        f"rm -f {CHROOT_SOURCES_LIST}",
+        f"rm -f {CHROOT_SOURCES_LIST} {CHROOT_APT_PROXY_CONF}",
         f"umount {CHROOT_REPO_MOUNT} || true",
     ]
 
@@ -171,6 +205,8 @@ def build_sbuild_command(config: SbuildConfig) -> list[str]:
     # Architecture
     if config.arch:
         cmd.extend(["--arch", config.arch])
+    if config.arch_all is not None:
+        cmd.append("--arch-all" if config.arch_all else "--no-arch-all")
 
     # Chroot name (if specified, otherwise sbuild uses default)
     # Note: Only use -c if no distribution is specified, as -c overrides
@@ -178,17 +214,28 @@ def build_sbuild_command(config: SbuildConfig) -> list[str]:
     if config.chroot_name and not config.distribution:
         cmd.extend(["-c", config.chroot_name])
 
+    # A warm chroot is selected explicitly; -d still sets the distribution.
+    # Its archive lists and packages were refreshed when it was seeded, so
+    # the per-build apt update/upgrade is skipped.
+    if config.warm_chroot:
+        cmd.extend(["-c", config.warm_chroot])
+        cmd.extend(["--no-apt-update", "--no-apt-upgrade", "--no-apt-distupgrade"])
+
     # Local repo setup via chroot-setup-commands
     # First ensure the repo has valid indexes (even if empty)
     if config.local_repo_root and config.local_repo_root.exists():
         ensure_repo_initialized(config.local_repo_root, config.arch)
-        setup_cmds = generate_chroot_setup_commands(config.local_repo_root)
+        setup_cmds = generate_chroot_setup_commands(config.local_repo_root, config.apt_proxy)
         for setup_cmd in setup_cmds:
             cmd.extend(["--chroot-setup-commands", setup_cmd])
 
         cleanup_cmds = generate_chroot_cleanup_commands()
         for cleanup_cmd in cleanup_cmds:
             cmd.extend(["--finished-build-commands", cleanup_cmd])
+    elif config.apt_proxy:
+        for setup_cmd in generate_apt_proxy_setup_commands(config.apt_proxy):
+            cmd.extend(["--chroot-setup-commands", setup_cmd])
+        cmd.extend(["--finished-build-commands", f"rm -f {CHROOT_APT_PROXY_CONF}"])
 
     # Extra arguments
     cmd.extend(config.extra_args)
@@ -253,7 +300,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
         # Run sbuild and capture output to files
         with stdout_log.open("w", encoding="utf-8") as stdout_f, stderr_log.open(
             "w", encoding="utf-8"
-        ) as stderr_f:
+        ) as stderr_f, command_span(cmd):
             result = subprocess.run(
                 cmd,
                 cwd=config.output_dir,
@@ -285,6 +332,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             version=config.version,
             start_time=start_time,
             sbuild_output=combined_output,
+            architectures=_collected_architectures(config),
         )
 
         # Create primary log symlink/copy. Use a stable, per-source name so
@@ -322,9 +370,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
         end_timestamp = datetime.now(UTC).isoformat()
 
         # Generate artifact report
-        report_dir = log_dir.parent / "reports" if log_dir.name == "logs" else log_dir / "reports"
-        report_dir.mkdir(parents=True, exist_ok=True)
-        report_path = report_dir / "sbuild-artifacts.json"
+        report_path = _report_dir(log_dir) / REPORT_FILE
 
         report = ArtifactReport(
             sbuild_command=cmd,
@@ -336,6 +382,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             stdout_path=str(stdout_log),
             stderr_path=str(stderr_log),
             primary_log_path=str(primary_log) if primary_log else "",
+            arch=config.arch,
         )
         report.write_json(report_path)
 
@@ -344,7 +391,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             output=combined_output,
             artifacts=legacy_artifacts,
             changes_file=changes_file,
-            chroot_name=config.chroot_name or f"{config.distribution}-{config.arch}",
+            chroot_name=config.warm_chroot or config.chroot_name or f"{config.distribution}-{config.arch}",
             setup_method="bind-mount" if config.local_repo_root else "none",
             local_repo_path=str(config.local_repo_root) if config.local_repo_root else "",
             exit_code=exit_code,
@@ -357,6 +404,8 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             validation_message=validation_msg,
             report_path=report_path,
             command=cmd,
+            arch=config.arch,
+            report=report,
         )
 
     except subprocess.TimeoutExpired:
@@ -367,6 +416,7 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             stdout_log_path=stdout_log if stdout_log.exists() else None,
             stderr_log_path=stderr_log if stderr_log.exists() else None,
             command=cmd,
+            arch=config.arch,
         )
     except Exception as e:
         return SbuildResult(
@@ -376,9 +426,151 @@ def run_sbuild(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
             stdout_log_path=stdout_log if stdout_log.exists() else None,
             stderr_log_path=stderr_log if stderr_log.exists() else None,
             command=cmd,
+            arch=config.arch,
         )
 
 
+def _report_dir(log_dir: Path) -> Path:
+    report_dir = log_dir.parent / "reports" if log_dir.name == "logs" else log_dir / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    return report_dir
+
+
+def _collected_architectures(config: SbuildConfig) -> set[str] | None:
+    """Architectures whose artifacts belong to this build.
+
+    Only builds with an explicit arch:all choice are filtered; they may run
+    alongside builds of the same package for other architectures.
+    """
+    if config.arch_all is None:
+        return None
+    return {config.arch, "all"} if config.arch_all else {config.arch}
+
+
+def split_architectures(
+    config: SbuildConfig,
+    architectures: list[str],
+    arch_all: str = "",
+    arch_any: bool = True,
+) -> list[SbuildConfig]:
+    """Derive one sbuild configuration per architecture from a host build.
+
+    Architecture: all packages are built once, by the ``arch_all`` build
+    (``--arch-all``); every other build passes ``--no-arch-all``. Each build
+    gets its own output and log directory, so concurrent builds never share
+    files. The chroot name and warm chroot of ``config`` are host-specific
+    and only kept for its own architecture; other architectures use the
+    sbuild chroot for ``<distribution>-<arch>`` (e.g. a qemu-user chroot).
+
+    Args:
+        config: Configuration for the host architecture build.
+        architectures: Architectures to build, in order.
+        arch_all: Architecture whose build also builds arch:all packages;
+            defaults to the host architecture if listed, else the first.
+        arch_any: Whether the source has architecture-dependent packages.
+            When it does not, only the arch:all build is needed.
+
+    Returns:
+        Configurations to build, the arch:all build first.
+    """
+    arches = list(dict.fromkeys(architectures)) or [config.arch]
+    if not arch_all or arch_all not in arches:
+        arch_all = config.arch if config.arch in arches else arches[0]
+    if not arch_any:
+        arches = [arch_all]
+    if arches == [config.arch]:
+        return [config]
+
+    arches.sort(key=lambda a: a != arch_all)
+    log_root = config.run_log_dir or config.output_dir
+    configs = []
+    for arch in arches:
+        host = arch == config.arch
+        configs.append(
+            replace(
+                config,
+                arch=arch,
+                arch_all=arch == arch_all,
+                output_dir=config.output_dir / arch,
+                run_log_dir=log_root / f"sbuild-{arch}",
+                chroot_name=config.chroot_name if host else "",
+                warm_chroot=config.warm_chroot if host else "",
+                extra_args=list(config.extra_args),
+                lintian_suppress_tags=list(config.lintian_suppress_tags),
+            )
+        )
+    return configs
+
+
+def merge_sbuild_results(results: list[SbuildResult], report_path: Path | None = None) -> SbuildResult:
+    """Combine per-architecture sbuild results into one.
+
+    The merged result succeeds only if every build did. Its report merges
+    the per-architecture artifact reports and is written to ``report_path``
+    when given.
+    """
+    reports = [r.report for r in results if r.report is not None]
+    report = ArtifactReport.merge(reports) if reports else None
+    if report is not None and report_path is not None:
+        report.write_json(report_path)
+
+    failed = [r for r in results if not r.success]
+    return SbuildResult(
+        success=bool(results) and not failed,
+        output="".join(f"==> {r.arch} <==\n{r.output}" for r in results),
+        artifacts=[a for r in results for a in r.artifacts],
+        changes_file=next((r.changes_file for r in results if r.changes_file), None),
+        chroot_name=", ".join(r.chroot_name for r in results if r.chroot_name),
+        setup_method=results[0].setup_method if results else "none",
+        local_repo_path=results[0].local_repo_path if results else "",
+        exit_code=next((r.exit_code for r in failed), 0),
+        collected_artifacts=[a for r in results for a in r.collected_artifacts],
+        collected_logs=[log for r in results for log in r.collected_logs],
+        searched_dirs=list(dict.fromkeys(d for r in results for d in r.searched_dirs)),
+        validation_message="; ".join(
+            f"{r.arch}: {r.validation_message}" for r in (failed or results) if r.validation_message
+        ),
+        report_path=report_path if report is not None else None,
+        arch=",".join(r.arch for r in results),
+        report=report,
+        arch_results=list(results),
+    )
+
+
+def run_sbuild_parallel(
+    configs: list[SbuildConfig], timeout: int = 3600, slots: HostSlots | None = None
+) -> SbuildResult:
+    """Run the sbuild builds of one package for several architectures at once.
+
+    Each build runs on its own worker; a single configuration is simply
+    passed to :func:`run_sbuild`.
+
+    Args:
+        configs: Per-architecture configurations (see :func:`split_architectures`).
+        timeout: Build timeout in seconds, per architecture.
+        slots: Optional host slots; each build holds an sbuild slot while it
+            runs.
+
+    Returns:
+        Merged SbuildResult; ``arch_results`` holds each build's own result.
+    """
+
+    def build(config: SbuildConfig) -> SbuildResult:
+        label = f"{config.source_package or config.dsc_path.name} {config.arch}"
+        with host_slot(slots, SLOT_SBUILD, label):
+            return run_sbuild(config, timeout=timeout)
+
+    if len(configs) == 1:
+        return build(configs[0])
+
+    with ThreadPoolExecutor(max_workers=len(configs), thread_name_prefix="sbuild") as pool:
+        results = list(pool.map(build, configs))
+
+    base = configs[0]
+    log_root = (base.run_log_dir or base.output_dir).parent
+    return merge_sbuild_results(results, _report_dir(log_root) / REPORT_FILE)
+
+
 def get_default_chroot_name(distribution: str, arch: str = "amd64") -> str:
     """Get the default sbuild chroot name for a distribution.
 
@@ -24,7 +24,8 @@ Parses $build_dir and $log_dir from Perl-style sbuild configuration files:
 - /etc/sbuild/sbuild.conf.d/*.conf (global config fragments)
 
 Only simple variable assignments are parsed; complex Perl expressions are
-skipped with a warning.
+skipped with a warning. The same files are also scanned for an apt proxy
+that is already configured for the build chroots.
 """
 
 from __future__ import annotations
@@ -52,6 +53,13 @@ PERL_VAR_PATTERN = re.compile(
     re.VERBOSE,
 )
 
+# Matches an apt proxy URL set via Acquire::http::Proxy (usually inside
+# chroot-setup-commands) or via http_proxy in $build_environment.
+APT_PROXY_PATTERN = re.compile(
+    r"""(?:Acquire::http::Proxy\s*\\?["']?|http_proxy['"]?\s*(?:=>|=)\s*['"]?)(https?://[^\s"';\\]+)""",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class SbuildPaths:
@@ -306,3 +314,41 @@ def parse_sbuild_output_for_paths(output: str) -> SbuildPaths:
                         break
 
     return result
+
+
+def parse_sbuildrc_apt_proxy(content: str) -> str:
+    """Return the apt proxy URL configured in sbuildrc content, if any.
+
+    Commented-out lines are ignored.
+
+    Args:
+        content: Content of an sbuildrc file.
+
+    Returns:
+        Proxy URL, or empty string if none is configured.
+    """
+    for line in content.splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        match = APT_PROXY_PATTERN.search(line)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def find_configured_apt_proxy() -> tuple[str, str]:
+    """Find an apt proxy already configured in the user or global sbuild config.
+
+    Returns:
+        Tuple of (proxy_url, source_path). Both are empty if none is found.
+    """
+    for path in [get_user_sbuildrc_path(), *get_global_sbuild_config_paths()]:
+        try:
+            content = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        url = parse_sbuildrc_apt_proxy(content)
+        if url:
+            logger.debug("Found apt proxy %s in %s", url, path)
+            return url, str(path)
+    return "", ""
@@ -36,10 +36,17 @@ import contextlib
 import json
 import os
 import subprocess
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from packastack.build.admission import ProcessTreeSampler, build_jobs, measure_build_usage
+from packastack.build.build_cache import (
+    compute_build_cache_key,
+    lookup_build_cache,
+    store_build_cache,
+)
 from packastack.build.errors import (
     EXIT_BUILD_FAILED,
     EXIT_CONFIG_ERROR,
@@ -57,15 +64,28 @@ from packastack.build.git_helpers import (
     git_commit,
     maybe_enable_sphinxdoc,
 )
+from packastack.build.prefetch import inputs_prefetched
+from packastack.build.progress import (
+    MARKER_PUBLISHED,
+    MARKER_RESOURCES,
+    PROGRESS_FILE_ENV,
+    report_progress,
+)
 from packastack.build.tarball import _fetch_release_tarball
 from packastack.core.run import activity
+from packastack.core.slots import create_host_slots
+from packastack.core.spans import span
 from packastack.core.spinner import activity_spinner
+from packastack.debpkg.control import ControlDocument
 from packastack.debpkg.gbp import run_command
+from packastack.planning.build_manifest import write_run_manifest
 from packastack.reports.deps_satisfaction import write_dependency_satisfaction_reports
 from packastack.upstream.gitfetch import GitFetcher
 
 if TYPE_CHECKING:
+    from packastack.apt.localrepo import FileChecksums
     from packastack.apt.packages import PackageIndex
+    from packastack.build.build_cache import BuildCacheEntry
     from packastack.build.provenance import BuildProvenance
     from packastack.core.run import RunContext
     from packastack.planning.type_selection import BuildType
@@ -137,6 +157,8 @@ class BuildResult:
     artifacts: list[Path] = field(default_factory=list)
     dsc_file: Path | None = None
     changes_file: Path | None = None
+    # Checksums computed during artifact collection, by file name
+    checksums: dict[str, FileChecksums] = field(default_factory=dict)
 
 
 # =============================================================================
@@ -242,16 +264,69 @@ class SingleBuildContext:
 
     # Schroot
     schroot_name: str | None = None
+    warm_chroot_name: str | None = None
+
+    # Build result cache
+    build_cache: bool = True
 
     # Provenance
     provenance: BuildProvenance | None = None
     dependency_reports: dict[str, Path] | None = None
     upstream_min_versions: dict[str, str] | None = None
 
+    # debian/control of pkg_repo, shared by the phases (see control_document)
+    control: ControlDocument | None = None
+
     # Resume support
     resume_workspace_path: Path | None = None
 
 
+def control_document(ctx: SingleBuildContext) -> ControlDocument | None:
+    """Return the packaging repository's debian/control for this build.
+
+    The document is loaded once and re-read only when the file changed on
+    disk (e.g. after a git operation), so phases share a single parse.
+
+    Returns:
+        The document, or None if there is no debian/control.
+    """
+    if ctx.pkg_repo is None:
+        return None
+    control_path = ctx.pkg_repo / "debian" / "control"
+    if ctx.control is None or ctx.control.path != control_path:
+        if not control_path.exists():
+            return None
+        ctx.control = ControlDocument.load(control_path)
+    else:
+        ctx.control.refresh()
+    return ctx.control
+
+
+def build_architectures(ctx: SingleBuildContext, host_arch: str) -> list[str]:
+    """Return the architectures binary packages are built for.
+
+    Configured by ``sbuild.architectures``; defaults to the host architecture.
+    """
+    configured = (ctx.cfg or {}).get("sbuild", {}).get("architectures") or [host_arch]
+    return list(dict.fromkeys(configured))
+
+
+def builds_arch_any(ctx: SingleBuildContext) -> bool:
+    """Whether debian/control declares an architecture-dependent binary.
+
+    A missing or unparseable control file counts as architecture-dependent,
+    so every configured architecture is built.
+    """
+    control = control_document(ctx)
+    if control is None:
+        return True
+    try:
+        binaries = control.source.binaries
+    except ValueError:
+        return True
+    return not binaries or any(b.architecture.strip() != "all" for b in binaries)
+
+
 # =============================================================================
 # Setup: Create and populate SingleBuildContext
 # =============================================================================
@@ -302,6 +377,9 @@ class SetupInputs:
     # Resume support
     resume_workspace_path: Path | None = None
 
+    # Reuse artifacts of an identical previous build
+    build_cache: bool = True
+
 
 def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildContext | None]:
     """Set up the build context by running pre-build phases.
@@ -327,6 +405,7 @@ def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildCo
         check_retirement_status,
         check_tools,
         ensure_schroot_ready,
+        ensure_warm_chroot_ready,
         load_package_indexes,
         resolve_upstream_registry,
     )
@@ -346,6 +425,7 @@ def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildCo
         get_previous_series,
         is_snapshot_eligible,
         load_openstack_packages,
+        package_to_project_name,
     )
     from packastack.upstream.source import select_upstream_source
 
@@ -365,9 +445,7 @@ def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildCo
 
     # Derive project name from releases metadata when possible
     openstack_pkgs = load_openstack_packages(releases_repo, openstack_target)
-    package = openstack_pkgs.get(pkg_name)
-    if not package:
-        package = pkg_name[7:] if pkg_name.startswith("python-") else pkg_name
+    package = package_to_project_name(pkg_name, openstack_pkgs)
 
     activity("resolve", f"Package: {pkg_name}")
     run.log_event({"event": "resolve.package", "name": pkg_name})
@@ -579,6 +657,16 @@ def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildCo
     if not result.success:
         return result, None
     schroot_name = schroot_info.schroot_name
+    warm_chroot_name = ensure_warm_chroot_ready(
+        schroot_name=schroot_name,
+        resolved_ubuntu=resolved_ubuntu,
+        cfg=cfg,
+        cache_root=paths["cache_root"],
+        local_repo=local_repo,
+        offline=inputs.offline,
+        run=run,
+        interactive=not inputs_prefetched(),
+    )
 
     # Select upstream source
     upstream = select_upstream_source(
@@ -636,6 +724,8 @@ def setup_build_context(inputs: SetupInputs) -> tuple[PhaseResult, SingleBuildCo
         current_lts_index=current_lts_index,
         openstack_pkgs=openstack_pkgs,
         schroot_name=schroot_name,
+        warm_chroot_name=warm_chroot_name,
+        build_cache=inputs.build_cache,
         provenance=provenance,
         resume_workspace_path=inputs.resume_workspace_path,
     )
@@ -718,8 +808,15 @@ def fetch_packaging_repo(
         run.add_log_mirror(workspace / "logs")
 
     # Clone packaging repo
+    # Clones come from the local packaging mirror; under build-all the
+    # prefetch stage has already refreshed it for this run.
     launchpad_username = ctx.cfg.get("git", {}).get("launchpad_username")
-    fetcher = GitFetcher(launchpad_username=launchpad_username)
+    fetcher = GitFetcher(
+        launchpad_username=launchpad_username,
+        mirror_dir=ctx.paths.get("packaging_mirrors", ctx.paths["cache_root"] / "packaging-mirrors"),
+        refresh_mirror=not inputs_prefetched(),
+        slots=create_host_slots(ctx.cfg, ctx.paths),
+    )
     with activity_spinner("fetch", f"Cloning packaging repository: {ctx.pkg_name}"):
         fetch_result = fetcher.fetch_and_checkout(
             ctx.pkg_name,
@@ -915,6 +1012,7 @@ def prepare_upstream_source(
     )
     from packastack.debpkg.launchpad_yaml import update_launchpad_yaml_series
     from packastack.planning.type_selection import BuildType
+    from packastack.upstream.compress import get_compressor
     from packastack.upstream.releases import load_project_releases, load_series_info
     from packastack.upstream.source import (
         SnapshotAcquisitionResult,
@@ -1090,10 +1188,15 @@ def prepare_upstream_source(
                 git_ref="HEAD",
                 package_name=ctx.pkg_name,
             )
+            tarball_cfg = (ctx.cfg or {}).get("snapshot_tarball", {})
             snapshot_result = acquire_upstream_snapshot(
                 request=snapshot_request,
                 work_dir=upstream_work_dir,
                 output_dir=ctx.workspace,
+                compressor=get_compressor(
+                    tarball_cfg.get("compression", "gzip"), int(tarball_cfg.get("threads", 0))
+                ),
+                cache_base=ctx.tarball_cache_base,
             )
 
             if not snapshot_result.success:
@@ -1494,15 +1597,15 @@ def validate_and_build_deps(
 def report_dependency_satisfaction(ctx: SingleBuildContext) -> PhaseResult:
     """Evaluate debian/control deps against dev and previous LTS and write reports."""
 
-    from packastack.debpkg.control import format_dependency_list, parse_control
+    from packastack.debpkg.control import format_dependency_list
     from packastack.planning.control_min_versions import (
         apply_min_version_policy,
         decisions_to_report,
     )
     from packastack.planning.dependency_satisfaction import evaluate_dependencies
 
-    control_path = ctx.pkg_repo / "debian" / "control"
-    if not control_path.exists():
+    control = control_document(ctx)
+    if control is None:
         activity("deps", "debian/control not found; skipping dependency satisfaction report")
         return PhaseResult.ok()
 
@@ -1512,7 +1615,7 @@ def report_dependency_satisfaction(ctx: SingleBuildContext) -> PhaseResult:
         activity("deps", "Ubuntu index unavailable; skipping dependency satisfaction")
         return PhaseResult.ok()
 
-    source_pkg = parse_control(control_path)
+    source_pkg = control.source
     build_dep_list = list(source_pkg.build_depends)
     build_dep_indep = list(source_pkg.build_depends_indep)
     build_deps = build_dep_list + build_dep_indep
@@ -1595,20 +1698,9 @@ def report_dependency_satisfaction(ctx: SingleBuildContext) -> PhaseResult:
 
             if not ctx.dry_run_control_edit:
                 # Rewrite Build-Depends/Build-Depends-Indep with updated ordering
-                text = control_path.read_text()
-
-                def _replace_field(body: str, field: str, value: str) -> str:
-                    import re
-
-                    pattern = rf"{field}:(?:[^\n]*\n(?:[ \t].*\n)*)"
-                    replacement = f"{field}: {value}\n"
-                    return re.sub(pattern, replacement, body, count=1)
-
-                build_field = format_dependency_list(updated_build)
-                indep_field = format_dependency_list(updated_indep)
-                text = _replace_field(text, "Build-Depends", build_field)
-                text = _replace_field(text, "Build-Depends-Indep", indep_field)
-                control_path.write_text(text)
+                control.replace_field("Build-Depends", format_dependency_list(updated_build))
+                control.replace_field("Build-Depends-Indep", format_dependency_list(updated_indep))
+                control.save()
 
             # Write control min-version report
             decisions = decisions_build + decisions_indep
@@ -1822,11 +1914,14 @@ def import_and_patch(
         PhaseResult indicating success or failure.
     """
     from packastack.debpkg.gbp import (
+        analyze_patch_series,
         check_upstreamed_patches,
         ensure_upstream_branch,
         import_orig,
+        import_upstream_commit,
         pq_export,
         pq_import,
+        upstream_import_store,
     )
     from packastack.planning.type_selection import BuildType
 
@@ -1872,29 +1967,53 @@ def import_and_patch(
             import_version = ctx.upstream.version
         else:
             import_version = None
-
-        # Import without merging - we'll handle the merge manually to preserve packaging files
-        import_result = import_orig(
-            pkg_repo,
-            upstream_tarball,
-            upstream_version=import_version,
-            upstream_branch=upstream_branch_name,
-            pristine_tar=True,
-            merge=False,  # Don't let gbp do the merge
-        )
+        import_store = upstream_import_store(ctx.paths["cache_root"], ctx.pkg_name)
+
+        if (
+            ctx.build_type == BuildType.SNAPSHOT
+            and snapshot_result
+            and snapshot_result.repo_path
+            and snapshot_result.git_sha
+            and import_version
+        ):
+            # Snapshots come straight from the mirror commit; the tarball is
+            # only needed for the source package
+            import_result = import_upstream_commit(
+                pkg_repo,
+                snapshot_result.repo_path,
+                snapshot_result.git_sha,
+                import_version,
+                upstream_branch_name,
+                import_store=import_store,
+            )
+        else:
+            # Import without merging - we'll handle the merge manually to preserve packaging files
+            import_result = import_orig(
+                pkg_repo,
+                upstream_tarball,
+                upstream_version=import_version,
+                upstream_branch=upstream_branch_name,
+                pristine_tar=True,
+                merge=False,  # Don't let gbp do the merge
+                import_store=import_store,
+            )
 
         if import_result.success:
-            activity("import-orig", "Upstream tarball imported successfully")
+            if import_result.skipped:
+                activity("import-orig", f"Upstream already imported: {import_result.output}")
+            else:
+                activity("import-orig", "Upstream tarball imported successfully")
             run.log_event(
                 {
                     "event": "import-orig.complete",
                     "tarball": str(upstream_tarball),
                     "version": import_result.upstream_version,
+                    "skipped": import_result.skipped,
                 }
             )
 
             # Now manually merge the upstream tag, preserving packaging files
-            upstream_tag = import_result.upstream_version
+            upstream_tag = import_result.upstream_tag or import_result.upstream_version
             if upstream_tag:
                 activity("import-orig", f"Merging upstream tag '{upstream_tag}' with -Xtheirs strategy")
 
@@ -1963,10 +2082,17 @@ def import_and_patch(
     else:
         activity("import-orig", "No upstream tarball to import")
 
-    # Patches phase
-    activity("patches", "Applying patches with gbp pq")
-
-    upstreamed = check_upstreamed_patches(pkg_repo)
+    # Patches phase: classify the whole series first so gbp pq import runs
+    # once, with the options the outcome calls for
+    activity("patches", "Analyzing patch series")
+    analysis = analyze_patch_series(pkg_repo)
+    if analysis.available:
+        counts = ", ".join(f"{n} {kind}" for kind, n in sorted(analysis.counts().items()))
+        activity("patches", f"Patch series: {counts or 'no patches'}")
+        run.log_event({"event": "patches.analysis", "counts": analysis.counts()})
+        upstreamed = analysis.upstreamed
+    else:
+        upstreamed = check_upstreamed_patches(pkg_repo)
     if upstreamed:
         activity("patches", f"Potentially upstreamed patches: {len(upstreamed)}")
         for report in upstreamed:
@@ -1982,10 +2108,29 @@ def import_and_patch(
             return PhaseResult.fail(EXIT_PATCH_FAILED, "Patches upstreamed")
         run.log_event({"event": "patches.upstreamed", "patches": [r.patch_name for r in upstreamed]})
 
-    pq_result = pq_import(pkg_repo)
+    if analysis.available and analysis.blocking:
+        activity("patches", "Patches that will not apply:")
+        for report in analysis.blocking:
+            activity("patches", f"  {report}")
+        if not ctx.force:
+            run.write_summary(
+                status="failed",
+                error="Patch import failed",
+                patches=[str(r) for r in analysis.blocking],
+                exit_code=EXIT_PATCH_FAILED,
+            )
+            return PhaseResult.fail(EXIT_PATCH_FAILED, "Patch import failed")
+
+    activity("patches", "Applying patches with gbp pq")
+    if analysis.available and analysis.needs_fuzz:
+        # The export below refreshes the patches once they are imported
+        pq_result = pq_import(pkg_repo, time_machine=0)
+    else:
+        pq_result = pq_import(pkg_repo)
+
     if pq_result.success:
         activity("patches", "Patches applied successfully")
-    elif pq_result.needs_refresh:
+    elif pq_result.needs_refresh and not analysis.available:
         activity("patches", "Patches need refresh - forcing import with time-machine")
         force_result = pq_import(pkg_repo, time_machine=0)
         if force_result.success:
@@ -2146,8 +2291,8 @@ def import_and_patch(
         openstack_series=ctx.openstack_target,
     )
 
-    # Use gbp dch for snapshots as well to keep changelog handling consistent.
-    use_gbp = True
+    # The entry is written in-process unless gbp dch/dch are configured
+    changelog_tool = (ctx.cfg or {}).get("changelog", {}).get("tool", "native")
 
     changelog_updated, changelog_error = update_changelog(
         debian_dir / "changelog",
@@ -2155,7 +2300,7 @@ def import_and_patch(
         new_version,
         ctx.resolved_ubuntu,
         changes,
-        prefer_gbp=use_gbp,
+        tool=changelog_tool,
     )
 
     if not changelog_updated:
@@ -2227,8 +2372,14 @@ def build_packages(
     Returns:
         Tuple of (PhaseResult, BuildResult).
     """
+    from packastack.build.apt_proxy import managed_apt_proxy
     from packastack.build.mode import Builder
-    from packastack.build.sbuild import SbuildConfig, is_sbuild_available, run_sbuild
+    from packastack.build.sbuild import (
+        SbuildConfig,
+        is_sbuild_available,
+        run_sbuild_parallel,
+        split_architectures,
+    )
     from packastack.debpkg.changelog import get_current_version, parse_version
     from packastack.debpkg.gbp import build_binary, build_source
     from packastack.planning.type_selection import BuildType
@@ -2269,6 +2420,7 @@ def build_packages(
     if ctx.binary and source_result.dsc_file:
         use_builder = Builder.SBUILD if ctx.builder == "sbuild" else Builder.DPKG
         host_arch = get_host_arch()
+        architectures = build_architectures(ctx, host_arch)
 
         if use_builder == Builder.SBUILD:
             if not is_sbuild_available():
@@ -2278,50 +2430,80 @@ def build_packages(
                 # Ensure local repo has indexes before sbuild
                 if not ctx.skip_repo_regen:
                     from packastack.build.localrepo_helpers import refresh_local_repo_indexes
-                    refresh_local_repo_indexes(ctx.local_repo, host_arch, run, phase="build")
-
-                sbuild_config = SbuildConfig(
-                    dsc_path=source_result.dsc_file,
-                    output_dir=build_output,
-                    distribution=ctx.resolved_ubuntu,
-                    arch=host_arch,
-                    local_repo_root=ctx.local_repo,
-                    chroot_name=ctx.schroot_name,
-                    run_log_dir=run.logs_path,
-                    source_package=ctx.package,
-                    version=str(
-                        parse_version(get_current_version(pkg_repo / "debian" / "changelog"))
+                    refresh_local_repo_indexes(
+                        ctx.local_repo, host_arch, run, phase="build", architectures=architectures
                     )
-                    if pkg_repo
-                    else None,
-                    lintian_suppress_tags=["inconsistent-maintainer"],
-                )
-
-                activity("build", f"Running sbuild (binary): {source_result.dsc_file.name}")
-                activity("build", f"sbuild logs will be captured to: {run.logs_path}/sbuild.*.log")
 
-                with activity_spinner(
-                    "sbuild",
-                    f"Building {source_result.dsc_file.name} ({ctx.resolved_ubuntu}/{host_arch})",
-                    disable=ctx.no_spinner,
-                ):
-                    sbuild_result = run_sbuild(sbuild_config)
+                apt_proxy_cache = ctx.paths.get("apt_proxy_cache", ctx.paths["cache_root"] / "apt-proxy")
+                with managed_apt_proxy(ctx.cfg, apt_proxy_cache) as (apt_proxy_url, apt_proxy):
+                    sbuild_config = SbuildConfig(
+                        dsc_path=source_result.dsc_file,
+                        output_dir=build_output,
+                        distribution=ctx.resolved_ubuntu,
+                        arch=host_arch,
+                        local_repo_root=ctx.local_repo,
+                        chroot_name=ctx.schroot_name,
+                        warm_chroot=ctx.warm_chroot_name or "",
+                        apt_proxy=apt_proxy_url,
+                        run_log_dir=run.logs_path,
+                        source_package=ctx.package,
+                        version=str(
+                            parse_version(get_current_version(pkg_repo / "debian" / "changelog"))
+                        )
+                        if pkg_repo
+                        else None,
+                        lintian_suppress_tags=["inconsistent-maintainer"],
+                    )
+                    sbuild_configs = split_architectures(
+                        sbuild_config,
+                        architectures,
+                        arch_all=(ctx.cfg or {}).get("sbuild", {}).get("arch_all") or "",
+                        arch_any=builds_arch_any(ctx),
+                    )
+                    build_arches = ", ".join(c.arch for c in sbuild_configs)
 
-                activity("build", f"sbuild exited: {sbuild_result.exit_code}")
+                    activity("build", f"Running sbuild (binary): {source_result.dsc_file.name}")
+                    if len(sbuild_configs) > 1:
+                        activity("build", f"Building architectures in parallel: {build_arches}")
+                        activity("build", f"sbuild logs will be captured to: {run.logs_path}/sbuild-<arch>/")
+                    else:
+                        activity("build", f"sbuild logs will be captured to: {run.logs_path}/sbuild.*.log")
+
+                    with activity_spinner(
+                        "sbuild",
+                        f"Building {source_result.dsc_file.name} ({ctx.resolved_ubuntu}/{build_arches})",
+                        disable=ctx.no_spinner,
+                    ):
+                        sbuild_result = run_sbuild_parallel(
+                            sbuild_configs, slots=create_host_slots(ctx.cfg or {}, ctx.paths)
+                        )
+
+                if apt_proxy is not None:
+                    stats = apt_proxy.stats
+                    activity(
+                        "build",
+                        f"apt proxy: {stats.hits} hits, {stats.misses} misses "
+                        f"({stats.bytes_from_cache // (1024 * 1024)} MiB from cache)",
+                    )
+                    run.log_event({"event": "build.apt_proxy", **stats.to_dict()})
 
-                run.log_event(
-                    {
+                for arch_result in sbuild_result.arch_results or [sbuild_result]:
+                    label = f" ({arch_result.arch})" if sbuild_result.arch_results else ""
+                    activity("build", f"sbuild exited{label}: {arch_result.exit_code}")
+                    event = {
                         "event": "build.sbuild_command",
-                        "command": sbuild_result.command,
-                        "exit_code": sbuild_result.exit_code,
-                        "stdout_path": str(sbuild_result.stdout_log_path)
-                        if sbuild_result.stdout_log_path
+                        "command": arch_result.command,
+                        "exit_code": arch_result.exit_code,
+                        "stdout_path": str(arch_result.stdout_log_path)
+                        if arch_result.stdout_log_path
                         else None,
-                        "stderr_path": str(sbuild_result.stderr_log_path)
-                        if sbuild_result.stderr_log_path
+                        "stderr_path": str(arch_result.stderr_log_path)
+                        if arch_result.stderr_log_path
                         else None,
                     }
-                )
+                    if sbuild_result.arch_results:
+                        event["arch"] = arch_result.arch
+                    run.log_event(event)
 
                 if sbuild_result.success:
                     deb_count = sum(
@@ -2342,9 +2524,13 @@ def build_packages(
                             "builder": "sbuild",
                             "artifacts": [str(a) for a in sbuild_result.artifacts],
                             "deb_count": deb_count,
+                            "architectures": [c.arch for c in sbuild_configs],
                         }
                     )
                     result.artifacts.extend(sbuild_result.artifacts)
+                    result.checksums.update(
+                        {a.copied_path.name: a.checksums() for a in sbuild_result.collected_artifacts}
+                    )
                     result.binary_success = True
                 else:
                     activity("build", "ERROR: no binaries found; check logs")
@@ -2424,6 +2610,7 @@ def verify_and_publish(
         activity("verify", f"Changes: {build_result.changes_file.name}")
 
     host_arch = get_host_arch()
+    architectures = build_architectures(ctx, host_arch) if ctx.binary else [host_arch]
 
     if build_result.artifacts:
         activity("verify", "Publishing artifacts to local APT repository")
@@ -2437,6 +2624,7 @@ def verify_and_publish(
             artifact_paths=build_result.artifacts,
             repo_root=ctx.local_repo,
             arch=host_arch,
+            checksums=build_result.checksums,
         )
 
         if publish_result.success:
@@ -2455,23 +2643,107 @@ def verify_and_publish(
 
             if not ctx.skip_repo_regen:
                 from packastack.build.localrepo_helpers import refresh_local_repo_indexes
-                refresh_local_repo_indexes(ctx.local_repo, host_arch, run)
+                refresh_local_repo_indexes(ctx.local_repo, host_arch, run, architectures=architectures)
         else:
             activity("verify", f"Warning: Failed to publish artifacts: {publish_result.error}")
             run.log_event({"event": "verify.publish_failed", "error": publish_result.error})
             if not ctx.skip_repo_regen:
                 from packastack.build.localrepo_helpers import refresh_local_repo_indexes
-                refresh_local_repo_indexes(ctx.local_repo, host_arch, run)
+                refresh_local_repo_indexes(ctx.local_repo, host_arch, run, architectures=architectures)
     else:
         activity("verify", "No build artifacts to publish; ensuring local repo metadata exists")
         if not ctx.skip_repo_regen:
             from packastack.build.localrepo_helpers import refresh_local_repo_indexes
-            refresh_local_repo_indexes(ctx.local_repo, host_arch, run)
+            refresh_local_repo_indexes(ctx.local_repo, host_arch, run, architectures=architectures)
 
     activity("verify", "Verification complete")
     return PhaseResult.ok()
 
 
+# =============================================================================
+# Build Result Cache
+# =============================================================================
+
+
+def compute_build_cache_inputs(
+    ctx: SingleBuildContext,
+    prepare_data: PrepareResult,
+) -> dict[str, Any] | None:
+    """Collect the inputs that determine a build's output.
+
+    Args:
+        ctx: Build context (after the packaging repo has been fetched).
+        prepare_data: Result from the prepare phase.
+
+    Returns:
+        Cache key inputs, or None if this build must not be cached (cache
+        disabled, uncommitted packaging changes, or unidentified upstream).
+    """
+    from packastack.build.build_cache import hash_file, local_build_dep_state, packaging_tree_id
+    from packastack.planning.type_selection import BuildType
+    from packastack.target.arch import get_host_arch
+
+    if not ctx.build_cache or ctx.pkg_repo is None:
+        return None
+
+    packaging_tree = packaging_tree_id(ctx.pkg_repo)
+    if not packaging_tree:
+        return None
+
+    upstream = ""
+    if ctx.build_type == BuildType.SNAPSHOT:
+        # Snapshot tarballs are regenerated per run; the commit identifies them
+        if prepare_data.git_sha not in ("HEAD", "cached"):
+            upstream = prepare_data.git_sha
+    elif prepare_data.upstream_tarball and prepare_data.upstream_tarball.is_file():
+        upstream = hash_file(prepare_data.upstream_tarball)
+    if not upstream:
+        return None
+
+    control = control_document(ctx)
+    if control is None:
+        return None
+    build_deps = local_build_dep_state(control, ctx.local_index)
+    if build_deps is None:
+        return None
+
+    return {
+        "package": ctx.pkg_name,
+        "version": prepare_data.new_version,
+        "packaging_tree": packaging_tree,
+        "upstream": upstream,
+        "build_deps": build_deps,
+        "series": ctx.resolved_ubuntu,
+        "cloud_archive": ctx.cloud_archive,
+        "arch": ",".join(build_architectures(ctx, get_host_arch())) if ctx.binary else get_host_arch(),
+        "build_type": ctx.build_type_str,
+        "binary": ctx.binary,
+        "builder": ctx.builder if ctx.binary else "",
+    }
+
+
+def restore_cached_build(ctx: SingleBuildContext, entry: BuildCacheEntry) -> BuildResult:
+    """Restore cached artifacts into the workspace as a build result.
+
+    Args:
+        ctx: Build context.
+        entry: Cache entry to restore.
+
+    Returns:
+        BuildResult describing the restored artifacts.
+    """
+    from packastack.build.build_cache import restore_build_cache
+
+    result = BuildResult(source_success=True, binary_success=ctx.binary)
+    result.artifacts = restore_build_cache(entry, ctx.workspace / "build-output")
+    for artifact in result.artifacts:
+        if artifact.suffix == ".dsc":
+            result.dsc_file = artifact
+        elif artifact.name.endswith("_source.changes"):
+            result.changes_file = artifact
+    return result
+
+
 # =============================================================================
 # Orchestrator: Build Single Package
 # =============================================================================
@@ -2490,6 +2762,14 @@ class SingleBuildOutcome:
     signature_verified: bool = False
 
 
+@contextlib.contextmanager
+def _phase(ctx: SingleBuildContext, name: str) -> Iterator[None]:
+    """Time a build phase and report it on the build-all progress stream."""
+    report_progress("package.phase", phase=name)
+    with span(name, package=ctx.pkg_name):
+        yield
+
+
 def build_single_package(
     ctx: SingleBuildContext,
     workspace_ref: Any = None,
@@ -2504,6 +2784,11 @@ def build_single_package(
     5. build_packages - Build source and binary packages
     6. verify_and_publish - Publish to local repo
 
+    Phases 4 and 5 are skipped when the build result cache holds artifacts
+    for identical inputs; those artifacts are republished instead. Each
+    phase is timed as a ``phase`` span and, under build-all, reported on the
+    progress stream.
+
     Args:
         ctx: Fully configured SingleBuildContext.
         workspace_ref: Optional callback to receive workspace path.
@@ -2511,6 +2796,8 @@ def build_single_package(
     Returns:
         SingleBuildOutcome with build results.
     """
+    from packastack.build.provenance import BuildCacheProvenance
+
     run = ctx.run
     outcome = SingleBuildOutcome(
         success=False,
@@ -2520,14 +2807,16 @@ def build_single_package(
     # -------------------------------------------------------------------------
     # Phase 1: Fetch packaging repository
     # -------------------------------------------------------------------------
-    fetch_result_phase, _fetch_data = fetch_packaging_repo(ctx, workspace_ref)
+    with _phase(ctx, "fetch"):
+        fetch_result_phase, _fetch_data = fetch_packaging_repo(ctx, workspace_ref)
     if not fetch_result_phase.success:
         outcome.exit_code = fetch_result_phase.exit_code
         outcome.error = fetch_result_phase.error
         return outcome
 
     # Dependency satisfaction reporting (build and runtime)
-    deps_report_result = report_dependency_satisfaction(ctx)
+    with _phase(ctx, "deps-report"):
+        deps_report_result = report_dependency_satisfaction(ctx)
     if not deps_report_result.success:
         outcome.exit_code = deps_report_result.exit_code
         outcome.error = deps_report_result.error
@@ -2536,7 +2825,8 @@ def build_single_package(
     # -------------------------------------------------------------------------
     # Phase 2: Prepare upstream source
     # -------------------------------------------------------------------------
-    prepare_result_phase, prepare_data = prepare_upstream_source(ctx)
+    with _phase(ctx, "prepare"):
+        prepare_result_phase, prepare_data = prepare_upstream_source(ctx)
     if not prepare_result_phase.success:
         outcome.exit_code = prepare_result_phase.exit_code
         outcome.error = prepare_result_phase.error
@@ -2548,50 +2838,117 @@ def build_single_package(
     # -------------------------------------------------------------------------
     # Phase 3: Validate dependencies (and auto-build if enabled)
     # -------------------------------------------------------------------------
-    validate_result_phase, _validate_data = validate_and_build_deps(
-        ctx,
-        upstream_tarball=prepare_data.upstream_tarball,
-        snapshot_result=prepare_data.snapshot_result,
-    )
+    with _phase(ctx, "validate-deps"):
+        validate_result_phase, _validate_data = validate_and_build_deps(
+            ctx,
+            upstream_tarball=prepare_data.upstream_tarball,
+            snapshot_result=prepare_data.snapshot_result,
+        )
     if not validate_result_phase.success:
         outcome.exit_code = validate_result_phase.exit_code
         outcome.error = validate_result_phase.error
         return outcome
 
     # -------------------------------------------------------------------------
-    # Phase 4: Import upstream and apply patches
+    # Build result cache lookup
     # -------------------------------------------------------------------------
-    import_result_phase = import_and_patch(
-        ctx,
-        upstream_tarball=prepare_data.upstream_tarball,
-        snapshot_result=prepare_data.snapshot_result,
-        new_version=prepare_data.new_version,
-    )
-    if not import_result_phase.success:
-        outcome.exit_code = import_result_phase.exit_code
-        outcome.error = import_result_phase.error
-        return outcome
+    cache_dir = ctx.paths.get("build_cache", ctx.paths["cache_root"] / "build-cache")
+    cache_inputs = compute_build_cache_inputs(ctx, prepare_data)
+    cache_key = compute_build_cache_key(cache_inputs) if cache_inputs is not None else ""
+    cached = lookup_build_cache(cache_dir, cache_key) if cache_key else None
+
+    if cache_inputs is not None and cache_key and ctx.provenance:
+        ctx.provenance.build_cache = BuildCacheProvenance(
+            key=cache_key,
+            hit=cached is not None,
+            source_run_id=cached.run_id if cached else "",
+            inputs=cache_inputs,
+        )
 
-    # -------------------------------------------------------------------------
-    # Phase 5: Build packages
-    # -------------------------------------------------------------------------
-    build_result_phase, build_data = build_packages(ctx, prepare_data.new_version)
-    if not build_result_phase.success:
-        outcome.exit_code = build_result_phase.exit_code
-        outcome.error = build_result_phase.error
-        return outcome
+    if cached is not None:
+        activity("build", f"Build cache hit ({cache_key[:12]}), reusing artifacts from {cached.run_id}")
+        run.log_event({
+            "event": "build.cache_hit",
+            "key": cache_key,
+            "source_run_id": cached.run_id,
+            "artifacts": cached.artifacts,
+        })
+        with _phase(ctx, "restore"):
+            build_data = restore_cached_build(ctx, cached)
+    else:
+        if cache_key:
+            run.log_event({"event": "build.cache_miss", "key": cache_key})
+
+        # ---------------------------------------------------------------------
+        # Phase 4: Import upstream and apply patches
+        # ---------------------------------------------------------------------
+        with _phase(ctx, "import"):
+            import_result_phase = import_and_patch(
+                ctx,
+                upstream_tarball=prepare_data.upstream_tarball,
+                snapshot_result=prepare_data.snapshot_result,
+                new_version=prepare_data.new_version,
+            )
+        if not import_result_phase.success:
+            outcome.exit_code = import_result_phase.exit_code
+            outcome.error = import_result_phase.error
+            return outcome
+
+        # ---------------------------------------------------------------------
+        # Phase 5: Build packages
+        # ---------------------------------------------------------------------
+        with _phase(ctx, "build"), ProcessTreeSampler() as memory:
+            build_result_phase, build_data = build_packages(ctx, prepare_data.new_version)
+        if not build_result_phase.success:
+            outcome.exit_code = build_result_phase.exit_code
+            outcome.error = build_result_phase.error
+            return outcome
+
+        # Lets build-all size its admission of this package next time
+        if os.environ.get(PROGRESS_FILE_ENV):
+            usage = measure_build_usage(ctx.workspace, memory.peak)
+            report_progress(
+                "package.marker",
+                marker=MARKER_RESOURCES,
+                status="recorded",
+                jobs=build_jobs(os.environ.get("DEB_BUILD_OPTIONS", "")),
+                **usage.to_dict(),
+            )
 
     outcome.artifacts = build_data.artifacts
 
     # -------------------------------------------------------------------------
     # Phase 6: Verify and publish
     # -------------------------------------------------------------------------
-    verify_result_phase = verify_and_publish(ctx, build_data)
+    with _phase(ctx, "publish"):
+        verify_result_phase = verify_and_publish(ctx, build_data)
     if not verify_result_phase.success:
         outcome.exit_code = verify_result_phase.exit_code
         outcome.error = verify_result_phase.error
         return outcome
 
+    # Record the published version so clean --local-repo keeps it
+    if os.environ.get(PROGRESS_FILE_ENV):
+        report_progress(
+            "package.marker", marker=MARKER_PUBLISHED, status="success", version=prepare_data.new_version
+        )
+    else:
+        write_run_manifest(run.run_path, ctx.openstack_target, {ctx.pkg_name: prepare_data.new_version})
+
+    if cache_inputs is not None and cache_key and cached is None and (build_data.binary_success or not ctx.binary):
+        with span("build-cache-store", "cache"):
+            entry = store_build_cache(
+                cache_dir,
+                cache_key,
+                package=ctx.pkg_name,
+                version=prepare_data.new_version,
+                artifacts=build_data.artifacts,
+                inputs=cache_inputs,
+                run_id=run.run_id,
+            )
+        if entry is not None:
+            run.log_event({"event": "build.cache_store", "key": cache_key, "path": str(entry.path)})
+
     # -------------------------------------------------------------------------
     # Phase 7: Provenance
     # -------------------------------------------------------------------------
@@ -23,34 +23,63 @@ methods: uscan, official URLs, PyPI, GitHub releases, and git archive.
 
 The main entry point is `fetch_release_tarball()` which implements a
 uscan-first strategy with fallback to other methods based on registry
-preferences.
+preferences. `prefetch_release_tarballs()` warms the tarball cache for a
+whole build-all plan concurrently before the build waves start.
 """
 
 from __future__ import annotations
 
+import contextlib
+import os
 import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from packastack.core.run import activity
 from packastack.debpkg.gbp import run_command
+from packastack.planning.type_selection import BuildType
+from packastack.upstream.download import (
+    DEFAULT_PREFETCH_WORKERS,
+    DownloadRequest,
+    DownloadResult,
+    get_download_manager,
+)
+from packastack.upstream.releases import load_openstack_packages, package_to_project_name
 from packastack.upstream.source import (
     download_and_verify_tarball,
     download_file,
     generate_snapshot_tarball,
+    select_upstream_source,
 )
 from packastack.upstream.tarball_cache import (
     TarballCacheEntry,
+    TarballMetadata,
     cache_tarball,
     find_cached_tarball,
+    get_tarball_cache_dir,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from packastack.build.provenance import BuildProvenance
-    from packastack.planning.type_selection import BuildType
+    from packastack.core.run import RunContext
     from packastack.upstream.source import UpstreamSource
 
 
+@dataclass
+class PrefetchSummary:
+    """Result of prefetching release tarballs for a build plan."""
+
+    downloaded: list[str] = field(default_factory=list)
+    cached: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    signatures: int = 0
+    bytes_downloaded: int = 0
+
+
 def run_uscan(repo_path: Path, version: str | None = None) -> tuple[bool, Path | None, str]:
     """Run uscan to fetch the upstream tarball.
 
@@ -143,6 +172,54 @@ def download_github_release_tarball(
     return ok, dest if ok else None, err
 
 
+def find_prefetched_tarball(
+    upstream: UpstreamSource | None,
+    project_key: str,
+    build_type: BuildType,
+    cache_base: Path,
+) -> tuple[Path | None, TarballMetadata | None]:
+    """Find a cached official tarball with a known sha256 for this upstream.
+
+    Such entries are written by `prefetch_release_tarballs()` and by earlier
+    official downloads, and can be reused without touching the network.
+    """
+    if not upstream or not upstream.version or not upstream.tarball_url:
+        return None, None
+    cached_path, cached_meta = find_cached_tarball(
+        project=project_key,
+        version=upstream.version,
+        build_type=build_type.value,
+        cache_base=cache_base,
+    )
+    if not cached_path or not cached_meta:
+        return None, None
+    if cached_meta.source_method != "official" or not cached_meta.sha256:
+        return None, None
+    if cached_meta.source_url != upstream.tarball_url:
+        return None, None
+    return cached_path, cached_meta
+
+
+def _stage_cached_tarball(cached_path: Path, workspace: Path) -> Path:
+    """Place a cached tarball in the workspace, hard-linking when possible.
+
+    A prefetched detached signature next to the tarball is staged too.
+    """
+    workspace.mkdir(parents=True, exist_ok=True)
+    staged = workspace / cached_path.name
+    for src, dst in (
+        (cached_path, staged),
+        (cached_path.with_name(cached_path.name + ".asc"), staged.with_name(staged.name + ".asc")),
+    ):
+        if dst.exists() or not src.exists():
+            continue
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+    return staged
+
+
 def fetch_release_tarball(
     upstream: UpstreamSource | None,
     upstream_config,
@@ -160,6 +237,7 @@ def fetch_release_tarball(
     """Fetch release tarball with uscan-first strategy.
 
     Implements the tarball acquisition strategy with fallback:
+    0. Prefetched official tarball from the cache (sha256-verified)
     1. uscan in packaging repo (uses debian/watch)
     2. Official tarball URL (OpenDev/releases.openstack.org)
     3. Fallback methods from registry tarball preferences:
@@ -200,6 +278,7 @@ def fetch_release_tarball(
         url: str = "",
         sig_verified: bool = False,
         sig_warning: str = "",
+        sha256: str = "",
     ):
         """Update provenance with tarball acquisition details."""
         provenance.tarball.method = method
@@ -207,6 +286,8 @@ def fetch_release_tarball(
             provenance.tarball.url = url
         if path:
             provenance.tarball.path = str(path)
+        if sha256:
+            provenance.tarball.sha256 = sha256
         if sig_warning:
             provenance.verification.result = "not_applicable"
         elif sig_verified:
@@ -232,11 +313,46 @@ def fetch_release_tarball(
                 cached_meta.source_url,
                 cached_meta.signature_verified,
                 cached_meta.signature_warning,
+                cached_meta.sha256,
             )
             provenance.verification.mode = upstream_config.signatures.mode.value
             return cached_path, cached_meta.signature_verified, cached_meta.signature_warning
         return None, False, f"Offline mode missing cached tarball for {project_key} {upstream.version}"
 
+    # 0) Prefetched official tarball - the tarball and its signature are reused
+    # from the cache (the tarball sha256 is re-checked before use).
+    cached_path, cached_meta = find_prefetched_tarball(upstream, project_key, build_type, cache_base)
+    if upstream and cached_path and cached_meta:
+        with contextlib.suppress(OSError):
+            _stage_cached_tarball(cached_path, workspace)
+        tarball_result = download_and_verify_tarball(
+            upstream, workspace, expected_sha256=cached_meta.sha256
+        )
+        if tarball_result.success:
+            activity("prepare", f"Using prefetched tarball: {cached_path.name}")
+            activity("prepare", "Tarball selected: official (prefetched)")
+            record(
+                "official",
+                tarball_result.path,
+                upstream.tarball_url,
+                tarball_result.signature_verified,
+                tarball_result.signature_warning,
+                tarball_result.sha256,
+            )
+            provenance.upstream.ref = upstream.version
+            provenance.release_source.resolved_version = upstream.version
+            provenance.verification.mode = upstream_config.signatures.mode.value
+            if tarball_result.signature_verified:
+                activity("prepare", "Upstream signature verified")
+            elif tarball_result.signature_warning:
+                activity("prepare", f"Signature warning: {tarball_result.signature_warning}")
+            return (
+                tarball_result.path,
+                tarball_result.signature_verified,
+                tarball_result.signature_warning,
+            )
+        activity("prepare", f"Prefetched tarball not usable: {tarball_result.error}")
+
     # 1) uscan - preferred method when watch file is available
     success, path, err = run_uscan(pkg_repo, upstream.version if upstream else None)
     if success and path:
@@ -275,6 +391,7 @@ def fetch_release_tarball(
                 upstream.tarball_url,
                 tarball_result.signature_verified,
                 tarball_result.signature_warning,
+                tarball_result.sha256,
             )
             provenance.upstream.ref = upstream.version
             provenance.release_source.resolved_version = upstream.version
@@ -295,6 +412,7 @@ def fetch_release_tarball(
                         source_url=upstream.tarball_url,
                         signature_verified=tarball_result.signature_verified,
                         signature_warning=tarball_result.signature_warning,
+                        sha256=tarball_result.sha256,
                     ),
                     cache_base=cache_base,
                 )
@@ -435,6 +553,134 @@ def fetch_release_tarball(
     return None, False, last_error or "No tarball could be fetched"
 
 
+def prefetch_release_tarballs(
+    packages: list[str],
+    releases_repo: Path | None,
+    openstack_target: str,
+    cache_base: Path,
+    run: RunContext | None = None,
+    max_workers: int = DEFAULT_PREFETCH_WORKERS,
+    on_package: Callable[[str], None] | None = None,
+) -> PrefetchSummary:
+    """Download official release tarballs for a build plan concurrently.
+
+    Tarballs are streamed straight into the tarball cache with their sha256
+    recorded, so the per-package builds pick them up through
+    `find_prefetched_tarball()` instead of downloading inside their build
+    slot. Detached signatures are stored next to the cached tarballs.
+    Packages without an official release tarball are skipped.
+
+    Source package names are resolved to their openstack/releases
+    deliverable (``python-oslo.config`` -> ``oslo.config``) exactly as the
+    single build does, and the cache is keyed by the deliverable, so the
+    child build finds what was prefetched.
+
+    Args:
+        packages: Source package names in build order.
+        releases_repo: Path to the openstack/releases checkout.
+        openstack_target: OpenStack series to resolve releases for.
+        cache_base: Base directory for the tarball cache.
+        run: Optional RunContext for event logging.
+        max_workers: Maximum number of concurrent downloads.
+        on_package: Optional callback invoked once each package is finished.
+
+    Returns:
+        PrefetchSummary describing what was downloaded, reused or skipped.
+    """
+    summary = PrefetchSummary()
+
+    def finish(pkg: str) -> None:
+        if on_package:
+            on_package(pkg)
+
+    if releases_repo is None or not releases_repo.exists():
+        summary.skipped.extend(packages)
+        for pkg in packages:
+            finish(pkg)
+        return summary
+
+    source_to_project = load_openstack_packages(releases_repo, openstack_target)
+    projects = {pkg: package_to_project_name(pkg, source_to_project) for pkg in packages}
+    upstreams: dict[str, UpstreamSource] = {}
+    work: list[DownloadRequest] = []
+    owners: dict[Path, tuple[str, bool]] = {}
+    outstanding: dict[str, int] = {}
+
+    for pkg in packages:
+        project = projects[pkg]
+        upstream = select_upstream_source(releases_repo, openstack_target, project, BuildType.RELEASE)
+        if upstream is None or not upstream.tarball_url:
+            summary.skipped.append(pkg)
+            finish(pkg)
+            continue
+
+        outstanding[pkg] = 0
+        cached_path, _meta = find_prefetched_tarball(upstream, project, BuildType.RELEASE, cache_base)
+        if cached_path:
+            summary.cached.append(pkg)
+            tarball_dest = cached_path
+        else:
+            filename = upstream.tarball_url.split("/")[-1]
+            tarball_dest = get_tarball_cache_dir(project, upstream.version, cache_base) / filename
+            upstreams[pkg] = upstream
+            work.append(DownloadRequest(url=upstream.tarball_url, dest=tarball_dest))
+            owners[tarball_dest] = (pkg, False)
+            outstanding[pkg] += 1
+
+        signature_dest = tarball_dest.with_name(tarball_dest.name + ".asc")
+        if upstream.signature_url and not signature_dest.exists():
+            work.append(DownloadRequest(url=upstream.signature_url, dest=signature_dest))
+            owners[signature_dest] = (pkg, True)
+            outstanding[pkg] += 1
+
+        if not outstanding[pkg]:
+            finish(pkg)
+
+    def on_download(res: DownloadResult) -> None:
+        pkg, is_signature = owners[res.path]
+        if is_signature:
+            # A missing signature is not fatal; verification reports it later
+            if res.success:
+                summary.signatures += 1
+        elif not res.success:
+            summary.failed[pkg] = res.error
+        else:
+            cache_tarball(
+                tarball_path=res.path,
+                entry=TarballCacheEntry(
+                    project=projects[pkg],
+                    package_name=pkg,
+                    version=upstreams[pkg].version,
+                    build_type=BuildType.RELEASE.value,
+                    source_method="official",
+                    source_url=upstreams[pkg].tarball_url,
+                    sha256=res.sha256,
+                ),
+                cache_base=cache_base,
+            )
+            summary.downloaded.append(pkg)
+        summary.bytes_downloaded += res.size
+        outstanding[pkg] -= 1
+        if not outstanding[pkg]:
+            finish(pkg)
+
+    if work:
+        get_download_manager().prefetch(work, max_workers=max_workers, on_complete=on_download)
+
+    if run is not None:
+        run.log_event({
+            "event": "prefetch.tarballs",
+            "downloaded": len(summary.downloaded),
+            "cached": len(summary.cached),
+            "skipped": len(summary.skipped),
+            "signatures": summary.signatures,
+            "failed": summary.failed,
+            "bytes": summary.bytes_downloaded,
+        })
+
+    return summary
+
+
 # =============================================================================
 # Backwards compatibility aliases (prefixed versions for gradual migration)
 # =============================================================================
@@ -16,33 +16,68 @@
 # You should have received a copy of the GNU General Public License along with
 # Packastack. If not, see <http://www.gnu.org/licenses/>.
 
-"""CLI application definition for Packastack."""
+"""CLI application definition for Packastack.
+
+Commands are registered by name and imported on first use, so running one
+command (or completing the command line) does not import the others and
+their dependencies. ``packastack build --all`` starts a child process per
+package, which makes this start-up cost matter.
+"""
 
 from __future__ import annotations
 
+import importlib
+from typing import Any
+
 from typer import Typer
+from typer.core import TyperGroup
+from typer.main import get_command
+
+# Command name -> "module:function", imported when the command is resolved
+COMMANDS: dict[str, str] = {
+    "build": "packastack.commands.build:build",
+    "clean": "packastack.commands.clean:clean",
+    "completion": "packastack.commands.completion:completion",
+    "explain": "packastack.commands.explain:explain",
+    "init": "packastack.commands.init:init",
+    "plan": "packastack.commands.plan:plan",
+    "refresh": "packastack.commands.refresh:refresh",
+    "search": "packastack.commands.search:search",
+    "status": "packastack.commands.status:status",
+}
+
+
+class LazyCommandGroup(TyperGroup):
+    """Command group that imports a command's module when it is invoked."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._loaded: dict[str, Any] = {}
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return sorted({*COMMANDS, *super().list_commands(ctx)})
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        target = COMMANDS.get(cmd_name)
+        if target is None:
+            return super().get_command(ctx, cmd_name)
+        if cmd_name not in self._loaded:
+            module_name, _, attr = target.partition(":")
+            func = getattr(importlib.import_module(module_name), attr)
+            single = Typer(add_completion=False)
+            single.command(name=cmd_name)(func)
+            self._loaded[cmd_name] = get_command(single)
+        return self._loaded[cmd_name]
 
-from packastack.commands.build import build
-from packastack.commands.clean import clean
-from packastack.commands.completion import completion
-from packastack.commands.explain import explain
-from packastack.commands.init import init
-from packastack.commands.plan import plan
-from packastack.commands.refresh import refresh
-from packastack.commands.search import search
 
 app: Typer = Typer(
     name="packastack",
     help="A tool for building OpenStack packages for Ubuntu.",
     add_completion=False,
+    cls=LazyCommandGroup,
 )
 
-# Register commands
-app.command(name="build")(build)
-app.command(name="clean")(clean)
-app.command(name="completion")(completion)
-app.command(name="explain")(explain)
-app.command(name="init")(init)
-app.command(name="plan")(plan)
-app.command(name="refresh")(refresh)
-app.command(name="search")(search)
+
+@app.callback()
+def main() -> None:
+    """A tool for building OpenStack packages for Ubuntu."""
@@ -46,6 +46,7 @@ from packastack.build import (
     EXIT_RESUME_ERROR,
     EXIT_SUCCESS,
 )
+from packastack.build.admission import create_admission_controller
 from packastack.build.all_helpers import (
     build_dependency_graph,
     build_upstream_versions_from_packaging,
@@ -62,6 +63,7 @@ from packastack.build.git_helpers import (
     ensure_no_merge_paths,
     git_commit,
 )
+from packastack.build.progress import MARKER_PPA_UPLOAD, report_progress
 from packastack.build.provenance import summarize_provenance
 from packastack.build.type_resolution import (
     build_type_from_string,
@@ -321,6 +323,8 @@ def run_build_all(
     force: bool,
     offline: bool,
     dry_run: bool,
+    build_cache: bool = True,
+    profile: bool = False,
 ) -> int:
     """Run build-all and return exit code (without sys.exit).
 
@@ -343,11 +347,13 @@ def run_build_all(
         force: Proceed despite warnings.
         offline: Run in offline mode.
         dry_run: Show plan without building.
+        build_cache: Reuse artifacts of identical previous builds.
+        profile: Profile the coordinator and every package build.
 
     Returns:
         Exit code.
     """
-    with RunContext("build-all") as run:
+    with RunContext("build-all", profile=profile) as run:
         exit_code = EXIT_SUCCESS
 
         try:
@@ -368,6 +374,8 @@ def run_build_all(
                 force=force,
                 offline=offline,
                 dry_run=dry_run,
+                build_cache=build_cache,
+                profile=profile,
             )
             exit_code = _run_build_all(run=run, request=request)
         except Exception as e:
@@ -441,6 +449,16 @@ def build(
     include_retired: bool = typer.Option(False, "--include-retired", help="Build retired upstream projects (default: refuse)"),
     skip_repo_regen: bool = typer.Option(False, "--skip-repo-regen", hidden=True, help="Skip local repo regeneration (internal use)"),
     ppa_upload: bool = typer.Option(False, "--ppa-upload", help="Upload to configured PPA on success"),
+    build_cache: bool = typer.Option(
+        True,
+        "--build-cache/--no-build-cache",
+        help="Reuse artifacts of a previous build with identical inputs",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile each build phase with cProfile (pstats written to the run's profile/ directory)",
+    ),
     # --all mode options
     all_packages: bool = typer.Option(False, "-a", "--all", help="Build all discovered packages in dependency order"),
     keep_going: bool = typer.Option(True, "--keep-going/--fail-fast", help="Continue on failure (default: keep-going) [--all only]"),
@@ -533,6 +551,8 @@ def build(
             parallel=parallel,
             packages_file=packages_file,
             dry_run=dry_run,
+            build_cache=build_cache,
+            profile=profile,
         )
     else:
         # Treat top-level --dry-run as validate-plan for single-package mode
@@ -568,6 +588,8 @@ def build(
             ppa_upload=ppa_upload,
             resume_workspace=resume,
             resume_run_id=resume_run_id,
+            build_cache=build_cache,
+            profile=profile,
         )
 
 
@@ -600,9 +622,11 @@ def _build_single_mode(
     ppa_upload: bool = False,
     resume_workspace: bool = False,
     resume_run_id: str = "",
+    build_cache: bool = True,
+    profile: bool = False,
 ) -> None:
     """Build a single package."""
-    with RunContext("build") as run:
+    with RunContext("build", profile=profile) as run:
         exit_code = EXIT_SUCCESS
         workspace: Path | None = None
         cleanup_on_exit = not no_cleanup
@@ -646,6 +670,7 @@ def _build_single_mode(
                 ppa_upload=ppa_upload,
                 resume_workspace=resume_flag,
                 resume_run_id=resume_run_id,
+                build_cache=build_cache,
                 workspace_ref=lambda w: _set_workspace(w, locals()),
             )
             exit_code = _run_build(run=run, request=request)
@@ -687,6 +712,8 @@ def _build_all_mode(
     parallel: int,
     packages_file: str,
     dry_run: bool,
+    build_cache: bool = True,
+    profile: bool = False,
 ) -> None:
     """Build all packages in dependency order."""
     exit_code = run_build_all(
@@ -706,6 +733,8 @@ def _build_all_mode(
         force=force,
         offline=offline,
         dry_run=dry_run,
+        build_cache=build_cache,
+        profile=profile,
     )
     sys.exit(exit_code)
 
@@ -730,6 +759,7 @@ def _upload_to_ppa(changes_file: Path, ppa: str, run: RunContextType) -> bool:
 
     if not changes_file.exists():
         activity("warn", f"Changes file not found: {changes_file}")
+        report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="changes file not found")
         return False
 
     # Handle ppa: prefix
@@ -749,6 +779,7 @@ def _upload_to_ppa(changes_file: Path, ppa: str, run: RunContextType) -> bool:
         if result.returncode == 0:
             activity("report", f"Successfully uploaded {changes_file.name} to {target_ppa}")
             run.log_event({"event": "build.ppa_upload_success", "ppa": target_ppa, "changes_file": str(changes_file)})
+            report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="success", ppa=target_ppa)
             return True
         else:
             activity("warn", f"PPA upload to {target_ppa} failed with exit code {result.returncode}")
@@ -762,16 +793,20 @@ def _upload_to_ppa(changes_file: Path, ppa: str, run: RunContextType) -> bool:
                 "exit_code": result.returncode,
                 "error": result.stderr or result.stdout,
             })
+            report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="failed", ppa=target_ppa)
             return False
     except FileNotFoundError:
         activity("warn", "dput is not installed. Install with: sudo apt install dput")
+        report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="dput not installed")
         return False
     except subprocess.TimeoutExpired:
         activity("warn", "PPA upload timed out (300 seconds)")
+        report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="timeout")
         return False
     except Exception as e:
         activity("warn", f"PPA upload failed: {e}")
         run.log_event({"event": "build.ppa_upload_error", "error": str(e)})
+        report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error=str(e))
         return False
 
 
@@ -996,6 +1031,7 @@ def _run_build(
             local_repo=paths.get("local_apt_repo"),
             run=run,
             ppa_upload=request.ppa_upload,
+            admission=create_admission_controller(cfg, paths) if request.binary else None,
         )
 
         return exit_code
@@ -1075,6 +1111,7 @@ def _run_build(
             cfg=cfg,
             run=run,
             resume_workspace_path=resume_workspace_path,
+            build_cache=request.build_cache,
         )
 
         # Run setup phases (retirement, registry, policy, indexes, tools, schroot)
@@ -1187,8 +1224,23 @@ def _run_build(
                             )
                             if upload_ok:
                                 _upload_to_ppa(source_changes, upload_ppa, run)
+                            else:
+                                report_progress(
+                                    "package.marker",
+                                    marker=MARKER_PPA_UPLOAD,
+                                    status="failed",
+                                    error="source upload files missing",
+                                )
+                        else:
+                            activity("error", "PPA source build produced no .changes file")
+                            report_progress(
+                                "package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="no source .changes"
+                            )
                     else:
                         activity("error", "PPA source build failed")
+                        report_progress(
+                            "package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="source build failed"
+                        )
 
                     # 4. Reset
                     activity("ppa", "Resetting workspace state")
@@ -1207,6 +1259,9 @@ def _run_build(
                         "warn",
                         "Set 'defaults.upload_ppa' to enable (e.g., 'mylesjp/gazpacho-devel')",
                     )
+                    report_progress(
+                        "package.marker", marker=MARKER_PPA_UPLOAD, status="failed", error="upload_ppa not configured"
+                    )
 
         # Write final summary
         run.write_summary(
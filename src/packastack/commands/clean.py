@@ -22,17 +22,24 @@ Removes cached data including:
 - Cached upstream tarballs and extractions
 - Git repository caches
 - Build workspaces
+
+It can also garbage collect superseded versions from the local APT
+repository, or migrate it to the per-source pool layout.
 """
 
 from __future__ import annotations
 
 import contextlib
+import json
+import os
 import shutil
 from pathlib import Path
 
 import typer
 
+from packastack.apt.localrepo import collect_garbage, migrate_pool_layout
 from packastack.core.config import load_config
+from packastack.planning.build_manifest import find_latest_run_manifest
 from packastack.upstream.tarball_cache import (
     DEFAULT_CACHE_DIR,
     cleanup_expired_cache,
@@ -70,6 +77,18 @@ def clean(
     dry_run: bool = typer.Option(False, "-n", "--dry-run", help="Show what would be removed without removing"),
     force: bool = typer.Option(False, "-f", "--force", help="Skip confirmation prompts"),
     max_age: int = typer.Option(14, "--max-age", help="Maximum age in days for cache entries"),
+    migrate_apt_repo: bool = typer.Option(
+        False, "--migrate-apt-repo", help="Move a flat local APT repo pool to pool/main/<prefix>/<source>/"
+    ),
+    local_repo: bool = typer.Option(
+        False, "--local-repo", help="Remove superseded package versions from the local APT repo"
+    ),
+    keep: int = typer.Option(2, "--keep", min=1, help="Versions to keep per source with --local-repo"),
+    protect_manifest: str = typer.Option(
+        "",
+        "--protect-manifest",
+        help="Build manifest JSON whose package versions --local-repo must keep (default: latest run's)",
+    ),
 ) -> None:
     """Clean up cached data and temporary files.
 
@@ -81,11 +100,31 @@ def clean(
         packastack clean --expired          # Remove only expired entries
         packastack clean --tarballs         # Remove tarball extraction cache
         packastack clean --all              # Remove all caches
+        packastack clean --migrate-apt-repo # Convert the local repo pool layout
+        packastack clean --local-repo --keep 1  # Drop superseded local repo versions
+
+    --local-repo keeps the versions in the latest run's build manifest
+    unless --protect-manifest names another one.
     """
     cfg = load_config()
     paths = cfg.get("paths", {})
     tarball_cache_dir = Path(paths.get("upstream_tarballs", DEFAULT_CACHE_DIR))
 
+    if migrate_apt_repo:
+        apt_repo_dir = Path(paths.get("local_apt_repo", Path.home() / ".cache" / "packastack" / "apt-repo"))
+        _migrate_apt_repo(apt_repo_dir, dry_run)
+        return
+
+    if local_repo:
+        apt_repo_dir = Path(paths.get("local_apt_repo", Path.home() / ".cache" / "packastack" / "apt-repo"))
+        manifest = Path(protect_manifest) if protect_manifest else _latest_run_manifest(paths)
+        protected = {}
+        if manifest is not None:
+            activity("clean", f"Keeping versions from build manifest {manifest}")
+            protected = _load_protected_versions(manifest)
+        _collect_local_repo_garbage(apt_repo_dir, keep, protected, dry_run, force)
+        return
+
     # Determine what to clean
     clean_tarballs = all_caches or tarballs
     clean_workspaces = all_caches or workspaces
@@ -198,6 +237,92 @@ def clean(
     activity("clean", f"Cleaned {format_size(total_size)}")
 
 
+def _migrate_apt_repo(apt_repo_dir: Path, dry_run: bool) -> None:
+    """Move a flat local APT repo pool into per-source directories."""
+    result = migrate_pool_layout(apt_repo_dir, dry_run=dry_run)
+    if not result.success:
+        activity("clean", f"Error migrating {apt_repo_dir}: {result.error}")
+        raise typer.Exit(1)
+    if not result.moved:
+        activity("clean", "Local APT repo already uses the per-source pool layout")
+        return
+
+    for src, dest in result.moved[:10]:
+        activity("clean", f"  {src.name} -> {dest.relative_to(apt_repo_dir)}")
+    if len(result.moved) > 10:
+        activity("clean", f"  ... and {len(result.moved) - 10} more")
+
+    if dry_run:
+        activity("clean", f"(dry-run) Would move {len(result.moved)} file(s) for {len(result.sources)} source(s)")
+        return
+    activity("clean", f"Moved {len(result.moved)} file(s) for {len(result.sources)} source(s)")
+
+
+def _latest_run_manifest(paths: dict) -> Path | None:
+    """Return the build manifest written by the most recent run, if any."""
+    runs_root = Path(paths.get("runs_root", Path.home() / ".cache" / "packastack" / "runs")).expanduser()
+    return find_latest_run_manifest(runs_root) if runs_root.is_dir() else None
+
+
+def _load_protected_versions(manifest_path: Path) -> dict[str, set[str]]:
+    """Read the package versions of a serialized BuildManifest."""
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return {
+            pkg.get("source_package", name): {pkg["full_version"]}
+            for name, pkg in data.get("packages", {}).items()
+            if pkg.get("full_version")
+        }
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        activity("clean", f"Error reading build manifest {manifest_path}: {e}")
+        raise typer.Exit(1) from e
+
+
+def _collect_local_repo_garbage(
+    apt_repo_dir: Path,
+    keep: int,
+    protected: dict[str, set[str]],
+    dry_run: bool,
+    force: bool,
+) -> None:
+    """Remove superseded versions from the local APT repo pool."""
+
+    plan = collect_garbage(apt_repo_dir, keep=keep, protected=protected, dry_run=True)
+    if not plan.success:
+        activity("clean", f"Error scanning {apt_repo_dir}: {plan.error}")
+        raise typer.Exit(1)
+    if not plan.removed:
+        activity("clean", f"Local APT repo has nothing beyond {keep} version(s) per source")
+        return
+
+    activity("clean", f"Superseded files in {len(plan.sources)} source(s):")
+    for path in plan.removed[:10]:
+        activity("clean", f"  {path.name}")
+    if len(plan.removed) > 10:
+        activity("clean", f"  ... and {len(plan.removed) - 10} more")
+    activity(
+        "clean",
+        f"Reclaimable: {format_size(plan.reclaimed_bytes)} of {format_size(plan.size_before)}",
+    )
+
+    if dry_run:
+        activity("clean", "(dry-run) No files removed")
+        return
+
+    if not force and not typer.confirm(f"Remove {len(plan.removed)} file(s)?"):
+        activity("clean", "Aborted")
+        return
+
+    result = collect_garbage(apt_repo_dir, keep=keep, protected=protected)
+    if not result.success:
+        activity("clean", f"Error cleaning {apt_repo_dir}: {result.error}")
+        raise typer.Exit(1)
+    activity(
+        "clean",
+        f"Removed {len(result.removed)} file(s), reclaimed {format_size(result.reclaimed_bytes)}",
+    )
+
+
 def _show_cache_status(paths: dict) -> None:
     """Show current cache status."""
     activity("status", "Cache status:")
@@ -248,12 +373,19 @@ def _get_dir_size(path: Path) -> int:
     if not path.exists():
         return 0
 
+    # os.scandir reuses the directory entry's cached type, avoiding the
+    # extra stat per file that Path.rglob + is_file would cost
     total = 0
-    try:
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                with contextlib.suppress(OSError):
-                    total += file_path.stat().st_size
-    except OSError:
-        pass
+    pending = [str(path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    with contextlib.suppress(OSError):
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
     return total
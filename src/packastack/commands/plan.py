@@ -41,6 +41,7 @@ from packastack.commands.init import _clone_or_update_project_config
 from packastack.core.config import load_config
 from packastack.core.paths import resolve_paths
 from packastack.core.run import RunContext, activity
+from packastack.core.spans import span
 from packastack.core.spinner import activity_spinner
 from packastack.debpkg.control import ParsedDependency
 from packastack.planning.cycle_suggestions import suggest_cycle_edge_exclusions
@@ -614,17 +615,18 @@ def run_plan_for_package(
         # vs release) which is useful for rendering waves.
         try:
             packages_tuples = [(pkg, _source_package_to_deliverable(pkg)) for pkg in build_order]
-            type_report = select_build_types_for_packages(
-                releases_repo=releases_repo,
-                series=openstack_target,
-                packages=packages_tuples,
-                run_id=run.run_id,
-                ubuntu_series=resolved_ubuntu,
-                type_mode=request.build_type,
-                parallel=1,
-                local_packages=set(build_order),
-                registry=registry,
-            )
+            with span("type-selection", packages=len(packages_tuples)):
+                type_report = select_build_types_for_packages(
+                    releases_repo=releases_repo,
+                    series=openstack_target,
+                    packages=packages_tuples,
+                    run_id=run.run_id,
+                    ubuntu_series=resolved_ubuntu,
+                    type_mode=request.build_type,
+                    parallel=1,
+                    local_packages=set(build_order),
+                    registry=registry,
+                )
         except Exception:
             type_report = None
 
@@ -818,6 +820,7 @@ def _enforce_retirement(
                 project_config_path=project_config_path,
                 releases_path=releases_repo,
                 target_series=openstack_target,
+                run=run,
             )
 
             for target in targets:
@@ -1023,6 +1026,12 @@ def _write_plan_dependency_summary(
         return None
 
 
+def _plan_graph_reuse_dir(paths: dict[str, Path], kind: str) -> Path | None:
+    """Return where the last plan graph HTML rendering of a kind of plan is kept."""
+    cache_root = paths.get("cache_root")
+    return Path(cache_root) / "plan-graph" / kind if cache_root else None
+
+
 def _format_graph(graph: DependencyGraph) -> list[str]:
     """Return a human-readable adjacency list for the graph."""
 
@@ -1198,6 +1207,7 @@ def _plan_all_packages(
                     project_config_path=project_config_path,
                     releases_path=releases_repo,
                     target_series=openstack_target,
+                    run=run,
                 )
         elif offline:
             activity("warn", "Project config not found, skipping retirement detection (offline mode)")
@@ -1233,6 +1243,24 @@ def _plan_all_packages(
             def _advance(count: int = 1) -> None:
                 progress.advance(task, count)
 
+            with span("type-selection", packages=len(package_names)):
+                report = select_build_types_for_packages(
+                    releases_repo=releases_repo,
+                    series=openstack_target,
+                    packages=packages_tuples,
+                    run_id=run.run_id,
+                    ubuntu_series=resolved_ubuntu,
+                    type_mode=type_mode,
+                    parallel=workers,
+                    local_packages=set(package_names),
+                    watch_config=watch_config,
+                    packaging_repos=packaging_repos,
+                    uscan_cache_path=uscan_cache_path,
+                    retirement_checker=retirement_checker,
+                    progress_callback=_advance,
+                )
+    else:
+        with span("type-selection", packages=len(package_names)):
             report = select_build_types_for_packages(
                 releases_repo=releases_repo,
                 series=openstack_target,
@@ -1246,23 +1274,7 @@ def _plan_all_packages(
                 packaging_repos=packaging_repos,
                 uscan_cache_path=uscan_cache_path,
                 retirement_checker=retirement_checker,
-                progress_callback=_advance,
             )
-    else:
-        report = select_build_types_for_packages(
-            releases_repo=releases_repo,
-            series=openstack_target,
-            packages=packages_tuples,
-            run_id=run.run_id,
-            ubuntu_series=resolved_ubuntu,
-            type_mode=type_mode,
-            parallel=workers,
-            local_packages=set(package_names),
-            watch_config=watch_config,
-            packaging_repos=packaging_repos,
-            uscan_cache_path=uscan_cache_path,
-            retirement_checker=retirement_checker,
-        )
 
     # Copy cross-reference warnings from discovery to report
     report.missing_upstream = discovery_result.missing_upstream
@@ -1443,11 +1455,12 @@ def _plan_all_packages(
             cycles=cycles,
         )
 
-        graph_paths = write_plan_graph_reports(plan_graph, reports_dir)
+        graph_paths = write_plan_graph_reports(plan_graph, reports_dir, _plan_graph_reuse_dir(paths, "all"))
         run.log_event({
             "event": "graph_reports.written",
             "json_path": str(graph_paths["json"]),
             "html_path": str(graph_paths["html"]),
+            "reused": "reused" in graph_paths,
         })
 
     dep_summary_paths = _write_plan_dependency_summary(
@@ -1559,6 +1572,7 @@ def plan(
     watch_max_projects: int = typer.Option(0, "--watch-max-projects", help="Max packages to run uscan for (0=unlimited)"),
     # Retirement options
     include_retired: bool = typer.Option(False, "--include-retired", help="Include retired upstream projects in the plan (default: skip)"),
+    profile: bool = typer.Option(False, "--profile", help="Profile plan phases with cProfile (pstats written to the run's profile/ directory)"),
 ) -> None:
     """Plan package builds and determine build order.
 
@@ -1574,7 +1588,7 @@ def plan(
       5 - Missing packages detected
       6 - Dependency cycle detected
     """
-    with RunContext("plan") as run:
+    with RunContext("plan", profile=profile) as run:
         cfg = load_config()
         paths = resolve_paths(cfg)
 
@@ -1896,11 +1910,14 @@ def plan(
                 cycles=cycles,
             )
 
-            graph_paths = write_plan_graph_reports(plan_graph, reports_dir)
+            graph_paths = write_plan_graph_reports(
+                plan_graph, reports_dir, _plan_graph_reuse_dir(paths, "package")
+            )
             run.log_event({
                 "event": "graph_reports.written",
                 "json_path": str(graph_paths["json"]),
                 "html_path": str(graph_paths["html"]),
+                "reused": "reused" in graph_paths,
             })
 
         dep_summary_paths = _write_plan_dependency_summary(
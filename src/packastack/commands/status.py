@@ -0,0 +1,222 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Implementation of `packastack status` command.
+
+Shows the live state of a build-all run from its progress stream
+(``<run>/progress.jsonl``), without touching the run's build logs. With
+``--slots`` it shows instead which processes on the host hold the shared
+sbuild and fetch slots and the local repository's publish lock.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from packastack.apt.localrepo import LOCK_FILE, LOCK_NAME
+from packastack.build.progress import PROGRESS_FILE, ProgressReader, ProgressState
+from packastack.core.config import load_config
+from packastack.core.paths import resolve_paths
+from packastack.core.slots import SlotHolder, SlotUsage, create_host_slots, read_holder
+
+EXIT_SUCCESS = 0
+EXIT_NOT_FOUND = 1
+
+# Finished packages listed in the text view
+RECENT_LIMIT = 10
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. ``1h02m``, ``4m05s`` or ``12s``."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def find_progress_file(runs_root: Path, run_id: str) -> Path | None:
+    """Return the progress stream of a run.
+
+    Args:
+        runs_root: Directory holding the run directories.
+        run_id: Run ID, or ``latest`` for the most recently updated stream.
+
+    Returns:
+        Path to the stream, or None if the run has none.
+    """
+    if run_id == "latest":
+        streams = [p for p in runs_root.glob(f"*/{PROGRESS_FILE}") if p.is_file()]
+        return max(streams, key=lambda p: p.stat().st_mtime, default=None)
+    path = runs_root / run_id / PROGRESS_FILE
+    return path if path.is_file() else None
+
+
+def render_status(run_id: str, state: ProgressState, now: float) -> list[str]:
+    """Render the current state of a run as text lines."""
+    ok = state.count("success")
+    failed = state.count("failed")
+    in_flight = sorted(state.in_flight, key=lambda p: p.started)
+    status = state.status or "running"
+    end = state.finished or now
+
+    lines = [
+        f"Run {run_id}: {status}",
+        f"  Packages: {ok + failed}/{state.total} done ({ok} ok, {failed} failed), "
+        f"{len(in_flight)} building, {state.queued} queued",
+        f"  Workers:  {state.running}/{state.workers} busy ({state.utilisation:.0%})",
+    ]
+    if state.started:
+        lines.append(f"  Elapsed:  {format_duration(end - state.started)}")
+
+    if in_flight:
+        lines.append("Building:")
+        for pkg in in_flight:
+            lines.append(f"  {pkg.name:<40} {pkg.phase or '-':<16} {format_duration(pkg.elapsed_at(now))}")
+
+    done = state.done[-RECENT_LIMIT:]
+    if done:
+        lines.append("Recently finished:" if len(state.done) > RECENT_LIMIT else "Finished:")
+        for pkg in done:
+            label = "ok" if pkg.status == "success" else "fail"
+            markers = " ".join(f"{name}={m.get('status', '')}" for name, m in pkg.markers.items())
+            detail = " ".join(part for part in (pkg.message, markers) if part)
+            lines.append(f"  {label:<5} {pkg.name:<40} {format_duration(pkg.elapsed):>7}  {detail}".rstrip())
+    return lines
+
+
+def _format_holder(holder: SlotHolder, now: float) -> str:
+    held = format_duration(now - holder.since) if holder.since else "-"
+    text = f"pid {holder.pid:<8} {holder.user:<12} {held:>7}  {holder.label}".rstrip()
+    return f"{text}  ({holder.command})" if holder.command else text
+
+
+def render_slots(usage: list[SlotUsage], locks: list[SlotHolder], now: float) -> list[str]:
+    """Render who holds the host's slots and locks as text lines."""
+    lines = ["Host slots:"]
+    for kind in usage:
+        waiting = f", {kind.waiting} waiting" if kind.waiting else ""
+        lines.append(f"  {kind.kind:<8} {len(kind.holders)}/{kind.limit} busy{waiting}")
+        for holder in sorted(kind.holders, key=lambda h: h.index):
+            lines.append(f"    #{holder.index:<3} {_format_holder(holder, now)}")
+    lines.append("Locks:")
+    if not locks:
+        lines.append("  none held")
+    for holder in locks:
+        lines.append(f"  {holder.kind:<8} {_format_holder(holder, now)}")
+    return lines
+
+
+def show_slots(cfg: dict[str, Any], paths: dict[str, Path], output_format: str) -> None:
+    """Print the holders of the host slots and the local repository lock."""
+    slots = create_host_slots(cfg, paths)
+    usage = slots.usage() if slots is not None else []
+    locks = []
+    local_repo = paths.get("local_apt_repo")
+    if local_repo is not None and (holder := read_holder(local_repo / LOCK_FILE)) is not None:
+        locks.append(holder if holder.pid else SlotHolder(kind=LOCK_NAME, label=str(local_repo)))
+
+    if output_format == "json":
+        payload = {"slots": [asdict(kind) for kind in usage], "locks": [h.to_dict() for h in locks]}
+        typer.echo(json.dumps(payload, indent=2))
+        return
+    if slots is None:
+        typer.echo("[status] Host slots are disabled (host_slots.enabled)")
+    for line in render_slots(usage, locks, time.time()):
+        typer.echo(line)
+
+
+def format_event(event: dict[str, Any]) -> str:
+    """Format one progress event as a line for --follow."""
+    stamp = time.strftime("%H:%M:%S", time.localtime(float(event.get("ts", 0.0))))
+    kind = event.get("event", "")
+    pkg = event.get("package", "")
+    if kind == "package.start":
+        text = f"start  {pkg}"
+    elif kind == "package.phase":
+        text = f"phase  {pkg}: {event.get('phase', '')}"
+    elif kind == "package.marker":
+        text = f"marker {pkg}: {event.get('marker', '')}={event.get('status', '')}"
+    elif kind == "package.done":
+        text = f"{'ok' if event.get('status') == 'success' else 'fail':<6} {pkg} ({format_duration(event.get('elapsed', 0))})"
+        if event.get("message"):
+            text += f": {event['message']}"
+    elif kind == "snapshot":
+        text = (
+            f"queue  {event.get('queued', 0)} queued, {event.get('running', 0)} running, "
+            f"{event.get('utilisation', 0.0):.0%} busy"
+        )
+    elif kind == "run.end":
+        text = f"end    {event.get('status', '')}"
+    else:
+        text = str(kind)
+    return f"[{stamp}] {text}"
+
+
+def status(
+    run_id: str = typer.Argument("latest", help="Run ID of a build-all run, or 'latest'"),
+    follow: bool = typer.Option(False, "-f", "--follow", help="Print new progress events until the run ends"),
+    interval: float = typer.Option(1.0, "--interval", help="Seconds between reads with --follow"),
+    output_format: str = typer.Option("text", "--format", help="Output format: text|json"),
+    slots: bool = typer.Option(False, "--slots", help="Show who holds the host's build slots and locks"),
+) -> None:
+    """Show the progress of a build-all run.
+
+    Examples:
+        packastack status                      # Most recent build-all run
+        packastack status 20250101T120000Z-ab  # A specific run
+        packastack status --follow             # Tail the progress stream
+        packastack status --slots              # Who holds the host's slots
+    """
+    cfg = load_config()
+    paths = resolve_paths(cfg)
+    if slots:
+        show_slots(cfg, paths, output_format)
+        return
+
+    runs_root = paths["runs_root"]
+    path = find_progress_file(runs_root, run_id)
+    if path is None:
+        typer.echo(f"[status] No build-all progress found for run {run_id} in {runs_root}", err=True)
+        raise typer.Exit(EXIT_NOT_FOUND)
+    run_id = path.parent.name
+
+    reader = ProgressReader(path)
+    state = ProgressState()
+    for event in reader.read_new():
+        state.apply(event)
+
+    if output_format == "json":
+        typer.echo(json.dumps({"run_id": run_id, **asdict(state)}, indent=2))
+        return
+
+    for line in render_status(run_id, state, time.time()):
+        typer.echo(line)
+
+    while follow and not state.status:
+        time.sleep(interval)
+        for event in reader.read_new():
+            state.apply(event)
+            typer.echo(format_event(event))
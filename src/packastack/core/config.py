@@ -34,6 +34,9 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "ubuntu_archive_cache": "~/.cache/packastack/ubuntu-archive",
         "local_apt_repo": "~/.cache/packastack/apt-repo",
         "upstream_tarballs": "~/.cache/packastack/upstream-tarballs",
+        "packaging_mirrors": "~/.cache/packastack/packaging-mirrors",
+        "apt_proxy_cache": "~/.cache/packastack/apt-proxy",
+        "build_cache": "~/.cache/packastack/build-cache",
         "build_root": "~/.cache/packastack/build",
         "runs_root": "~/.cache/packastack/runs",
     },
@@ -70,6 +73,44 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "service-release": None,
     },
     "behavior": {"offline": False, "snapshot_archive_on_build": True},
+    "chroot_cache": {
+        "enabled": False,  # Seeding copies the base chroot and needs sudo
+        "max_age": "24h",  # Re-seed the warm chroot snapshot after this long
+        "seed_packages": None,  # None uses the built-in OpenStack build-deps set
+    },
+    "apt_proxy": {
+        "enabled": False,  # Cache Build-Depends .debs in a local proxy for sbuild
+        "port": 0,  # 0 picks a free port
+        "url": None,  # Use an existing proxy (e.g. apt-cacher-ng) instead
+    },
+    "sbuild": {
+        "architectures": None,  # e.g. ["amd64", "arm64"]; None builds for the host only
+        "arch_all": None,  # Architecture whose build also builds arch:all packages
+    },
+    "host_slots": {
+        "enabled": True,  # Share sbuild and fetch slots with other packastack runs on this host
+        "sbuild": 0,  # Concurrent sbuilds on the host; 0 = half the CPUs
+        "fetch": 0,  # Concurrent network clones/fetches; 0 = 8
+    },
+    "admission": {
+        "enabled": True,  # Start build-all builds only while they fit in memory and disk
+        "memory_reserve_mb": 1024,  # Available memory left to the system
+        "disk_reserve_mb": 4096,  # Free disk under build_root left unused
+        "default_memory_mb": 2048,  # Assumed peak memory of packages never built before
+        "default_disk_mb": 2048,  # Assumed disk use of packages never built before
+    },
+    "snapshot_tarball": {
+        "compression": "gzip",  # gzip, or xz if installed
+        "threads": 0,  # 0 = one per CPU
+    },
+    "changelog": {
+        "tool": "native",  # native, gbp (gbp dch) or dch
+    },
+    "events": {
+        "flush_interval": 1.0,  # Seconds between writes of logs/events.jsonl
+        "compress": False,  # Write logs/events.jsonl.gz instead
+        "sample": {},  # Event-name pattern -> keep one in N, e.g. {"fetch.*": 10}
+    },
 }
 
 
@@ -102,6 +102,7 @@ class BuildRequest:
         skip_repo_regen: --skip-repo-regen flag (skip local repo regeneration).
         resume_workspace: Resume a previous workspace in single-package mode.
         resume_run_id: Specific run ID to resume in single-package mode.
+        build_cache: --build-cache flag (reuse artifacts of identical builds).
         workspace_ref: Callback to set workspace in outer scope.
     """
 
@@ -138,6 +139,7 @@ class BuildRequest:
     ppa_upload: bool = False
     resume_workspace: bool = False
     resume_run_id: str = ""
+    build_cache: bool = True
     workspace_ref: Callable[[Path], None] | None = None
 
     def to_plan_request(self) -> PlanRequest:
@@ -174,6 +176,8 @@ class BuildAllRequest:
         force: Proceed despite warnings.
         offline: Offline mode.
         dry_run: Show plan without building.
+        build_cache: Reuse artifacts of identical previous builds.
+        profile: Profile every package build (--profile).
     """
 
     target: str = "devel"
@@ -192,6 +196,8 @@ class BuildAllRequest:
     force: bool = False
     offline: bool = False
     dry_run: bool = False
+    build_cache: bool = True
+    profile: bool = False
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,229 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Buffered structured event sink for run logs.
+
+``RunContext.log_event`` hands events to an :class:`EventSink`. The caller
+only stamps and serialises the event and puts it on a queue; a background
+thread writes events in batches to every events file and flushes at most
+once per ``flush_interval``. ``close()`` drains the queue and
+fsyncs the files, so nothing emitted before the run ends is lost.
+
+Events may be written gzip-compressed (``events.jsonl.gz``), and a sampling
+policy keeps only one in N events of chatty types (matched with shell-style
+patterns such as ``fetch.*``). The number of events dropped per pattern is
+written as a final ``events.sampled`` event.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import fnmatch
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import IO, Any, cast
+
+EVENTS_FILE = "events.jsonl"
+EVENTS_FILE_GZ = "events.jsonl.gz"
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BATCH = 1024
+
+# Queue markers handled by the writer thread
+_FLUSH = object()
+_STOP = object()
+
+
+def events_filename(compress: bool) -> str:
+    """Return the events file name for the configured format."""
+    return EVENTS_FILE_GZ if compress else EVENTS_FILE
+
+
+class EventSink:
+    """Batching, background-thread writer of JSONL events.
+
+    Args:
+        path: Primary events file.
+        flush_interval: Maximum seconds between flushes to disk.
+        max_batch: Maximum events serialised per write.
+        compress: Write gzip-compressed JSONL.
+        sample: Mapping of event-name pattern to N, keeping one in N.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        compress: bool = False,
+        sample: Mapping[str, int] | None = None,
+    ) -> None:
+        self.compress = compress
+        self.flush_interval = max(flush_interval, 0.0)
+        self.max_batch = max(max_batch, 1)
+        self.sample = {pattern: int(n) for pattern, n in (sample or {}).items() if int(n) > 1}
+        self.seen: dict[str, int] = {}
+        self.dropped: dict[str, int] = {}
+        # (writer, underlying binary file) pairs
+        self._files: list[tuple[IO[bytes], IO[bytes]]] = []
+        self._files_lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._closed = False
+        self._files.append(self._open(path))
+        self._thread = threading.Thread(target=self._run, name="packastack-events", daemon=True)
+        self._thread.start()
+
+    def add_file(self, path: Path) -> None:
+        """Also write subsequent events to another file (e.g. a log mirror)."""
+        # Write out what is already queued so the new file only receives
+        # events emitted after it was added.
+        self.flush()
+        pair = self._open(path)
+        with self._files_lock:
+            self._files.append(pair)
+
+    def _open(self, path: Path) -> tuple[IO[bytes], IO[bytes]]:
+        raw = path.open("ab")
+        if not self.compress:
+            return raw, raw
+        # GzipFile is a binary file object but does not derive from IO
+        return cast("IO[bytes]", gzip.GzipFile(fileobj=raw, mode="ab")), raw
+
+    def _sample_pattern(self, name: str) -> str | None:
+        for pattern in self.sample:
+            if fnmatch.fnmatchcase(name, pattern):
+                return pattern
+        return None
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Queue an event, stamping it with the current time."""
+        if self._closed:
+            return
+        if self.sample:
+            pattern = self._sample_pattern(str(event.get("event", "")))
+            if pattern is not None:
+                with self._sample_lock:
+                    count = self.seen.get(pattern, 0)
+                    self.seen[pattern] = count + 1
+                    if count % self.sample[pattern]:
+                        self.dropped[pattern] = self.dropped.get(pattern, 0) + 1
+                        return
+        # Serialise now, so callers may reuse or mutate the event; formatting
+        # the timestamp is left to the writer thread. An event that carries
+        # its own timestamp is written as is.
+        body = json.dumps(event, default=str)
+        self._queue.put((None if "timestamp" in event else time.time(), body))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every event emitted so far is written and flushed."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write remaining events, fsync and close every file."""
+        if self._closed:
+            return
+        if self.dropped:
+            self.emit({"event": "events.sampled", "dropped": dict(self.dropped), "policy": self.sample})
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _write(self, batch: list[tuple[float | None, str]]) -> None:
+        if not batch:
+            return
+        lines = []
+        for stamp, body in batch:
+            if stamp is None:
+                lines.append(body + "\n")
+                continue
+            timestamp = json.dumps(datetime.datetime.fromtimestamp(stamp, datetime.UTC).isoformat())
+            sep = "" if body == "{}" else ", "
+            lines.append(f'{{"timestamp": {timestamp}{sep}{body[1:]}\n')
+        data = "".join(lines).encode("utf-8")
+        with self._files_lock:
+            for writer, _raw in self._files:
+                with contextlib.suppress(OSError, ValueError):
+                    writer.write(data)
+
+    def _flush_files(self) -> None:
+        # GzipFile.flush() emits a sync block, so a compressed file is
+        # readable up to the last flush even before it is closed.
+        with self._files_lock:
+            for writer, raw in self._files:
+                with contextlib.suppress(OSError, ValueError):
+                    writer.flush()
+                    raw.flush()
+
+    def _close_files(self) -> None:
+        with self._files_lock:
+            for writer, raw in self._files:
+                with contextlib.suppress(OSError, ValueError):
+                    if writer is not raw:
+                        writer.close()
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                with contextlib.suppress(OSError, ValueError):
+                    raw.close()
+            self._files.clear()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval or None)
+            except queue.Empty:
+                item = None
+
+            # Collect up to max_batch events, stopping at a control marker
+            batch: list[tuple[float | None, str]] = []
+            control = None
+            while item is not None:
+                if item is _STOP or item[0] is _FLUSH:
+                    control = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            self._write(batch)
+            if control is _STOP:
+                self._close_files()
+                return
+
+            now = time.monotonic()
+            if control is not None or now - last_flush >= self.flush_interval:
+                self._flush_files()
+                last_flush = now
+            if control is not None:
+                control[1].set()
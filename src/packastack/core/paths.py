@@ -54,6 +54,9 @@ def ensure_directories(paths_cfg: Mapping[str, Any] | None = None) -> dict[str,
             "ubuntu_archive_cache": cache_root / "ubuntu-archive",
             "local_apt_repo": cache_root / "apt-repo",
             "upstream_tarballs": cache_root / "upstream-tarballs",
+            "packaging_mirrors": cache_root / "packaging-mirrors",
+            "apt_proxy_cache": cache_root / "apt-proxy",
+            "build_cache": cache_root / "build-cache",
             "build_root": cache_root / "build",
             "runs_root": cache_root / "runs",
         }
@@ -71,6 +74,7 @@ def ensure_directories(paths_cfg: Mapping[str, Any] | None = None) -> dict[str,
         paths["ubuntu_archive_cache"] / "snapshots",
         paths["local_apt_repo"],
         paths["upstream_tarballs"],
+        paths["packaging_mirrors"],
         paths["build_root"],
         paths["runs_root"],
     ]
@@ -19,7 +19,9 @@
 """Run context manager for Packastack CLI runs.
 
 This module implements the run directory creation, stdout/stderr capture to
-files, JSONL event logging, and summary.json generation. The spinner output
+files, JSONL event logging, and summary.json generation. Events are written
+by a buffered background sink (see :mod:`packastack.core.events`), and the
+run's timing spans are exported to trace.json (see :mod:`packastack.core.spans`). The spinner output
 must never go into the log files; therefore spinner/console output writes to
 sys.__stdout__ when available.
 """
@@ -29,12 +31,23 @@ from __future__ import annotations
 import contextlib
 import datetime
 import json
+import os
 import sys
 import uuid
 from pathlib import Path
 from typing import Any
 
 from packastack.core.config import load_config
+from packastack.core.events import DEFAULT_FLUSH_INTERVAL, EventSink, events_filename
+from packastack.core.spans import (
+    PROFILE_DIR,
+    TRACE_DIR_ENV,
+    TRACE_FILE,
+    Tracer,
+    chrome_trace_events,
+    set_tracer,
+    write_chrome_trace,
+)
 
 
 class RunContext:
@@ -44,10 +57,16 @@ class RunContext:
         with RunContext("init") as run:
             run.log_event({"msg": "starting"})
             ...
+
+    Args:
+        command: Command name, used in the run id.
+        profile: Run top-level phases under cProfile, writing their stats
+            to ``profile/`` in the run directory.
     """
 
-    def __init__(self, command: str) -> None:
+    def __init__(self, command: str, profile: bool = False) -> None:
         self.command = command
+        self.profile = profile
         self.cfg = load_config()
         self.paths = {k: Path(v).expanduser().resolve() for k, v in self.cfg.get("paths", {}).items()}
         self.runs_root = self.paths.get("runs_root", Path.home() / ".cache" / "packastack" / "runs")
@@ -57,9 +76,14 @@ class RunContext:
         self.logs_path = self.run_path / "logs"
         self.stdout_file: Any | None = None
         self.stderr_file: Any | None = None
-        self.events_file: Any | None = None
-        self._event_files: list[Any] = []
+        events_cfg = self.cfg.get("events", {})
+        self.events_compress = bool(events_cfg.get("compress", False))
+        self.events_name = events_filename(self.events_compress)
+        self.events: EventSink | None = None
+        self.tracer: Tracer | None = None
+        self._previous_tracer: Tracer | None = None
         self._mirror_files: list[Any] = []
+        self._mirror_dirs: list[Path] = []
         self._orig_stdout = sys.stdout
         self._orig_stderr = sys.stderr
         self.summary: dict[str, Any] = {"command": command, "start_utc": now_utc.isoformat()}
@@ -74,9 +98,10 @@ class RunContext:
 
         mirror_stdout = (mirror_logs_path / "stdout.log").open("a", encoding="utf-8")
         mirror_stderr = (mirror_logs_path / "stderr.log").open("a", encoding="utf-8")
-        mirror_events = (mirror_logs_path / "events.jsonl").open("a", encoding="utf-8")
-        self._mirror_files.extend([mirror_stdout, mirror_stderr, mirror_events])
-        self._event_files.append(mirror_events)
+        self._mirror_files.extend([mirror_stdout, mirror_stderr])
+        self._mirror_dirs.append(mirror_logs_path)
+        if self.events is not None:
+            self.events.add_file(mirror_logs_path / self.events_name)
 
         class _TeeTextIO:
             def __init__(self, streams: list[Any]) -> None:
@@ -105,8 +130,13 @@ class RunContext:
         # Open log files and redirect stdout/stderr to them
         self.stdout_file = (self.logs_path / "stdout.log").open("w", encoding="utf-8")
         self.stderr_file = (self.logs_path / "stderr.log").open("w", encoding="utf-8")
-        self.events_file = (self.logs_path / "events.jsonl").open("a", encoding="utf-8")
-        self._event_files = [self.events_file]
+        events_cfg = self.cfg.get("events", {})
+        self.events = EventSink(
+            self.logs_path / self.events_name,
+            flush_interval=float(events_cfg.get("flush_interval", DEFAULT_FLUSH_INTERVAL)),
+            compress=self.events_compress,
+            sample=events_cfg.get("sample") or {},
+        )
 
         # Backwards-compatible links at run root
         def _link(src: Path, dst: Path) -> None:
@@ -117,24 +147,53 @@ class RunContext:
 
         _link(self.logs_path / "stdout.log", self.run_path / "stdout.log")
         _link(self.logs_path / "stderr.log", self.run_path / "stderr.log")
-        _link(self.logs_path / "events.jsonl", self.run_path / "events.jsonl")
+        _link(self.logs_path / self.events_name, self.run_path / self.events_name)
 
         sys.stdout = self.stdout_file
         sys.stderr = self.stderr_file
 
+        self.tracer = Tracer(
+            emit=self.log_event,
+            profile_dir=self.run_path / PROFILE_DIR if self.profile else None,
+        )
+        self._previous_tracer = set_tracer(self.tracer)
+
         # Write initial event
         self.log_event({"event": "run.start", "run_id": self.run_id})
         return self
 
     def log_event(self, event: dict[str, Any]) -> None:
-        """Write a JSONL event with a timestamp."""
-        if not self._event_files:  # pragma: no cover
+        """Queue a JSONL event with a timestamp.
+
+        The event is written by a background thread, at the latest
+        ``events.flush_interval`` seconds later; call :meth:`flush_events`
+        when it must be on disk now.
+        """
+        if self.events is None:  # pragma: no cover
+            return
+        self.events.emit(event)
+
+    def flush_events(self) -> None:
+        """Block until all events logged so far are written to disk."""
+        if self.events is not None:
+            self.events.flush()
+
+    def _write_trace(self) -> None:
+        """Export the run's spans as a Chrome trace, plus merged profiles."""
+        if self.tracer is None:
             return
-        payload = {"timestamp": datetime.datetime.now(datetime.UTC).isoformat(), **event}
-        line = json.dumps(payload, default=str) + "\n"
-        for f in list(self._event_files):
-            f.write(line)
-            f.flush()
+        set_tracer(self._previous_tracer)
+        if self.tracer.spans:
+            events = chrome_trace_events(self.tracer.spans, pid=os.getpid(), process_name=self.command)
+            with contextlib.suppress(OSError):
+                self.summary["trace"] = str(write_chrome_trace(self.run_path / TRACE_FILE, events))
+            trace_dir = os.environ.get(TRACE_DIR_ENV)
+            if trace_dir:
+                with contextlib.suppress(OSError):
+                    write_chrome_trace(Path(trace_dir) / TRACE_FILE, events)
+        combined = self.tracer.write_combined_profile()
+        if combined is not None:
+            self.summary["profile"] = str(combined.parent)
 
     def write_summary(self, **kwargs: Any) -> None:
         self.summary.update(kwargs)
@@ -142,13 +201,9 @@ class RunContext:
         (self.run_path / "summary.json").write_text(blob)
         # Convenience copy alongside logs
         (self.logs_path / "summary.json").write_text(blob)
-        for f in self._mirror_files:
-            # mirror_files are file handles; derive their directory to place summary
-            try:
-                mirror_dir = Path(f.name).parent
+        for mirror_dir in self._mirror_dirs:
+            with contextlib.suppress(OSError):
                 (mirror_dir / "summary.json").write_text(blob)
-            except Exception:
-                continue
 
     def __exit__(
         self,
@@ -163,6 +218,7 @@ class RunContext:
 
         self.summary["end_utc"] = datetime.datetime.now(datetime.UTC).isoformat()
         self.summary["status"] = status
+        self._write_trace()
         self.write_summary()
 
         # Write a final event
@@ -175,9 +231,8 @@ class RunContext:
                 self.stdout_file.close()
             if self.stderr_file:
                 self.stderr_file.close()
-            for f in self._event_files:
-                with contextlib.suppress(Exception):
-                    f.close()
+            if self.events is not None:
+                self.events.close()
             for f in self._mirror_files:
                 with contextlib.suppress(Exception):
                     f.close()
@@ -0,0 +1,287 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Host-wide build slots shared by every packastack process.
+
+Concurrent ``packastack build`` and ``build --all`` runs on one host take
+their sbuild and network fetch slots from the same :class:`HostSlots`
+directory under the cache root. Each kind of slot is a set of lock files
+(``<kind>.<n>.lock``); holding an flock on one of them is holding the slot,
+so a crashed process releases its slots with its file descriptors.
+
+Waiters queue in ``<kind>.queue/`` with one ticket file each, and only the
+oldest ``limit`` live waiters may take a free slot, so slots go to runs in
+the order they asked rather than to whichever polls first. A slot's lock
+file records its holder (pid, user, command and label) while held, which
+is what ``packastack status --slots`` shows.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import getpass
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+SLOTS_DIR = "host-slots"
+
+SLOT_SBUILD = "sbuild"
+SLOT_FETCH = "fetch"
+
+DEFAULT_FETCH_SLOTS = 8
+
+# Seconds between attempts while waiting for a slot
+POLL_INTERVAL = 0.5
+
+
+def default_sbuild_slots() -> int:
+    """Return the default number of concurrent sbuilds: half the CPUs."""
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+@dataclass
+class SlotHolder:
+    """The process holding a slot or lock.
+
+    Attributes:
+        kind: Slot kind (``sbuild``, ``fetch``) or lock name.
+        index: Slot number within its kind.
+        pid: Holding process.
+        user: User running the process.
+        label: What the slot is used for, e.g. the package being built.
+        command: Command line of the process.
+        since: Unix time the slot was taken.
+    """
+
+    kind: str
+    index: int = 0
+    pid: int = 0
+    user: str = ""
+    label: str = ""
+    command: str = ""
+    since: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+@dataclass
+class SlotUsage:
+    """Holders and waiters of one slot kind."""
+
+    kind: str
+    limit: int
+    holders: list[SlotHolder] = field(default_factory=list)
+    waiting: int = 0
+
+
+def _user() -> str:
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return str(os.getuid())
+
+
+def record_holder(fd: int, kind: str, index: int = 0, label: str = "") -> None:
+    """Write the current process as holder into a locked file."""
+    holder = SlotHolder(
+        kind=kind,
+        index=index,
+        pid=os.getpid(),
+        user=_user(),
+        label=label,
+        command=" ".join(["packastack", *sys.argv[1:]]),
+        since=time.time(),
+    )
+    os.ftruncate(fd, 0)
+    os.pwrite(fd, json.dumps(holder.to_dict()).encode("utf-8"), 0)
+
+
+def clear_holder(fd: int) -> None:
+    """Remove the holder record from a locked file before unlocking it."""
+    with contextlib.suppress(OSError):
+        os.ftruncate(fd, 0)
+
+
+def read_holder(path: Path) -> SlotHolder | None:
+    """Return the holder of a lock file, or None if it is free."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            pass
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            return None
+        try:
+            data = json.loads(os.pread(fd, 64 * 1024, 0).decode("utf-8"))
+            return SlotHolder(**data)
+        except (OSError, ValueError, TypeError):
+            # Taken, but the holder has not written its record yet
+            return SlotHolder(kind=path.name.split(".", 1)[0])
+    finally:
+        os.close(fd)
+
+
+def _is_live(ticket: Path) -> bool:
+    """Return whether a queue ticket's waiter still holds it."""
+    try:
+        fd = os.open(ticket, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    # Left behind by a waiter that died
+    ticket.unlink(missing_ok=True)
+    return False
+
+
+def _tickets(queue: Path) -> list[Path]:
+    return sorted(t for t in queue.iterdir() if not t.name.startswith("."))
+
+
+class HostSlots:
+    """File-lock semaphores shared by all packastack processes on a host.
+
+    Args:
+        root: Directory holding the slot and queue files.
+        limits: Number of slots per kind.
+        poll_interval: Seconds between attempts while waiting.
+    """
+
+    def __init__(self, root: Path, limits: dict[str, int], poll_interval: float = POLL_INTERVAL) -> None:
+        self.root = root
+        self.limits = {kind: max(1, int(n)) for kind, n in limits.items()}
+        self.poll_interval = poll_interval
+
+    def _slot_path(self, kind: str, index: int) -> Path:
+        return self.root / f"{kind}.{index}.lock"
+
+    def _queue_dir(self, kind: str) -> Path:
+        return self.root / f"{kind}.queue"
+
+    def _try_take(self, kind: str, label: str) -> tuple[int, int] | None:
+        for index in range(self.limits[kind]):
+            fd = os.open(self._slot_path(kind, index), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            record_holder(fd, kind, index, label)
+            return index, fd
+        return None
+
+    @contextlib.contextmanager
+    def slot(self, kind: str, label: str = "") -> Iterator[int]:
+        """Hold one slot of a kind, waiting in turn for it.
+
+        Kinds without a configured limit are not limited.
+
+        Args:
+            kind: Slot kind, e.g. :data:`SLOT_SBUILD`.
+            label: What the slot is used for, shown by ``packastack status``.
+
+        Yields:
+            The slot number, or -1 for an unlimited kind.
+        """
+        if kind not in self.limits:
+            yield -1
+            return
+
+        index, fd = self._wait(kind, label)
+        try:
+            yield index
+        finally:
+            clear_holder(fd)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _wait(self, kind: str, label: str) -> tuple[int, int]:
+        queue = self._queue_dir(kind)
+        queue.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}"
+        ticket = queue / name
+        # Locked before it is visible, so no one takes it for a dead waiter's
+        pending = queue / f".{name}"
+        ticket_fd = os.open(pending, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(ticket_fd, fcntl.LOCK_EX)
+        pending.rename(ticket)
+        try:
+            while True:
+                ahead = [t for t in _tickets(queue) if t.name < name and _is_live(t)]
+                if len(ahead) < self.limits[kind]:
+                    taken = self._try_take(kind, label)
+                    if taken is not None:
+                        return taken
+                time.sleep(self.poll_interval)
+        finally:
+            ticket.unlink(missing_ok=True)
+            os.close(ticket_fd)
+
+    def usage(self) -> list[SlotUsage]:
+        """Return the holders and waiters of every slot kind."""
+        result = []
+        for kind, limit in sorted(self.limits.items()):
+            holders = [h for i in range(limit) if (h := read_holder(self._slot_path(kind, i))) is not None]
+            queue = self._queue_dir(kind)
+            waiting = sum(1 for t in _tickets(queue) if _is_live(t)) if queue.is_dir() else 0
+            result.append(SlotUsage(kind=kind, limit=limit, holders=holders, waiting=waiting))
+        return result
+
+
+def create_host_slots(cfg: dict[str, Any], paths: dict[str, Path]) -> HostSlots | None:
+    """Build the host slots from the host_slots config.
+
+    Returns:
+        The slots, or None if host-wide slots are disabled or there is no
+        cache root to share them through.
+    """
+    slots_cfg = cfg.get("host_slots", {})
+    cache_root = paths.get("cache_root")
+    if not slots_cfg.get("enabled", True) or cache_root is None:
+        return None
+    return HostSlots(
+        cache_root / SLOTS_DIR,
+        {
+            SLOT_SBUILD: slots_cfg.get("sbuild") or default_sbuild_slots(),
+            SLOT_FETCH: slots_cfg.get("fetch") or DEFAULT_FETCH_SLOTS,
+        },
+    )
+
+
+def host_slot(slots: HostSlots | None, kind: str, label: str = "") -> contextlib.AbstractContextManager:
+    """Hold a host slot, or nothing when host slots are disabled."""
+    return slots.slot(kind, label) if slots is not None else contextlib.nullcontext(-1)
@@ -0,0 +1,350 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Span-based timing instrumentation.
+
+A span records how long a named piece of work took, where it sat in the
+call tree and on which thread. ``RunContext`` installs a :class:`Tracer`
+for the duration of a run; instrumented code opens spans through the
+module-level :func:`span`, which does nothing when no tracer is active::
+
+    with span("fetch", package="nova"):
+        ...
+
+Categories used across Packastack:
+
+- ``phase``: build phases (fetch, prepare, import, build, publish, ...)
+- ``step``: activity spinner steps within a phase
+- ``subprocess``: external commands (git, gbp, sbuild, uscan, dpkg-deb)
+- ``cache``: cache lookups
+
+Every finished span is logged as a ``span`` event in ``events.jsonl`` and
+the run writes all spans to ``trace.json`` in Chrome trace format, which
+can be opened in Perfetto or ``chrome://tracing``. With profiling enabled,
+each outermost ``phase`` or ``step`` span is run under cProfile and its
+stats written to ``profile/<nn>-<name>.pstats``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import itertools
+import json
+import pstats
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+SPAN_EVENT = "span"
+TRACE_FILE = "trace.json"
+PROFILE_DIR = "profile"
+COMBINED_PROFILE = "combined.pstats"
+
+# Set by build-all so child builds also write their trace to its log dir
+TRACE_DIR_ENV = "PACKASTACK_TRACE_DIR"
+
+# Commands whose first argument is a subcommand worth keeping in the span name
+_SUBCOMMAND_TOOLS = frozenset({"git", "gbp"})
+
+_PROFILED_CATEGORIES = frozenset({"phase", "step"})
+
+
+@dataclass
+class Span:
+    """A timed unit of work."""
+
+    name: str
+    category: str = "phase"
+    start: float = 0.0  # Epoch seconds
+    duration: float = 0.0  # Seconds
+    span_id: int = 0
+    parent_id: int = 0
+    thread_id: int = 0
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_event(self) -> dict[str, Any]:
+        """Convert to a run event."""
+        return {
+            "event": SPAN_EVENT,
+            "name": self.name,
+            "cat": self.category,
+            "start": self.start,
+            "duration": round(self.duration, 6),
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "tid": self.thread_id,
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """Collects spans for one run.
+
+    Args:
+        emit: Called with the event for every finished span.
+        profile_dir: Write per-phase cProfile stats here (None disables).
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[dict[str, Any]], None] | None = None,
+        profile_dir: Path | None = None,
+    ) -> None:
+        self.emit = emit
+        self.profile_dir = profile_dir
+        self.spans: list[Span] = []
+        self.profiles: list[Path] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "phase", **attrs: Any) -> Iterator[Span]:
+        """Time the wrapped block as a span nested under the current one."""
+        stack = self._stack()
+        current = Span(
+            name=name,
+            category=category,
+            start=time.time(),
+            span_id=next(self._ids),
+            parent_id=stack[-1].span_id if stack else 0,
+            thread_id=threading.get_native_id(),
+            attrs=attrs,
+        )
+        profiler = self._start_profile(current)
+        stack.append(current)
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException as exc:
+            current.attrs.setdefault("error", type(exc).__name__)
+            raise
+        finally:
+            current.duration = time.perf_counter() - started
+            stack.pop()
+            if profiler is not None:
+                self._stop_profile(current, profiler)
+            with self._lock:
+                self.spans.append(current)
+            if self.emit is not None:
+                with contextlib.suppress(Exception):
+                    self.emit(current.to_event())
+
+    def _start_profile(self, current: Span) -> cProfile.Profile | None:
+        # Only one profiler can be active per thread, so profile the
+        # outermost phase or step and let nested ones be part of it.
+        if self.profile_dir is None or current.category not in _PROFILED_CATEGORIES:
+            return None
+        if getattr(self._local, "profiling", False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiler is already active
+            return None
+        self._local.profiling = True
+        return profiler
+
+    def _stop_profile(self, current: Span, profiler: cProfile.Profile) -> None:
+        profiler.disable()
+        self._local.profiling = False
+        assert self.profile_dir is not None
+        with self._lock:
+            index = len(self.profiles) + 1
+            path = self.profile_dir / f"{index:02d}-{_safe_name(current.name)}.pstats"
+            self.profiles.append(path)
+        with contextlib.suppress(OSError):
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(path)
+
+    def write_combined_profile(self) -> Path | None:
+        """Merge the per-phase profiles into ``combined.pstats``."""
+        if self.profile_dir is None:
+            return None
+        existing = [str(p) for p in self.profiles if p.is_file()]
+        if not existing:
+            return None
+        path = self.profile_dir / COMBINED_PROFILE
+        try:
+            pstats.Stats(*existing).dump_stats(path)
+        except (OSError, TypeError, EOFError):
+            return None
+        return path
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name) or "span"
+
+
+_tracer: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer | None:
+    """Install the active tracer, returning the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_tracer() -> Tracer | None:
+    """Return the active tracer, if any."""
+    return _tracer
+
+
+def span(name: str, category: str = "phase", **attrs: Any) -> contextlib.AbstractContextManager[Span | None]:
+    """Time the wrapped block if a tracer is active."""
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, category, **attrs)
+
+
+def command_name(cmd: Sequence[str]) -> str:
+    """Return a span name for a command line (e.g. ``git fetch``)."""
+    if not cmd:
+        return "command"
+    tool = Path(str(cmd[0])).name
+    if tool in _SUBCOMMAND_TOOLS:
+        args = iter(str(a) for a in cmd[1:])
+        for arg in args:
+            if arg in {"-C", "-c"}:  # Option taking a value (git -C <dir>)
+                next(args, None)
+            elif not arg.startswith("-"):
+                return f"{tool} {arg}"
+    return tool
+
+
+def command_span(cmd: Sequence[str], **attrs: Any) -> contextlib.AbstractContextManager[Span | None]:
+    """Time an external command as a ``subprocess`` span."""
+    return span(command_name(cmd), "subprocess", **attrs)
+
+
+# -----------------------------------------------------------------------------
+# Chrome trace export
+# -----------------------------------------------------------------------------
+
+
+def chrome_trace_events(spans: Iterable[Span], pid: int = 1, process_name: str = "") -> list[dict[str, Any]]:
+    """Convert spans to Chrome trace "complete" events."""
+    events: list[dict[str, Any]] = []
+    if process_name:
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}})
+    for s in sorted(spans, key=lambda s: s.start):
+        events.append({
+            "name": s.name,
+            "cat": s.category,
+            "ph": "X",
+            "ts": round(s.start * 1_000_000),
+            "dur": round(s.duration * 1_000_000),
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": {"id": s.span_id, "parent": s.parent_id, **s.attrs},
+        })
+    return events
+
+
+def write_chrome_trace(path: Path, events: list[dict[str, Any]]) -> Path:
+    """Write Chrome trace events to a JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+    return path
+
+
+def load_chrome_trace(path: Path) -> list[Span]:
+    """Read the spans back from a Chrome trace file.
+
+    Returns:
+        Spans in the file, or an empty list if it is missing or unreadable.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    events = data.get("traceEvents", []) if isinstance(data, dict) else data
+    spans = []
+    for event in events:
+        if not isinstance(event, dict) or event.get("ph") != "X":
+            continue
+        args = dict(event.get("args") or {})
+        spans.append(Span(
+            name=str(event.get("name", "")),
+            category=str(event.get("cat", "")),
+            start=event.get("ts", 0) / 1_000_000,
+            duration=event.get("dur", 0) / 1_000_000,
+            span_id=int(args.pop("id", 0)),
+            parent_id=int(args.pop("parent", 0)),
+            thread_id=int(event.get("tid", 0)),
+            attrs=args,
+        ))
+    return spans
+
+
+# -----------------------------------------------------------------------------
+# Aggregation
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class SpanStats:
+    """Aggregate timing of all spans with the same category and name."""
+
+    category: str
+    name: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "category": self.category,
+            "name": self.name,
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 3),
+            "mean_seconds": round(self.mean_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+
+def aggregate_spans(spans: Iterable[Span]) -> list[SpanStats]:
+    """Sum span durations by (category, name), largest total first."""
+    stats: dict[tuple[str, str], SpanStats] = {}
+    for s in spans:
+        entry = stats.get((s.category, s.name))
+        if entry is None:
+            entry = stats[(s.category, s.name)] = SpanStats(category=s.category, name=s.name)
+        entry.count += 1
+        entry.total_seconds += s.duration
+        entry.max_seconds = max(entry.max_seconds, s.duration)
+    return sorted(stats.values(), key=lambda e: e.total_seconds, reverse=True)
@@ -20,7 +20,8 @@
 
 Uses Rich spinners when stdout is a TTY, falls back to plain text otherwise.
 The spinner output is written directly to the real terminal (sys.__stdout__)
-and never goes into captured log files.
+and never goes into captured log files. Each spinner block is also timed as
+a ``step`` span.
 """
 
 from __future__ import annotations
@@ -33,6 +34,8 @@ from rich.console import Console
 from rich.live import Live
 from rich.spinner import Spinner
 
+from packastack.core.spans import span
+
 
 def is_tty() -> bool:
     """Return True if stdout is a TTY."""
@@ -56,7 +59,11 @@ def activity_spinner(phase: str, description: str, disable: bool = False) -> Ite
     When stdout is not a TTY or disable is True, the activity line is printed
     without animation and immediately returned.
     """
+    with span(phase, "step", description=description):
+        yield from _spin(phase, description, disable)
+
 
+def _spin(phase: str, description: str, disable: bool) -> Iterator[None]:
     text = f"[{phase}] {description}"
 
     # Non-TTY or explicitly disabled: print once and return.
@@ -18,7 +18,10 @@
 
 """Debian changelog manipulation for Packastack build operations.
 
-Handles version string generation and changelog updates using python-debian.
+Handles version string generation and changelog updates. New entries are
+written in-process by :func:`update_changelog`, which reads only the top
+entry of the existing changelog and prepends the new one to the untouched
+remainder; ``gbp dch`` and ``dch`` are only run when configured.
 """
 
 from __future__ import annotations
@@ -27,10 +30,12 @@ import datetime
 import os
 import re
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packastack.core.spans import command_span
+
 if TYPE_CHECKING:
     pass
 
@@ -42,6 +47,10 @@ except ImportError:
     Version = None  # type: ignore
 
 
+# Tools update_changelog can write an entry with
+CHANGELOG_TOOLS = ("native", "gbp", "dch")
+
+
 @dataclass
 class VersionInfo:
     """Parsed Debian version information."""
@@ -269,6 +278,254 @@ def get_current_version(changelog_path: Path) -> str | None:
     return None
 
 
+@dataclass
+class ChangelogTop:
+    """The top entry of a changelog and where it ends.
+
+    Attributes:
+        distribution: Target distribution of the entry.
+        author: Maintainer from the entry's trailer.
+        changes: The entry's changes, one item per bullet with its
+            continuation and sub-bullet lines, or per ``[ Name ]``
+            attribution line, as written in the changelog.
+        end: Offset just past the entry and its trailing blank lines.
+    """
+
+    distribution: str = ""
+    author: str = ""
+    changes: list[str] = field(default_factory=list)
+    end: int = 0
+
+
+def _is_attribution(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith("[") and stripped.endswith("]")
+
+
+def group_changes(lines: list[str]) -> list[str]:
+    """Group the change lines of an entry into whole bullets.
+
+    Continuation and sub-bullet lines stay with the bullet they follow;
+    ``[ Name ]`` attribution lines are items of their own. Lines are kept
+    as written, and blank separator lines are dropped.
+    """
+    groups: list[str] = []
+    for line in lines:
+        line = line.rstrip()
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("* ") or _is_attribution(line) or not groups or _is_attribution(groups[-1]):
+            groups.append(line)
+        else:
+            groups[-1] += "\n" + line
+    return groups
+
+
+def read_changelog_top(text: str) -> ChangelogTop | None:
+    """Parse the first entry of a changelog with python-debian.
+
+    Only the lines up to the first trailer are parsed, so the cost does
+    not grow with the length of the changelog.
+
+    Returns:
+        The top entry, or None if the text does not start with one or
+        python-debian is not available.
+    """
+    lines = text.splitlines(keepends=True)
+    if Changelog is None or not lines or lines[0][:1].isspace() or "(" not in lines[0]:
+        return None
+    trailer = next((idx for idx, line in enumerate(lines) if line.startswith(" -- ")), None)
+    if trailer is None:
+        return None
+
+    try:
+        cl = Changelog("".join(lines[: trailer + 1]), max_blocks=1)
+    except ValueError:
+        return None
+    if len(cl) == 0 or cl[0].package is None:
+        return None
+    block = cl[0]
+
+    # Consume the blank lines separating it from the next entry
+    end = trailer + 1
+    while end < len(lines) and not lines[end].strip():
+        end += 1
+    return ChangelogTop(
+        distribution=str(block.distributions or ""),
+        author=str(block.author or ""),
+        changes=group_changes(block.changes()),
+        end=sum(len(line) for line in lines[:end]),
+    )
+
+
+def _detect_existing_maintainer(changelog_path: Path) -> str | None:
+    """Return the maintainer of the top changelog entry, if any."""
+    # Prefer the maintainer from the current top changelog entry to avoid
+    # introducing inconsistent-maintainer lintian errors.
+    try:
+        with changelog_path.open(encoding="utf-8") as f:
+            head = []
+            for line in f:
+                head.append(line)
+                if line.startswith(" -- "):
+                    break
+    except OSError:
+        return None
+    top = read_changelog_top("".join(head))
+    return top.author if top and top.author else None
+
+
+def _default_maintainer() -> str:
+    name = os.environ.get("DEBFULLNAME", os.environ.get("NAME", "Packastack"))
+    email = os.environ.get("DEBEMAIL", os.environ.get("EMAIL", "packastack@ubuntu.com"))
+    return f"{name} <{email}>"
+
+
+def _change_key(bullet: str) -> str:
+    """Return a bullet's text with the marker and line wrapping removed."""
+    normalized = " ".join(bullet.split())
+    return normalized[2:] if normalized.startswith("* ") else normalized
+
+
+def _dedupe_changes(bullets: list[str]) -> list[str]:
+    """Drop repeated bullets and all but the first 'New upstream version' one.
+
+    Bullets are compared whole; attribution lines are always kept.
+    """
+    result: list[str] = []
+    seen: set[str] = set()
+    seen_version_line = False
+    for bullet in bullets:
+        key = _change_key(bullet)
+        if not key:
+            continue
+        if not _is_attribution(bullet):
+            if key in seen:
+                continue
+            if key.startswith("New upstream version"):
+                if seen_version_line:
+                    continue
+                seen_version_line = True
+            seen.add(key)
+        result.append(bullet)
+    return result
+
+
+def _format_body(bullets: list[str]) -> str:
+    """Join rendered bullets, with a blank line before each attribution."""
+    body = ""
+    for bullet in bullets:
+        if body and _is_attribution(bullet):
+            body += "\n"
+        body += bullet + "\n"
+    return body
+
+
+def _merge_changes(merged: list[str], changes: list[str], maintainer: str) -> list[str]:
+    """Render new changes after the bullets of a merged UNRELEASED entry.
+
+    When the merged entry is split by ``[ Name ]`` attribution lines, the
+    new changes go under one for the maintainer, so they are not credited
+    to whoever was attributed last.
+    """
+    kept = _dedupe_changes(merged)
+    bullets = _dedupe_changes(kept + [f"  * {change}" for change in changes])
+    attributions = [bullet.strip() for bullet in kept if _is_attribution(bullet)]
+    name = maintainer.split("<", 1)[0].strip()
+    if len(bullets) > len(kept) and attributions and attributions[-1] != f"[ {name} ]":
+        bullets.insert(len(kept), f"  [ {name} ]")
+    return bullets
+
+
+def format_changelog_entry(
+    package: str,
+    version: str,
+    distribution: str,
+    changes: list[str],
+    maintainer: str,
+    urgency: str = "medium",
+    date: str | None = None,
+) -> str:
+    """Format a changelog entry, followed by the blank separator line."""
+    return _format_entry(
+        package, version, distribution, [f"  * {change}" for change in changes], maintainer, urgency, date
+    )
+
+
+def _format_entry(
+    package: str,
+    version: str,
+    distribution: str,
+    bullets: list[str],
+    maintainer: str,
+    urgency: str = "medium",
+    date: str | None = None,
+) -> str:
+    if date is None:
+        date = datetime.datetime.now(datetime.UTC).strftime("%a, %d %b %Y %H:%M:%S %z")
+    return (
+        f"{package} ({version}) {distribution}; urgency={urgency}\n\n"
+        f"{_format_body(bullets)}\n"
+        f" -- {maintainer}  {date}\n\n"
+    )
+
+
+def _update_changelog_native(
+    changelog_path: Path,
+    package: str,
+    version: str,
+    distribution: str,
+    changes: list[str],
+    maintainer: str | None,
+    urgency: str,
+) -> tuple[bool, str]:
+    """Prepend a new entry to the changelog in-process.
+
+    Only the top entry is parsed (with python-debian), for maintainer
+    detection and to merge an UNRELEASED entry, whose bullets are carried
+    over as written and de-duplicated against the new changes; the rest of
+    the file is copied unchanged.
+
+    Returns:
+        Tuple of (success, error_message).
+    """
+    try:
+        if Version is not None:
+            Version(version)
+        text = changelog_path.read_text(encoding="utf-8") if changelog_path.exists() else ""
+    except (OSError, ValueError) as e:
+        return False, f"native changelog update failed: {e}"
+
+    top = read_changelog_top(text)
+    remainder = text if text.strip() else ""
+    merged: list[str] = []
+    if top is not None:
+        if maintainer is None and top.author:
+            maintainer = top.author
+        # Merge an existing UNRELEASED entry into the new entry
+        if top.distribution.upper() == "UNRELEASED":
+            merged = top.changes
+            remainder = text[top.end :]
+
+    maintainer = maintainer or _default_maintainer()
+    entry = _format_entry(
+        package,
+        version,
+        distribution,
+        _merge_changes(merged, changes, maintainer),
+        maintainer,
+        urgency,
+    )
+    if not remainder:
+        entry = entry[:-1]
+
+    try:
+        changelog_path.write_text(entry + remainder, encoding="utf-8")
+    except OSError as e:
+        return False, f"native changelog update failed: {e}"
+    return True, ""
+
+
 def update_changelog(
     changelog_path: Path,
     package: str,
@@ -278,6 +535,7 @@ def update_changelog(
     maintainer: str | None = None,
     urgency: str = "medium",
     prefer_gbp: bool = False,
+    tool: str | None = None,
 ) -> tuple[bool, str]:
     """Update debian/changelog with a new entry.
 
@@ -287,73 +545,39 @@ def update_changelog(
         version: New version string.
         distribution: Target distribution (e.g., "noble", "UNRELEASED").
         changes: List of changelog entry lines.
-        maintainer: Maintainer name and email (default: from environment).
+        maintainer: Maintainer name and email (default: from the top entry,
+            then from the environment).
         urgency: Package urgency level.
-        prefer_gbp: Whether to prefer gbp dch over dch/python-debian.
+        prefer_gbp: Shorthand for ``tool="gbp"``.
+        tool: One of CHANGELOG_TOOLS. ``gbp`` and ``dch`` run the external
+            tools and fall back to the native writer if they fail.
 
     Returns:
         Tuple of (success: bool, error_message: str). error_message is empty on success.
     """
-    def _detect_existing_maintainer() -> str | None:
-        # Prefer the maintainer from the current top changelog entry to avoid
-        # introducing inconsistent-maintainer lintian errors.
-        if not changelog_path.exists():
-            return None
-
-        if Changelog:
-            try:
-                with changelog_path.open(encoding="utf-8") as f:
-                    cl = Changelog(f)
-                    if cl and cl[0].author:
-                        return str(cl[0].author)
-            except Exception:
-                pass
-
-        # Fallback: parse the first author line manually (" -- Name <email>  date")
-        try:
-            with changelog_path.open(encoding="utf-8") as f:
-                for line in f:
-                    if line.startswith(" -- "):
-                        author = line[4:].strip()
-                        if "  " in author:
-                            author = author.split("  ", 1)[0]
-                        return author
-        except Exception:
-            return None
-
-        return None
+    if tool is None:
+        tool = "gbp" if prefer_gbp else "native"
+    if tool not in CHANGELOG_TOOLS:
+        return False, f"Unknown changelog tool: {tool}"
 
-    # Determine maintainer
-    if maintainer is None:
-        maintainer = _detect_existing_maintainer()
+    if tool != "native":
         if maintainer is None:
-            name = os.environ.get("DEBFULLNAME", os.environ.get("NAME", "Packastack"))
-            email = os.environ.get("DEBEMAIL", os.environ.get("EMAIL", "packastack@ubuntu.com"))
-            maintainer = f"{name} <{email}>"
-
-    # Debug logging
-    import sys
-    print(f"[update_changelog] maintainer={maintainer}", file=sys.stderr)
-    print(f"[update_changelog] prefer_gbp={prefer_gbp}", file=sys.stderr)
-
-    if prefer_gbp:
-        success, error = _update_changelog_gbp_dch(
-            changelog_path, version, distribution, changes, maintainer, urgency
-        )
+            maintainer = _detect_existing_maintainer(changelog_path) or _default_maintainer()
+        if tool == "gbp":
+            success, _error = _update_changelog_gbp_dch(
+                changelog_path, version, distribution, changes, maintainer, urgency
+            )
+        else:
+            success, _error = _update_changelog_dch(
+                changelog_path, package, version, distribution, changes, maintainer, urgency
+            )
         if success:
             return True, ""
-        # Fall through to try other methods if gbp dch fails
+        # Fall through to the native writer if the external tool fails
 
-    if Changelog is not None:
-        success, error = _update_changelog_python_debian(
-            changelog_path, package, version, distribution, changes, maintainer, urgency
-        )
-        return success, error
-    else:
-        success, error = _update_changelog_dch(
-            changelog_path, package, version, distribution, changes, maintainer, urgency
-        )
-        return success, error
+    return _update_changelog_native(
+        changelog_path, package, version, distribution, changes, maintainer, urgency
+    )
 
 
 def _update_changelog_gbp_dch(
@@ -403,13 +627,14 @@ def _update_changelog_gbp_dch(
             version,
         ]
 
-        result = subprocess.run(
-            cmd,
-            cwd=repo_root,
-            env=env,
-            capture_output=True,
-            text=True,
-        )
+        with command_span(cmd):
+            result = subprocess.run(
+                cmd,
+                cwd=repo_root,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
 
         if result.returncode != 0:
             error_msg = f"gbp dch failed (rc={result.returncode}): {result.stderr or result.stdout}"
@@ -444,67 +669,6 @@ def _update_changelog_gbp_dch(
         return False, f"Exception in _update_changelog_gbp_dch: {e}"
 
 
-def _update_changelog_python_debian(
-    changelog_path: Path,
-    package: str,
-    version: str,
-    distribution: str,
-    changes: list[str],
-    maintainer: str,
-    urgency: str,
-) -> tuple[bool, str]:
-    """Update changelog using python-debian library.
-
-    Returns:
-        Tuple of (success, error_message).
-    """
-    try:
-        # Read existing changelog
-        if changelog_path.exists():
-            with changelog_path.open(encoding="utf-8") as f:
-                cl = Changelog(f)
-        else:
-            cl = Changelog()
-
-        # Merge any existing UNRELEASED entry into the new entry.
-        merged_changes: list[str] = []
-        if cl and len(cl) > 0:
-            top = cl[0]
-            top_dist = str(getattr(top, "distributions", "")).strip()
-            if top_dist.upper() == "UNRELEASED":
-                for change in top.changes:
-                    normalized = change.strip()
-                    if normalized.startswith("* "):
-                        normalized = normalized[2:]
-                    elif normalized.startswith("  * "):
-                        normalized = normalized[4:]
-                    if normalized:
-                        merged_changes.append(normalized)
-                del cl[0]
-
-        # Create new block
-        cl.new_block(
-            package=package,
-            version=Version(version),
-            distributions=distribution,
-            urgency=urgency,
-            author=maintainer,
-            date=datetime.datetime.now(datetime.UTC).strftime("%a, %d %b %Y %H:%M:%S %z"),
-        )
-
-        # Add changes
-        for change in merged_changes + changes:
-            cl.add_change(f"  * {change}")
-
-        # Write back
-        with changelog_path.open("w", encoding="utf-8") as f:
-            cl.write_to_open_file(f)
-
-        return True, ""
-    except Exception as e:
-        return False, f"python-debian changelog update failed: {e}"
-
-
 def _update_changelog_dch(
     changelog_path: Path,
     package: str,
@@ -549,13 +713,14 @@ def _update_changelog_dch(
         print(f"[dch-debug] DEBEMAIL={env.get('DEBEMAIL')}", file=sys.stderr)
         print(f"[dch-debug] Changes: {changes}", file=sys.stderr)
 
-        result = subprocess.run(
-            cmd,
-            cwd=changelog_path.parent.parent,  # Run from package root
-            env=env,
-            capture_output=True,
-            text=True,
-        )
+        with command_span(cmd):
+            result = subprocess.run(
+                cmd,
+                cwd=changelog_path.parent.parent,  # Run from package root
+                env=env,
+                capture_output=True,
+                text=True,
+            )
 
         print(f"[dch-debug] Return code: {result.returncode}", file=sys.stderr)
         if result.stdout:
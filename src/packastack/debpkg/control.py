@@ -16,12 +16,20 @@
 # You should have received a copy of the GNU General Public License along with
 # Packastack. If not, see <http://www.gnu.org/licenses/>.
 
-"""Debian control file parsing utilities using python-debian."""
+"""Debian control file parsing utilities using python-debian.
+
+:class:`ControlDocument` holds a debian/control file in memory. Parsing is
+cached by the sha256 of the file content, so every reader of the same
+content shares one parse, and edits are applied to the text line by line
+(preserving formatting) and written once by :meth:`ControlDocument.save`.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import re
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -33,7 +41,10 @@ with warnings.catch_warnings():
     from debian.deb822 import Deb822
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
+
+# Parsed control files kept in memory, by content sha256
+PARSE_CACHE_SIZE = 512
 
 
 @dataclass
@@ -177,24 +188,25 @@ def iter_control_paragraphs(control_path: Path) -> Iterator[Deb822]:
         yield from Deb822.iter_paragraphs(f, use_apt_pkg=False)
 
 
-def parse_control(control_path: Path) -> SourcePackage:
-    """Parse a debian/control file and return a SourcePackage.
+def parse_control_text(text: str, origin: str = "debian/control") -> SourcePackage:
+    """Parse the content of a debian/control file.
 
     Args:
-        control_path: Path to the debian/control file.
+        text: Content of the control file.
+        origin: Name of the file, used in error messages.
 
     Returns:
         SourcePackage with all stanzas parsed.
     """
-    paragraphs = list(iter_control_paragraphs(control_path))
+    paragraphs = list(Deb822.iter_paragraphs(text.splitlines(keepends=True), use_apt_pkg=False))
     if not paragraphs:
-        raise ValueError(f"Empty or invalid control file: {control_path}")
+        raise ValueError(f"Empty or invalid control file: {origin}")
 
     # First paragraph is the source stanza
     source_para = paragraphs[0]
     source_name = source_para.get("Source", "")
     if not source_name:
-        raise ValueError(f"Missing Source field in control file: {control_path}")
+        raise ValueError(f"Missing Source field in control file: {origin}")
 
     source = SourcePackage(
         name=source_name,
@@ -231,6 +243,218 @@ def parse_control(control_path: Path) -> SourcePackage:
     return source
 
 
+_parsed: OrderedDict[str, SourcePackage] = OrderedDict()
+
+
+def _parse_cached(digest: str, text: str, origin: str) -> SourcePackage:
+    """Parse control content once per digest.
+
+    The returned SourcePackage is shared between callers and must be
+    treated as read-only.
+    """
+    source = _parsed.get(digest)
+    if source is not None:
+        _parsed.move_to_end(digest)
+        return source
+    source = parse_control_text(text, origin)
+    _parsed[digest] = source
+    if len(_parsed) > PARSE_CACHE_SIZE:
+        _parsed.popitem(last=False)
+    return source
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_control(control_path: Path) -> SourcePackage:
+    """Parse a debian/control file and return a SourcePackage.
+
+    Files with the same content are only parsed once per process; the
+    returned SourcePackage is shared and must be treated as read-only.
+
+    Args:
+        control_path: Path to the debian/control file.
+
+    Returns:
+        SourcePackage with all stanzas parsed.
+    """
+    return ControlDocument.load(control_path).source
+
+
+class ControlDocument:
+    """A debian/control file held in memory.
+
+    Readers use :attr:`source`, parsed at most once per content hash.
+    Editing methods change the text in memory and return whether they
+    changed anything; :meth:`save` writes all pending edits at once.
+
+    Args:
+        path: Path to the debian/control file.
+        text: Current content of the file.
+    """
+
+    def __init__(self, path: Path, text: str) -> None:
+        self.path = path
+        self._text = text
+        self._saved_text = text
+        self.digest = _digest(text)
+
+    @classmethod
+    def load(cls, path: Path) -> ControlDocument:
+        """Read a control file."""
+        return cls(path, path.read_text(encoding="utf-8"))
+
+    @property
+    def text(self) -> str:
+        """Current content, including unsaved edits."""
+        return self._text
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are edits not yet written."""
+        return self._text != self._saved_text
+
+    @property
+    def source(self) -> SourcePackage:
+        """The parsed document (shared, read-only)."""
+        return _parse_cached(self.digest, self._text, str(self.path))
+
+    def refresh(self) -> bool:
+        """Re-read the file if it changed on disk.
+
+        Unsaved edits are kept; the file is only re-read when the
+        document has none.
+
+        Returns:
+            True if the content changed.
+        """
+        if self.dirty:
+            return False
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except OSError:
+            return False
+        if text == self._saved_text:
+            return False
+        self._saved_text = text
+        self._set_text(text)
+        return True
+
+    def save(self) -> bool:
+        """Write pending edits to the file.
+
+        Returns:
+            True if the file was written.
+        """
+        if not self.dirty:
+            return False
+        try:
+            self.path.write_text(self._text, encoding="utf-8")
+        except OSError:
+            return False
+        self._saved_text = self._text
+        return True
+
+    def _set_text(self, text: str) -> None:
+        self._text = text
+        self.digest = _digest(text)
+
+    def apply(self, edit: Callable[[str], str]) -> bool:
+        """Apply a text transformation.
+
+        Returns:
+            True if the content changed.
+        """
+        updated = edit(self._text)
+        if updated == self._text:
+            return False
+        self._set_text(updated)
+        return True
+
+    def replace_field(self, name: str, value: str) -> bool:
+        """Replace the value of the first field called ``name``.
+
+        The field and its continuation lines are replaced by
+        ``name: value``; a missing field is left alone.
+
+        Returns:
+            True if the content changed.
+        """
+        pattern = re.compile(rf"^{re.escape(name)}:(?:[^\n]*\n(?:[ \t].*\n)*)", re.MULTILINE)
+        return self.apply(lambda text: pattern.sub(lambda _m: f"{name}: {value}\n", text, count=1))
+
+    def fix_priority_extra(self) -> bool:
+        """Replace deprecated 'Priority: extra' with 'Priority: optional'."""
+        return self.apply(_fix_priority_extra_text)
+
+    def ensure_misc_pre_depends(self) -> bool:
+        """Add ${misc:Pre-Depends} to every binary package."""
+        return self.apply(_ensure_misc_pre_depends_text)
+
+    def update_dependencies(
+        self,
+        new_deps: list[ParsedDependency],
+        version_overrides: dict[str, str] | None = None,
+        binary_name: str | None = None,
+    ) -> bool:
+        """Merge dependencies into the Depends of python3-* binaries.
+
+        Args:
+            new_deps: New dependencies to merge.
+            version_overrides: Optional version constraints to apply.
+            binary_name: Specific binary package to update (None = all python3-* binaries).
+
+        Returns:
+            True if the content changed.
+        """
+        target_binaries = [
+            binary
+            for binary in self.source.binaries
+            if (not binary_name or binary.name == binary_name) and binary.name.startswith("python3-")
+        ]
+        if not target_binaries:
+            return False
+
+        lines = self._text.split("\n")
+        modified = False
+
+        for binary in target_binaries:
+            # Merge dependencies
+            merged = merge_dependencies(binary.depends, new_deps, version_overrides)
+            if merged == binary.depends:
+                continue
+
+            # Find and update the Depends field in the file
+            in_binary = False
+            depends_start = -1
+            depends_end = -1
+
+            for i, line in enumerate(lines):
+                if line.startswith("Package:") and binary.name in line:
+                    in_binary = True
+                elif in_binary and line.startswith("Package:"):
+                    in_binary = False
+                elif in_binary and line.startswith("Depends:"):
+                    depends_start = i
+                    # Find end of depends field (continuation lines start with space)
+                    j = i + 1
+                    while j < len(lines) and lines[j].startswith((" ", "\t")):
+                        j += 1
+                    depends_end = j
+                    break
+
+            if depends_start >= 0 and depends_end >= 0:
+                # Replace depends field
+                new_depends_line = "Depends: " + format_dependency_list(merged)
+                lines[depends_start:depends_end] = [new_depends_line]
+                modified = True
+
+        if modified:
+            self._set_text("\n".join(lines))
+        return modified
+
+
 def get_changelog_version(changelog_path: Path) -> str:
     """Extract version from debian/changelog.
 
@@ -310,6 +534,15 @@ def merge_dependencies(
     return result
 
 
+def _load_document(control_path: Path) -> ControlDocument | None:
+    if not control_path.exists():
+        return None
+    try:
+        return ControlDocument.load(control_path)
+    except OSError:
+        return None
+
+
 def update_control_dependencies(
     control_path: Path,
     new_deps: list[ParsedDependency],
@@ -327,108 +560,27 @@ def update_control_dependencies(
     Returns:
         True if file was modified, False otherwise.
     """
-    if not control_path.exists():
+    doc = _load_document(control_path)
+    if doc is None:
         return False
+    return doc.update_dependencies(new_deps, version_overrides, binary_name) and doc.save()
 
-    content = control_path.read_text(encoding="utf-8")
-    lines = content.split("\n")
-
-    # Parse to get structure
-    source = parse_control(control_path)
-
-    # Find which binaries to update
-    target_binaries = []
-    for binary in source.binaries:
-        if binary_name and binary.name != binary_name:
-            continue
-        if binary.name.startswith("python3-"):
-            target_binaries.append(binary)
-
-    if not target_binaries:
-        return False
-
-    modified = False
-
-    for binary in target_binaries:
-        # Merge dependencies
-        merged = merge_dependencies(binary.depends, new_deps, version_overrides)
-        if merged == binary.depends:
-            continue
-
-        # Find and update the Depends field in the file
-        in_binary = False
-        depends_start = -1
-        depends_end = -1
-
-        for i, line in enumerate(lines):
-            if line.startswith("Package:") and binary.name in line:
-                in_binary = True
-            elif in_binary and line.startswith("Package:"):
-                in_binary = False
-            elif in_binary and line.startswith("Depends:"):
-                depends_start = i
-                # Find end of depends field (continuation lines start with space)
-                j = i + 1
-                while j < len(lines) and lines[j].startswith((" ", "\t")):
-                    j += 1
-                depends_end = j
-                break
-
-        if depends_start >= 0 and depends_end >= 0:
-            # Replace depends field
-            new_depends_line = "Depends: " + format_dependency_list(merged)
-            lines[depends_start:depends_end] = [new_depends_line]
-            modified = True
-
-    if modified:
-        control_path.write_text("\n".join(lines), encoding="utf-8")
-
-    return modified
-
-
-def fix_priority_extra(control_path: Path) -> bool:
-    """Replace deprecated 'Priority: extra' with 'Priority: optional'.
-
-    Since Debian Policy 4.0.1, 'extra' priority is deprecated and
-    should be replaced with 'optional'.
-
-    Args:
-        control_path: Path to the debian/control file.
-
-    Returns:
-        True if any changes were made.
-    """
-    if not control_path.exists():
-        return False
-
-    try:
-        content = control_path.read_text(encoding="utf-8")
-    except OSError:
-        return False
 
+def _fix_priority_extra_text(content: str) -> str:
     # Case-insensitive match for 'Priority: extra' (with possible whitespace)
-    updated = re.sub(
+    return re.sub(
         r"^(Priority:\s*)extra\s*$",
         r"\1optional",
         content,
         flags=re.MULTILINE | re.IGNORECASE,
     )
 
-    if updated != content:
-        try:
-            control_path.write_text(updated, encoding="utf-8")
-            return True
-        except OSError:
-            return False
-
-    return False
-
 
-def ensure_misc_pre_depends(control_path: Path) -> bool:
-    """Ensure packages with systemd units have Pre-Depends: ${misc:Pre-Depends}.
+def fix_priority_extra(control_path: Path) -> bool:
+    """Replace deprecated 'Priority: extra' with 'Priority: optional'.
 
-    This is required for packages using init-system-helpers to avoid
-    the 'missing-dependency-on-init-system-helpers' lintian warning.
+    Since Debian Policy 4.0.1, 'extra' priority is deprecated and
+    should be replaced with 'optional'.
 
     Args:
         control_path: Path to the debian/control file.
@@ -436,20 +588,18 @@ def ensure_misc_pre_depends(control_path: Path) -> bool:
     Returns:
         True if any changes were made.
     """
-    if not control_path.exists():
+    doc = _load_document(control_path)
+    if doc is None:
         return False
+    return doc.fix_priority_extra() and doc.save()
 
-    try:
-        content = control_path.read_text(encoding="utf-8")
-    except OSError:
-        return False
 
+def _ensure_misc_pre_depends_text(content: str) -> str:
     # Check if ${misc:Pre-Depends} is already present
     if "${misc:Pre-Depends}" in content:
-        return False
+        return content
 
     lines = content.split("\n")
-    modified = False
     i = 0
 
     while i < len(lines):
@@ -471,7 +621,6 @@ def ensure_misc_pre_depends(control_path: Path) -> bool:
                             lines[stanza_end] += " ${misc:Pre-Depends},"
                         else:
                             lines[stanza_end] += ", ${misc:Pre-Depends}"
-                        modified = True
                 stanza_end += 1
 
             # If no Pre-Depends exists, add one after Architecture:
@@ -479,21 +628,31 @@ def ensure_misc_pre_depends(control_path: Path) -> bool:
                 for j in range(i + 1, stanza_end):
                     if lines[j].startswith("Architecture:"):
                         lines.insert(j + 1, "Pre-Depends: ${misc:Pre-Depends}")
-                        modified = True
                         break
 
             i = stanza_end
         else:
             i += 1
 
-    if modified:
-        try:
-            control_path.write_text("\n".join(lines), encoding="utf-8")
-            return True
-        except OSError:
-            return False
+    return "\n".join(lines)
+
+
+def ensure_misc_pre_depends(control_path: Path) -> bool:
+    """Ensure packages with systemd units have Pre-Depends: ${misc:Pre-Depends}.
+
+    This is required for packages using init-system-helpers to avoid
+    the 'missing-dependency-on-init-system-helpers' lintian warning.
 
-    return False
+    Args:
+        control_path: Path to the debian/control file.
+
+    Returns:
+        True if any changes were made.
+    """
+    doc = _load_document(control_path)
+    if doc is None:
+        return False
+    return doc.ensure_misc_pre_depends() and doc.save()
 
 
 if __name__ == "__main__":
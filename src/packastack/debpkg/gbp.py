@@ -24,15 +24,23 @@ and optional binary building via sbuild.
 
 from __future__ import annotations
 
+import contextlib
+import fcntl
+import hashlib
 import os
+import re
+import shutil
 import subprocess
+import tempfile
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packastack.core.spans import command_span
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
 
 
 class PatchFailureReason(Enum):
@@ -108,16 +116,18 @@ def run_command(
         run_env.update(env)
 
     if capture:
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            env=run_env,
-            capture_output=True,
-            text=True,
-        )
+        with command_span(cmd):
+            result = subprocess.run(
+                cmd,
+                cwd=cwd,
+                env=run_env,
+                capture_output=True,
+                text=True,
+            )
         return result.returncode, result.stdout, result.stderr
     else:
-        result = subprocess.run(cmd, cwd=cwd, env=run_env)
+        with command_span(cmd):
+            result = subprocess.run(cmd, cwd=cwd, env=run_env)
         return result.returncode, "", ""
 
 
@@ -220,6 +230,8 @@ class ImportOrigResult:
     success: bool
     output: str
     upstream_version: str = ""
+    skipped: bool = False  # Already imported, nothing was done
+    upstream_tag: str = ""  # Ref to merge, when it is not the version itself
 
 
 @dataclass
@@ -346,13 +358,18 @@ def import_orig(
     upstream_branch: str | None = None,
     pristine_tar: bool = True,
     merge: bool = True,
+    tarball_sha256: str | None = None,
+    import_store: Path | None = None,
 ) -> ImportOrigResult:
     """Import an upstream tarball using gbp import-orig.
 
     This imports the tarball, creates/updates the upstream branch,
     and optionally stores it in the pristine-tar branch.
 
-    If the upstream tag already exists, skips the import and returns success.
+    If the upstream tag already exists, or a tarball with the same sha256
+    was imported before (see find_upstream_import), skips the import and
+    returns success. With ``import_store``, imports recorded by earlier
+    runs are found too, and this one is kept for later runs.
 
     Args:
         repo_path: Path to the git repository.
@@ -361,20 +378,33 @@ def import_orig(
         upstream_branch: Name of upstream branch (e.g., "upstream-dalmatian").
         pristine_tar: If True, store tarball in pristine-tar branch.
         merge: If True, merge upstream into the current branch.
+        tarball_sha256: sha256 of the tarball, computed if not given.
+        import_store: Store of imports recorded by earlier runs (see
+            upstream_import_store).
 
     Returns:
         ImportOrigResult with success status.
     """
     # Check if upstream tag already exists (e.g., from previous push)
-    if upstream_version:
-        check_tag_cmd = ["git", "tag", "-l", upstream_version]
-        tag_rc, tag_out, _ = run_command(check_tag_cmd, cwd=repo_path)
-        if tag_rc == 0 and tag_out.strip() == upstream_version:
-            # Tag exists, skip import
+    skipped = _existing_upstream_tag(repo_path, upstream_version)
+    if skipped:
+        return skipped
+
+    # The same tarball may have been imported under another tag or branch
+    if tarball_sha256 is None:
+        try:
+            tarball_sha256 = _sha256_file(tarball_path)
+        except OSError:
+            tarball_sha256 = ""
+    if tarball_sha256:
+        record = find_upstream_import(repo_path, sha256=tarball_sha256, import_store=import_store)
+        if record is not None:
             return ImportOrigResult(
                 success=True,
-                output=f"Upstream tag '{upstream_version}' already exists, skipping import",
-                upstream_version=upstream_version,
+                output=f"Tarball already imported as '{record.version}', skipping import",
+                upstream_version=record.version,
+                skipped=True,
+                upstream_tag=record.commit,
             )
 
     cmd = ["gbp", "import-orig", "--no-interactive"]
@@ -411,10 +441,338 @@ def import_orig(
                     version = parts[1].rstrip("]").strip()
                     break
 
+    success = returncode == 0
+    tag = upstream_tag_name(version) if version else ""
+    if success and tarball_sha256:
+        # The imported commit is the version's tag, or the upstream branch tip
+        # if gbp tagged it differently
+        recorded = record_upstream_import(repo_path, tag, version, sha256=tarball_sha256) if tag else ""
+        if not recorded:
+            recorded = record_upstream_import(repo_path, upstream_branch or "HEAD", version, sha256=tarball_sha256)
+        if recorded and import_store is not None:
+            save_upstream_import(repo_path, import_store, recorded)
+
     return ImportOrigResult(
-        success=returncode == 0,
+        success=success,
         output=output,
         upstream_version=version,
+        upstream_tag=tag if tag != version else "",
+    )
+
+
+# Notes recording the source of each upstream import, attached to the
+# imported upstream commit
+UPSTREAM_IMPORT_NOTES_REF = "refs/notes/packastack-upstream"
+
+# Packaging clones only live for one run, so the notes, and the commits they
+# describe (as refs/upstream-imports/<commit>), are kept in a bare
+# repository per package under the cache root
+UPSTREAM_IMPORTS_DIR = "upstream-imports"
+_IMPORT_REF_PREFIX = "refs/upstream-imports/"
+
+
+@dataclass
+class UpstreamImportRecord:
+    """An upstream import recorded in the packaging repository."""
+
+    commit: str
+    version: str = ""
+    sha256: str = ""  # Of the imported tarball
+    upstream_commit: str = ""  # Of the upstream git commit, for snapshots
+
+    def to_note(self) -> str:
+        lines = [f"version {self.version}"]
+        if self.sha256:
+            lines.append(f"sha256 {self.sha256}")
+        if self.upstream_commit:
+            lines.append(f"upstream-commit {self.upstream_commit}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_note(cls, commit: str, text: str) -> UpstreamImportRecord:
+        values = dict(line.split(" ", 1) for line in text.splitlines() if " " in line)
+        return cls(
+            commit=commit,
+            version=values.get("version", ""),
+            sha256=values.get("sha256", ""),
+            upstream_commit=values.get("upstream-commit", ""),
+        )
+
+
+def _sha256_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def upstream_tag_name(version: str) -> str:
+    """Return the git tag for an upstream version, mangled as gbp does."""
+    return version.replace(":", "%").replace("~", "_")
+
+
+def _existing_upstream_tag(repo_path: Path, upstream_version: str | None) -> ImportOrigResult | None:
+    if not upstream_version:
+        return None
+    tag = upstream_tag_name(upstream_version)
+    tag_rc, tag_out, _ = run_command(["git", "tag", "-l", tag], cwd=repo_path)
+    if tag_rc == 0 and tag_out.strip() == tag:
+        return ImportOrigResult(
+            success=True,
+            output=f"Upstream tag '{tag}' already exists, skipping import",
+            upstream_version=upstream_version,
+            skipped=True,
+            upstream_tag=tag if tag != upstream_version else "",
+        )
+    return None
+
+
+def list_upstream_imports(repo_path: Path) -> list[UpstreamImportRecord]:
+    """Return every upstream import recorded in the repository's notes."""
+    rc, out, _ = run_command(["git", "notes", f"--ref={UPSTREAM_IMPORT_NOTES_REF}", "list"], cwd=repo_path)
+    pairs = [line.split() for line in out.splitlines() if len(line.split()) == 2] if rc == 0 else []
+    if not pairs:
+        return []
+
+    # Read all note blobs in one call
+    batch = "".join(f"{note}\n" for note, _commit in pairs)
+    with command_span(["git", "cat-file", "--batch"]):
+        result = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_path,
+            input=batch.encode(),
+            capture_output=True,
+        )
+    if result.returncode != 0:
+        return []
+
+    records = []
+    data = result.stdout
+    pos = 0
+    for _note, commit in pairs:
+        header_end = data.index(b"\n", pos)
+        header = data[pos:header_end].split()
+        if len(header) != 3:
+            # "<object> missing"
+            pos = header_end + 1
+            continue
+        size = int(header[2])
+        body = data[header_end + 1 : header_end + 1 + size].decode("utf-8", "replace")
+        pos = header_end + 1 + size + 1
+        records.append(UpstreamImportRecord.from_note(commit, body))
+    return records
+
+
+def upstream_import_store(cache_root: Path, package: str) -> Path:
+    """Return the store of a package's recorded upstream imports."""
+    return cache_root / UPSTREAM_IMPORTS_DIR / f"{package}.git"
+
+
+def _has_commit(repo_path: Path, commit: str) -> bool:
+    rc, _, _ = run_command(["git", "cat-file", "-e", f"{commit}^{{commit}}"], cwd=repo_path)
+    return rc == 0
+
+
+def load_upstream_imports(repo_path: Path, import_store: Path) -> bool:
+    """Fetch the imports recorded by earlier runs into a packaging clone.
+
+    Returns:
+        True if the store had imports to fetch.
+    """
+    if not (import_store / "HEAD").exists():
+        return False
+    rc, _, _ = run_command(
+        [
+            "git", "fetch", "--no-tags", str(import_store),
+            f"+{UPSTREAM_IMPORT_NOTES_REF}:{UPSTREAM_IMPORT_NOTES_REF}",
+        ],
+        cwd=repo_path,
+    )
+    return rc == 0
+
+
+@contextlib.contextmanager
+def _store_lock(import_store: Path) -> Iterator[None]:
+    import_store.parent.mkdir(parents=True, exist_ok=True)
+    with (import_store.parent / f".{import_store.name}.lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def save_upstream_import(repo_path: Path, import_store: Path, commit: str) -> bool:
+    """Keep a recorded import, and the commit it describes, for later runs.
+
+    Imports other runs saved since this clone loaded the store are merged
+    into the clone's notes first, so none are lost.
+
+    Returns:
+        True if the store was updated.
+    """
+    saved = f"{UPSTREAM_IMPORT_NOTES_REF}-saved"
+    with _store_lock(import_store):
+        if not (import_store / "HEAD").exists():
+            rc, _, _ = run_command(["git", "init", "--bare", "--quiet", str(import_store)], cwd=repo_path)
+            if rc != 0:
+                return False
+        rc, _, _ = run_command(
+            ["git", "fetch", "--no-tags", str(import_store), f"+{UPSTREAM_IMPORT_NOTES_REF}:{saved}"],
+            cwd=repo_path,
+        )
+        if rc == 0:
+            rc, _, _ = run_command(
+                ["git", "notes", f"--ref={UPSTREAM_IMPORT_NOTES_REF}", "merge", "-s", "cat_sort_uniq", saved],
+                cwd=repo_path,
+            )
+            if rc != 0:
+                return False
+        rc, _, _ = run_command(
+            [
+                "git", "push", "--quiet", "--force", str(import_store),
+                f"{UPSTREAM_IMPORT_NOTES_REF}:{UPSTREAM_IMPORT_NOTES_REF}",
+                f"{commit}:{_IMPORT_REF_PREFIX}{commit}",
+            ],
+            cwd=repo_path,
+        )
+    return rc == 0
+
+
+def find_upstream_import(
+    repo_path: Path,
+    sha256: str = "",
+    upstream_commit: str = "",
+    import_store: Path | None = None,
+) -> UpstreamImportRecord | None:
+    """Find an earlier import of the same tarball or upstream commit.
+
+    Args:
+        repo_path: Path to the packaging repository.
+        sha256: sha256 of the orig tarball.
+        upstream_commit: Upstream git commit of a snapshot.
+        import_store: Store of imports recorded by earlier runs, whose
+            commits are fetched into the repository when found.
+
+    Returns:
+        The recorded import, or None if there is none or its commit is not
+        available.
+    """
+    if import_store is not None:
+        load_upstream_imports(repo_path, import_store)
+    for record in list_upstream_imports(repo_path):
+        if (sha256 and record.sha256 == sha256) or (upstream_commit and record.upstream_commit == upstream_commit):
+            if _has_commit(repo_path, record.commit):
+                return record
+            if import_store is not None:
+                rc, _, _ = run_command(
+                    ["git", "fetch", "--no-tags", str(import_store), f"{_IMPORT_REF_PREFIX}{record.commit}"],
+                    cwd=repo_path,
+                )
+                if rc == 0 and _has_commit(repo_path, record.commit):
+                    return record
+    return None
+
+
+def record_upstream_import(
+    repo_path: Path,
+    ref: str,
+    version: str,
+    sha256: str = "",
+    upstream_commit: str = "",
+) -> str:
+    """Attach a note describing an upstream import to the imported commit.
+
+    Returns:
+        The imported commit, or "" if the note was not written.
+    """
+    rc, out, _ = run_command(["git", "rev-parse", "--verify", f"{ref}^{{commit}}"], cwd=repo_path)
+    if rc != 0:
+        return ""
+    record = UpstreamImportRecord(
+        commit=out.strip(), version=version, sha256=sha256, upstream_commit=upstream_commit
+    )
+    rc, _, _ = run_command(
+        ["git", "notes", f"--ref={UPSTREAM_IMPORT_NOTES_REF}", "add", "-f", "-m", record.to_note(), record.commit],
+        cwd=repo_path,
+    )
+    return record.commit if rc == 0 else ""
+
+
+def import_upstream_commit(
+    repo_path: Path,
+    mirror_path: Path,
+    commit: str,
+    upstream_version: str,
+    upstream_branch: str,
+    import_store: Path | None = None,
+) -> ImportOrigResult:
+    """Import a snapshot from the upstream git mirror instead of a tarball.
+
+    The tree of the upstream commit is committed on top of the upstream
+    branch and tagged with the upstream version, which is what gbp
+    import-orig would produce from a ``git archive`` of the same commit,
+    without writing, unpacking or storing a tarball. No pristine-tar data
+    is recorded; snapshot tarballs can be regenerated from the commit.
+
+    Args:
+        repo_path: Path to the packaging repository.
+        mirror_path: Path to the upstream git clone.
+        commit: Upstream commit sha to import.
+        upstream_version: Version used for the commit message and tag.
+        upstream_branch: Name of the upstream branch to advance.
+        import_store: Store of imports recorded by earlier runs (see
+            upstream_import_store).
+
+    Returns:
+        ImportOrigResult with success status.
+    """
+    skipped = _existing_upstream_tag(repo_path, upstream_version)
+    if skipped:
+        return skipped
+    record = find_upstream_import(repo_path, upstream_commit=commit, import_store=import_store)
+    if record is not None:
+        return ImportOrigResult(
+            success=True,
+            output=f"Upstream commit {commit[:12]} already imported as '{record.version}', skipping import",
+            upstream_version=record.version,
+            skipped=True,
+            upstream_tag=record.commit,
+        )
+
+    def fail(step: str, out: str, err: str) -> ImportOrigResult:
+        return ImportOrigResult(success=False, output=f"{step} failed: {(err or out).strip()}")
+
+    rc, out, err = run_command(["git", "fetch", "--no-tags", str(mirror_path), commit], cwd=repo_path)
+    if rc != 0:
+        return fail("Fetching upstream commit", out, err)
+
+    branch_ref = f"refs/heads/{upstream_branch}"
+    rc, out, _ = run_command(["git", "rev-parse", "--verify", "--quiet", branch_ref], cwd=repo_path)
+    parent = out.strip() if rc == 0 else ""
+
+    message = f"New upstream snapshot {upstream_version}\n\nImported from upstream commit {commit}.\n"
+    cmd = ["git", "commit-tree", f"{commit}^{{tree}}", "-m", message]
+    if parent:
+        cmd[3:3] = ["-p", parent]
+    rc, out, err = run_command(cmd, cwd=repo_path)
+    if rc != 0:
+        return fail("Creating upstream commit", out, err)
+    new_commit = out.strip()
+
+    rc, out, err = run_command(["git", "update-ref", branch_ref, new_commit, parent], cwd=repo_path)
+    if rc != 0:
+        return fail(f"Updating {upstream_branch}", out, err)
+    tag = upstream_tag_name(upstream_version)
+    rc, out, err = run_command(["git", "tag", tag, new_commit], cwd=repo_path)
+    if rc != 0:
+        return fail(f"Tagging {tag}", out, err)
+
+    if record_upstream_import(repo_path, new_commit, upstream_version, upstream_commit=commit) and import_store:
+        save_upstream_import(repo_path, import_store, new_commit)
+    return ImportOrigResult(
+        success=True,
+        output=f"Imported upstream commit {commit[:12]} as {upstream_version}",
+        upstream_version=upstream_version,
+        upstream_tag=tag if tag != upstream_version else "",
     )
 
 
@@ -563,6 +921,181 @@ def check_upstreamed_patches(
     return reports
 
 
+_STRIP_LEVEL_RE = re.compile(r"^-p(\d+)$")
+
+# Context lines git apply may ignore before a patch counts as needing fuzz
+FUZZ_CONTEXT = 1
+
+
+@dataclass
+class PatchSeriesAnalysis:
+    """Outcome of applying a whole patch series to a temporary index.
+
+    ``available`` is False when the series could not be analysed (no
+    series file, not a git checkout, ...); callers then fall back to
+    letting gbp pq find out.
+    """
+
+    available: bool
+    patches: list[PatchHealthReport] = field(default_factory=list)
+    error: str = ""
+
+    def with_reason(self, *reasons: PatchFailureReason) -> list[PatchHealthReport]:
+        """Reports of the patches classified with any of the reasons."""
+        return [r for r in self.patches if r.failure_reason in reasons]
+
+    @property
+    def upstreamed(self) -> list[PatchHealthReport]:
+        """Patches whose changes are already in the tree."""
+        return self.with_reason(PatchFailureReason.UPSTREAMED)
+
+    @property
+    def blocking(self) -> list[PatchHealthReport]:
+        """Patches that gbp pq import cannot apply."""
+        return self.with_reason(PatchFailureReason.CONFLICT, PatchFailureReason.MISSING_FILE)
+
+    @property
+    def needs_refresh(self) -> bool:
+        """True if some patch only applies with an offset or fuzz."""
+        return bool(self.with_reason(PatchFailureReason.OFFSET, PatchFailureReason.FUZZ))
+
+    @property
+    def needs_fuzz(self) -> bool:
+        """True if some patch does not apply without fuzz."""
+        return bool(self.with_reason(PatchFailureReason.FUZZ))
+
+    def counts(self) -> dict[str, int]:
+        """Number of patches per classification (``clean`` for no issue)."""
+        result: dict[str, int] = {}
+        for report in self.patches:
+            key = report.failure_reason.value if report.failure_reason else "clean"
+            result[key] = result.get(key, 0) + 1
+        return result
+
+
+def read_patch_series(patches_dir: Path) -> list[tuple[str, int]]:
+    """Return the (patch name, strip level) entries of debian/patches/series."""
+    entries = []
+    for line in (patches_dir / "series").read_text().splitlines():
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        strip = 1
+        for option in fields[1:]:
+            match = _STRIP_LEVEL_RE.match(option)
+            if match:
+                strip = int(match.group(1))
+        entries.append((fields[0], strip))
+    return entries
+
+
+def _classify_patch(
+    repo_path: Path,
+    env: dict[str, str],
+    index: Path,
+    patch_name: str,
+    patch_file: Path,
+    strip: int,
+) -> PatchHealthReport:
+    """Classify one patch against the temporary index, applying it if possible.
+
+    Attempts go from strictest to loosest: reverse check (upstreamed),
+    plain apply (clean or offset), reduced context (fuzz), then a three-way
+    merge. A failed attempt leaves the index as it was.
+    """
+    base = ["git", "apply", "--cached", f"-p{strip}"]
+
+    def attempt(*args: str) -> tuple[int, str]:
+        backup = index.with_suffix(".bak")
+        shutil.copyfile(index, backup)
+        rc, out, err = run_command([*base, *args, str(patch_file)], cwd=repo_path, env=env)
+        if rc != 0:
+            shutil.copyfile(backup, index)
+        return rc, out + err
+
+    def report(reason: PatchFailureReason | None, action: str = "", output: str = "") -> PatchHealthReport:
+        return PatchHealthReport(
+            patch_name=patch_name,
+            success=reason in (None, PatchFailureReason.OFFSET, PatchFailureReason.FUZZ),
+            failure_reason=reason,
+            suggested_action=action,
+            output=output.strip(),
+        )
+
+    rc, output = attempt("--check", "--reverse")
+    if rc == 0:
+        return report(PatchFailureReason.UPSTREAMED, "Patch appears to be in upstream; consider dropping")
+
+    rc, output = attempt("-v")
+    if rc == 0:
+        if "(offset " in output:
+            return report(PatchFailureReason.OFFSET, "Refresh patch with gbp pq export", output)
+        return report(None)
+
+    rc, fuzz_output = attempt(f"-C{FUZZ_CONTEXT}")
+    if rc != 0:
+        rc, fuzz_output = attempt("--3way")
+    if rc == 0:
+        return report(PatchFailureReason.FUZZ, "Refresh patch with gbp pq export", fuzz_output)
+
+    if "does not exist in index" in output or "No such file" in output:
+        return report(
+            PatchFailureReason.MISSING_FILE, "File removed upstream; drop or update patch", output
+        )
+    return report(PatchFailureReason.CONFLICT, "Manual conflict resolution required", fuzz_output or output)
+
+
+def analyze_patch_series(repo_path: Path, patches_dir: Path | None = None) -> PatchSeriesAnalysis:
+    """Classify every patch in debian/patches in a single pass.
+
+    The series is applied in order to a temporary index built from HEAD,
+    so each patch is checked against the tree the previous ones produce,
+    without touching the working tree, the real index or the patch-queue
+    branch. Every patch ends up clean, offset, fuzz, upstreamed, missing
+    file or conflict, which tells the caller up front whether gbp pq import
+    will succeed and whether the patches need refreshing.
+
+    Args:
+        repo_path: Path to the packaging git repository.
+        patches_dir: Path to debian/patches (default: repo_path/debian/patches).
+
+    Returns:
+        PatchSeriesAnalysis for the series.
+    """
+    if patches_dir is None:
+        patches_dir = repo_path / "debian" / "patches"
+    if not (patches_dir / "series").is_file():
+        return PatchSeriesAnalysis(available=False, error="no patch series")
+
+    try:
+        series = read_patch_series(patches_dir)
+    except OSError as e:
+        return PatchSeriesAnalysis(available=False, error=str(e))
+
+    with tempfile.TemporaryDirectory(prefix="packastack-patches-") as tmp:
+        index = Path(tmp) / "index"
+        env = {"GIT_INDEX_FILE": str(index)}
+        rc, out, err = run_command(["git", "read-tree", "HEAD"], cwd=repo_path, env=env)
+        if rc != 0:
+            return PatchSeriesAnalysis(available=False, error=(err or out).strip())
+
+        analysis = PatchSeriesAnalysis(available=True)
+        for patch_name, strip in series:
+            patch_file = patches_dir / patch_name
+            if not patch_file.is_file():
+                analysis.patches.append(
+                    PatchHealthReport(
+                        patch_name=patch_name,
+                        success=False,
+                        failure_reason=PatchFailureReason.MISSING_FILE,
+                        suggested_action="Patch listed in series does not exist",
+                    )
+                )
+                continue
+            analysis.patches.append(_classify_patch(repo_path, env, index, patch_name, patch_file, strip))
+    return analysis
+
+
 def build_source(
     repo_path: Path,
     output_dir: Path | None = None,
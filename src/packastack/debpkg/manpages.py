@@ -28,6 +28,8 @@ import re
 from dataclasses import dataclass
 from pathlib import Path
 
+from packastack.debpkg.control import ControlDocument
+
 
 @dataclass
 class ManPagesConfig:
@@ -85,7 +87,10 @@ def has_sphinx_build_dep(control_path: Path) -> bool:
     if not control_path.exists():
         return False
 
-    content = control_path.read_text(encoding="utf-8")
+    return _has_sphinx_build_dep_text(control_path.read_text(encoding="utf-8"))
+
+
+def _has_sphinx_build_dep_text(content: str) -> bool:
     # Look for python3-sphinx in Build-Depends or Build-Depends-Indep
     return bool(re.search(r"python3-sphinx", content))
 
@@ -102,10 +107,14 @@ def add_sphinx_build_dep(control_path: Path) -> bool:
     if not control_path.exists():
         return False
 
-    if has_sphinx_build_dep(control_path):
-        return False
+    control = ControlDocument.load(control_path)
+    return control.apply(_add_sphinx_build_dep_text) and control.save()
+
+
+def _add_sphinx_build_dep_text(content: str) -> str:
+    if _has_sphinx_build_dep_text(content):
+        return content
 
-    content = control_path.read_text(encoding="utf-8")
     lines = content.split("\n")
     modified = False
 
@@ -138,9 +147,8 @@ def add_sphinx_build_dep(control_path: Path) -> bool:
                 break
 
     if modified:
-        control_path.write_text("\n".join(lines), encoding="utf-8")
-
-    return modified
+        return "\n".join(lines)
+    return content
 
 
 def has_man_page_rules(rules_path: Path) -> bool:
@@ -277,8 +285,10 @@ def get_main_package_name(control_path: Path) -> str | None:
     if not control_path.exists():
         return None
 
-    content = control_path.read_text(encoding="utf-8")
+    return _main_package_name(control_path.read_text(encoding="utf-8"))
+
 
+def _main_package_name(content: str) -> str | None:
     # Find all Package: lines
     packages = re.findall(r"^Package:\s*(.+)$", content, re.MULTILINE)
 
@@ -337,13 +347,19 @@ def apply_man_pages_support(workspace: Path) -> ManPagesResult:
     control_path = debian_dir / "control"
     rules_path = debian_dir / "rules"
 
+    if not control_path.exists():
+        return ManPagesResult(applied=False)
+
+    # Read debian/control once for both the package name and the edit
+    control = ControlDocument.load(control_path)
+
     # Get main package name for .manpages file
-    main_package = get_main_package_name(control_path)
+    main_package = _main_package_name(control.text)
     if not main_package:
         return ManPagesResult(applied=False)
 
     # Apply changes
-    control_modified = add_sphinx_build_dep(control_path)
+    control_modified = control.apply(_add_sphinx_build_dep_text) and control.save()
     rules_modified = patch_rules_for_man_pages(rules_path, config.doc_source_dir)
     manpages_created = create_manpages_file(debian_dir, main_package)
 
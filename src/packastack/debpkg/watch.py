@@ -39,6 +39,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from packastack.core.spans import command_span
+
 
 class DetectedWatchMode(Enum):
     """Detected upstream source type from debian/watch."""
@@ -736,19 +738,20 @@ def run_uscan_dehs(
         )
 
     try:
-        result = subprocess.run(
-            [
-                "uscan",
-                "--dehs",  # Output DEHS XML format
-                "--report",  # Report only, don't download
-                "--safe",  # Don't follow redirects to untrusted hosts
-                "--no-download",  # Extra safety: don't download anything
-            ],
-            cwd=packaging_repo,
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
+        with command_span(["uscan"]):
+            result = subprocess.run(
+                [
+                    "uscan",
+                    "--dehs",  # Output DEHS XML format
+                    "--report",  # Report only, don't download
+                    "--safe",  # Don't follow redirects to untrusted hosts
+                    "--no-download",  # Extra safety: don't download anything
+                ],
+                cwd=packaging_repo,
+                capture_output=True,
+                text=True,
+                timeout=timeout_seconds,
+            )
 
         # uscan returns various exit codes:
         # 0 = up to date
@@ -903,42 +906,27 @@ def cache_uscan_result(
     )
 
 
-def update_signing_key(pkg_repo: Path, releases_repo: Path, series: str, is_snapshot: bool = False) -> bool:
-    """Update or remove debian/upstream/signing-key.asc based on build type.
+def find_series_signing_key(releases_repo: Path, series: str) -> Path | None:
+    """Locate the OpenStack release signing key for a series.
 
-    For snapshot builds, removes the signing key file since snapshots are unsigned.
-    For release builds, updates the signing key for the current series.
+    The openstack/releases documentation lists the cycle signing keys in
+    doc/source/index.rst and ships the armoured keys under doc/source/_static.
 
     Args:
-        pkg_repo: Path to the package repository.
         releases_repo: Path to the openstack-releases repository.
         series: OpenStack series name (e.g., "2026.1", "gazpacho").
-        is_snapshot: True for snapshot builds (removes key), False for releases (updates key).
 
     Returns:
-        True if signing key was updated or removed, False otherwise.
+        Path to the armoured key file, or None if it cannot be found.
     """
-    signing_key_path = pkg_repo / "debian" / "upstream" / "signing-key.asc"
-
-    # For snapshot builds, remove the signing key if it exists
-    if is_snapshot:
-        if signing_key_path.exists():
-            try:
-                signing_key_path.unlink()
-                return True
-            except OSError:
-                return False
-        return False
-
-    # For release builds, update the signing key
     index_path = releases_repo / "doc" / "source" / "index.rst"
     if not index_path.exists():
-        return False
+        return None
 
     try:
         content = index_path.read_text(encoding="utf-8", errors="replace")
     except OSError:
-        return False
+        return None
 
     # Parse the index.rst to find the signing key for the series
     # Format is multi-line:
@@ -964,7 +952,7 @@ def update_signing_key(pkg_repo: Path, releases_repo: Path, series: str, is_snap
                 break
 
     if not key_id:
-        return False
+        return None
 
     # Construct the key file path directly - the naming convention is consistent:
     # Key ID 0x<hex> maps to _static/0x<hex>.txt or static/0x<hex>.txt
@@ -975,6 +963,41 @@ def update_signing_key(pkg_repo: Path, releases_repo: Path, series: str, is_snap
         key_file_path = releases_repo / "doc" / "source" / "static" / f"{key_id}.txt"
 
     if not key_file_path.exists():
+        return None
+
+    return key_file_path
+
+
+def update_signing_key(pkg_repo: Path, releases_repo: Path, series: str, is_snapshot: bool = False) -> bool:
+    """Update or remove debian/upstream/signing-key.asc based on build type.
+
+    For snapshot builds, removes the signing key file since snapshots are unsigned.
+    For release builds, updates the signing key for the current series.
+
+    Args:
+        pkg_repo: Path to the package repository.
+        releases_repo: Path to the openstack-releases repository.
+        series: OpenStack series name (e.g., "2026.1", "gazpacho").
+        is_snapshot: True for snapshot builds (removes key), False for releases (updates key).
+
+    Returns:
+        True if signing key was updated or removed, False otherwise.
+    """
+    signing_key_path = pkg_repo / "debian" / "upstream" / "signing-key.asc"
+
+    # For snapshot builds, remove the signing key if it exists
+    if is_snapshot:
+        if signing_key_path.exists():
+            try:
+                signing_key_path.unlink()
+                return True
+            except OSError:
+                return False
+        return False
+
+    # For release builds, update the signing key
+    key_file_path = find_series_signing_key(releases_repo, series)
+    if key_file_path is None:
         return False
 
     # Copy the key file to debian/upstream/signing-key.asc
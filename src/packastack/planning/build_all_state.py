@@ -19,17 +19,34 @@
 """State management for build-all mode.
 
 Provides persistence for build-all runs to enable resume capability.
+
+State is kept as a snapshot (``build-all.json``) plus an append-only
+journal (``build-all.journal``) of per-package transitions. Each transition
+appends one JSON line holding the package's full new state, so recording a
+completion costs O(1) regardless of run size and replaying a record twice
+is harmless. The snapshot is replaced atomically and the journal truncated
+once it grows past a threshold. A coordinator killed mid-write leaves at
+most a torn final journal line, which replay ignores.
 """
 
 from __future__ import annotations
 
+import contextlib
 import json
+import os
+import tempfile
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+STATE_FILE = "build-all.json"
+JOURNAL_FILE = "build-all.journal"
+
+# Journal size that triggers compaction into a new snapshot
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
 
 def _utcnow_iso() -> str:
     """Get current UTC time as ISO format string."""
@@ -73,6 +90,8 @@ class PackageState:
     end_time: str = ""
     duration_seconds: float = 0.0
     attempt: int = 0
+    version: str = ""
+    """Version published to the local repository, once built."""
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -86,6 +105,7 @@ class PackageState:
             "end_time": self.end_time,
             "duration_seconds": self.duration_seconds,
             "attempt": self.attempt,
+            "version": self.version,
         }
 
     @classmethod
@@ -108,6 +128,7 @@ class PackageState:
             end_time=data.get("end_time", ""),
             duration_seconds=data.get("duration_seconds", 0.0),
             attempt=data.get("attempt", 0),
+            version=data.get("version", ""),
         )
 
 
@@ -196,6 +217,12 @@ class BuildAllState:
     parallel: int = 1
     """Number of parallel builds."""
 
+    prefetch: dict[str, Any] = field(default_factory=dict)
+    """Results and timing of the prefetch stage (empty if it did not run)."""
+
+    apt_proxy: dict[str, Any] = field(default_factory=dict)
+    """Hit/miss statistics of the caching apt proxy (empty if it did not run)."""
+
     def get_pending_packages(self) -> list[str]:
         """Get packages that are pending build."""
         return [
@@ -254,13 +281,14 @@ class BuildAllState:
             self.packages[package].attempt += 1
         self.updated_at = _utcnow_iso()
 
-    def mark_success(self, package: str, log_path: str = "") -> None:
-        """Mark a package as successfully built."""
+    def mark_success(self, package: str, log_path: str = "", version: str = "") -> None:
+        """Mark a package as successfully built, with the version it published."""
         if package in self.packages:
             state = self.packages[package]
             state.status = PackageStatus.SUCCESS
             state.end_time = _utcnow_iso()
             state.log_path = log_path
+            state.version = version or state.version
             if state.start_time:
                 start = datetime.fromisoformat(state.start_time)
                 end = datetime.fromisoformat(state.end_time)
@@ -331,6 +359,8 @@ class BuildAllState:
             "max_failures": self.max_failures,
             "keep_going": self.keep_going,
             "parallel": self.parallel,
+            "prefetch": self.prefetch,
+            "apt_proxy": self.apt_proxy,
         }
 
     @classmethod
@@ -350,6 +380,8 @@ class BuildAllState:
             max_failures=data.get("max_failures", 0),
             keep_going=data.get("keep_going", True),
             parallel=data.get("parallel", 1),
+            prefetch=data.get("prefetch", {}),
+            apt_proxy=data.get("apt_proxy", {}),
         )
 
         for name, pkg_data in data.get("packages", {}).items():
@@ -362,7 +394,12 @@ class BuildAllState:
 
 
 def save_state(state: BuildAllState, state_dir: Path) -> Path:
-    """Save build-all state to disk.
+    """Write a snapshot of the build-all state and reset the journal.
+
+    The snapshot is written to a temporary file, fsynced and renamed over
+    the previous one, so a crash leaves either the old or the new snapshot.
+    The journal is only truncated afterwards; replaying it over the new
+    snapshot is harmless.
 
     Args:
         state: The state to save.
@@ -372,30 +409,113 @@ def save_state(state: BuildAllState, state_dir: Path) -> Path:
         Path to the saved state file.
     """
     state_dir.mkdir(parents=True, exist_ok=True)
-    state_file = state_dir / "build-all.json"
-    state_file.write_text(json.dumps(state.to_dict(), indent=2))
+    state_file = state_dir / STATE_FILE
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{STATE_FILE}.", suffix=".tmp", dir=state_dir)
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state.to_dict(), indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(state_file)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    with contextlib.suppress(FileNotFoundError):
+        os.truncate(state_dir / JOURNAL_FILE, 0)
     return state_file
 
 
+def record_transition(state: BuildAllState, state_dir: Path, package: str) -> None:
+    """Append a package's current state to the journal.
+
+    Call after each ``mark_*`` instead of rewriting the whole snapshot.
+    The journal is compacted into a new snapshot once it exceeds
+    ``JOURNAL_COMPACT_BYTES``.
+
+    Args:
+        state: The state containing the updated package.
+        state_dir: Directory holding the snapshot and journal.
+        package: Package whose state changed.
+    """
+    pkg_state = state.packages.get(package)
+    if pkg_state is None:
+        return
+
+    state_dir.mkdir(parents=True, exist_ok=True)
+    record = {"updated_at": state.updated_at, "package": pkg_state.to_dict()}
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+    # One write() on an O_APPEND descriptor: a kill can tear only this line
+    fd = os.open(state_dir / JOURNAL_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+    if size >= JOURNAL_COMPACT_BYTES:
+        save_state(state, state_dir)
+
+
+def _replay_journal(state: BuildAllState, journal: Path) -> int:
+    """Apply journal records to a snapshot; returns the number applied.
+
+    A torn final record (from a coordinator killed mid-write) is cut off
+    the journal so later appends start on a clean line.
+    """
+    try:
+        data = journal.read_bytes()
+    except FileNotFoundError:
+        return 0
+
+    applied = 0
+    offset = 0
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        try:
+            if end < 0:
+                raise ValueError("unterminated record")
+            record = json.loads(data[offset:end])
+            pkg_state = PackageState.from_dict(record["package"])
+        except (KeyError, TypeError, ValueError):
+            with contextlib.suppress(OSError):
+                os.truncate(journal, offset)
+            break
+        if pkg_state.name in state.packages:
+            state.packages[pkg_state.name] = pkg_state
+        state.updated_at = record.get("updated_at", state.updated_at)
+        applied += 1
+        offset = end + 1
+    return applied
+
+
 def load_state(state_dir: Path) -> BuildAllState | None:
     """Load build-all state from disk.
 
+    Reads the snapshot and replays the journal on top of it.
+
     Args:
         state_dir: Directory containing state file.
 
     Returns:
         Loaded state, or None if not found.
     """
-    state_file = state_dir / "build-all.json"
+    state_file = state_dir / STATE_FILE
     if not state_file.exists():
         return None
 
     try:
         data = json.loads(state_file.read_text())
-        return BuildAllState.from_dict(data)
+        state = BuildAllState.from_dict(data)
     except (json.JSONDecodeError, KeyError, ValueError):
         return None
 
+    _replay_journal(state, state_dir / JOURNAL_FILE)
+    return state
+
 
 def create_initial_state(
     run_id: str,
@@ -20,10 +20,15 @@
 
 Computes all package versions upfront using topological sort to ensure
 consistent dependency resolution across the entire build.
+
+Every build run also records the versions it published to the local
+repository in ``<run>/build-manifest.json``, in the same form as
+:meth:`BuildManifest.to_dict`, so that ``clean --local-repo`` keeps them.
 """
 
 from __future__ import annotations
 
+import json
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -41,6 +46,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Versions published by a run, written into its run directory
+RUN_MANIFEST_FILE = "build-manifest.json"
+
 
 @dataclass
 class PackageVersion:
@@ -346,3 +354,36 @@ def create_manifest(
         )
 
     return manifest
+
+
+def write_run_manifest(run_dir: Path, series: str, versions: dict[str, str]) -> Path:
+    """Record the source versions a run published to the local repository.
+
+    Args:
+        run_dir: Run directory to write the manifest into.
+        series: OpenStack series of the run.
+        versions: Published version by source package.
+
+    Returns:
+        Path to the written manifest.
+    """
+    data = {
+        "series": series,
+        "packages": {
+            name: {"source_package": name, "full_version": version}
+            for name, version in sorted(versions.items())
+            if version
+        },
+    }
+    path = run_dir / RUN_MANIFEST_FILE
+    run_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{RUN_MANIFEST_FILE}.tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def find_latest_run_manifest(runs_root: Path) -> Path | None:
+    """Return the most recently written run manifest, if any."""
+    manifests = [p for p in runs_root.glob(f"*/{RUN_MANIFEST_FILE}") if p.is_file()]
+    return max(manifests, key=lambda p: p.stat().st_mtime, default=None)
@@ -25,10 +25,15 @@ The core purpose is to:
 1. Parse upstream requirements.txt/pyproject.toml to determine dependencies
 2. Check which dependencies are missing from the archive and local repo
 3. Create a build plan (topological order) to build them first
+
+Availability is answered from already-loaded package indexes (Ubuntu plus
+cloud-archive, and the local repository) in one batch. Without an archive
+index, a single ``apt-cache policy`` call covers all requirements.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
 import re
 import subprocess
@@ -36,6 +41,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packastack.apt.packages import PackageIndex, load_local_repo_index
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -172,45 +179,67 @@ def parse_pyproject_toml_deps(path: Path) -> list[tuple[str, str]]:
     return requirements
 
 
-def check_archive_availability(
-    package_name: str,
-    distribution: str = "",
-) -> tuple[bool, str]:
-    """Check if a package is available in the Ubuntu archive.
+def query_apt_policy(package_names: Sequence[str]) -> dict[str, str]:
+    """Return the candidate versions of packages from one ``apt-cache policy`` call.
 
     Args:
-        package_name: Debian package name to check.
-        distribution: Ubuntu codename (optional, uses default if not provided).
+        package_names: Debian package names to query.
 
     Returns:
-        Tuple of (is_available, version_string).
+        Mapping of package name to candidate version, for packages that
+        have a candidate.
     """
-    cmd = ["apt-cache", "policy", package_name]
+    if not package_names:
+        return {}
 
     try:
         result = subprocess.run(
-            cmd,
+            ["apt-cache", "policy", *package_names],
             capture_output=True,
             text=True,
             timeout=30,
         )
+    except Exception as e:
+        logger.debug(f"Error running apt-cache policy: {e}")
+        return {}
 
-        if result.returncode != 0:
-            return False, ""
+    if result.returncode != 0:
+        return {}
 
-        # Parse apt-cache policy output
-        output = result.stdout
-        for line in output.splitlines():
-            if "Candidate:" in line:
-                version = line.split("Candidate:")[-1].strip()
-                if version and version != "(none)":
-                    return True, version
+    # Output has one block per package, starting with an unindented "name:"
+    candidates: dict[str, str] = {}
+    current = ""
+    for line in result.stdout.splitlines():
+        if line and not line[0].isspace() and line.endswith(":"):
+            current = line[:-1]
+        elif current and "Candidate:" in line:
+            version = line.split("Candidate:")[-1].strip()
+            if version and version != "(none)":
+                candidates[current] = version
+    return candidates
 
-        return False, ""
 
-    except Exception as e:
-        logger.debug(f"Error checking archive for {package_name}: {e}")
-        return False, ""
+def check_archive_availability(
+    package_name: str,
+    distribution: str = "",
+    archive_index: PackageIndex | None = None,
+) -> tuple[bool, str]:
+    """Check if a package is available in the Ubuntu archive.
+
+    Args:
+        package_name: Debian package name to check.
+        distribution: Ubuntu codename (optional, uses default if not provided).
+        archive_index: Loaded archive index; apt-cache is queried without one.
+
+    Returns:
+        Tuple of (is_available, version_string).
+    """
+    if archive_index is not None:
+        pkg = archive_index.find_package(package_name)
+        return (True, pkg.version) if pkg else (False, "")
+
+    version = query_apt_policy([package_name]).get(package_name, "")
+    return bool(version), version
 
 
 def check_local_repo_availability(
@@ -253,10 +282,61 @@ def check_local_repo_availability(
         return False, ""
 
 
+def check_availability(
+    package_names: Sequence[str],
+    archive_index: PackageIndex | None = None,
+    local_index: PackageIndex | None = None,
+) -> dict[str, DependencyCheckResult]:
+    """Check archive and local repository availability of many packages.
+
+    Args:
+        package_names: Debian package names to check.
+        archive_index: Ubuntu (and cloud-archive) index; without one, the
+            archive is queried with a single ``apt-cache policy`` call.
+        local_index: Index of the PackaStack local APT repo (optional).
+
+    Returns:
+        Mapping of package name to DependencyCheckResult with the
+        availability fields filled in.
+    """
+    if archive_index is None:
+        candidates = query_apt_policy(package_names)
+    else:
+        candidates = {}
+        for name in package_names:
+            pkg = archive_index.find_package(name)
+            if pkg is not None:
+                candidates[name] = pkg.version
+
+    results: dict[str, DependencyCheckResult] = {}
+    for name in package_names:
+        result = DependencyCheckResult(name=name)
+        if name in candidates:
+            result.available_in_archive = True
+            result.archive_version = candidates[name]
+        if local_index is not None:
+            pkg = local_index.find_package(name)
+            if pkg is not None:
+                result.available_in_local = True
+                result.local_version = pkg.version
+        results[name] = result
+    return results
+
+
+def _local_index(
+    local_repo_root: Path | None, local_index: PackageIndex | None
+) -> PackageIndex | None:
+    if local_index is None and local_repo_root is not None:
+        return load_local_repo_index(local_repo_root)
+    return local_index
+
+
 def check_dependencies(
     source_dir: Path,
     local_repo_root: Path | None = None,
     distribution: str = "",
+    archive_index: PackageIndex | None = None,
+    local_index: PackageIndex | None = None,
 ) -> DependencyBuildPlan:
     """Check dependencies for a package source.
 
@@ -264,6 +344,9 @@ def check_dependencies(
         source_dir: Path to the package source directory.
         local_repo_root: Path to the PackaStack local APT repo (optional).
         distribution: Ubuntu codename (optional).
+        archive_index: Loaded Ubuntu/cloud-archive index (optional).
+        local_index: Loaded local repo index; read from local_repo_root
+            when not given.
 
     Returns:
         DependencyBuildPlan with categorized dependencies.
@@ -291,25 +374,15 @@ def check_dependencies(
             seen.add(name.lower())
             unique_reqs.append((name, constraint))
 
-    # Check each requirement
-    for py_name, constraint in unique_reqs:
-        deb_name = normalize_python_package_name(py_name)
-
-        result = DependencyCheckResult(
-            name=deb_name,
-            version_constraint=constraint,
-        )
-
-        # Check archive
-        archive_avail, archive_ver = check_archive_availability(deb_name, distribution)
-        result.available_in_archive = archive_avail
-        result.archive_version = archive_ver
+    # Check all requirements in one batch
+    deb_names = [normalize_python_package_name(py_name) for py_name, _ in unique_reqs]
+    availability = check_availability(
+        deb_names, archive_index, _local_index(local_repo_root, local_index)
+    )
 
-        # Check local repo
-        if local_repo_root:
-            local_avail, local_ver = check_local_repo_availability(deb_name, local_repo_root)
-            result.available_in_local = local_avail
-            result.local_version = local_ver
+    for (py_name, constraint), deb_name in zip(unique_reqs, deb_names, strict=True):
+        result = availability[deb_name]
+        result.version_constraint = constraint
 
         # Determine if it needs building
         if result.available_in_archive:
@@ -335,6 +408,10 @@ def compute_topological_order(
 ) -> list[str]:
     """Compute topological order for building packages.
 
+    Dependencies outside ``packages`` are ignored. Packages that do not
+    depend on each other keep their input order. Packages on a dependency
+    cycle cannot be ordered; they are appended in input order.
+
     Args:
         packages: List of package names to order.
         dep_graph: Mapping of package -> list of dependencies.
@@ -342,16 +419,43 @@ def compute_topological_order(
     Returns:
         Packages in build order (dependencies first).
     """
-    # Simple topological sort using Kahn's algorithm
-    # For now, just return packages in original order
-    # (full implementation would need to build the dependency graph)
-    return list(packages)
+    position = {pkg: idx for idx, pkg in enumerate(dict.fromkeys(packages))}
+
+    # Kahn's algorithm, taking the earliest ready package each time
+    remaining = dict.fromkeys(position, 0)
+    dependents: dict[str, list[str]] = {pkg: [] for pkg in position}
+    for pkg in position:
+        for dep in set(dep_graph.get(pkg, [])):
+            if dep in position and dep != pkg:
+                remaining[pkg] += 1
+                dependents[dep].append(pkg)
+
+    ready = [position[pkg] for pkg, count in remaining.items() if count == 0]
+    heapq.heapify(ready)
+    names = list(position)
+    order: list[str] = []
+    while ready:
+        pkg = names[heapq.heappop(ready)]
+        order.append(pkg)
+        for dependent in dependents[pkg]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, position[dependent])
+
+    if len(order) < len(names):
+        cyclic = [pkg for pkg in names if remaining[pkg] > 0]
+        logger.warning(f"Dependency cycle among {', '.join(cyclic)}; using input order")
+        order.extend(cyclic)
+    return order
 
 
 def create_build_plan(
     packages: Sequence[str],
     local_repo_root: Path | None = None,
     distribution: str = "",
+    archive_index: PackageIndex | None = None,
+    local_index: PackageIndex | None = None,
+    dep_graph: dict[str, list[str]] | None = None,
 ) -> DependencyBuildPlan:
     """Create a build plan for a list of packages.
 
@@ -359,35 +463,32 @@ def create_build_plan(
         packages: Python package names to build.
         local_repo_root: Path to local APT repo.
         distribution: Ubuntu codename.
+        archive_index: Loaded Ubuntu/cloud-archive index (optional).
+        local_index: Loaded local repo index; read from local_repo_root
+            when not given.
+        dep_graph: Mapping of Python package name -> Python package names
+            it depends on, used to order the packages to build.
 
     Returns:
         DependencyBuildPlan with build order.
     """
     plan = DependencyBuildPlan()
 
-    for py_name in packages:
-        deb_name = normalize_python_package_name(py_name)
-
-        result = DependencyCheckResult(name=deb_name)
-
-        # Check availability
-        archive_avail, archive_ver = check_archive_availability(deb_name, distribution)
-        result.available_in_archive = archive_avail
-        result.archive_version = archive_ver
+    deb_names = [normalize_python_package_name(py_name) for py_name in packages]
+    availability = check_availability(
+        deb_names, archive_index, _local_index(local_repo_root, local_index)
+    )
 
-        if local_repo_root:
-            local_avail, local_ver = check_local_repo_availability(deb_name, local_repo_root)
-            result.available_in_local = local_avail
-            result.local_version = local_ver
+    for py_name, deb_name in zip(packages, deb_names, strict=True):
+        result = availability[deb_name]
 
-        if archive_avail or result.available_in_local:
+        if result.available_in_archive or result.available_in_local:
             plan.already_available.append(py_name)
         else:
             plan.to_build.append(py_name)
 
         plan.check_results[deb_name] = result
 
-    # Order by dependencies (placeholder - just use input order for now)
-    plan.to_build = compute_topological_order(plan.to_build, {})
+    plan.to_build = compute_topological_order(plan.to_build, dep_graph or {})
 
     return plan
@@ -29,17 +29,17 @@ import re
 from dataclasses import dataclass, field
 from datetime import UTC
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from packastack.upstream.registry import RegistryError, UpstreamsRegistry
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-try:
-    from launchpadlib.launchpad import Launchpad
-except ImportError:
-    Launchpad = None  # type: ignore[assignment, misc]
+# launchpadlib (and httplib2 under it) is slow to import and only needed
+# for online discovery; _launchpad_class() imports it on first use.
+_NOT_LOADED: Any = object()
+Launchpad: Any = _NOT_LOADED
 
 try:
     import requests
@@ -107,6 +107,18 @@ class DiscoveryResult:
     """Libraries/services in openstack/releases without a packaging repo."""
 
 
+def _launchpad_class() -> Any:
+    """Return launchpadlib's Launchpad class, or None if it is not installed."""
+    global Launchpad
+    if Launchpad is _NOT_LOADED:
+        try:
+            from launchpadlib.launchpad import Launchpad as launchpad
+        except ImportError:
+            launchpad = None
+        Launchpad = launchpad
+    return Launchpad
+
+
 def _is_excluded_repo(name: str) -> tuple[bool, str]:
     """Check if a repository name should be excluded.
 
@@ -176,13 +188,14 @@ def discover_packages_from_launchpad(
         except (json.JSONDecodeError, KeyError, OSError):
             pass  # Cache invalid, proceed with API query
 
-    if Launchpad is None:
+    launchpad = _launchpad_class()
+    if launchpad is None:
         result.errors.append("launchpadlib library not available")
         return result
 
     try:
         # Anonymous login for read-only access
-        lp = Launchpad.login_anonymously(
+        lp = launchpad.login_anonymously(
             'packastack',
             'production',
             version='devel',
@@ -24,12 +24,23 @@ Provides:
 - render_ascii(): ASCII tree/list output
 - render_html(): Self-contained HTML visualization
 - render_json(): Machine-readable JSON format
+- write_plan_graph_reports(): JSON and HTML reports, streamed to disk
+
+The report writers stream their output (see iter_json() and iter_html()),
+and the HTML report loads the data for its graph view from a sidecar of
+per-wave chunks, so reports for full-archive plans stay cheap to write and
+to open.
 """
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import html
 import json
+import os
+import shutil
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
@@ -39,6 +50,15 @@ if TYPE_CHECKING:
     from packastack.planning.graph import DependencyGraph
     from packastack.planning.type_selection import TypeSelectionReport
 
+PLAN_GRAPH_JSON = "plan-graph.json"
+PLAN_GRAPH_HTML = "plan-graph.html"
+PLAN_GRAPH_DATA = "plan-graph.data.js"
+PLAN_GRAPH_RUN = "plan-graph.run.js"
+GRAPH_HASH_FILE = "graph-hash"
+
+# Bump when the HTML report changes, so renderings kept for reuse are redone
+PLAN_GRAPH_RENDER_VERSION = 2
+
 
 @dataclass
 class GraphNode:
@@ -136,6 +156,27 @@ class PlanGraph:
             },
         }
 
+    def content_hash(self) -> str:
+        """Return a sha256 over the structure of the graph.
+
+        Run metadata (run id, generation time) is not included, so two plans
+        that produce the same graph have the same hash.
+        """
+        hasher = hashlib.sha256()
+
+        def feed(value: object) -> None:
+            hasher.update(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+            hasher.update(b"\n")
+
+        feed([PLAN_GRAPH_RENDER_VERSION, self.target, self.ubuntu_series, self.topo_order, self.cycles])
+        feed(sorted([wave, nodes] for wave, nodes in self.waves.items()))
+        for node_id in sorted(self.nodes):
+            n = self.nodes[node_id]
+            feed([n.id, n.build_type, n.status, n.order, n.wave, n.dependencies, n.dependents, n.forced_by])
+        for e in self.edges:
+            feed([e.from_node, e.to_node, e.kind])
+        return hasher.hexdigest()
+
     @classmethod
     def from_dependency_graph(
         cls,
@@ -477,19 +518,144 @@ def render_build_order_list(
     return "\n".join(lines)
 
 
-def render_json(graph: PlanGraph, output_path: Path) -> Path:
+def _js_json(value: object) -> str:
+    """Serialise compactly, safe to embed in a <script> element."""
+    return json.dumps(value, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def _write_chunks(output_path: Path, chunks: Iterable[str]) -> Path:
+    """Write string pieces to a file as they are produced."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return output_path
+
+
+def _iter_json_list(key: str, items: Iterable[object], last: bool = False) -> Iterator[str]:
+    yield f"  {json.dumps(key)}: ["
+    sep = "\n"
+    for item in items:
+        yield f"{sep}    {json.dumps(item)}"
+        sep = ",\n"
+    yield "\n  ]" if sep != "\n" else "]"
+    yield "\n" if last else ",\n"
+
+
+def iter_json(graph: PlanGraph, graph_hash: str | None = None) -> Iterator[str]:
+    """Yield the JSON document of a plan graph piece by piece.
+
+    The document is equivalent to ``graph.to_dict()`` plus ``graph_hash``,
+    with one node, edge or wave per line, but is never held in memory as a
+    whole. ``graph_hash`` saves recomputing a known content hash.
+    """
+    yield "{\n"
+    for key, value in (
+        ("run_id", graph.run_id),
+        ("generated_at_utc", graph.generated_at_utc),
+        ("target", graph.target),
+        ("ubuntu_series", graph.ubuntu_series),
+        ("graph_hash", graph_hash or graph.content_hash()),
+    ):
+        yield f"  {json.dumps(key)}: {json.dumps(value)},\n"
+    yield from _iter_json_list("nodes", (n.to_dict() for n in graph.nodes.values()))
+    yield from _iter_json_list("edges", (e.to_dict() for e in graph.edges))
+    yield f'  "topo_order": {json.dumps(graph.topo_order)},\n'
+    yield from _iter_json_list(
+        "waves", ({"wave": wave_num, "packages": nodes} for wave_num, nodes in sorted(graph.waves.items()))
+    )
+    summary = {
+        "node_count": graph.node_count,
+        "edge_count": graph.edge_count,
+        "wave_count": graph.wave_count,
+        "cycles": len(graph.cycles),
+    }
+    yield f'  "summary": {json.dumps(summary)}\n}}\n'
+
+
+def render_json(graph: PlanGraph, output_path: Path, graph_hash: str | None = None) -> Path:
     """Render plan graph as JSON.
 
+    The file is written incrementally with :func:`iter_json`.
+
     Args:
         graph: The plan graph to render.
         output_path: Path to write the JSON file.
+        graph_hash: Content hash of the graph, if already known.
 
     Returns:
         Path to the written file.
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(graph.to_dict(), indent=2))
-    return output_path
+    return _write_chunks(output_path, iter_json(graph, graph_hash))
+
+
+def iter_graph_chunks(graph: PlanGraph) -> Iterator[dict]:
+    """Yield the nodes and edges of a plan graph in compact per-wave chunks.
+
+    Each chunk holds the nodes of one wave as
+    ``[id, type, status, order, dependency count, dependent count]`` rows and
+    the edges leaving them as ``[from, to]`` pairs. Nodes without a wave
+    (e.g. when cycles prevent wave computation) are in wave -1.
+    """
+    nodes_by_wave: dict[int, list[GraphNode]] = {}
+    for node in graph.nodes.values():
+        nodes_by_wave.setdefault(node.wave, []).append(node)
+    edges_by_wave: dict[int, list[list[str]]] = {}
+    for edge in graph.edges:
+        source = graph.nodes.get(edge.from_node)
+        edges_by_wave.setdefault(source.wave if source else -1, []).append([edge.from_node, edge.to_node])
+
+    for wave_num in sorted(nodes_by_wave.keys() | edges_by_wave.keys()):
+        yield {
+            "wave": wave_num,
+            "nodes": [
+                [n.id, n.build_type, n.status, n.order, len(n.dependencies), len(n.dependents)]
+                for n in nodes_by_wave.get(wave_num, [])
+            ],
+            "edges": edges_by_wave.get(wave_num, []),
+        }
+
+
+def _iter_graph_data_js(graph: PlanGraph, graph_hash: str) -> Iterator[str]:
+    for chunk in iter_graph_chunks(graph):
+        yield f"packastackPlanGraph.push({_js_json(chunk)});\n"
+    yield f"packastackPlanGraph.end({_js_json({'graph_hash': graph_hash})});\n"
+
+
+def render_run_data(graph: PlanGraph, output_path: Path) -> Path:
+    """Write the run metadata script loaded by a reusable HTML report.
+
+    The run id and generation time change on every run while the rest of
+    the page only depends on the graph, so they are kept out of the markup
+    and filled in from this script.
+
+    Args:
+        graph: The plan graph of the run.
+        output_path: Path to write the script to.
+
+    Returns:
+        Path to the written file.
+    """
+    meta = {"run_id": graph.run_id, "generated_at_utc": graph.generated_at_utc}
+    return _write_chunks(output_path, [f"packastackPlanGraph.run({_js_json(meta)});\n"])
+
+
+def render_graph_data(graph: PlanGraph, output_path: Path, graph_hash: str | None = None) -> Path:
+    """Write the graph data sidecar loaded by the HTML report.
+
+    Every line of the sidecar hands one chunk from :func:`iter_graph_chunks`
+    to the page. It is a script rather than a plain JSON file because
+    browsers refuse to fetch JSON next to a page opened from ``file://``.
+
+    Args:
+        graph: The plan graph to render.
+        output_path: Path to write the sidecar to.
+        graph_hash: Content hash of the graph, if already known.
+
+    Returns:
+        Path to the written file.
+    """
+    return _write_chunks(output_path, _iter_graph_data_js(graph, graph_hash or graph.content_hash()))
 
 
 def render_dot(
@@ -671,15 +837,32 @@ def render_ascii(
 
     return '\n'.join(lines)
 
-
-def render_html(graph: PlanGraph) -> str:
-    """Render plan graph as self-contained HTML with interactive visualization.
+def iter_html(
+    graph: PlanGraph,
+    data_src: str | None = None,
+    graph_hash: str | None = None,
+    run_src: str | None = None,
+) -> Iterator[str]:
+    """Yield the HTML report of a plan graph piece by piece.
+
+    The wave lanes and build order table are static markup produced one
+    row at a time. The node and edge data behind the dependency graph view
+    comes in the per-wave chunks of :func:`iter_graph_chunks`: embedded in
+    the page, or loaded from the ``data_src`` sidecar only once the graph
+    panel scrolls into view. Large graphs have no graph view, so their data
+    is never loaded.
 
     Args:
         graph: The plan graph to render.
-
-    Returns:
-        Complete HTML document as string.
+        data_src: URL of the graph data sidecar relative to the page, or
+            None to embed the data and produce a self-contained page.
+        graph_hash: Content hash of the graph, if already known.
+        run_src: URL of the run metadata script relative to the page, or
+            None to write the run id and generation time into the markup.
+            With a script the page only depends on the graph.
+
+    Yields:
+        Consecutive pieces of the HTML document.
     """
 
     def esc(s: str) -> str:
@@ -687,26 +870,10 @@ def render_html(graph: PlanGraph) -> str:
 
     # Determine if we need simplified view for large graphs
     simplified = graph.node_count > 400
-
-    # Generate node data for JavaScript
-    nodes_json = json.dumps([
-        {
-            "id": n.id,
-            "type": n.build_type,
-            "status": n.status,
-            "order": n.order,
-            "deps": n.dependencies,
-            "dependents": n.dependents,
-        }
-        for n in graph.nodes.values()
-    ])
-
-    edges_json = json.dumps([
-        {"from": e.from_node, "to": e.to_node}
-        for e in graph.edges
-    ])
-
-    topo_json = json.dumps(graph.topo_order)
+    graph_hash = graph_hash or graph.content_hash()
+    run_id = esc(graph.run_id) if run_src is None else ""
+    generated_at = esc(graph.generated_at_utc) if run_src is None else ""
+    title = f"Build Order Graph - {run_id}" if run_id else "Build Order Graph"
 
     # Count by type
     type_counts = {"release": 0, "snapshot": 0}
@@ -714,31 +881,7 @@ def render_html(graph: PlanGraph) -> str:
         if node.build_type in type_counts:
             type_counts[node.build_type] += 1
 
-    # Build the build order list HTML
-    order_rows = []
     order_list = graph.topo_order if graph.topo_order else sorted(graph.nodes.keys())
-    for i, node_id in enumerate(order_list):
-        node = graph.nodes.get(node_id)
-        if not node:
-            continue
-        deps_html = ""
-        if node.dependencies:
-            deps = [f'<span class="dep-link" data-pkg="{esc(d)}">{esc(d)}</span>' for d in sorted(node.dependencies)[:5]]
-            deps_html = ", ".join(deps)
-            if len(node.dependencies) > 5:
-                deps_html += f" <em>(+{len(node.dependencies) - 5})</em>"
-
-        status_class = f"status-{node.status}" if node.status != "ok" else ""
-        type_class = f"type-{node.build_type}"
-        order_rows.append(f'''
-        <tr class="{type_class} {status_class}" data-pkg="{esc(node.id)}">
-            <td class="order-num">{i + 1}</td>
-            <td class="pkg-name"><span class="node-link" data-pkg="{esc(node.id)}">{esc(node.id)}</span></td>
-            <td class="pkg-type"><span class="type-badge {type_class}">{esc(node.build_type)}</span></td>
-            <td class="pkg-deps">{deps_html}</td>
-        </tr>''')
-
-    order_table = '\n'.join(order_rows)
 
     # Cycles warning HTML
     cycles_html = ""
@@ -755,53 +898,15 @@ def render_html(graph: PlanGraph) -> str:
         </div>
         '''
 
-    # Build waves HTML (swim lanes)
-    if graph.waves:
-        wave_rows = []
-        for wave_num in sorted(graph.waves.keys()):
-            nodes = graph.waves[wave_num]
-            pills = []
-            for node_id in nodes:
-                node = graph.nodes.get(node_id)
-                if not node:
-                    continue
-                type_class = f"type-{node.build_type}"
-                pills.append(
-                    f'<span class="wave-pill {type_class} node-link" data-pkg="{esc(node.id)}">{esc(node.id)}</span>'
-                )
-            wave_rows.append(f'''
-            <div class="wave-lane">
-                <div class="wave-label">Wave {wave_num} <span class="wave-count">({len(nodes)})</span></div>
-                <div class="wave-packages">{''.join(pills)}</div>
-            </div>
-            ''')
-        wave_lanes = ''.join(wave_rows)
-    else:
-        wave_lanes = '<div class="wave-empty">(no waves computed - graph may have cycles)</div>'
-
-    waves_html = f'''
-        <div class="panel panel-full">
-            <div class="panel-header">
-                <span>Build Waves ({graph.wave_count} waves)</span>
-            </div>
-            <div class="panel-body">
-                <div class="wave-lanes">
-                    {wave_lanes}
-                </div>
-            </div>
-        </div>
-    '''
-
     # SVG dimensions for graph visualization
-    min(1200, max(800, graph.node_count * 8))
     svg_height = min(800, max(400, graph.node_count * 4))
 
-    html_content = f'''<!DOCTYPE html>
+    yield f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Build Order Graph - {esc(graph.run_id)}</title>
+    <title>{title}</title>
     <style>
         :root {{
             --color-release: #90EE90;
@@ -1040,10 +1145,11 @@ def render_html(graph: PlanGraph) -> str:
         <header>
             <h1>📦 Build Order Graph</h1>
             <div class="meta">
-                <div class="meta-item"><span class="meta-label">Run ID:</span> {esc(graph.run_id)}</div>
+                <div class="meta-item"><span class="meta-label">Run ID:</span> <span class="run-id">{run_id}</span></div>
                 <div class="meta-item"><span class="meta-label">Target:</span> {esc(graph.target)}</div>
                 <div class="meta-item"><span class="meta-label">Ubuntu:</span> {esc(graph.ubuntu_series)}</div>
-                <div class="meta-item"><span class="meta-label">Generated:</span> {esc(graph.generated_at_utc)}</div>
+                <div class="meta-item"><span class="meta-label">Generated:</span> <span class="generated-at">{generated_at}</span></div>
+                <div class="meta-item"><span class="meta-label">Graph:</span> {esc(graph_hash[:12])}</div>
             </div>
         </header>
 
@@ -1068,7 +1174,40 @@ def render_html(graph: PlanGraph) -> str:
 
         {cycles_html}
 
-        {waves_html}
+
+        <div class="panel panel-full">
+            <div class="panel-header">
+                <span>Build Waves ({graph.wave_count} waves)</span>
+            </div>
+            <div class="panel-body">
+                <div class="wave-lanes">
+'''
+
+    # Build waves (swim lanes)
+    if not graph.waves:
+        yield '<div class="wave-empty">(no waves computed - graph may have cycles)</div>'
+    for wave_num in sorted(graph.waves.keys()):
+        nodes = graph.waves[wave_num]
+        pills = []
+        for node_id in nodes:
+            node = graph.nodes.get(node_id)
+            if not node:
+                continue
+            type_class = f"type-{node.build_type}"
+            pills.append(
+                f'<span class="wave-pill {type_class} node-link" data-pkg="{esc(node.id)}">{esc(node.id)}</span>'
+            )
+        yield f'''
+            <div class="wave-lane">
+                <div class="wave-label">Wave {wave_num} <span class="wave-count">({len(nodes)})</span></div>
+                <div class="wave-packages">{''.join(pills)}</div>
+            </div>
+            '''
+
+    yield f'''
+                </div>
+            </div>
+        </div>
 
         <div class="panels">
             <div class="panel">
@@ -1087,7 +1226,31 @@ def render_html(graph: PlanGraph) -> str:
                             </tr>
                         </thead>
                         <tbody>
-                            {order_table}
+'''
+
+    # Build order rows
+    for i, node_id in enumerate(order_list):
+        node = graph.nodes.get(node_id)
+        if not node:
+            continue
+        deps_html = ""
+        if node.dependencies:
+            deps = [f'<span class="dep-link" data-pkg="{esc(d)}">{esc(d)}</span>' for d in sorted(node.dependencies)[:5]]
+            deps_html = ", ".join(deps)
+            if len(node.dependencies) > 5:
+                deps_html += f" <em>(+{len(node.dependencies) - 5})</em>"
+
+        status_class = f"status-{node.status}" if node.status != "ok" else ""
+        type_class = f"type-{node.build_type}"
+        yield f'''
+        <tr class="{type_class} {status_class}" data-pkg="{esc(node.id)}">
+            <td class="order-num">{i + 1}</td>
+            <td class="pkg-name"><span class="node-link" data-pkg="{esc(node.id)}">{esc(node.id)}</span></td>
+            <td class="pkg-type"><span class="type-badge {type_class}">{esc(node.build_type)}</span></td>
+            <td class="pkg-deps">{deps_html}</td>
+        </tr>'''
+
+    yield f'''
                         </tbody>
                     </table>
                 </div>
@@ -1102,16 +1265,61 @@ def render_html(graph: PlanGraph) -> str:
         </div>
 
         <footer>
-            Generated by Packastack | Run: {esc(graph.run_id)}
+            Generated by Packastack | Run: <span class="run-id">{run_id}</span>
         </footer>
     </div>
 
     <script>
-        // Graph data
-        const nodes = {nodes_json};
-        const edges = {edges_json};
-        const topoOrder = {topo_json};
+        // Graph data arrives in per-wave chunks, see iter_graph_chunks()
+        window.packastackPlanGraph = {{
+            nodes: [],
+            edges: [],
+            done: false,
+            src: {_js_json(data_src)},
+            requested: false,
+            waiting: [],
+            push(chunk) {{
+                chunk.nodes.forEach(n => this.nodes.push(
+                    {{id: n[0], type: n[1], status: n[2], order: n[3], deps: n[4], dependents: n[5]}}
+                ));
+                chunk.edges.forEach(e => this.edges.push({{from: e[0], to: e[1]}}));
+            }},
+            end(meta) {{
+                this.done = true;
+                this.waiting.splice(0).forEach(callback => callback(this));
+            }},
+            run(meta) {{
+                document.title = `Build Order Graph - ${{meta.run_id}}`;
+                document.querySelectorAll('.run-id').forEach(el => {{ el.textContent = meta.run_id; }});
+                document.querySelectorAll('.generated-at').forEach(el => {{ el.textContent = meta.generated_at_utc; }});
+            }},
+            load(callback) {{
+                if (this.done) {{
+                    callback(this);
+                    return;
+                }}
+                this.waiting.push(callback);
+                if (this.src && !this.requested) {{
+                    this.requested = true;
+                    const tag = document.createElement('script');
+                    tag.src = this.src;
+                    document.body.appendChild(tag);
+                }}
+            }}
+        }};
+    </script>
+'''
+
+    if run_src is not None:
+        yield f'    <script src="{html.escape(run_src)}"></script>\n'
+    if data_src is None:
+        for line in _iter_graph_data_js(graph, graph_hash):
+            yield f"    <script>{line.rstrip()}</script>\n"
+
+    yield f'''
+    <script>
         const simplified = {'true' if simplified else 'false'};
+        window.highlightSvgNode = function(pkg) {{}};
 
         // Search functionality
         const searchInput = document.getElementById('search-input');
@@ -1151,9 +1359,14 @@ def render_html(graph: PlanGraph) -> str:
             }}
         }}
 
-        // SVG Graph rendering (only for non-simplified view)
-        if (!simplified && nodes.length > 0) {{
+        // SVG Graph rendering (only for non-simplified view), once the
+        // graph data has been loaded
+        function renderGraph(data) {{
+            const nodes = data.nodes;
+            const edges = data.edges;
+            const topoOrder = nodes.filter(n => n.order >= 0).sort((a, b) => a.order - b.order).map(n => n.id);
             const svg = document.getElementById('graph-svg');
+            if (!svg || nodes.length === 0) return;
             const width = svg.clientWidth || 800;
             const height = svg.clientHeight || 400;
 
@@ -1253,7 +1466,7 @@ def render_html(graph: PlanGraph) -> str:
                 const color = n.status !== 'ok' ? statusColors[n.status] : typeColors[n.type] || '#D3D3D3';
                 svgContent += `<circle class="node-circle" data-pkg="${{n.id}}" cx="${{n.x}}" cy="${{n.y}}" r="6" fill="${{color}}" stroke="#333" stroke-width="1" />`;
                 // Only show labels for nodes with few connections or in small graphs
-                if (nodes.length < 50 || n.deps.length === 0 || n.dependents.length === 0) {{
+                if (nodes.length < 50 || n.deps === 0 || n.dependents === 0) {{
                     svgContent += `<text class="node-label" x="${{n.x + 8}}" y="${{n.y + 3}}">${{n.id}}</text>`;
                 }}
             }});
@@ -1284,39 +1497,117 @@ def render_html(graph: PlanGraph) -> str:
                 }});
             }};
         }}
+
+        if (!simplified) {{
+            const panel = document.getElementById('graph-svg');
+            if (panel && 'IntersectionObserver' in window) {{
+                const observer = new IntersectionObserver(entries => {{
+                    if (entries.some(e => e.isIntersecting)) {{
+                        observer.disconnect();
+                        packastackPlanGraph.load(renderGraph);
+                    }}
+                }});
+                observer.observe(panel);
+            }} else {{
+                packastackPlanGraph.load(renderGraph);
+            }}
+        }}
     </script>
 </body>
 </html>'''
 
-    return html_content
+
+def render_html(graph: PlanGraph) -> str:
+    """Render plan graph as self-contained HTML with interactive visualization.
+
+    Args:
+        graph: The plan graph to render.
+
+    Returns:
+        Complete HTML document as string.
+    """
+    return "".join(iter_html(graph))
 
 
 def write_plan_graph_reports(
     graph: PlanGraph,
     output_dir: Path,
+    reuse_dir: Path | None = None,
 ) -> dict[str, Path]:
     """Write all plan graph reports to the output directory.
 
+    The JSON report and the run metadata script are always written. The
+    HTML report and its graph data sidecar only depend on the graph, so
+    with ``reuse_dir`` the previous rendering is kept there, keyed by
+    :meth:`PlanGraph.content_hash`, and linked into ``output_dir`` instead
+    of rendering again when the graph has not changed. Cached files are
+    only ever replaced, never rewritten, so links from earlier runs keep
+    their content.
+
     Args:
         graph: The plan graph to render.
         output_dir: Directory to write reports to.
+        reuse_dir: Directory holding the previous HTML rendering.
 
     Returns:
-        Dictionary mapping report type to file path.
+        Dictionary mapping report type to file path. Contains ``reused``
+        (the reuse directory) when the HTML was not rendered again.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    paths: dict[str, Path] = {}
-
-    # JSON report
-    json_path = output_dir / "plan-graph.json"
-    render_json(graph, json_path)
-    paths["json"] = json_path
+    graph_hash = graph.content_hash()
+    paths: dict[str, Path] = {
+        "json": render_json(graph, output_dir / PLAN_GRAPH_JSON, graph_hash),
+        "html": output_dir / PLAN_GRAPH_HTML,
+        "data": output_dir / PLAN_GRAPH_DATA,
+        "run": render_run_data(graph, output_dir / PLAN_GRAPH_RUN),
+    }
+    rendered = (PLAN_GRAPH_HTML, PLAN_GRAPH_DATA)
 
-    # HTML report
-    html_path = output_dir / "plan-graph.html"
-    html_content = render_html(graph)
-    html_path.write_text(html_content)
-    paths["html"] = html_path
+    if reuse_dir is not None and _read_graph_hash(reuse_dir) == graph_hash:
+        try:
+            for name in rendered:
+                _link_or_copy(reuse_dir / name, output_dir / name)
+        except OSError:
+            pass
+        else:
+            paths["reused"] = reuse_dir
+            return paths
+
+    render_graph_data(graph, paths["data"], graph_hash)
+    _write_chunks(
+        paths["html"], iter_html(graph, data_src=PLAN_GRAPH_DATA, graph_hash=graph_hash, run_src=PLAN_GRAPH_RUN)
+    )
+
+    if reuse_dir is not None:
+        # Drop the old hash first so an interrupted update is never reused
+        with contextlib.suppress(OSError):
+            reuse_dir.mkdir(parents=True, exist_ok=True)
+            (reuse_dir / GRAPH_HASH_FILE).unlink(missing_ok=True)
+            for name in rendered:
+                _replace_with_copy(output_dir / name, reuse_dir / name)
+            (reuse_dir / GRAPH_HASH_FILE).write_text(graph_hash + "\n", encoding="utf-8")
 
     return paths
+
+
+def _read_graph_hash(reuse_dir: Path) -> str:
+    try:
+        return (reuse_dir / GRAPH_HASH_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def _replace_with_copy(src: Path, dst: Path) -> None:
+    # A new inode, so runs that linked the old file keep their copy
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copy2(src, tmp)
+    tmp.replace(dst)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
@@ -0,0 +1,185 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Multi-threaded, reproducible compressors for generated tarballs.
+
+:class:`ParallelGzip` compresses like pigz: the input is cut into
+fixed-size chunks that are deflated on a thread pool (zlib releases the
+GIL), each primed with the last 32 KiB of the previous chunk, and joined
+into a single gzip member. The output depends only on the input, the level
+and the chunk size, never on the number of threads, and the header carries
+no name or timestamp, so the same tree always gives the same bytes.
+
+:class:`ParallelXz` pipes through ``xz`` (5.4 or later) in multi-threaded
+mode with a fixed block size, which keeps its output independent of the
+thread count.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Any, Protocol
+
+from packastack.core.spans import command_span
+
+COMPRESSIONS = ("gzip", "xz")
+
+GZIP_CHUNK_SIZE = 1024 * 1024
+XZ_BLOCK_SIZE = 8 * 1024 * 1024
+
+_DICT_SIZE = 32 * 1024
+
+# Magic, deflate, no flags, mtime 0; XFL and OS (unix) follow
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00"
+_GZIP_OS_UNIX = 3
+
+
+class Compressor(Protocol):
+    """Compresses a byte stream into a file."""
+
+    @property
+    def suffix(self) -> str:
+        """File suffix, e.g. ``gz``."""
+        ...
+
+    @property
+    def key(self) -> str:
+        """Identifies every setting that affects the output bytes."""
+        ...
+
+    def compress(self, source: IO[bytes], dest: IO[bytes]) -> None:
+        """Compress everything read from source into dest."""
+        ...
+
+
+def _threads(threads: int) -> int:
+    return threads if threads > 0 else os.cpu_count() or 1
+
+
+def _deflate(chunk: bytes, zdict: bytes, last: bool, level: int) -> bytes:
+    kwargs: dict[str, Any] = {"zdict": zdict} if zdict else {}
+    deflater = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, **kwargs)
+    # A sync flush ends the chunk on a byte boundary without ending the stream
+    return deflater.compress(chunk) + deflater.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+@dataclass(frozen=True)
+class ParallelGzip:
+    """Chunked gzip compression on a thread pool.
+
+    Args:
+        threads: Worker threads (0 for one per CPU).
+        level: zlib compression level.
+        chunk_size: Bytes per independently compressed chunk.
+    """
+
+    threads: int = 0
+    level: int = 6
+    chunk_size: int = GZIP_CHUNK_SIZE
+
+    @property
+    def suffix(self) -> str:
+        return "gz"
+
+    @property
+    def key(self) -> str:
+        return f"gzip-{self.level}-{self.chunk_size}"
+
+    def compress(self, source: IO[bytes], dest: IO[bytes]) -> None:
+        workers = _threads(self.threads)
+        xfl = 2 if self.level == 9 else 4 if self.level == 1 else 0
+        dest.write(_GZIP_HEADER + bytes([xfl, _GZIP_OS_UNIX]))
+
+        crc = 0
+        size = 0
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gzip") as pool:
+            zdict = b""
+            chunk = source.read(self.chunk_size)
+            while True:
+                following = source.read(self.chunk_size) if chunk else b""
+                last = not following
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                pending.append(pool.submit(_deflate, chunk, zdict, last, self.level))
+                zdict = chunk[-_DICT_SIZE:]
+                # Bound the memory held by chunks waiting to be written
+                while pending and (last or len(pending) > 2 * workers):
+                    dest.write(pending.popleft().result())
+                if last:
+                    break
+                chunk = following
+
+        dest.write(struct.pack("<II", crc & 0xFFFFFFFF, size & 0xFFFFFFFF))
+
+
+@dataclass(frozen=True)
+class ParallelXz:
+    """Multi-threaded xz through the ``xz`` executable.
+
+    Args:
+        threads: Worker threads (0 for one per CPU).
+        preset: xz preset level.
+        block_size: Bytes per block; fixing it keeps the output the same
+            for any thread count.
+    """
+
+    threads: int = 0
+    preset: int = 6
+    block_size: int = XZ_BLOCK_SIZE
+
+    @property
+    def suffix(self) -> str:
+        return "xz"
+
+    @property
+    def key(self) -> str:
+        return f"xz-{self.preset}-{self.block_size}"
+
+    def compress(self, source: IO[bytes], dest: IO[bytes]) -> None:
+        cmd = [
+            "xz",
+            "--compress",
+            "--stdout",
+            f"-{self.preset}",
+            # "+" keeps multi-threaded mode (and its output) even for one thread
+            f"--threads=+{_threads(self.threads)}",
+            f"--block-size={self.block_size}",
+        ]
+        with command_span(cmd):
+            proc = subprocess.run(cmd, stdin=source, stdout=dest, stderr=subprocess.PIPE, check=False)
+        if proc.returncode != 0:
+            raise OSError(f"xz failed: {proc.stderr.decode(errors='replace').strip()}")
+
+
+def get_compressor(compression: str = "gzip", threads: int = 0) -> Compressor:
+    """Return the compressor for a snapshot_tarball config.
+
+    xz is only used when requested and installed; otherwise tarballs are
+    gzip compressed.
+    """
+    if compression == "xz" and shutil.which("xz"):
+        return ParallelXz(threads=threads)
+    return ParallelGzip(threads=threads)
@@ -0,0 +1,279 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared HTTP download manager for upstream artifacts.
+
+All tarball and signature downloads go through a single pooled
+``requests.Session`` so connections to tarballs.opendev.org, PyPI and
+GitHub are kept alive between files. Downloads are written to a ``.part``
+file first and resumed with an HTTP Range request when a previous attempt
+was interrupted. The sha256 of the content is computed while streaming,
+so callers never need to re-read the file to hash it.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import hashlib
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Number of pooled connections kept per host
+DEFAULT_POOL_SIZE = 16
+
+# Default number of concurrent downloads when prefetching
+DEFAULT_PREFETCH_WORKERS = 4
+
+# Streaming chunk size in bytes
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Default per-request timeout in seconds
+DEFAULT_TIMEOUT = 300
+
+# Suffix used for in-progress downloads
+PARTIAL_SUFFIX = ".part"
+
+USER_AGENT = "packastack"
+
+
+@dataclass(frozen=True)
+class DownloadRequest:
+    """Immutable description of a single file to download.
+
+    Attributes:
+        url: URL to download.
+        dest: Final destination path.
+        expected_sha256: Optional expected sha256; a mismatch fails the download.
+    """
+
+    url: str
+    dest: Path
+    expected_sha256: str = ""
+
+
+@dataclass
+class DownloadResult:
+    """Result of a single download."""
+
+    url: str
+    path: Path
+    success: bool
+    sha256: str = ""
+    size: int = 0
+    resumed: bool = False
+    from_existing: bool = False
+    error: str = ""
+
+
+def _create_session(pool_size: int) -> requests.Session:
+    """Create a requests session with a connection pool sized for prefetching."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def partial_path(dest: Path) -> Path:
+    """Return the in-progress download path for a destination file."""
+    return dest.with_name(dest.name + PARTIAL_SUFFIX)
+
+
+def _hash_file(path: Path, hasher: hashlib._Hash, chunk_size: int) -> int:
+    """Feed an existing file into a hasher and return its size."""
+    size = 0
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+    return size
+
+
+class DownloadManager:
+    """Pooled, resumable, hashing HTTP downloader.
+
+    A single instance is safe to share between threads; requests' connection
+    pool handles concurrent use of the underlying session.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: int = DEFAULT_TIMEOUT,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.session = session or _create_session(pool_size)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        expected_sha256: str = "",
+        timeout: int | None = None,
+    ) -> DownloadResult:
+        """Download a URL to dest, resuming a partial download if present.
+
+        If dest already exists and matches expected_sha256, no request is
+        made. Otherwise data is streamed into ``dest.part`` and renamed into
+        place once complete (and verified, when a hash is expected).
+
+        Args:
+            url: URL to download.
+            dest: Destination path.
+            expected_sha256: Optional expected sha256 hex digest.
+            timeout: Per-request timeout override in seconds.
+
+        Returns:
+            DownloadResult with the streamed sha256 and size.
+        """
+        result = DownloadResult(url=url, path=dest, success=False)
+
+        if expected_sha256 and dest.exists():
+            hasher = hashlib.sha256()
+            size = _hash_file(dest, hasher, self.chunk_size)
+            if hasher.hexdigest() == expected_sha256:
+                result.success = True
+                result.sha256 = expected_sha256
+                result.size = size
+                result.from_existing = True
+                return result
+
+        part = partial_path(dest)
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            sha256, size, resumed = self._stream_to_partial(url, part, timeout or self.timeout)
+        except (requests.RequestException, OSError) as e:
+            # Keep the partial file so the next attempt can resume it
+            result.error = str(e)
+            return result
+
+        if expected_sha256 and sha256 != expected_sha256:
+            with contextlib.suppress(OSError):
+                part.unlink()
+            result.error = f"sha256 mismatch: expected {expected_sha256}, got {sha256}"
+            return result
+
+        part.replace(dest)
+        result.success = True
+        result.sha256 = sha256
+        result.size = size
+        result.resumed = resumed
+        return result
+
+    def _stream_to_partial(self, url: str, part: Path, timeout: int) -> tuple[str, int, bool]:
+        """Stream url into the partial file, returning (sha256, size, resumed)."""
+        hasher = hashlib.sha256()
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self.session.get(url, headers=headers, stream=True, timeout=timeout) as resp:
+            if offset and resp.status_code == 416:
+                # The partial file is stale or already complete; start over.
+                part.unlink()
+                return self._stream_to_partial(url, part, timeout)
+
+            resp.raise_for_status()
+
+            resumed = bool(offset) and resp.status_code == 206
+            if resumed:
+                size = _hash_file(part, hasher, self.chunk_size)
+                mode = "ab"
+            else:
+                size = 0
+                mode = "wb"
+
+            with part.open(mode) as f:
+                for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    size += len(chunk)
+
+        return hasher.hexdigest(), size, resumed
+
+    def prefetch(
+        self,
+        items: Iterable[DownloadRequest],
+        max_workers: int = DEFAULT_PREFETCH_WORKERS,
+        on_complete: Callable[[DownloadResult], None] | None = None,
+    ) -> list[DownloadResult]:
+        """Download many files concurrently over the shared session.
+
+        Args:
+            items: Download requests to execute.
+            max_workers: Maximum number of concurrent downloads.
+            on_complete: Optional callback invoked as each download finishes.
+
+        Returns:
+            List of DownloadResult in the same order as items.
+        """
+        work = list(items)
+        if not work:
+            return []
+
+        results: list[DownloadResult | None] = [None] * len(work)
+        workers = max(1, min(max_workers, self.pool_size, len(work)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.download, item.url, item.dest, item.expected_sha256): idx
+                for idx, item in enumerate(work)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                idx = futures[future]
+                item = work[idx]
+                try:
+                    res = future.result()
+                except Exception as e:  # pragma: no cover - download() traps errors
+                    res = DownloadResult(url=item.url, path=item.dest, success=False, error=str(e))
+                results[idx] = res
+                if on_complete:
+                    on_complete(res)
+
+        return [r for r in results if r is not None]
+
+    def close(self) -> None:
+        """Close the underlying session and its pooled connections."""
+        self.session.close()
+
+
+_shared_manager: DownloadManager | None = None
+_shared_lock = threading.Lock()
+
+
+def get_download_manager() -> DownloadManager:
+    """Return the process-wide shared DownloadManager."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = DownloadManager()
+        return _shared_manager
@@ -19,7 +19,9 @@
 """Git repository fetching for Ubuntu OpenStack packaging sources.
 
 Clones or updates packaging repositories from ubuntu-openstack-dev on Launchpad,
-with file-based locking to prevent concurrent clone operations.
+with file-based locking to prevent concurrent clone operations. When a mirror
+directory is configured, bare mirrors of the packaging repositories are kept
+there and working clones are made from them locally.
 """
 
 from __future__ import annotations
@@ -33,9 +35,13 @@ from typing import TYPE_CHECKING
 
 import git
 
+from packastack.core.slots import SLOT_FETCH, host_slot
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from packastack.core.slots import HostSlots
+
 # Default base URL for ubuntu-openstack-dev repositories
 LAUNCHPAD_BASE_URL = "https://git.launchpad.net/~ubuntu-openstack-dev/ubuntu/+source"
 
@@ -65,6 +71,14 @@ class GitFetcher:
     When a launchpad_username is provided, clones use SSH URLs directly
     (git+ssh://<username>@git.launchpad.net/...) instead of HTTPS. This
     requires SSH keys to be configured for Launchpad access.
+
+    When a mirror_dir is provided, new clones are made from a bare mirror
+    (<mirror_dir>/<package>.git) and the origin remote is then pointed back
+    at Launchpad. With refresh_mirror=False an existing mirror is used as-is,
+    which lets build-all refresh every mirror once up front.
+
+    When host slots are given, every network clone or fetch holds a fetch
+    slot, shared with the other packastack processes on the host.
     """
 
     def __init__(
@@ -72,6 +86,9 @@ class GitFetcher:
         base_url: str = LAUNCHPAD_BASE_URL,
         lock_timeout: int = LOCK_TIMEOUT,
         launchpad_username: str | None = None,
+        mirror_dir: Path | None = None,
+        refresh_mirror: bool = True,
+        slots: HostSlots | None = None,
     ) -> None:
         """Initialize the fetcher.
 
@@ -79,10 +96,16 @@ class GitFetcher:
             base_url: Base URL for git repositories.
             lock_timeout: Maximum seconds to wait for a lock.
             launchpad_username: Launchpad username for SSH push access.
+            mirror_dir: Optional directory holding bare packaging mirrors.
+            refresh_mirror: Fetch into an existing mirror before cloning from it.
+            slots: Optional host slots limiting concurrent network fetches.
         """
         self.base_url = base_url.rstrip("/")
         self.lock_timeout = lock_timeout
         self.launchpad_username = launchpad_username
+        self.mirror_dir = mirror_dir
+        self.refresh_mirror = refresh_mirror
+        self.slots = slots
 
     def build_url(self, package: str, use_ssh: bool | None = None) -> str:
         """Build the git URL for a package.
@@ -133,6 +156,62 @@ class GitFetcher:
         with contextlib.suppress(OSError):
             lock_path.unlink(missing_ok=True)
 
+    def mirror_path(self, package: str) -> Path | None:
+        """Return the bare mirror path for a package, or None without a mirror_dir."""
+        if self.mirror_dir is None:
+            return None
+        return self.mirror_dir / f"{package}.git"
+
+    def update_mirror(self, package: str) -> FetchResult:
+        """Create or refresh the bare mirror of a packaging repository.
+
+        Mirrors are always fetched over anonymous HTTPS; the SSH remote is
+        only configured on the working clones made from them.
+
+        Args:
+            package: Source package name.
+
+        Returns:
+            FetchResult for the mirror (path points at the bare repository).
+        """
+        mirror = self.mirror_path(package)
+        if mirror is None or self.mirror_dir is None:
+            return FetchResult(package=package, path=Path(), error="No mirror directory configured")
+
+        result = FetchResult(package=package, path=mirror)
+        lock_path = self.mirror_dir / f".{package}.lock"
+
+        fd = self._acquire_lock(lock_path)
+        if fd is None:
+            result.error = f"Timeout waiting for mirror lock on {package}"
+            result.was_locked = True
+            return result
+
+        try:
+            with host_slot(self.slots, SLOT_FETCH, package):
+                if (mirror / "HEAD").exists():
+                    repo = git.Repo(mirror)
+                    repo.git.remote("update", "--prune")
+                    result.updated = True
+                else:
+                    git.Repo.clone_from(self.build_url(package, use_ssh=False), mirror, mirror=True)
+                    result.cloned = True
+            result.branches = sorted(head.name for head in git.Repo(mirror).heads)
+        except git.GitCommandError as e:
+            result.error = f"Mirror update failed: {e}"
+        finally:
+            self._release_lock(lock_path)
+
+        return result
+
+    def _clone_from_mirror(self, package: str, pkg_path: Path) -> None:
+        """Clone a working repository from its local mirror and repoint origin."""
+        mirror = self.mirror_path(package)
+        git.Repo.clone_from(str(mirror), pkg_path)
+        repo = git.Repo(pkg_path)
+        repo.remotes.origin.set_url(self.build_url(package, use_ssh=False))
+        self._ensure_ssh_remote(repo, package)
+
     def clone(
         self,
         url: str,
@@ -199,7 +278,16 @@ class GitFetcher:
         lock_path = dest_dir / f".{package}.lock"
 
         if offline:
-            # In offline mode, just check if repo exists
+            # In offline mode, a clone can still be made from a local mirror
+            mirror = self.mirror_path(package)
+            if not (pkg_path / ".git").is_dir() and mirror is not None and (mirror / "HEAD").exists():
+                try:
+                    self._clone_from_mirror(package, pkg_path)
+                    result.cloned = True
+                except git.GitCommandError as e:
+                    result.error = f"Clone from mirror failed: {e}"
+                    return result
+            # Otherwise just check if repo exists
             if pkg_path.exists() and (pkg_path / ".git").is_dir():
                 result.branches = self._list_branches(pkg_path)
             else:
@@ -223,11 +311,28 @@ class GitFetcher:
                     # Ensure SSH remote if username is configured
                     self._ensure_ssh_remote(repo, package)
                     origin = repo.remotes.origin
-                    origin.fetch(prune=True)
+                    with host_slot(self.slots, SLOT_FETCH, package):
+                        origin.fetch(prune=True)
                     result.updated = True
                 except git.GitCommandError as e:
                     result.error = f"Fetch failed: {e}"
                     return result
+            elif self.mirror_dir is not None:
+                # Clone from the local mirror, refreshing it first if required
+                mirror = self.mirror_path(package)
+                if self.refresh_mirror or mirror is None or not (mirror / "HEAD").exists():
+                    mirror_result = self.update_mirror(package)
+                    if mirror_result.error:
+                        result.error = mirror_result.error
+                        result.was_locked = mirror_result.was_locked
+                        return result
+                try:
+                    pkg_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._clone_from_mirror(package, pkg_path)
+                    result.cloned = True
+                except git.GitCommandError as e:
+                    result.error = f"Clone from mirror failed: {e}"
+                    return result
             else:
                 # Clone new repository
                 try:
@@ -235,7 +340,8 @@ class GitFetcher:
                     kwargs: dict = {}
                     if depth is not None:
                         kwargs["depth"] = depth
-                    git.Repo.clone_from(url, pkg_path, **kwargs)
+                    with host_slot(self.slots, SLOT_FETCH, package):
+                        git.Repo.clone_from(url, pkg_path, **kwargs)
                     result.cloned = True
                     # Convert to SSH remote if username is configured
                     repo = git.Repo(pkg_path)
@@ -268,6 +268,23 @@ def load_openstack_packages(
     return packages
 
 
+def package_to_project_name(pkg_name: str, source_to_project: dict[str, str]) -> str:
+    """Map an Ubuntu source package name to its openstack/releases deliverable.
+
+    Args:
+        pkg_name: Ubuntu source package name (e.g., "python-oslo.config").
+        source_to_project: Mapping from :func:`load_openstack_packages`.
+
+    Returns:
+        The deliverable name, or the package name without a ``python-``
+        prefix when the package is not in the releases metadata.
+    """
+    project = source_to_project.get(pkg_name)
+    if project:
+        return project
+    return pkg_name[7:] if pkg_name.startswith("python-") else pkg_name
+
+
 def project_to_package_name(project: str, local_repo: Path) -> str:
     """Map an OpenStack project name to Ubuntu source package name.
 
@@ -26,10 +26,23 @@ This module detects retired upstream projects using:
 
 The module also handles mapping Ubuntu source package names to upstream
 project identifiers (e.g., "glance" -> "openstack/glance").
+
+Parsing projects.yaml and scanning the releases tree is slow, and every
+build-all child repeats it. :func:`load_retirement_snapshot` therefore
+compiles both into a :class:`RetirementSnapshot` pickled under a key made of
+the project-config and releases HEAD SHAs, so later checkers (in any
+process) load it in milliseconds.
 """
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import os
+import pickle
+import subprocess
+import tempfile
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -37,6 +50,12 @@ from typing import Any
 
 import yaml
 
+# Bump when the snapshot layout changes, invalidating stored snapshots
+RETIREMENT_SNAPSHOT_VERSION = 1
+
+# Directory next to the project-config clone holding compiled snapshots
+RETIREMENT_SNAPSHOT_DIR = "retirement-snapshots"
+
 
 class RetirementStatus(str, Enum):
     """Status of a project's retirement state."""
@@ -344,6 +363,49 @@ def find_last_seen_series(
     return last_seen, cycles_since
 
 
+@dataclass
+class ReleasesIndex:
+    """Series in which each deliverable appears in openstack/releases.
+
+    Answers the same question as :func:`find_last_seen_series` from memory,
+    for any target series.
+    """
+
+    series_order: list[str] = field(default_factory=list)
+    # deliverable -> indexes into series_order, ascending
+    deliverables: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def scan(cls, releases_path: Path) -> ReleasesIndex:
+        """Build the index from a releases clone."""
+        series_order = get_series_order(releases_path)
+        deliverables: dict[str, list[int]] = {}
+        for idx, series in enumerate(series_order):
+            with os.scandir(releases_path / "deliverables" / series) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".yaml") and entry.is_file():
+                        deliverables.setdefault(entry.name[:-5], []).append(idx)
+        return cls(series_order=series_order, deliverables=deliverables)
+
+    def last_seen(self, deliverable: str, target_series: str) -> tuple[str, int]:
+        """Find the last series where a deliverable was present.
+
+        Returns:
+            Tuple of (last_seen_series, cycles_since_last_seen), or ("", -1)
+            if never seen, as for :func:`find_last_seen_series`.
+        """
+        if not self.series_order:
+            return "", -1
+        try:
+            target_idx = self.series_order.index(target_series)
+        except ValueError:
+            target_idx = len(self.series_order) - 1
+        for idx in reversed(self.deliverables.get(deliverable, [])):
+            if idx <= target_idx:
+                return self.series_order[idx], target_idx - idx
+        return "", -1
+
+
 def check_retirement(
     source_package: str,
     project_config_path: Path | None,
@@ -352,6 +414,7 @@ def check_retirement(
     registry: Any | None = None,
     releases_deliverables: set[str] | None = None,
     project_config_data: ProjectConfigData | None = None,
+    releases_index: ReleasesIndex | None = None,
 ) -> RetirementInfo:
     """Check retirement status for a package.
 
@@ -363,6 +426,7 @@ def check_retirement(
         registry: UpstreamsRegistry instance (optional).
         releases_deliverables: Set of known deliverable names (optional).
         project_config_data: Pre-loaded project-config data (optional).
+        releases_index: Pre-scanned releases data (optional).
 
     Returns:
         RetirementInfo with retirement status and details.
@@ -423,9 +487,12 @@ def check_retirement(
         if "/" in upstream_project:
             deliverable = upstream_project.split("/")[-1]
 
-        last_seen, cycles_since = find_last_seen_series(
-            deliverable, releases_path, target_series
-        )
+        if releases_index is not None:
+            last_seen, cycles_since = releases_index.last_seen(deliverable, target_series)
+        else:
+            last_seen, cycles_since = find_last_seen_series(
+                deliverable, releases_path, target_series
+            )
 
         info.last_seen_series = last_seen
         info.cycles_since_last_seen = cycles_since
@@ -449,6 +516,165 @@ def check_retirement(
     return info
 
 
+@dataclass
+class RetirementSnapshot:
+    """Compiled project-config and releases data for retirement checks."""
+
+    key: str = ""
+    project_config: ProjectConfigData = field(default_factory=ProjectConfigData)
+    releases: ReleasesIndex | None = None
+
+
+@dataclass
+class SnapshotLoad:
+    """How a retirement snapshot was obtained, for run events."""
+
+    key: str = ""
+    source: str = "compiled"  # "memory", "cache", "compiled"
+    load_ms: float = 0.0
+    projects: int = 0
+    deliverables: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "key": self.key[:12],
+            "source": self.source,
+            "load_ms": self.load_ms,
+            "projects": self.projects,
+            "deliverables": self.deliverables,
+        }
+
+
+# Snapshots already loaded by this process, by key
+_loaded_snapshots: dict[str, RetirementSnapshot] = {}
+
+
+def _git_head(repo: Path) -> str:
+    """Return the HEAD commit of a git checkout, or empty string."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def retirement_snapshot_key(project_config_path: Path, releases_path: Path | None) -> str:
+    """Return the snapshot key for the current clones.
+
+    Returns:
+        sha256 over the project-config and releases HEAD SHAs, or empty string
+        if either clone is not a git checkout (such data is never cached).
+    """
+    project_config_head = _git_head(project_config_path)
+    if not project_config_head:
+        return ""
+    releases_head = ""
+    if releases_path is not None and releases_path.exists():
+        releases_head = _git_head(releases_path)
+        if not releases_head:
+            return ""
+    payload = f"{RETIREMENT_SNAPSHOT_VERSION}:{project_config_head}:{releases_head}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_retirement_snapshot(
+    project_config_path: Path, releases_path: Path | None, key: str = ""
+) -> RetirementSnapshot:
+    """Parse project-config and scan releases into a snapshot."""
+    releases = None
+    if releases_path is not None and releases_path.exists():
+        releases = ReleasesIndex.scan(releases_path)
+    return RetirementSnapshot(
+        key=key,
+        project_config=load_project_config(project_config_path),
+        releases=releases,
+    )
+
+
+def _read_snapshot(path: Path, key: str) -> RetirementSnapshot | None:
+    try:
+        with path.open("rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+        return None
+    if not isinstance(snapshot, RetirementSnapshot) or snapshot.key != key:
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: RetirementSnapshot) -> None:
+    """Write a snapshot atomically; failures only cost a recompile later."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    except OSError:
+        return
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def load_retirement_snapshot(
+    project_config_path: Path,
+    releases_path: Path | None,
+    snapshot_dir: Path | None = None,
+) -> tuple[RetirementSnapshot, SnapshotLoad]:
+    """Load the retirement snapshot for the current clones.
+
+    Looks in this process first, then in ``snapshot_dir``, and compiles (and
+    stores) the snapshot only if neither has it. Snapshots of project-config
+    that failed to load are not stored.
+
+    Args:
+        project_config_path: Path to openstack/project-config clone.
+        releases_path: Path to openstack/releases clone.
+        snapshot_dir: Directory of stored snapshots; defaults to
+            ``retirement-snapshots`` next to the project-config clone.
+
+    Returns:
+        Tuple of (snapshot, load details).
+    """
+    start = time.perf_counter()
+    key = retirement_snapshot_key(project_config_path, releases_path)
+    if snapshot_dir is None:
+        snapshot_dir = project_config_path.parent / RETIREMENT_SNAPSHOT_DIR
+    path = snapshot_dir / f"{key}.pickle"
+
+    source = "memory"
+    snapshot = _loaded_snapshots.get(key) if key else None
+    if snapshot is None and key:
+        source = "cache"
+        snapshot = _read_snapshot(path, key)
+    if snapshot is None:
+        source = "compiled"
+        snapshot = compile_retirement_snapshot(project_config_path, releases_path, key)
+        if key and not snapshot.project_config.load_error:
+            _write_snapshot(path, snapshot)
+    if key and not snapshot.project_config.load_error:
+        _loaded_snapshots[key] = snapshot
+
+    load = SnapshotLoad(
+        key=key,
+        source=source,
+        load_ms=round((time.perf_counter() - start) * 1000, 2),
+        projects=len(snapshot.project_config.projects),
+        deliverables=len(snapshot.releases.deliverables) if snapshot.releases else 0,
+    )
+    return snapshot, load
+
+
 class RetirementChecker:
     """Cached retirement checker for multiple packages.
 
@@ -462,6 +688,8 @@ class RetirementChecker:
         target_series: str = "",
         registry: Any | None = None,
         releases_deliverables: set[str] | None = None,
+        snapshot_dir: Path | None = None,
+        run: Any | None = None,
     ):
         """Initialize the checker.
 
@@ -471,6 +699,8 @@ class RetirementChecker:
             target_series: The target OpenStack series.
             registry: UpstreamsRegistry instance.
             releases_deliverables: Set of known deliverable names.
+            snapshot_dir: Directory of stored retirement snapshots.
+            run: RunContext to log the snapshot load to (optional).
         """
         self.project_config_path = project_config_path
         self.releases_path = releases_path
@@ -478,10 +708,18 @@ class RetirementChecker:
         self.registry = registry
         self.releases_deliverables = releases_deliverables
 
-        # Pre-load project-config
+        # Pre-load project-config and releases from the compiled snapshot
         self._project_config: ProjectConfigData | None = None
+        self._releases: ReleasesIndex | None = None
+        self.snapshot_load: SnapshotLoad | None = None
         if project_config_path is not None and project_config_path.exists():
-            self._project_config = load_project_config(project_config_path)
+            snapshot, self.snapshot_load = load_retirement_snapshot(
+                project_config_path, releases_path, snapshot_dir
+            )
+            self._project_config = snapshot.project_config
+            self._releases = snapshot.releases
+            if run is not None:
+                run.log_event({"event": "retirement.snapshot", **self.snapshot_load.to_dict()})
 
         # Cache for results
         self._cache: dict[str, RetirementInfo] = {}
@@ -518,6 +756,7 @@ class RetirementChecker:
             registry=self.registry,
             releases_deliverables=self.releases_deliverables,
             project_config_data=self._project_config,
+            releases_index=self._releases,
         )
 
         self._cache[source_package] = info
@@ -25,10 +25,12 @@ management.
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import os
 import shutil
 import subprocess
-import urllib.request
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -36,14 +38,21 @@ from urllib.parse import urljoin
 
 import git
 
+from packastack.core.spans import command_span, span
 from packastack.planning.type_selection import BuildType
+from packastack.upstream.compress import ParallelGzip
+from packastack.upstream.download import DownloadResult, get_download_manager
+from packastack.upstream.tarball_cache import get_snapshot_tarball_cache_path
 
 if TYPE_CHECKING:
-    pass
+    from packastack.upstream.compress import Compressor
 
 # OpenStack release tarball base URL
 OPENSTACK_TARBALLS_URL = "https://tarballs.opendev.org"
 
+# Seconds git archive may take to finish once its output has been read
+SNAPSHOT_ARCHIVE_TIMEOUT = 300
+
 
 @dataclass
 class UpstreamSource:
@@ -74,6 +83,7 @@ class TarballResult:
     signature_verified: bool = False
     signature_warning: str = ""
     error: str = ""
+    sha256: str = ""  # Computed while downloading, empty for generated tarballs
 
 
 @dataclass
@@ -218,6 +228,24 @@ def select_upstream_source(
     return None
 
 
+def fetch_file(url: str, dest: Path, expected_sha256: str = "", timeout: int = 300) -> DownloadResult:
+    """Download a file through the shared download manager.
+
+    Uses the pooled HTTP session, resumes partial downloads and computes
+    the sha256 while streaming.
+
+    Args:
+        url: URL to download.
+        dest: Destination path.
+        expected_sha256: Optional expected sha256; a mismatch fails the download.
+        timeout: Download timeout in seconds.
+
+    Returns:
+        DownloadResult with success flag, sha256 and error message.
+    """
+    return get_download_manager().download(url, dest, expected_sha256=expected_sha256, timeout=timeout)
+
+
 def download_file(url: str, dest: Path, timeout: int = 300) -> tuple[bool, str]:
     """Download a file from a URL.
 
@@ -229,17 +257,8 @@ def download_file(url: str, dest: Path, timeout: int = 300) -> tuple[bool, str]:
     Returns:
         Tuple of (success, error_message).
     """
-    try:
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        # Download with timeout
-        with urllib.request.urlopen(url, timeout=timeout) as response:
-            with dest.open("wb") as f:
-                shutil.copyfileobj(response, f)
-
-        return True, ""
-    except Exception as e:
-        return False, str(e)
+    result = fetch_file(url, dest, timeout=timeout)
+    return result.success, result.error
 
 
 def verify_signature(
@@ -265,12 +284,13 @@ def verify_signature(
     cmd.extend([str(signature_path), str(tarball_path)])
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+        with command_span(cmd):
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
         if result.returncode == 0:
             return True, "Signature verified"
         else:
@@ -287,6 +307,7 @@ def download_and_verify_tarball(
     source: UpstreamSource,
     dest_dir: Path,
     keyring_path: Path | None = None,
+    expected_sha256: str = "",
 ) -> TarballResult:
     """Download a tarball and optionally verify its signature.
 
@@ -294,6 +315,7 @@ def download_and_verify_tarball(
         source: UpstreamSource with URLs.
         dest_dir: Directory to download to.
         keyring_path: Optional path to signing key for verification.
+        expected_sha256: Optional expected tarball sha256.
 
     Returns:
         TarballResult with download status and verification info.
@@ -307,16 +329,20 @@ def download_and_verify_tarball(
     signature_path = dest_dir / (filename + ".asc")
 
     # Download tarball
-    success, error = download_file(source.tarball_url, tarball_path)
-    if not success:
-        return TarballResult(success=False, error=f"Failed to download tarball: {error}")
+    download = fetch_file(source.tarball_url, tarball_path, expected_sha256=expected_sha256)
+    if not download.success:
+        return TarballResult(success=False, error=f"Failed to download tarball: {download.error}")
 
     # Try to download signature
     signature_verified = False
     signature_warning = ""
 
     if source.signature_url:
-        sig_success, sig_error = download_file(source.signature_url, signature_path)
+        # A signature staged alongside a prefetched tarball is reused as-is
+        if signature_path.exists() and signature_path.stat().st_size > 0:
+            sig_success, sig_error = True, ""
+        else:
+            sig_success, sig_error = download_file(source.signature_url, signature_path)
         if sig_success:
             # Verify signature
             verified, msg = verify_signature(tarball_path, signature_path, keyring_path)
@@ -334,6 +360,7 @@ def download_and_verify_tarball(
         path=tarball_path,
         signature_verified=signature_verified,
         signature_warning=signature_warning,
+        sha256=download.sha256,
     )
 
 
@@ -343,57 +370,72 @@ def generate_snapshot_tarball(
     package: str,
     version: str,
     output_dir: Path,
+    compressor: Compressor | None = None,
+    cache_base: Path | None = None,
+    project: str = "",
 ) -> TarballResult:
     """Generate an orig tarball from a git repository snapshot.
 
+    ``git archive`` streams an uncompressed tar into the compressor, which
+    by default is the multi-threaded, reproducible ParallelGzip. With a
+    cache_base, the result is kept in the tarball cache keyed by project,
+    commit, archive prefix and compressor, and rebuilding the same commit
+    copies it from there instead of regenerating it.
+
     Args:
         repo_path: Path to the upstream git repository.
         ref: Git ref to snapshot (commit, tag, branch).
         package: Package name for the tarball.
         version: Version string for the tarball.
         output_dir: Directory to write the tarball.
+        compressor: Compressor to use (default: ParallelGzip).
+        cache_base: Tarball cache base directory, or None to not cache.
+        project: Project for the cache key (default: package).
 
     Returns:
         TarballResult with the generated tarball path.
     """
+    if compressor is None:
+        compressor = ParallelGzip()
+
     # Clean version for filename (remove epoch if present)
     clean_version = version.split(":")[-1] if ":" in version else version
 
     # Tarball name follows Debian convention: package_version.orig.tar.gz
-    tarball_name = f"{package}_{clean_version}.orig.tar.gz"
+    tarball_name = f"{package}_{clean_version}.orig.tar.{compressor.suffix}"
     tarball_path = output_dir / tarball_name
+    # The prefix should be package-version/
+    prefix = f"{package}-{clean_version}/"
 
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Use git archive to create tarball
-        # The prefix should be package-version/
-        prefix = f"{package}-{clean_version}/"
-
-        cmd = [
-            "git",
-            "archive",
-            "--format=tar.gz",
-            f"--prefix={prefix}",
-            "--output",
-            str(tarball_path),
-            ref,
-        ]
-
-        result = subprocess.run(
-            cmd,
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
-
-        if result.returncode != 0:
+        cached = None
+        if cache_base is not None:
+            commit = _resolve_commit(repo_path, ref)
+            if commit:
+                cached = get_snapshot_tarball_cache_path(
+                    project or package, commit, prefix, compressor.key, tarball_name, cache_base
+                )
+        if cached is not None and cached.is_file():
+            with span("snapshot-tarball", "cache", hit=True):
+                _copy_atomic(cached, tarball_path)
             return TarballResult(
-                success=False,
-                error=f"git archive failed: {result.stderr}",
+                success=True,
+                path=tarball_path,
+                signature_verified=False,
+                signature_warning="Snapshot build - no signature verification",
             )
 
+        error = _write_snapshot_archive(repo_path, ref, prefix, compressor, tarball_path)
+        if error:
+            return TarballResult(success=False, error=error)
+
+        if cached is not None:
+            with contextlib.suppress(OSError):
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                _copy_atomic(tarball_path, cached)
+
         return TarballResult(
             success=True,
             path=tarball_path,
@@ -407,6 +449,64 @@ def generate_snapshot_tarball(
         return TarballResult(success=False, error=str(e))
 
 
+def _resolve_commit(repo_path: Path, ref: str) -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", f"{ref}^{{commit}}"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _temp_beside(path: Path) -> tuple[int, Path]:
+    """Create a uniquely named, world-readable temp file next to path."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    os.fchmod(fd, 0o644)
+    return fd, Path(tmp_name)
+
+
+def _copy_atomic(src: Path, dest: Path) -> None:
+    fd, tmp = _temp_beside(dest)
+    try:
+        with os.fdopen(fd, "wb") as f, src.open("rb") as source:
+            shutil.copyfileobj(source, f)
+        tmp.replace(dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_snapshot_archive(
+    repo_path: Path, ref: str, prefix: str, compressor: Compressor, tarball_path: Path
+) -> str:
+    """Stream git archive through the compressor into tarball_path.
+
+    Returns:
+        Error message, or empty string on success.
+    """
+    cmd = ["git", "archive", "--format=tar", f"--prefix={prefix}", ref]
+    fd, tmp = _temp_beside(tarball_path)
+    try:
+        with os.fdopen(fd, "wb") as f, command_span(cmd):
+            proc = subprocess.Popen(cmd, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            try:
+                if proc.stdout is None:
+                    raise RuntimeError("git archive has no output pipe")
+                compressor.compress(proc.stdout, f)
+                proc.stdout.close()
+                _, stderr = proc.communicate(timeout=SNAPSHOT_ARCHIVE_TIMEOUT)
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+        if proc.returncode != 0:
+            return f"git archive failed: {stderr.decode(errors='replace')}"
+        tmp.replace(tarball_path)
+        return ""
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
 def get_git_snapshot_info(repo_path: Path, ref: str = "HEAD") -> tuple[str, str, str]:
     """Get snapshot information from a git repository.
 
@@ -672,6 +772,8 @@ def acquire_upstream_snapshot(
     request: SnapshotRequest,
     work_dir: Path,
     output_dir: Path,
+    compressor: Compressor | None = None,
+    cache_base: Path | None = None,
 ) -> SnapshotAcquisitionResult:
     """Acquire an upstream snapshot for building.
 
@@ -695,6 +797,8 @@ def acquire_upstream_snapshot(
         request: SnapshotRequest with project, version, and git parameters.
         work_dir: Working directory for cloning the repo.
         output_dir: Directory to write the orig tarball.
+        compressor: Tarball compressor (see generate_snapshot_tarball).
+        cache_base: Tarball cache base for generated tarballs, or None.
 
     Returns:
         SnapshotAcquisitionResult with all snapshot metadata and tarball.
@@ -757,6 +861,9 @@ def acquire_upstream_snapshot(
         package=pkg_name,
         version=upstream_version,
         output_dir=output_dir,
+        compressor=compressor,
+        cache_base=cache_base,
+        project=request.project,
     )
 
     if not tarball_result.success:
@@ -25,6 +25,7 @@ for dependency analysis during release builds.
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import json
 import logging
 import shutil
@@ -34,6 +35,8 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packastack.core.spans import span
+
 if TYPE_CHECKING:
     pass
 
@@ -54,6 +57,9 @@ TARBALLS_DIR_NAME = "artifacts"
 # Metadata filename for cached tarballs
 TARBALL_METADATA_FILE = "tarball.json"
 
+# Generated snapshot tarballs (under the raw tarball cache directory)
+SNAPSHOTS_DIR_NAME = "snapshots"
+
 
 @dataclass(frozen=True)
 class TarballCacheEntry:
@@ -74,6 +80,7 @@ class TarballCacheEntry:
         git_ref: Git ref used (branch or tag name).
         signature_verified: Whether GPG signature was verified.
         signature_warning: Warning message about signature verification.
+        sha256: sha256 of the tarball, if known.
     """
 
     project: str
@@ -87,6 +94,7 @@ class TarballCacheEntry:
     git_ref: str = ""
     signature_verified: bool = False
     signature_warning: str = ""
+    sha256: str = ""
 
 
 @dataclass
@@ -148,6 +156,7 @@ class TarballMetadata:
     git_ref: str = ""
     signature_verified: bool = False
     signature_warning: str = ""
+    sha256: str = ""
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -166,6 +175,7 @@ class TarballMetadata:
             "git_ref": self.git_ref,
             "signature_verified": self.signature_verified,
             "signature_warning": self.signature_warning,
+            "sha256": self.sha256,
         }
 
     @classmethod
@@ -186,6 +196,7 @@ class TarballMetadata:
             git_ref=data.get("git_ref", ""),
             signature_verified=bool(data.get("signature_verified", False)),
             signature_warning=data.get("signature_warning", ""),
+            sha256=data.get("sha256", ""),
         )
 
 
@@ -544,6 +555,29 @@ def get_tarball_cache_dir(
     return get_tarball_cache_root(cache_base) / safe_project / safe_version
 
 
+def get_snapshot_tarball_cache_path(
+    project: str,
+    commit: str,
+    prefix: str,
+    compressor_key: str,
+    tarball_name: str,
+    cache_base: Path = DEFAULT_CACHE_DIR,
+) -> Path:
+    """Return where a generated snapshot tarball is cached.
+
+    The tarball content is fully determined by the commit, the path prefix
+    inside the archive and the compressor settings, so those form the key.
+    """
+    digest = hashlib.sha256(json.dumps([project, commit, prefix, compressor_key]).encode()).hexdigest()
+    return (
+        get_tarball_cache_root(cache_base)
+        / SNAPSHOTS_DIR_NAME
+        / _safe_cache_key(project)
+        / f"{commit}-{digest[:16]}"
+        / tarball_name
+    )
+
+
 def read_tarball_metadata(cache_dir: Path) -> TarballMetadata | None:
     """Read tarball metadata from a cache directory."""
     metadata_path = cache_dir / TARBALL_METADATA_FILE
@@ -593,7 +627,9 @@ def cache_tarball(
     try:
         cache_dir.mkdir(parents=True, exist_ok=True)
         dest = cache_dir / tarball_path.name
-        shutil.copy2(tarball_path, dest)
+        # Tarballs downloaded straight into the cache need no copy
+        if dest.resolve() != tarball_path.resolve():
+            shutil.copy2(tarball_path, dest)
     except OSError as e:
         logger.debug(f"Failed to cache tarball: {e}")
         return None, None
@@ -613,6 +649,7 @@ def cache_tarball(
         git_ref=entry.git_ref,
         signature_verified=entry.signature_verified,
         signature_warning=entry.signature_warning,
+        sha256=entry.sha256,
     )
     write_tarball_metadata(cache_dir, metadata)
     return dest, metadata
@@ -626,6 +663,20 @@ def find_cached_tarball(
     allow_latest: bool = False,
 ) -> tuple[Path | None, TarballMetadata | None]:
     """Find a cached tarball and its metadata."""
+    with span("tarball-cache", "cache", project=project) as current:
+        found = _find_cached_tarball(project, version, build_type, cache_base, allow_latest)
+        if current is not None:
+            current.attrs["hit"] = found[0] is not None
+    return found
+
+
+def _find_cached_tarball(
+    project: str,
+    version: str | None,
+    build_type: str | None,
+    cache_base: Path,
+    allow_latest: bool,
+) -> tuple[Path | None, TarballMetadata | None]:
     project_dir = get_tarball_cache_root(cache_base) / _safe_cache_key(project)
     if not project_dir.exists():
         return None, None
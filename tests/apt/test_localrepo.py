@@ -21,10 +21,14 @@
 from __future__ import annotations
 
 import gzip
+import shutil
 import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from packastack.apt import localrepo
 
 
@@ -299,8 +303,8 @@ class TestPublishArtifacts:
 
         assert result.success is True
         assert len(result.published_paths) == 2
-        assert (repo_root / "pool" / "main" / "test_1.0_amd64.deb").exists()
-        assert (repo_root / "pool" / "main" / "test-doc_1.0_all.deb").exists()
+        assert (repo_root / "pool" / "main" / "t" / "test" / "test_1.0_amd64.deb").exists()
+        assert (repo_root / "pool" / "main" / "t" / "test-doc" / "test-doc_1.0_all.deb").exists()
 
     def test_publish_mixed_artifacts(self, tmp_path: Path) -> None:
         """Test publishing mixed artifact types."""
@@ -324,7 +328,7 @@ class TestPublishArtifacts:
 
         assert result.success is True
         assert len(result.published_paths) == 4
-        pool_main = repo_root / "pool" / "main"
+        pool_main = repo_root / "pool" / "main" / "t" / "test"
         assert (pool_main / "test_1.0_amd64.deb").exists()
         assert (pool_main / "test_1.0.dsc").exists()
         assert (pool_main / "test_1.0_amd64.changes").exists()
@@ -687,7 +691,7 @@ class TestPublishArtifactsEdgeCases:
 
         assert result.success is True
         assert len(result.published_paths) == 1
-        assert (repo_root / "pool" / "main" / "test-dbgsym_1.0_amd64.ddeb").exists()
+        assert (repo_root / "pool" / "main" / "t" / "test-dbgsym" / "test-dbgsym_1.0_amd64.ddeb").exists()
 
     def test_publish_buildinfo_files(self, tmp_path: Path) -> None:
         """Test publishing .buildinfo files."""
@@ -704,12 +708,12 @@ class TestPublishArtifactsEdgeCases:
         )
 
         assert result.success is True
-        assert (repo_root / "pool" / "main" / "test_1.0_amd64.buildinfo").exists()
+        assert (repo_root / "pool" / "main" / "t" / "test" / "test_1.0_amd64.buildinfo").exists()
 
     def test_publish_overwrites_existing(self, tmp_path: Path) -> None:
         """Test that publishing overwrites existing files."""
         repo_root = tmp_path / "repo"
-        pool_main = repo_root / "pool" / "main"
+        pool_main = repo_root / "pool" / "main" / "t" / "test"
         pool_main.mkdir(parents=True)
 
         # Create existing file with old content
@@ -739,8 +743,8 @@ class TestPublishArtifactsEdgeCases:
         deb = artifacts_dir / "test_1.0_amd64.deb"
         deb.write_bytes(b"deb content")
 
-        with patch("shutil.copy2") as mock_copy:
-            mock_copy.side_effect = PermissionError("Access denied")
+        with patch.object(localrepo, "clone_file") as mock_clone:
+            mock_clone.side_effect = PermissionError("Access denied")
             result = localrepo.publish_artifacts(
                 artifact_paths=[deb],
                 repo_root=repo_root,
@@ -1173,3 +1177,293 @@ class TestEnsureRepoInitialized:
         assert binary_all.is_dir()
         assert (binary_arm64 / "Packages").exists()
         assert (binary_arm64 / "Packages.gz").exists()
+
+
+class TestTransactionalPublish:
+    """Tests for locked, atomic publishing and the Release file."""
+
+    def test_publish_hard_links_same_filesystem(self, tmp_path: Path) -> None:
+        deb = tmp_path / "test_1.0_amd64.deb"
+        deb.write_bytes(b"deb content")
+
+        result = localrepo.publish_artifacts([deb], tmp_path / "repo")
+
+        assert result.success is True
+        assert result.published_paths[0].stat().st_ino == deb.stat().st_ino
+        assert not list((tmp_path / "repo" / "pool" / "main").glob(".*.tmp"))
+
+    def test_publish_falls_back_to_copy(self, tmp_path: Path) -> None:
+        deb = tmp_path / "test_1.0_amd64.deb"
+        deb.write_bytes(b"deb content")
+
+        with patch.object(localrepo.os, "link", side_effect=OSError(18, "cross-device")):
+            result = localrepo.publish_artifacts([deb], tmp_path / "repo")
+
+        assert result.success is True
+        assert result.published_paths[0].read_bytes() == b"deb content"
+        assert result.published_paths[0].stat().st_ino != deb.stat().st_ino
+
+    def test_failed_publish_leaves_pool_untouched(self, tmp_path: Path) -> None:
+        first = tmp_path / "a_1.0_all.deb"
+        second = tmp_path / "b_1.0_all.deb"
+        first.write_bytes(b"a")
+        second.write_bytes(b"b")
+        real_clone = localrepo.clone_file
+
+        def flaky_clone(src: Path, dest: Path) -> None:
+            if src == second:
+                raise OSError("disk full")
+            real_clone(src, dest)
+
+        with patch.object(localrepo, "clone_file", side_effect=flaky_clone):
+            result = localrepo.publish_artifacts([first, second], tmp_path / "repo")
+
+        assert result.success is False
+        assert list((tmp_path / "repo" / "pool" / "main").iterdir()) == []
+
+    def test_release_lists_index_hashes(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        localrepo.ensure_repo_initialized(repo_root, arch="amd64")
+
+        release = (repo_root / "dists" / "local" / "Release").read_text()
+
+        assert "Acquire-By-Hash: yes" in release
+        assert "Architectures: all amd64" in release
+        packages = repo_root / "dists" / "local" / "main" / "binary-amd64" / "Packages.gz"
+        _md5, sha256 = localrepo.compute_file_hashes(packages)
+        assert f" {sha256} " in release
+        assert release.count("main/binary-amd64/Packages.gz") == 2
+        assert "main/source/Sources" in release
+
+    def test_indexes_are_published_by_hash(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        result = localrepo.regenerate_indexes(repo_root, arch="amd64")
+
+        _md5, sha256 = localrepo.compute_file_hashes(result.packages_gz_file)
+        by_hash = result.packages_gz_file.parent / "by-hash" / "SHA256" / sha256
+        assert by_hash.read_bytes() == result.packages_gz_file.read_bytes()
+
+    def test_unchanged_index_is_byte_identical(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        first = localrepo.regenerate_indexes(repo_root, arch="amd64").packages_gz_file.read_bytes()
+        second = localrepo.regenerate_indexes(repo_root, arch="amd64").packages_gz_file.read_bytes()
+
+        assert first == second
+
+    def test_ensure_initialized_adds_missing_release(self, tmp_path: Path) -> None:
+        localrepo.ensure_repo_initialized(tmp_path, arch="amd64")
+        release = tmp_path / "dists" / "local" / "Release"
+        release.unlink()
+
+        assert localrepo.ensure_repo_initialized(tmp_path, arch="amd64") is True
+        assert release.exists()
+
+    def test_repo_lock_excludes_other_processes(self, tmp_path: Path) -> None:
+        script = (
+            "import fcntl, sys\n"
+            "f = open(sys.argv[1], 'w')\n"
+            "try:\n"
+            "    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+            "except BlockingIOError:\n"
+            "    sys.exit(1)\n"
+        )
+        lock_path = str(tmp_path / localrepo.LOCK_FILE)
+
+        with localrepo.repo_lock(tmp_path), localrepo.repo_lock(tmp_path):
+            held = subprocess.run([sys.executable, "-c", script, lock_path], check=False)
+        released = subprocess.run([sys.executable, "-c", script, lock_path], check=False)
+
+        assert held.returncode == 1
+        assert released.returncode == 0
+
+
+def _build_deb(out_dir: Path, package: str, version: str = "1.0", arch: str = "all", source: str = "") -> Path:
+    """Build a minimal real .deb with dpkg-deb."""
+    root = out_dir / f"{package}-root"
+    (root / "DEBIAN").mkdir(parents=True)
+    control = f"Package: {package}\nVersion: {version}\nArchitecture: {arch}\nMaintainer: T <t@example.com>\n"
+    if source:
+        control += f"Source: {source}\n"
+    (root / "DEBIAN" / "control").write_text(control + "Description: test\n")
+    deb = out_dir / f"{package}_{version}_{arch}.deb"
+    subprocess.run(["dpkg-deb", "--build", str(root), str(deb)], check=True, capture_output=True)
+    return deb
+
+
+@pytest.mark.skipif(shutil.which("dpkg-deb") is None, reason="dpkg-deb not available")
+class TestPoolLayout:
+    """Tests for the per-source pool layout and manifest shards."""
+
+    @pytest.mark.parametrize(
+        ("source", "prefix"),
+        [("nova", "n"), ("libvirt", "libv"), ("lib", "l"), ("python-oslo.config", "p")],
+    )
+    def test_pool_prefix(self, source: str, prefix: str) -> None:
+        assert localrepo.pool_prefix(source) == prefix
+
+    def test_binaries_follow_their_source(self, tmp_path: Path) -> None:
+        deb = _build_deb(tmp_path, "python3-oslo.config", source="python-oslo.config")
+        repo_root = tmp_path / "repo"
+
+        result = localrepo.publish_artifacts([deb], repo_root)
+
+        assert result.published_paths == [repo_root / "pool/main/p/python-oslo.config" / deb.name]
+        manifest = localrepo.load_source_manifest(repo_root, "python-oslo.config")
+        assert manifest is not None
+        assert manifest.binaries[deb.name].filename == f"pool/main/p/python-oslo.config/{deb.name}"
+
+    def test_regeneration_reuses_shards(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        localrepo.publish_artifacts([_build_deb(tmp_path, "nova-common", source="nova")], repo_root)
+        localrepo.publish_artifacts([_build_deb(tmp_path, "python3-glance", source="glance")], repo_root)
+
+        with patch.object(localrepo, "extract_deb_control") as mock_extract:
+            result = localrepo.regenerate_indexes(repo_root, arch="amd64")
+
+        mock_extract.assert_not_called()
+        assert result.package_count == 2
+        packages = result.packages_file.read_text()
+        assert "Filename: pool/main/g/glance/python3-glance_1.0_all.deb" in packages
+        assert "Filename: pool/main/n/nova/nova-common_1.0_all.deb" in packages
+
+    def test_publish_only_reads_its_own_source(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        localrepo.publish_artifacts([_build_deb(tmp_path, "nova-common", source="nova")], repo_root)
+        glance = _build_deb(tmp_path, "python3-glance", source="glance")
+        real_extract = localrepo.extract_deb_control
+        seen: list[str] = []
+
+        def spy(path: Path):
+            seen.append(path.name)
+            return real_extract(path)
+
+        with patch.object(localrepo, "extract_deb_control", side_effect=spy):
+            localrepo.publish_artifacts([glance], repo_root)
+
+        assert set(seen) == {"python3-glance_1.0_all.deb"}
+
+    def test_out_of_band_change_rebuilds_shard(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        localrepo.publish_artifacts([_build_deb(tmp_path, "nova-common", source="nova")], repo_root)
+        extra = _build_deb(tmp_path, "nova-api", source="nova")
+        shutil.copy2(extra, localrepo.source_pool_dir(repo_root, "nova") / extra.name)
+
+        result = localrepo.regenerate_indexes(repo_root, arch="amd64")
+
+        assert result.package_count == 2
+
+    def test_migrate_flat_pool(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        localrepo.ensure_repo_initialized(repo_root, arch="amd64")
+        pool_main = repo_root / "pool" / "main"
+        deb = _build_deb(tmp_path, "python3-nova", source="nova")
+        shutil.copy2(deb, pool_main / deb.name)
+        (pool_main / "nova_1.0.dsc").write_text("Source: nova\nVersion: 1.0\n")
+
+        planned = localrepo.migrate_pool_layout(repo_root, dry_run=True)
+        assert (pool_main / deb.name).exists()
+        migrated = localrepo.migrate_pool_layout(repo_root)
+
+        assert planned.sources == migrated.sources == ["nova"]
+        assert sorted(p.name for p in (pool_main / "n" / "nova").iterdir()) == ["nova_1.0.dsc", deb.name]
+        packages = (repo_root / "dists/local/main/binary-amd64/Packages").read_text()
+        assert f"Filename: pool/main/n/nova/{deb.name}" in packages
+        assert "Directory: pool/main/n/nova" in (repo_root / "dists/local/main/source/Sources").read_text()
+        assert localrepo.get_source_versions(repo_root, "nova") == ["1.0"]
+        assert localrepo.migrate_pool_layout(repo_root).moved == []
+
+
+@pytest.mark.skipif(shutil.which("dpkg-deb") is None, reason="dpkg-deb not available")
+class TestRegenerateArchIndexes:
+    """Tests for regenerate_arch_indexes."""
+
+    def test_matches_per_arch_regeneration(self, tmp_path: Path) -> None:
+        repo_root = tmp_path / "repo"
+        debs = [
+            _build_deb(tmp_path, "nova-common", source="nova"),
+            _build_deb(tmp_path, "nova-compute-kvm", arch="amd64", source="nova"),
+            _build_deb(tmp_path, "nova-compute-arm", arch="arm64", source="nova"),
+        ]
+        localrepo.publish_artifacts(debs, repo_root)
+
+        results = localrepo.regenerate_arch_indexes(repo_root, ["amd64", "arm64", "amd64"])
+
+        assert list(results) == ["amd64", "arm64"]
+        assert {arch: r.package_count for arch, r in results.items()} == {"amd64": 2, "arm64": 2}
+        together = {arch: r.packages_gz_file.read_bytes() for arch, r in results.items()}
+        for arch in ("amd64", "arm64"):
+            assert localrepo.regenerate_indexes(repo_root, arch).packages_gz_file.read_bytes() == together[arch]
+        release = (repo_root / "dists/local/Release").read_text()
+        assert "main/binary-arm64/Packages.gz" in release
+        assert "Architectures: amd64 arm64" in release
+
+
+@pytest.mark.skipif(shutil.which("dpkg-deb") is None, reason="dpkg-deb not available")
+class TestGarbageCollection:
+    """Tests for local repo garbage collection."""
+
+    @pytest.fixture
+    def repo_root(self, tmp_path: Path) -> Path:
+        repo_root = tmp_path / "repo"
+        localrepo.ensure_repo_initialized(repo_root, arch="amd64")
+        for version in ("1.0-1", "1.0-2", "2.0-1"):
+            out = tmp_path / version
+            out.mkdir()
+            dsc = out / f"nova_{version}.dsc"
+            dsc.write_text(f"Source: nova\nVersion: {version}\n")
+            orig = out / f"nova_{version.split('-')[0]}.orig.tar.gz"
+            orig.write_bytes(b"orig")
+            deb = _build_deb(out, "python3-nova", version=version, source="nova")
+            localrepo.publish_artifacts([dsc, orig, deb], repo_root)
+        localrepo.regenerate_all_indexes(repo_root, arch="amd64")
+        return repo_root
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("nova_1.0-1.dsc", ("1.0-1", False)),
+            ("nova_1.0.orig.tar.gz", ("1.0", True)),
+            ("nova_1.0.orig-docs.tar.xz.asc", ("1.0", True)),
+            ("nova_1.0-1.debian.tar.xz", ("1.0-1", False)),
+            ("python3-nova_1.0-1_all.deb", ("1.0-1", False)),
+            ("nova_1.0-1_source.changes", ("1.0-1", False)),
+            ("README", ("", False)),
+        ],
+    )
+    def test_pool_file_version(self, name: str, expected: tuple[str, bool]) -> None:
+        assert localrepo.pool_file_version(name) == expected
+
+    def test_keeps_newest_versions_and_shared_orig(self, repo_root: Path) -> None:
+        pool_dir = localrepo.source_pool_dir(repo_root, "nova")
+        size_before = localrepo.pool_size(repo_root)
+
+        result = localrepo.collect_garbage(repo_root, keep=2)
+
+        assert result.success is True
+        assert sorted(p.name for p in result.removed) == ["nova_1.0-1.dsc", "python3-nova_1.0-1_all.deb"]
+        assert (pool_dir / "nova_1.0.orig.tar.gz").exists()
+        assert result.size_before == size_before
+        assert localrepo.pool_size(repo_root) == size_before - result.reclaimed_bytes
+        packages = (repo_root / "dists/local/main/binary-amd64/Packages").read_text()
+        assert "Version: 1.0-1\n" not in packages
+        assert "Version: 2.0-1\n" in packages
+
+    def test_protected_versions_survive(self, repo_root: Path) -> None:
+        result = localrepo.collect_garbage(repo_root, keep=1, protected={"nova": {"1:1.0-1"}})
+
+        assert sorted(p.name for p in result.removed) == ["nova_1.0-2.dsc", "python3-nova_1.0-2_all.deb"]
+
+    def test_dry_run_removes_nothing(self, repo_root: Path) -> None:
+        result = localrepo.collect_garbage(repo_root, keep=1, dry_run=True)
+
+        assert len(result.removed) == 5
+        assert all(p.exists() for p in result.removed)
+
+    def test_plan_reads_only_the_manifest(self, repo_root: Path) -> None:
+        with patch.object(Path, "stat", side_effect=AssertionError("pool walked")):
+            plan = localrepo.plan_garbage_collection(
+                localrepo.load_source_manifest(repo_root, "nova"), keep=1
+            )
+
+        assert "nova_1.0.orig.tar.gz" in plan
+        assert "nova_2.0.orig.tar.gz" not in plan
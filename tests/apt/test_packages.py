@@ -126,6 +126,7 @@ Source: test-src
 Depends: libc6
 Provides: test-alt
 Filename: pool/main/t/test-src/test-pkg_1.0.0_amd64.deb
+SHA256: 5d41402abc4b2a76b9719d911017c592
 
 Package: another-pkg
 Version: 2.0.0
@@ -147,10 +148,12 @@ Filename: pool/main/a/another/another-pkg_2.0.0_amd64.deb
             assert pkg1.source == "test-src"
             assert "libc6" in pkg1.depends
             assert "test-alt" in pkg1.provides
+            assert pkg1.sha256 == "5d41402abc4b2a76b9719d911017c592"
 
             pkg2 = packages[1]
             assert pkg2.name == "another-pkg"
             assert pkg2.version == "2.0.0"
+            assert pkg2.sha256 == ""
         finally:
             temp_path.unlink()
 
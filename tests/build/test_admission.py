@@ -0,0 +1,168 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.admission module."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from packastack.build import admission
+from packastack.build.admission import (
+    AdmissionController,
+    ResourceBudget,
+    ResourceHistory,
+    ResourceUsage,
+)
+
+
+def _controller(cpus: int = 8, memory: int = 1000, disk: int = 1000, **kwargs: object) -> AdmissionController:
+    return AdmissionController(ResourceBudget(cpus=cpus, memory=memory, disk=disk), **kwargs)
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    def test_waits_until_memory_is_released(self) -> None:
+        """A build that does not fit starts once a running build finishes."""
+        controller = _controller(default_usage=ResourceUsage(memory=600))
+        first = controller.acquire("a")
+        started = threading.Event()
+
+        def second() -> None:
+            with controller.admit("b"):
+                started.set()
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not started.wait(0.2)
+        controller.release(first)
+        assert started.wait(5)
+        thread.join()
+        assert controller.running == 0
+
+    def test_admits_oversized_build_when_idle(self) -> None:
+        """A build larger than the budget still runs, alone."""
+        controller = _controller(default_usage=ResourceUsage(memory=5000, disk=5000))
+        with controller.admit("huge") as admitted:
+            assert admitted.usage.memory == 5000
+            assert controller.running == 1
+
+    def test_cpu_share(self) -> None:
+        """Each build gets its share of the CPUs, at least one."""
+        controller = _controller(cpus=8)
+        assert controller.acquire("a", share=2).jobs == 4
+        assert controller.acquire("b", share=3).jobs == 2
+        assert controller.acquire("c", share=2).jobs == 2
+        assert controller.acquire("d", share=2).jobs == 1
+
+    def test_history_overrides_default(self, tmp_path: Path) -> None:
+        """Recorded use replaces the default estimate."""
+        history = ResourceHistory(tmp_path / "h.json")
+        controller = _controller(history=history, default_usage=ResourceUsage(memory=10))
+        controller.record("a", {"memory": 300, "disk": 40})
+        controller.record("b", {})
+        assert controller.estimate("a") == ResourceUsage(memory=300, disk=40)
+        assert controller.estimate("b") == ResourceUsage(memory=10)
+
+    def test_memory_scales_with_jobs(self, tmp_path: Path) -> None:
+        """Recorded memory is per CPU and scaled by the CPUs a build gets."""
+        history = ResourceHistory(tmp_path / "h.json")
+        controller = _controller(cpus=8, memory=10_000, history=history, default_usage=ResourceUsage(memory=10))
+        controller.record("a", {"memory": 800, "disk": 40, "jobs": 4})
+
+        assert controller.estimate("a", jobs=2) == ResourceUsage(memory=400, disk=40)
+        admitted = controller.acquire("a", share=1)
+        assert admitted.jobs == 8
+        assert admitted.usage.memory == 1600
+        assert controller.acquire("b", share=1).usage.memory == 10
+
+
+class TestResourceHistory:
+    """Tests for ResourceHistory."""
+
+    def test_round_trip_keeps_recent_maximum(self, tmp_path: Path) -> None:
+        """The estimate is the largest of the last samples, across runs."""
+        path = tmp_path / "cache" / admission.HISTORY_FILE
+        history = ResourceHistory.load(path)
+        history.record("nova", ResourceUsage(memory=10_000, disk=1))
+        for n in range(admission.HISTORY_SAMPLES):
+            history.record("nova", ResourceUsage(memory=n, disk=n))
+        history.save()
+
+        loaded = ResourceHistory.load(path)
+        assert loaded.estimate("nova") == ResourceUsage(memory=4, disk=4)
+        assert loaded.estimate("glance") is None
+
+    def test_unreadable_file_is_empty(self, tmp_path: Path) -> None:
+        """A corrupt history is ignored."""
+        path = tmp_path / "h.json"
+        path.write_text("{not json")
+        assert ResourceHistory.load(path).samples == {}
+
+
+def test_deb_build_options_keeps_other_options() -> None:
+    """Only the parallel option is replaced."""
+    assert admission.deb_build_options(4, "nocheck parallel=16 noopt") == "nocheck noopt parallel=4"
+    assert admission.deb_build_options(2) == "parallel=2"
+    assert admission.build_jobs("nocheck parallel=6") == 6
+    assert admission.build_jobs("nocheck") == 1
+
+
+def test_process_tree_rss_counts_descendants() -> None:
+    """Memory held by a subprocess counts towards this process's tree."""
+    child = subprocess.Popen(
+        [sys.executable, "-c", "x = bytearray(64 * 1024 * 1024); print('ready', flush=True); input()"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert child.stdout.readline().strip() == "ready"
+        own = admission.process_tree_rss(child.pid)
+        assert own >= 64 * 1024 * 1024
+        assert admission.process_tree_rss(os.getpid()) >= own
+        with admission.ProcessTreeSampler(interval=0.05) as sampler:
+            pass
+        assert sampler.peak >= own
+    finally:
+        child.communicate("")
+
+
+def test_directory_size_counts_hard_links_once(tmp_path: Path) -> None:
+    """Hard-linked files are counted once."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.deb").write_bytes(b"x" * 100)
+    os.link(tmp_path / "a.deb", tmp_path / "sub" / "a.deb")
+    (tmp_path / "b").write_bytes(b"y" * 10)
+    assert admission.directory_size(tmp_path) == 110
+
+
+def test_create_admission_controller(tmp_path: Path) -> None:
+    """The config sets the defaults; disabling it gives no controller."""
+    paths = {"cache_root": tmp_path, "build_root": tmp_path / "build"}
+    cfg = {"admission": {"default_memory_mb": 1, "default_disk_mb": 2, "memory_reserve_mb": 0}}
+    controller = admission.create_admission_controller(cfg, paths)
+    assert controller is not None
+    assert controller.estimate("nova") == ResourceUsage(memory=admission.MIB, disk=2 * admission.MIB)
+    assert controller.history.path == tmp_path / admission.HISTORY_FILE
+    assert admission.create_admission_controller({"admission": {"enabled": False}}, paths) is None
@@ -0,0 +1,185 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.apt_proxy module."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import http.client
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+import requests
+
+import packastack.build.apt_proxy as apt_proxy
+from packastack.build.apt_proxy import (
+    AptCacheProxy,
+    AptProxyStats,
+    cache_path_for,
+    managed_apt_proxy,
+)
+
+DEB = b"!<arch>\n" + bytes(range(256)) * 512
+DEB_PATH = "/ubuntu/pool/main/d/debhelper/debhelper_13.15_all.deb"
+
+
+def _get(proxy: AptCacheProxy, url: str) -> tuple[int, bytes]:
+    """Issue an absolute-URI request through the proxy, as apt does."""
+    conn = http.client.HTTPConnection(proxy.host, proxy.port, timeout=10)
+    try:
+        conn.request("GET", url)
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def proxy(tmp_path: Path) -> Iterator[AptCacheProxy]:
+    session = requests.Session()
+    session.trust_env = False
+    with AptCacheProxy(tmp_path / "cache", session=session) as running:
+        yield running
+    session.close()
+
+
+class TestCachePathFor:
+    """Tests for cache_path_for."""
+
+    def test_pool_file_is_cached(self, tmp_path: Path) -> None:
+        path = cache_path_for(tmp_path, f"http://archive.ubuntu.com{DEB_PATH}")
+        assert path == tmp_path / "archive.ubuntu.com" / DEB_PATH.lstrip("/")
+
+    def test_by_hash_is_cached(self, tmp_path: Path) -> None:
+        url = "http://archive.ubuntu.com/ubuntu/dists/noble/main/binary-amd64/by-hash/SHA256/abc"
+        assert cache_path_for(tmp_path, url) is not None
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://archive.ubuntu.com/ubuntu/dists/noble/InRelease",
+            "http://archive.ubuntu.com/ubuntu/dists/noble/main/binary-amd64/Packages.xz",
+            "http://archive.ubuntu.com/ubuntu/pool/../../etc/passwd",
+            "https://archive.ubuntu.com/ubuntu/pool/main/d/debhelper/debhelper.deb",
+            "http://archive.ubuntu.com/ubuntu/pool/main/x.deb?token=1",
+            "http://archive.ubuntu.com/ubuntu/pool",
+        ],
+    )
+    def test_not_cached(self, tmp_path: Path, url: str) -> None:
+        assert cache_path_for(tmp_path, url) is None
+
+
+class TestAptCacheProxy:
+    """Tests for AptCacheProxy against a local mirror."""
+
+    def test_miss_then_hit(self, proxy: AptCacheProxy, local_http_server) -> None:
+        local_http_server.files[DEB_PATH] = DEB
+        url = f"{local_http_server.url}{DEB_PATH}"
+
+        assert _get(proxy, url) == (200, DEB)
+        assert _get(proxy, url) == (200, DEB)
+
+        assert len(local_http_server.requests) == 1
+        stats = proxy.stats
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.bytes_from_cache == len(DEB)
+        assert stats.bytes_from_upstream == len(DEB)
+
+    def test_indexes_pass_through(self, proxy: AptCacheProxy, local_http_server) -> None:
+        local_http_server.files["/ubuntu/dists/noble/InRelease"] = b"Origin: Ubuntu\n"
+        url = f"{local_http_server.url}/ubuntu/dists/noble/InRelease"
+
+        assert _get(proxy, url) == (200, b"Origin: Ubuntu\n")
+        assert _get(proxy, url) == (200, b"Origin: Ubuntu\n")
+
+        assert len(local_http_server.requests) == 2
+        assert proxy.stats.passthrough == 2
+        assert not any(p.is_file() for p in proxy.cache_dir.rglob("*"))
+
+    def test_missing_file_not_cached(self, proxy: AptCacheProxy, local_http_server) -> None:
+        status, _ = _get(proxy, f"{local_http_server.url}/ubuntu/pool/main/n/nope/nope.deb")
+
+        assert status == 404
+        assert proxy.stats.misses == 0
+        assert not any(p.is_file() for p in proxy.cache_dir.rglob("*"))
+
+    def test_concurrent_requests_download_once(self, proxy: AptCacheProxy, local_http_server) -> None:
+        local_http_server.files[DEB_PATH] = DEB
+        url = f"{local_http_server.url}{DEB_PATH}"
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _i: _get(proxy, url), range(4)))
+
+        assert all(r == (200, DEB) for r in results)
+        assert len(local_http_server.requests) == 1
+        assert proxy.stats.hits == 3
+
+    def test_rejects_relative_requests(self, proxy: AptCacheProxy) -> None:
+        status, _ = _get(proxy, "/ubuntu/pool/main/x.deb")
+        assert status == 501
+
+
+def test_stats_to_dict() -> None:
+    data = AptProxyStats(hits=3, misses=1).to_dict()
+    assert data["hits"] == 3
+    assert data["hit_ratio"] == 0.75
+    assert AptProxyStats().hit_ratio == 0.0
+
+
+class TestManagedAptProxy:
+    """Tests for managed_apt_proxy."""
+
+    @pytest.fixture(autouse=True)
+    def _no_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv(apt_proxy.APT_PROXY_ENV, raising=False)
+        monkeypatch.setattr(apt_proxy, "activity", lambda *_a, **_k: None)
+        monkeypatch.setattr(apt_proxy, "find_configured_apt_proxy", lambda: ("", ""))
+
+    def test_disabled(self, tmp_path: Path) -> None:
+        with managed_apt_proxy({}, tmp_path) as (url, proxy):
+            assert url == ""
+            assert proxy is None
+
+    def test_inherits_coordinator_proxy(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setenv(apt_proxy.APT_PROXY_ENV, "http://127.0.0.1:3142")
+        with managed_apt_proxy({}, tmp_path) as (url, proxy):
+            assert url == "http://127.0.0.1:3142"
+            assert proxy is None
+
+    def test_external_url(self, tmp_path: Path) -> None:
+        cfg = {"apt_proxy": {"enabled": True, "url": "http://cacher:3142"}}
+        with managed_apt_proxy(cfg, tmp_path) as (url, proxy):
+            assert url == "http://cacher:3142"
+            assert proxy is None
+
+    def test_respects_sbuildrc_proxy(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setattr(
+            apt_proxy, "find_configured_apt_proxy", lambda: ("http://cacher:3142", "~/.sbuildrc")
+        )
+        with managed_apt_proxy({"apt_proxy": {"enabled": True}}, tmp_path) as (url, proxy):
+            assert url == ""
+            assert proxy is None
+
+    def test_starts_and_stops_local_proxy(self, tmp_path: Path) -> None:
+        with managed_apt_proxy({"apt_proxy": {"enabled": True}}, tmp_path / "cache") as (url, proxy):
+            assert proxy is not None
+            assert url == proxy.url
+            assert proxy.port != 0
+        assert proxy._server is None
@@ -0,0 +1,293 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.build_cache module."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import packastack.build.single_build as single_build
+from packastack.apt.packages import BinaryPackage, PackageIndex
+from packastack.build.build_cache import (
+    compute_build_cache_key,
+    local_build_dep_state,
+    lookup_build_cache,
+    packaging_tree_id,
+    store_build_cache,
+)
+from packastack.build.provenance import (
+    BuildCacheProvenance,
+    _from_dict,
+    _to_dict,
+    create_provenance,
+    summarize_provenance,
+)
+from packastack.build.single_build import (
+    BuildResult,
+    PhaseResult,
+    PrepareResult,
+    SingleBuildContext,
+    build_single_package,
+)
+from packastack.planning.type_selection import BuildType
+
+CONTROL = """\
+Source: python-oslo.config
+Build-Depends: debhelper-compat (= 13), python3-pbr | python3-setuptools
+Build-Depends-Indep: python3-netaddr
+
+Package: python3-oslo.config
+Architecture: all
+"""
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def pkg_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "pkg"
+    (repo / "debian").mkdir(parents=True)
+    (repo / "debian" / "control").write_text(CONTROL)
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+def _index(*entries: tuple[str, str, str]) -> PackageIndex:
+    index = PackageIndex()
+    for name, version, sha in entries:
+        index.add_package(BinaryPackage(name=name, version=version, architecture="all", sha256=sha), "main", "local")
+    return index
+
+
+def _artifacts(tmp_path: Path) -> list[Path]:
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    paths = []
+    for name in ("foo_1.0-1.dsc", "foo_1.0-1_source.changes", "python3-foo_1.0-1_all.deb"):
+        path = out / name
+        path.write_text(name)
+        paths.append(path)
+    return paths
+
+
+class TestPackagingTreeId:
+    """Tests for packaging_tree_id."""
+
+    def test_same_tree_across_commits(self, pkg_repo: Path) -> None:
+        tree = packaging_tree_id(pkg_repo)
+        _git(pkg_repo, "commit", "-q", "--allow-empty", "-m", "watch update")
+
+        assert tree
+        assert packaging_tree_id(pkg_repo) == tree
+
+    def test_dirty_tree_is_uncacheable(self, pkg_repo: Path) -> None:
+        (pkg_repo / "debian" / "control").write_text(CONTROL + "\n")
+        assert packaging_tree_id(pkg_repo) == ""
+
+    def test_not_a_repo(self, tmp_path: Path) -> None:
+        assert packaging_tree_id(tmp_path) == ""
+
+
+class TestLocalBuildDepState:
+    """Tests for local_build_dep_state."""
+
+    def test_includes_local_alternatives(self, pkg_repo: Path) -> None:
+        index = _index(("python3-pbr", "6.0.0-1", "aa"), ("python3-netaddr", "1.0-1", "bb"), ("nova", "1", "cc"))
+
+        state = local_build_dep_state(pkg_repo / "debian" / "control", index)
+
+        assert state == {"python3-netaddr": "1.0-1 bb", "python3-pbr": "6.0.0-1 aa"}
+
+    def test_without_index(self, pkg_repo: Path) -> None:
+        assert local_build_dep_state(pkg_repo / "debian" / "control", None) == {}
+
+    def test_unparseable_control(self, tmp_path: Path) -> None:
+        assert local_build_dep_state(tmp_path / "missing", None) is None
+
+
+class TestStoreAndLookup:
+    """Tests for store_build_cache and lookup_build_cache."""
+
+    def test_key_depends_on_inputs(self) -> None:
+        base = {"packaging_tree": "t1", "build_deps": {"python3-pbr": "6.0.0-1 aa"}}
+        changed = {"packaging_tree": "t1", "build_deps": {"python3-pbr": "6.0.0-1 ab"}}
+
+        assert compute_build_cache_key(base) == compute_build_cache_key(dict(base))
+        assert compute_build_cache_key(base) != compute_build_cache_key(changed)
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = tmp_path / "cache"
+        artifacts = _artifacts(tmp_path)
+
+        stored = store_build_cache(cache, "ab" * 32, "foo", "1.0-1", artifacts, {"x": 1}, run_id="r1")
+        found = lookup_build_cache(cache, "ab" * 32)
+
+        assert stored is not None
+        assert found is not None
+        assert found.run_id == "r1"
+        assert found.path == cache / "ab" / ("ab" * 32)
+        assert sorted(p.name for p in found.artifact_paths()) == sorted(a.name for a in artifacts)
+        assert not list(found.path.parent.glob(".*"))
+
+    def test_cache_is_independent_of_workspace(self, tmp_path: Path) -> None:
+        cache = tmp_path / "cache"
+        artifacts = _artifacts(tmp_path)
+        entry = store_build_cache(cache, "cd" * 32, "foo", "1.0-1", artifacts, {})
+        artifacts[0].write_text("re-signed")
+
+        assert entry is not None
+        assert (entry.path / artifacts[0].name).read_text() == artifacts[0].name
+
+    def test_missing_artifact_is_a_miss(self, tmp_path: Path) -> None:
+        cache = tmp_path / "cache"
+        entry = store_build_cache(cache, "ef" * 32, "foo", "1.0-1", _artifacts(tmp_path), {})
+        assert entry is not None
+        entry.artifact_paths()[0].unlink()
+
+        assert lookup_build_cache(cache, "ef" * 32) is None
+
+    def test_unknown_key(self, tmp_path: Path) -> None:
+        assert lookup_build_cache(tmp_path, "00" * 32) is None
+
+    def test_nothing_to_store(self, tmp_path: Path) -> None:
+        assert store_build_cache(tmp_path, "11" * 32, "foo", "1", [tmp_path / "nope.deb"], {}) is None
+
+
+def test_provenance_round_trip() -> None:
+    provenance = create_provenance("python-oslo.config", run_id="r2")
+    provenance.build_cache = BuildCacheProvenance(key="abc", hit=True, source_run_id="r1", inputs={"series": "noble"})
+
+    loaded = _from_dict(_to_dict(provenance))
+
+    assert loaded.build_cache == provenance.build_cache
+    assert summarize_provenance(loaded)["build_cache_hit"] is True
+
+
+class TestBuildSinglePackageCache:
+    """Tests for build result caching in build_single_package."""
+
+    @pytest.fixture
+    def ctx(self, tmp_path: Path, pkg_repo: Path) -> SingleBuildContext:
+        run = MagicMock()
+        run.run_id = "run-1"
+        run.run_path = tmp_path / "run"
+        return SingleBuildContext(
+            pkg_name="python-oslo.config",
+            package="oslo.config",
+            run=run,
+            target="devel",
+            openstack_target="gazpacho",
+            ubuntu_series="devel",
+            resolved_ubuntu="resolute",
+            cloud_archive="",
+            build_type=BuildType.RELEASE,
+            build_type_str="release",
+            binary=True,
+            builder="sbuild",
+            force=False,
+            offline=False,
+            skip_repo_regen=True,
+            no_spinner=True,
+            build_deps=False,
+            min_version_policy="enforce",
+            dep_report=False,
+            fail_on_cloud_archive_required=False,
+            fail_on_mir_required=False,
+            update_control_min_versions=False,
+            normalize_to_prev_lts_floor=False,
+            dry_run_control_edit=False,
+            paths={"cache_root": tmp_path / "cache", "build_cache": tmp_path / "build-cache"},
+            workspace=tmp_path / "ws",
+            pkg_repo=pkg_repo,
+            local_index=_index(("python3-pbr", "6.0.0-1", "aa")),
+            provenance=create_provenance("python-oslo.config", run_id="run-1"),
+        )
+
+    @pytest.fixture
+    def phases(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict:
+        tarball = tmp_path / "oslo.config_9.0.0.orig.tar.gz"
+        tarball.write_bytes(b"upstream")
+        calls: dict = {"built": 0, "published": []}
+
+        def fake_build(ctx, _version):
+            calls["built"] += 1
+            return PhaseResult.ok(), BuildResult(
+                source_success=True, binary_success=True, artifacts=_artifacts(tmp_path)
+            )
+
+        def fake_publish(_ctx, build_result):
+            calls["published"].append([a.name for a in build_result.artifacts])
+            return PhaseResult.ok()
+
+        ok = PhaseResult.ok()
+        prepare = PrepareResult(upstream_tarball=tarball, new_version="9.0.0-0ubuntu1")
+        monkeypatch.setattr(single_build, "activity", lambda *_a, **_k: None)
+        monkeypatch.setattr(single_build, "fetch_packaging_repo", lambda *_a: (ok, None))
+        monkeypatch.setattr(single_build, "report_dependency_satisfaction", lambda _ctx: ok)
+        monkeypatch.setattr(single_build, "prepare_upstream_source", lambda _ctx: (ok, prepare))
+        monkeypatch.setattr(single_build, "validate_and_build_deps", lambda *_a, **_k: (ok, None))
+        monkeypatch.setattr(single_build, "import_and_patch", lambda *_a, **_k: ok)
+        monkeypatch.setattr(single_build, "build_packages", fake_build)
+        monkeypatch.setattr(single_build, "verify_and_publish", fake_publish)
+        monkeypatch.setattr("packastack.build.provenance.write_provenance", lambda *_a: tmp_path / "p.yaml")
+        return calls
+
+    def test_second_build_reuses_artifacts(self, ctx: SingleBuildContext, phases: dict) -> None:
+        first = build_single_package(ctx)
+        assert ctx.provenance.build_cache.hit is False
+
+        second = build_single_package(ctx)
+
+        assert first.success and second.success
+        assert phases["built"] == 1
+        assert phases["published"][0] == phases["published"][1]
+        assert ctx.provenance.build_cache.hit is True
+        assert ctx.provenance.build_cache.source_run_id == "run-1"
+        assert all(a.parent == ctx.workspace / "build-output" for a in second.artifacts)
+
+    def test_build_dep_change_rebuilds(self, ctx: SingleBuildContext, phases: dict) -> None:
+        build_single_package(ctx)
+        ctx.local_index = _index(("python3-pbr", "6.0.0-1", "a2"))
+
+        build_single_package(ctx)
+
+        assert phases["built"] == 2
+
+    def test_disabled(self, ctx: SingleBuildContext, phases: dict) -> None:
+        ctx.build_cache = False
+
+        build_single_package(ctx)
+        build_single_package(ctx)
+
+        assert phases["built"] == 2
+        assert ctx.provenance.build_cache.key == ""
@@ -0,0 +1,237 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.chroot_cache module."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import packastack.build.chroot_cache as chroot_cache
+from packastack.build.chroot_cache import (
+    DEFAULT_SEED_PACKAGES,
+    WarmChrootConfig,
+    compute_seed_fingerprint,
+    ensure_warm_chroot,
+    generate_seed_script,
+    get_warm_chroot_name,
+    render_schroot_config,
+    warm_chroot_enabled,
+)
+
+
+def _write_packages(repo: Path, entries: list[tuple[str, str]]) -> None:
+    binary_dir = repo / "dists" / "local" / "main" / "binary-amd64"
+    binary_dir.mkdir(parents=True, exist_ok=True)
+    stanzas = [f"Package: {name}\nVersion: {version}\nArchitecture: all\n" for name, version in entries]
+    (binary_dir / "Packages").write_text("\n".join(stanzas))
+
+
+def _config(tmp_path: Path, repo: Path | None = None) -> WarmChrootConfig:
+    return WarmChrootConfig(
+        series="noble",
+        arch="amd64",
+        base_chroot="packastack-noble-amd64",
+        state_dir=tmp_path / "chroots",
+        local_repo_root=repo,
+    )
+
+
+class TestSettings:
+    """Tests for config parsing helpers."""
+
+    def test_from_settings_defaults(self, tmp_path: Path) -> None:
+        config = WarmChrootConfig.from_settings(
+            {}, "noble", "amd64", "packastack-noble-amd64", tmp_path, None
+        )
+        assert config.seed_packages == DEFAULT_SEED_PACKAGES
+        assert config.max_age_seconds == 86400
+        assert config.state_dir == tmp_path / "chroots"
+
+    def test_from_settings_overrides(self, tmp_path: Path) -> None:
+        cfg = {"chroot_cache": {"seed_packages": ["debhelper"], "max_age": "2h"}}
+        config = WarmChrootConfig.from_settings(cfg, "noble", "amd64", "base", tmp_path, None)
+        assert config.seed_packages == ("debhelper",)
+        assert config.max_age_seconds == 7200
+
+    def test_enabled(self) -> None:
+        assert warm_chroot_enabled({}) is False
+        assert warm_chroot_enabled({"chroot_cache": {"enabled": True}}) is True
+
+    def test_name(self) -> None:
+        assert get_warm_chroot_name("noble", "arm64") == "packastack-noble-arm64-warm"
+
+
+class TestFingerprint:
+    """Tests for compute_seed_fingerprint."""
+
+    def test_changes_with_seed_list(self, tmp_path: Path) -> None:
+        config = _config(tmp_path)
+        smaller = dataclasses.replace(config, seed_packages=("debhelper",))
+        assert compute_seed_fingerprint(smaller) != compute_seed_fingerprint(config)
+
+    def test_ignores_local_repo_versions(self, tmp_path: Path) -> None:
+        """Seed packages published mid-run must not force a re-seed."""
+        repo = tmp_path / "repo"
+        _write_packages(repo, [("python3-oslo.config", "9.0.0-1"), ("python3-nova", "1.0-1")])
+        before = compute_seed_fingerprint(_config(tmp_path, repo))
+
+        _write_packages(repo, [("python3-oslo.config", "9.1.0-1"), ("python3-nova", "2.0-1")])
+        assert compute_seed_fingerprint(_config(tmp_path, repo)) == before
+
+    def test_missing_repo(self, tmp_path: Path) -> None:
+        assert compute_seed_fingerprint(_config(tmp_path, tmp_path / "nope"))
+        assert compute_seed_fingerprint(_config(tmp_path))
+
+
+class TestRendering:
+    """Tests for schroot config and seed script rendering."""
+
+    def test_overlay_config(self) -> None:
+        text = render_schroot_config("warm", Path("/srv/gen1"), "desc", overlay=True)
+        assert text.startswith("[warm]\n")
+        assert "directory=/srv/gen1" in text
+        assert "union-type=overlay" in text
+
+    def test_seed_config_has_no_overlay(self) -> None:
+        text = render_schroot_config("seed", Path("/srv/gen1"), "desc", overlay=False)
+        assert "union-type" not in text
+
+    def test_seed_script_with_local_repo(self, tmp_path: Path) -> None:
+        script = generate_seed_script(("debhelper", "python3-pbr"), tmp_path)
+        assert "for p in debhelper python3-pbr; do" in script
+        assert "mount --bind" in script
+        assert script.index("apt-get update") < script.index("apt-get clean")
+
+    def test_seed_script_without_local_repo(self) -> None:
+        script = generate_seed_script(("debhelper",), None)
+        assert "mount --bind" not in script
+        assert "dist-upgrade" in script
+
+
+class TestEnsureWarmChroot:
+    """Tests for ensure_warm_chroot."""
+
+    @pytest.fixture
+    def host(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict:
+        calls: dict = {"root": [], "existing": set()}
+        base = tmp_path / "base"
+        base.mkdir()
+
+        def fake_run_root(cmd, input_text=None, timeout=None):
+            calls["root"].append(cmd)
+            if cmd[0] == "tee":
+                calls["existing"].add(Path(cmd[1]).name)
+            return True, ""
+
+        monkeypatch.setattr(chroot_cache.shutil, "which", lambda _name: "/usr/bin/schroot")
+        monkeypatch.setattr(chroot_cache.os, "geteuid", lambda: 0)
+        monkeypatch.setattr(chroot_cache, "_run_root", fake_run_root)
+        monkeypatch.setattr(chroot_cache, "_chroot_directory", lambda _name: base)
+        monkeypatch.setattr(chroot_cache, "schroot_exists", lambda name: name in calls["existing"])
+        monkeypatch.setattr(chroot_cache, "SCHROOT_CHROOT_DIR", tmp_path / "chroots-root")
+        return calls
+
+    def test_seeds_new_generation(self, host: dict, tmp_path: Path) -> None:
+        config = _config(tmp_path)
+
+        result = ensure_warm_chroot(config, offline=False)
+
+        assert result.ready is True
+        assert result.refreshed is True
+        assert result.name == "packastack-noble-amd64-warm"
+        commands = [cmd[0] for cmd in host["root"]]
+        assert commands[:3] == ["cp", "tee", "schroot"]
+        state = chroot_cache.read_warm_state(config)
+        assert state["generation"] == result.generation
+        assert state["fingerprint"] == result.fingerprint
+
+    def test_fresh_snapshot_is_reused(self, host: dict, tmp_path: Path) -> None:
+        config = _config(tmp_path)
+        first = ensure_warm_chroot(config, offline=False)
+        host["root"].clear()
+
+        second = ensure_warm_chroot(config, offline=False)
+
+        assert second.ready is True
+        assert second.refreshed is False
+        assert second.generation == first.generation
+        assert host["root"] == []
+
+    def test_expired_snapshot_is_reseeded(self, host: dict, tmp_path: Path) -> None:
+        config = _config(tmp_path)
+        ensure_warm_chroot(config, offline=False)
+        state_file = config.state_dir / "packastack-noble-amd64-warm.json"
+        state = json.loads(state_file.read_text())
+        state["created_at"] = (datetime.now(UTC) - timedelta(days=2)).isoformat()
+        state_file.write_text(json.dumps(state))
+        host["root"].clear()
+
+        result = ensure_warm_chroot(config, offline=False)
+
+        assert result.refreshed is True
+        assert host["root"][0][0] == "cp"
+
+    def test_offline_uses_stale_snapshot(self, host: dict, tmp_path: Path) -> None:
+        ensure_warm_chroot(_config(tmp_path), offline=False)
+        host["root"].clear()
+
+        stale = dataclasses.replace(_config(tmp_path), seed_packages=("debhelper",))
+        result = ensure_warm_chroot(stale, offline=True)
+
+        assert result.ready is True
+        assert result.refreshed is False
+        assert host["root"] == []
+
+    def test_offline_without_snapshot(self, host: dict, tmp_path: Path) -> None:
+        result = ensure_warm_chroot(_config(tmp_path), offline=True)
+        assert result.ready is False
+        assert "offline" in result.error
+
+    def test_seed_failure_falls_back(
+        self, host: dict, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        def failing_run_root(cmd, input_text=None, timeout=None):
+            host["root"].append(cmd)
+            return (False, "E: Unable to locate package") if cmd[0] == "schroot" else (True, "")
+
+        monkeypatch.setattr(chroot_cache, "_run_root", failing_run_root)
+
+        result = ensure_warm_chroot(_config(tmp_path), offline=False)
+
+        assert result.ready is False
+        assert "Unable to locate" in result.error
+        assert host["root"][-1][:2] == ["rm", "-rf"]
+        assert chroot_cache.read_warm_state(_config(tmp_path)) is None
+
+    def test_no_sudo_non_interactive(
+        self, host: dict, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        monkeypatch.setattr(chroot_cache.os, "geteuid", lambda: 1000)
+        monkeypatch.setattr(chroot_cache, "_sudo_credentials_cached", lambda: False)
+
+        result = ensure_warm_chroot(_config(tmp_path), offline=False, interactive=False)
+
+        assert result.ready is False
+        assert "sudo" in result.error
+        assert host["root"] == []
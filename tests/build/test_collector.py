@@ -20,10 +20,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import time
 from pathlib import Path
+from unittest.mock import patch
 
+from packastack.apt import localrepo
+from packastack.build import collector
 from packastack.build.collector import (
     ArtifactReport,
     CollectedFile,
@@ -131,6 +135,53 @@ class TestCopyFileWithChecksum:
         assert result2.copied_path.exists()
         assert result1.copied_path != result2.copied_path
 
+    def test_links_on_same_filesystem(self, tmp_path: Path) -> None:
+        """Should hard-link instead of copying when possible."""
+        src = tmp_path / "file.deb"
+        src.write_bytes(b"deb content")
+
+        result = copy_file_with_checksum(src, tmp_path / "dest")
+
+        assert result.copied_path.stat().st_ino == src.stat().st_ino
+        assert result.md5sum == hashlib.md5(b"deb content").hexdigest()
+
+    def test_copy_fallback_reads_once(self, tmp_path: Path) -> None:
+        """Should hash while copying when linking is not possible."""
+        src = tmp_path / "file.deb"
+        src.write_bytes(b"deb content")
+
+        with (
+            patch.object(collector, "link_or_reflink", return_value=False),
+            patch.object(collector, "_hash_file", side_effect=AssertionError("re-read")),
+        ):
+            result = copy_file_with_checksum(src, tmp_path / "dest")
+
+        assert result.copied_path.read_bytes() == b"deb content"
+        assert result.copied_path.stat().st_ino != src.stat().st_ino
+        assert result.sha256 == hashlib.sha256(b"deb content").hexdigest()
+
+    def test_checksums_reused_by_publish(self, tmp_path: Path) -> None:
+        """Publishing should index the collected checksums without re-hashing."""
+        src = tmp_path / "foo_1.0_all.deb"
+        src.write_bytes(b"deb content")
+        collected = copy_file_with_checksum(src, tmp_path / "dest")
+        info = localrepo.DebPackageInfo(package="foo", version="1.0", architecture="all")
+
+        with (
+            patch.object(localrepo, "extract_deb_control", return_value=info),
+            patch.object(localrepo, "compute_file_hashes", side_effect=AssertionError("re-hashed")),
+        ):
+            result = localrepo.publish_artifacts(
+                [collected.copied_path],
+                tmp_path / "repo",
+                checksums={collected.copied_path.name: collected.checksums()},
+            )
+
+        assert result.success is True
+        manifest = localrepo.load_source_manifest(tmp_path / "repo", "foo")
+        assert manifest is not None
+        assert manifest.binaries[src.name].sha256 == collected.sha256
+
 
 class TestMatchesPackage:
     """Tests for matches_package function."""
@@ -266,6 +317,15 @@ class TestFindArtifactsInDirectory:
 
         assert result == []
 
+    def test_filters_by_architecture(self, tmp_path: Path) -> None:
+        """Should keep to the given architectures when building several at once."""
+        for name in ("nova_1.0_amd64.deb", "nova_1.0_arm64.deb", "nova-doc_1.0_all.deb", "nova_1.0_arm64.changes"):
+            (tmp_path / name).write_text(name)
+
+        result = find_artifacts_in_directory(tmp_path, source_package="nova", architectures={"arm64"})
+
+        assert sorted(p.name for p in result) == ["nova_1.0_arm64.changes", "nova_1.0_arm64.deb"]
+
 
 class TestFindLogsInDirectory:
     """Tests for find_logs_in_directory function."""
@@ -443,9 +503,60 @@ class TestCollectionResult:
         assert "/tmp/build" in d["searched_dirs"]
 
 
+    def test_merge(self) -> None:
+        """Should combine per-architecture collections and drop duplicates."""
+        shared = CollectedFile(Path("doc_1_all.deb"), Path("/out/doc_1_all.deb"), "h", 1, 0)
+        amd64 = CollectionResult(success=True, searched_dirs=["/a"])
+        amd64.binaries = [CollectedFile(Path("x_1_amd64.deb"), Path("/out/x_1_amd64.deb"), "h", 1, 0), shared]
+        arm64 = CollectionResult(success=True, searched_dirs=["/a", "/b"])
+        arm64.binaries = [CollectedFile(Path("x_1_arm64.deb"), Path("/out/x_1_arm64.deb"), "h", 1, 0), shared]
+
+        merged = CollectionResult.merge([amd64, arm64])
+
+        assert merged.success
+        assert merged.deb_count == 3
+        assert merged.searched_dirs == ["/a", "/b"]
+        assert merged.validation_message.startswith("Collected 3 binary package(s)")
+
+    def test_merge_fails_if_any_failed(self) -> None:
+        """A build that produced nothing fails the merged collection."""
+        ok = CollectionResult(success=True, validation_message="Collected 1")
+        failed = CollectionResult(success=False, validation_message="No binary packages found")
+
+        merged = CollectionResult.merge([ok, failed])
+
+        assert not merged.success
+        assert merged.validation_message == "No binary packages found"
+
+
 class TestArtifactReport:
     """Tests for ArtifactReport dataclass."""
 
+    def test_merge(self) -> None:
+        """Should keep each architecture's report and the first failing exit code."""
+
+        def report(arch: str, exit_code: int, start: str) -> ArtifactReport:
+            return ArtifactReport(
+                sbuild_command=["sbuild", "--arch", arch],
+                sbuild_exit_code=exit_code,
+                start_timestamp=start,
+                end_timestamp=start,
+                candidate_dirs=[f"/build/{arch}"],
+                collection=CollectionResult(success=exit_code == 0),
+                stdout_path="",
+                stderr_path="",
+                primary_log_path="",
+                arch=arch,
+            )
+
+        merged = ArtifactReport.merge([report("amd64", 0, "2025-01-01T00:01"), report("arm64", 2, "2025-01-01T00:00")])
+        data = merged.to_dict()
+
+        assert merged.sbuild_exit_code == 2
+        assert merged.start_timestamp == "2025-01-01T00:00"
+        assert data["arch"] == "amd64,arm64"
+        assert [r["sbuild_command"][-1] for r in data["architectures"]] == ["amd64", "arm64"]
+
     def test_write_json(self, tmp_path: Path) -> None:
         """Should write report to JSON file."""
         report = ArtifactReport(
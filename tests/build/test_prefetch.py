@@ -0,0 +1,174 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.prefetch module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import packastack.build.prefetch as prefetch
+from packastack.build.tarball import PrefetchSummary
+from packastack.upstream.gitfetch import FetchResult
+
+
+class _FakeFetcher:
+    """GitFetcher stand-in recording mirror updates."""
+
+    def __init__(self, errors: dict[str, str] | None = None) -> None:
+        self.errors = errors or {}
+        self.mirrored: list[str] = []
+
+    def update_mirror(self, package: str) -> FetchResult:
+        self.mirrored.append(package)
+        if package in self.errors:
+            return FetchResult(package=package, path=Path(), error=self.errors[package])
+        return FetchResult(package=package, path=Path(f"/m/{package}.git"), cloned=package == "nova")
+
+
+class TestPrefetchPackagingMirrors:
+    """Tests for prefetch_packaging_mirrors."""
+
+    def test_mirrors_every_package(self) -> None:
+        fetcher = _FakeFetcher(errors={"glance": "boom"})
+        finished: list[str] = []
+
+        results = prefetch.prefetch_packaging_mirrors(
+            ["nova", "glance", "keystone"], fetcher, max_workers=2, on_package=finished.append
+        )
+
+        assert sorted(results) == ["glance", "keystone", "nova"]
+        assert results["glance"].error == "boom"
+        assert sorted(fetcher.mirrored) == ["glance", "keystone", "nova"]
+        assert sorted(finished) == ["glance", "keystone", "nova"]
+
+    def test_empty(self) -> None:
+        assert prefetch.prefetch_packaging_mirrors([], _FakeFetcher()) == {}
+
+
+class TestRunPrefetch:
+    """Tests for run_prefetch."""
+
+    @pytest.fixture
+    def patched(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict:
+        calls: dict = {"tarballs": []}
+        releases = tmp_path / "releases"
+        static = releases / "doc" / "source" / "_static"
+        static.mkdir(parents=True)
+        (releases / "doc" / "source" / "index.rst").write_text(
+            "* 2025-10-06..present (2026.1/Gazpacho Cycle key):\n  `key 0xabc123`_\n"
+        )
+        (static / "0xabc123.txt").write_text("KEY")
+
+        def fake_tarballs(**kwargs) -> PrefetchSummary:
+            calls["tarballs"].append(kwargs)
+            for pkg in kwargs["packages"]:
+                kwargs["on_package"](pkg)
+            return PrefetchSummary(downloaded=["nova"], cached=["glance"], bytes_downloaded=2048)
+
+        monkeypatch.setattr(prefetch, "GitFetcher", lambda mirror_dir, slots=None: _FakeFetcher())
+        monkeypatch.setattr(prefetch, "prefetch_release_tarballs", fake_tarballs)
+        monkeypatch.setattr(prefetch, "activity", lambda *_a, **_k: None)
+        calls["paths"] = {
+            "cache_root": tmp_path,
+            "openstack_releases_repo": releases,
+        }
+        return calls
+
+    def test_release_prefetch_reports_all_stages(self, patched: dict) -> None:
+        run = MagicMock()
+
+        report = prefetch.run_prefetch(
+            packages=["nova", "glance"],
+            paths=patched["paths"],
+            openstack_target="2026.1",
+            build_type="release",
+            run=run,
+        )
+
+        assert report.packages == 2
+        assert report.mirrors_cloned == ["nova"]
+        assert report.mirrors_updated == ["glance"]
+        assert report.signing_key.endswith("0xabc123.txt")
+        assert set(report.stage_seconds) == {"packaging", "tarballs", "signing_key"}
+        assert report.duration_seconds >= 0
+        assert patched["tarballs"][0]["packages"] == ["nova", "glance"]
+
+        data = report.to_dict()
+        assert data["tarballs"]["downloaded"] == 1
+        assert data["tarballs"]["bytes"] == 2048
+        assert data["mirrors"] == {"cloned": 1, "updated": 1, "failed": {}}
+        event = run.log_event.call_args.args[0]
+        assert event["event"] == "prefetch.complete"
+
+    def test_snapshot_prefetch_only_mirrors(self, patched: dict) -> None:
+        report = prefetch.run_prefetch(
+            packages=["nova"],
+            paths=patched["paths"],
+            openstack_target="2026.1",
+            build_type="snapshot",
+        )
+
+        assert patched["tarballs"] == []
+        assert set(report.stage_seconds) == {"packaging"}
+        assert report.signing_key == ""
+
+    def test_auto_prefetch_skips_snapshot_packages(
+        self, patched: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Only packages auto-selected as releases get their tarballs fetched."""
+        from types import SimpleNamespace
+
+        from packastack.planning.type_selection import BuildType
+
+        deliverables: list[str] = []
+
+        def fake_select(**kwargs: object) -> SimpleNamespace:
+            deliverables.append(str(kwargs["deliverable"]))
+            chosen = BuildType.SNAPSHOT if kwargs["source_package"] == "nova" else BuildType.RELEASE
+            return SimpleNamespace(chosen_type=chosen)
+
+        monkeypatch.setattr(prefetch, "determine_cycle_stage", lambda *_a: None)
+        monkeypatch.setattr(prefetch, "select_build_type", fake_select)
+
+        report = prefetch.run_prefetch(
+            packages=["nova", "python-oslo.config"],
+            paths=patched["paths"],
+            openstack_target="2026.1",
+            build_type="auto",
+        )
+
+        assert deliverables == ["nova", "oslo.config"]
+        assert patched["tarballs"][0]["packages"] == ["python-oslo.config"]
+        assert "tarballs" in report.stage_seconds
+
+    def test_warmed_excludes_failures(self) -> None:
+        report = prefetch.PrefetchReport(
+            mirror_failures={"nova": "boom"}, tarballs=PrefetchSummary(failed={"glance": "404"})
+        )
+        assert report.warmed(["nova", "glance", "keystone"]) == {"keystone"}
+
+
+def test_inputs_prefetched(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(prefetch.PREFETCHED_ENV, raising=False)
+    assert prefetch.inputs_prefetched() is False
+    monkeypatch.setenv(prefetch.PREFETCHED_ENV, "1")
+    assert prefetch.inputs_prefetched() is True
@@ -0,0 +1,124 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.build.progress module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import packastack.build.progress as progress
+from packastack.build.progress import (
+    MARKER_PPA_UPLOAD,
+    PROGRESS_FILE_ENV,
+    PROGRESS_PACKAGE_ENV,
+    BuildAllProgress,
+    ProgressReader,
+    ProgressStream,
+    load_progress,
+    report_progress,
+)
+
+
+class TestProgressReader:
+    """Tests for ProgressReader."""
+
+    def test_reads_only_new_events(self, tmp_path: Path) -> None:
+        path = tmp_path / "progress.jsonl"
+        reader = ProgressReader(path)
+        assert reader.read_new() == []
+
+        with ProgressStream(path) as stream:
+            stream.emit("run.start", total=2)
+            assert [e["event"] for e in reader.read_new()] == ["run.start"]
+            stream.emit("package.start", package="nova")
+            stream.emit("package.done", package="nova", status="success")
+
+        assert [e["event"] for e in reader.read_new()] == ["package.start", "package.done"]
+        assert reader.read_new() == []
+
+    def test_partial_line_is_deferred(self, tmp_path: Path) -> None:
+        path = tmp_path / "progress.jsonl"
+        path.write_text('{"event": "run.start"}\n{"event": "pack')
+        reader = ProgressReader(path)
+
+        assert [e["event"] for e in reader.read_new()] == ["run.start"]
+        with path.open("a") as f:
+            f.write('age.start", "package": "nova"}\n')
+        assert reader.read_new() == [{"event": "package.start", "package": "nova"}]
+
+
+class TestReportProgress:
+    """Tests for report_progress in child builds."""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(progress, "_child_stream", None)
+
+    def test_noop_outside_build_all(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv(PROGRESS_FILE_ENV, raising=False)
+        report_progress("package.phase", phase="fetch")
+        assert progress._child_stream is None
+
+    def test_tags_events_with_package(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path = tmp_path / "progress.jsonl"
+        monkeypatch.setenv(PROGRESS_FILE_ENV, str(path))
+        monkeypatch.setenv(PROGRESS_PACKAGE_ENV, "nova")
+
+        report_progress("package.phase", phase="build")
+        report_progress("package.marker", marker=MARKER_PPA_UPLOAD, status="success")
+
+        state = load_progress(path)
+        assert state.packages["nova"].phase == "build"
+        assert state.packages["nova"].markers[MARKER_PPA_UPLOAD]["status"] == "success"
+
+
+class TestBuildAllProgress:
+    """Tests for the coordinator side of the stream."""
+
+    def test_tracks_queue_and_utilisation(self, tmp_path: Path) -> None:
+        path = tmp_path / "progress.jsonl"
+        coordinator = BuildAllProgress(path, total=3, pending=3, workers=2)
+
+        coordinator.package_started("a")
+        coordinator.package_started("b")
+        mid = load_progress(path)
+        coordinator.package_finished("a", True)
+        coordinator.package_finished("b", False, "boom")
+        coordinator.close("failed")
+
+        assert (mid.queued, mid.running, mid.utilisation) == (1, 2, 1.0)
+        state = load_progress(path)
+        assert state.total == 3
+        assert state.status == "failed"
+        assert state.count("success") == 1
+        assert state.packages["b"].message == "boom"
+        assert state.running == 0
+
+    def test_returns_child_markers(self, tmp_path: Path) -> None:
+        path = tmp_path / "progress.jsonl"
+        coordinator = BuildAllProgress(path, total=1, pending=1, workers=1)
+        coordinator.package_started("nova")
+        with ProgressStream(path, package="nova") as child:
+            child.emit("package.marker", marker=MARKER_PPA_UPLOAD, status="failed")
+
+        reported = coordinator.package_finished("nova", True)
+
+        assert reported.markers[MARKER_PPA_UPLOAD]["status"] == "failed"
@@ -20,6 +20,7 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -34,6 +35,8 @@ from packastack.build.sbuild import (
     generate_chroot_setup_commands,
     get_default_chroot_name,
     run_sbuild,
+    run_sbuild_parallel,
+    split_architectures,
 )
 
 
@@ -188,6 +191,53 @@ class TestBuildSbuildCommand:
         assert "-c" in cmd
         assert "noble-amd64-sbuild" in cmd
 
+    def test_with_warm_chroot(self, tmp_path: Path) -> None:
+        """Test command with a pre-seeded warm chroot."""
+        config = SbuildConfig(
+            dsc_path=tmp_path / "pkg.dsc",
+            output_dir=tmp_path,
+            distribution="noble",
+            warm_chroot="packastack-noble-amd64-warm",
+        )
+        cmd = build_sbuild_command(config)
+        assert cmd[cmd.index("-c") + 1] == "packastack-noble-amd64-warm"
+        assert cmd[cmd.index("-d") + 1] == "noble"
+        assert "--no-apt-update" in cmd
+        assert "--no-apt-upgrade" in cmd
+        assert "--no-apt-distupgrade" in cmd
+
+    def test_with_apt_proxy_and_local_repo(self, tmp_path: Path) -> None:
+        """Test that the apt proxy is configured before the local repo update."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        config = SbuildConfig(
+            dsc_path=tmp_path / "pkg.dsc",
+            output_dir=tmp_path,
+            distribution="noble",
+            local_repo_root=repo,
+            apt_proxy="http://127.0.0.1:3142",
+        )
+        cmd = build_sbuild_command(config)
+        setup = [cmd[i + 1] for i, x in enumerate(cmd) if x == "--chroot-setup-commands"]
+        assert "Acquire::http::Proxy" in setup[0]
+        assert "http://127.0.0.1:3142" in setup[0]
+        assert "apt-get update" in setup[-1]
+
+    def test_with_apt_proxy_only(self, tmp_path: Path) -> None:
+        """Test that the apt proxy is configured without a local repo."""
+        config = SbuildConfig(
+            dsc_path=tmp_path / "pkg.dsc",
+            output_dir=tmp_path,
+            distribution="noble",
+            apt_proxy="http://127.0.0.1:3142",
+        )
+        cmd = build_sbuild_command(config)
+        setup = [cmd[i + 1] for i, x in enumerate(cmd) if x == "--chroot-setup-commands"]
+        cleanup = [cmd[i + 1] for i, x in enumerate(cmd) if x == "--finished-build-commands"]
+        assert len(setup) == 1
+        assert "Acquire::http::Proxy" in setup[0]
+        assert cleanup == ["rm -f /etc/apt/apt.conf.d/99packastack-proxy"]
+
     def test_with_local_repo(self, tmp_path: Path) -> None:
         """Test command with local repo setup."""
         repo = tmp_path / "repo"
@@ -248,6 +298,113 @@ class TestBuildSbuildCommand:
             assert "--fail-on" in cmd, "Expected --fail-on in lintian options"
 
 
+class TestSplitArchitectures:
+    """Tests for split_architectures function."""
+
+    def _config(self, tmp_path: Path) -> SbuildConfig:
+        return SbuildConfig(
+            dsc_path=tmp_path / "nova_1.0.dsc",
+            output_dir=tmp_path / "build-output",
+            distribution="noble",
+            arch="amd64",
+            chroot_name="noble-amd64-sbuild",
+            warm_chroot="packastack-noble-amd64-warm",
+            run_log_dir=tmp_path / "logs",
+        )
+
+    def test_host_only_is_unchanged(self, tmp_path: Path) -> None:
+        """A host-only build keeps its configuration and sbuild's arch:all default."""
+        config = self._config(tmp_path)
+
+        assert split_architectures(config, ["amd64"]) == [config]
+        assert split_architectures(config, []) == [config]
+
+    def test_one_build_per_arch_with_arch_all_split(self, tmp_path: Path) -> None:
+        """Only one build builds arch:all packages, and it runs first."""
+        configs = split_architectures(self._config(tmp_path), ["arm64", "amd64", "arm64"])
+
+        assert [(c.arch, c.arch_all) for c in configs] == [("amd64", True), ("arm64", False)]
+        assert [c.output_dir.name for c in configs] == ["amd64", "arm64"]
+        assert [c.run_log_dir.name for c in configs] == ["sbuild-amd64", "sbuild-arm64"]
+        assert configs[0].warm_chroot and not configs[1].warm_chroot
+        assert not configs[1].chroot_name
+        assert "--arch-all" in build_sbuild_command(configs[0])
+        assert "--no-arch-all" in build_sbuild_command(configs[1])
+
+    def test_explicit_arch_all(self, tmp_path: Path) -> None:
+        """arch:all can be moved to another architecture's build."""
+        configs = split_architectures(self._config(tmp_path), ["amd64", "arm64"], arch_all="arm64")
+
+        assert [(c.arch, c.arch_all) for c in configs] == [("arm64", True), ("amd64", False)]
+
+    def test_arch_all_only_source(self, tmp_path: Path) -> None:
+        """Sources without arch-dependent packages are built once."""
+        configs = split_architectures(self._config(tmp_path), ["arm64", "s390x"], arch_any=False)
+
+        assert [(c.arch, c.arch_all) for c in configs] == [("arm64", True)]
+
+
+class TestRunSbuildParallel:
+    """Tests for run_sbuild_parallel function."""
+
+    def test_builds_each_arch_and_merges(self, tmp_path: Path) -> None:
+        """Every architecture is built and the artifacts end up in one report."""
+        shared_build_dir = tmp_path / "user_build"
+        shared_build_dir.mkdir()
+        for name in ("nova_1.0_amd64.deb", "nova_1.0_arm64.deb", "nova-doc_1.0_all.deb"):
+            (shared_build_dir / name).write_text(name)
+        base = SbuildConfig(
+            dsc_path=tmp_path / "nova_1.0.dsc",
+            output_dir=tmp_path / "build-output",
+            distribution="noble",
+            arch="amd64",
+            run_log_dir=tmp_path / "logs",
+            source_package="nova",
+            version="1.0",
+        )
+        configs = split_architectures(base, ["amd64", "arm64"])
+
+        from packastack.build.sbuildrc import CandidateDirectories
+
+        def candidates(**_kwargs):
+            found = CandidateDirectories()
+            found.add_build_dir(shared_build_dir, "~/.sbuildrc")
+            return found
+
+        with patch("packastack.build.sbuild.is_sbuild_available", return_value=True), \
+             patch("packastack.build.sbuild.subprocess.run", return_value=MagicMock(returncode=0)) as mock_run, \
+             patch("packastack.build.sbuild.discover_candidate_directories", side_effect=candidates):
+            result = run_sbuild_parallel(configs)
+
+        assert mock_run.call_count == 2
+        assert result.success
+        assert [r.arch for r in result.arch_results] == ["amd64", "arm64"]
+        assert sorted(p.name for p in result.arch_results[0].artifacts) == ["nova-doc_1.0_all.deb", "nova_1.0_amd64.deb"]
+        assert [p.name for p in result.arch_results[1].artifacts] == ["nova_1.0_arm64.deb"]
+        assert result.report_path == tmp_path / "reports" / "sbuild-artifacts.json"
+        report = json.loads(result.report_path.read_text())
+        assert report["collection"]["counts"]["debs"] == 3
+        assert [r["arch"] for r in report["architectures"]] == ["amd64", "arm64"]
+
+    def test_fails_if_any_arch_fails(self, tmp_path: Path) -> None:
+        """One failed architecture fails the package."""
+        configs = split_architectures(
+            SbuildConfig(dsc_path=tmp_path / "nova.dsc", output_dir=tmp_path / "out", distribution="noble"),
+            ["amd64", "arm64"],
+        )
+
+        def fake_run(config: SbuildConfig, timeout: int = 3600) -> SbuildResult:
+            ok = config.arch == "amd64"
+            return SbuildResult(success=ok, exit_code=0 if ok else 3, arch=config.arch, validation_message="boom")
+
+        with patch("packastack.build.sbuild.run_sbuild", side_effect=fake_run):
+            result = run_sbuild_parallel(configs)
+
+        assert not result.success
+        assert result.exit_code == 3
+        assert result.validation_message == "arm64: boom"
+
+
 class TestGetDefaultChrootName:
     """Tests for get_default_chroot_name function."""
 
@@ -26,10 +26,12 @@ from unittest.mock import patch
 from packastack.build.sbuildrc import (
     CandidateDirectories,
     discover_candidate_directories,
+    find_configured_apt_proxy,
     get_default_candidate_dirs,
     get_global_sbuild_config_paths,
     get_user_sbuildrc_path,
     parse_sbuild_output_for_paths,
+    parse_sbuildrc_apt_proxy,
     parse_sbuildrc_content,
     parse_sbuildrc_file,
 )
@@ -335,3 +337,44 @@ class TestGetDefaultCandidateDirs:
 
         assert any("/var/lib/sbuild" in p for p in paths)
         assert any("/var/log/sbuild" in p for p in paths)
+
+
+class TestAptProxyDetection:
+    """Tests for detecting an apt proxy configured for sbuild."""
+
+    def test_acquire_proxy_in_setup_commands(self) -> None:
+        """Should find Acquire::http::Proxy written by chroot-setup-commands."""
+        content = """
+        $external_commands = { 'chroot-setup-commands' => [
+            'echo "Acquire::http::Proxy \\"http://localhost:3142\\";" > /etc/apt/apt.conf.d/01proxy',
+        ] };
+        """
+        assert parse_sbuildrc_apt_proxy(content) == "http://localhost:3142"
+
+    def test_build_environment_http_proxy(self) -> None:
+        """Should find http_proxy in $build_environment."""
+        content = "$build_environment = { 'http_proxy' => 'http://10.0.0.1:3142' };"
+        assert parse_sbuildrc_apt_proxy(content) == "http://10.0.0.1:3142"
+
+    def test_commented_out_ignored(self) -> None:
+        """Should ignore commented-out proxy settings."""
+        assert parse_sbuildrc_apt_proxy('# Acquire::http::Proxy "http://x:1";') == ""
+
+    def test_find_in_user_sbuildrc(self, tmp_path: Path) -> None:
+        """Should report the proxy and the file it came from."""
+        rc_file = tmp_path / ".sbuildrc"
+        rc_file.write_text("$build_environment = { 'http_proxy' => 'http://cacher:3142' };\n")
+
+        with (
+            patch("packastack.build.sbuildrc.get_user_sbuildrc_path", return_value=rc_file),
+            patch("packastack.build.sbuildrc.get_global_sbuild_config_paths", return_value=[]),
+        ):
+            assert find_configured_apt_proxy() == ("http://cacher:3142", str(rc_file))
+
+    def test_none_configured(self, tmp_path: Path) -> None:
+        """Should return empty strings when nothing is configured."""
+        with (
+            patch("packastack.build.sbuildrc.get_user_sbuildrc_path", return_value=tmp_path / "missing"),
+            patch("packastack.build.sbuildrc.get_global_sbuild_config_paths", return_value=[]),
+        ):
+            assert find_configured_apt_proxy() == ("", "")
@@ -24,6 +24,9 @@ from packastack.build.single_build import (
     PrepareResult,
     SingleBuildContext,
     ValidateDepsResult,
+    build_architectures,
+    builds_arch_any,
+    control_document,
     resolve_lp_bug_key,
 )
 
@@ -174,6 +177,111 @@ class TestSingleBuildContext:
         assert ctx.binary is True
 
 
+class TestControlDocument:
+    """Tests for the control_document helper."""
+
+    def test_shared_until_file_changes(self, tmp_path: Path) -> None:
+        """Test that phases share one document that follows the file."""
+        from types import SimpleNamespace
+
+        control_path = tmp_path / "debian" / "control"
+        control_path.parent.mkdir()
+        control_path.write_text("Source: foo\n\nPackage: python3-foo\nArchitecture: all\n")
+        ctx = SimpleNamespace(pkg_repo=tmp_path, control=None)
+
+        first = control_document(ctx)
+        assert first is not None
+        assert control_document(ctx) is first
+        assert first.source.name == "foo"
+
+        control_path.write_text("Source: bar\n\nPackage: python3-bar\nArchitecture: all\n")
+        assert control_document(ctx) is first
+        assert first.source.name == "bar"
+
+    def test_missing_control(self, tmp_path: Path) -> None:
+        """Test that a repo without debian/control has no document."""
+        from types import SimpleNamespace
+
+        assert control_document(SimpleNamespace(pkg_repo=tmp_path, control=None)) is None
+
+
+class TestBuildArchitectures:
+    """Tests for the architecture selection helpers."""
+
+    def test_defaults_to_host(self) -> None:
+        """Test that only the host is built unless architectures are configured."""
+        from types import SimpleNamespace
+
+        assert build_architectures(SimpleNamespace(cfg=None), "amd64") == ["amd64"]
+        ctx = SimpleNamespace(cfg={"sbuild": {"architectures": ["amd64", "arm64", "amd64"]}})
+        assert build_architectures(ctx, "amd64") == ["amd64", "arm64"]
+
+    def test_arch_any(self, tmp_path: Path) -> None:
+        """Test that arch:all-only sources are recognised."""
+        from types import SimpleNamespace
+
+        control_path = tmp_path / "debian" / "control"
+        control_path.parent.mkdir()
+        control_path.write_text("Source: foo\n\nPackage: python3-foo\nArchitecture: all\n")
+        ctx = SimpleNamespace(pkg_repo=tmp_path, control=None)
+        assert not builds_arch_any(ctx)
+
+        control_path.write_text(
+            "Source: foo\n\nPackage: python3-foo\nArchitecture: all\n\nPackage: foo-ext\nArchitecture: any\n"
+        )
+        assert builds_arch_any(ctx)
+
+
+class TestImportAndPatch:
+    """Tests for the patches step of import_and_patch."""
+
+    def _analysis(self, reason):
+        from packastack.debpkg.gbp import PatchHealthReport, PatchSeriesAnalysis
+
+        return PatchSeriesAnalysis(
+            available=True,
+            patches=[
+                PatchHealthReport("ok.patch", success=True),
+                PatchHealthReport("other.patch", success=False, failure_reason=reason),
+            ],
+        )
+
+    def test_blocking_patch_skips_gbp(self, tmp_path: Path) -> None:
+        """Test that a conflicting patch fails the phase before gbp pq runs."""
+        from types import SimpleNamespace
+
+        from packastack.build.single_build import EXIT_PATCH_FAILED, import_and_patch
+        from packastack.debpkg.gbp import PatchFailureReason
+
+        ctx = SimpleNamespace(run=MagicMock(), pkg_repo=tmp_path, force=False)
+        with (
+            patch("packastack.debpkg.gbp.analyze_patch_series", return_value=self._analysis(PatchFailureReason.CONFLICT)),
+            patch("packastack.debpkg.gbp.pq_import") as mock_pq_import,
+        ):
+            result = import_and_patch(ctx, None, None, "1.0-0ubuntu1")
+
+        assert result.exit_code == EXIT_PATCH_FAILED
+        mock_pq_import.assert_not_called()
+
+    def test_fuzz_imports_once_with_time_machine(self, tmp_path: Path) -> None:
+        """Test that fuzzy patches are imported once, without a retry."""
+        from types import SimpleNamespace
+
+        from packastack.build.single_build import EXIT_PATCH_FAILED, import_and_patch
+        from packastack.debpkg.gbp import PatchFailureReason, PQResult
+
+        ctx = SimpleNamespace(run=MagicMock(), pkg_repo=tmp_path, force=False)
+        failed = PQResult(success=False, output="failed", needs_refresh=True)
+        with (
+            patch("packastack.debpkg.gbp.analyze_patch_series", return_value=self._analysis(PatchFailureReason.FUZZ)),
+            patch("packastack.debpkg.gbp.pq_import", return_value=failed) as mock_pq_import,
+        ):
+            result = import_and_patch(ctx, None, None, "1.0-0ubuntu1")
+
+        assert result.exit_code == EXIT_PATCH_FAILED
+        mock_pq_import.assert_called_once_with(tmp_path, time_machine=0)
+
+
 class TestResolveLpBugKey:
     """Tests for resolve_lp_bug_key helper."""
 
@@ -18,8 +18,13 @@ from packastack.build.tarball import (
     download_github_release_tarball,
     download_pypi_tarball,
     fetch_release_tarball,
+    find_prefetched_tarball,
+    prefetch_release_tarballs,
     run_uscan,
 )
+from packastack.planning.type_selection import BuildType
+from packastack.upstream.source import UpstreamSource
+from packastack.upstream.tarball_cache import TarballCacheEntry, cache_tarball
 
 
 class TestRunUscan:
@@ -478,6 +483,188 @@ class TestFetchReleaseTarball:
         assert "No tarball could be fetched" in sig_warn
 
 
+class TestPrefetchReleaseTarballs:
+    """Tests for prefetch_release_tarballs and find_prefetched_tarball."""
+
+    def _upstream(self, base_url: str, name: str) -> UpstreamSource:
+        return UpstreamSource(
+            version="1.0.0",
+            tarball_url=f"{base_url}/{name}-1.0.0.tar.gz",
+            signature_url=f"{base_url}/{name}-1.0.0.tar.gz.asc",
+            build_type=BuildType.RELEASE,
+        )
+
+    def test_prefetch_populates_cache(self, local_http_server, tmp_path: Path):
+        """Downloaded tarballs and signatures land in the cache with their sha256."""
+        releases = tmp_path / "releases"
+        releases.mkdir()
+        cache_base = tmp_path / "cache"
+        local_http_server.files["/nova-1.0.0.tar.gz"] = b"nova tarball"
+        local_http_server.files["/nova-1.0.0.tar.gz.asc"] = b"nova signature"
+        finished: list[str] = []
+        upstreams = {
+            "nova": self._upstream(local_http_server.url, "nova"),
+            "glance": self._upstream(local_http_server.url, "glance"),  # 404
+            "unreleased": None,
+        }
+
+        with patch(
+            "packastack.build.tarball.select_upstream_source",
+            side_effect=lambda _repo, _series, pkg, _bt: upstreams[pkg],
+        ), patch("packastack.build.tarball.activity"):
+            summary = prefetch_release_tarballs(
+                packages=["nova", "glance", "unreleased"],
+                releases_repo=releases,
+                openstack_target="2025.1",
+                cache_base=cache_base,
+                on_package=finished.append,
+            )
+
+        assert summary.downloaded == ["nova"]
+        assert list(summary.failed) == ["glance"]
+        assert summary.skipped == ["unreleased"]
+        assert summary.signatures == 1
+        assert sorted(finished) == ["glance", "nova", "unreleased"]
+        path, meta = find_prefetched_tarball(upstreams["nova"], "nova", BuildType.RELEASE, cache_base)
+        assert path is not None and path.read_bytes() == b"nova tarball"
+        assert meta is not None and len(meta.sha256) == 64
+        assert path.with_name(path.name + ".asc").read_bytes() == b"nova signature"
+
+        # A second prefetch reuses the cache without any request
+        requests_before = len(local_http_server.requests)
+        with patch(
+            "packastack.build.tarball.select_upstream_source",
+            side_effect=lambda _repo, _series, pkg, _bt: upstreams[pkg],
+        ), patch("packastack.build.tarball.activity"):
+            summary = prefetch_release_tarballs(
+                packages=["nova"],
+                releases_repo=releases,
+                openstack_target="2025.1",
+                cache_base=cache_base,
+            )
+        assert summary.cached == ["nova"]
+        assert len(local_http_server.requests) == requests_before
+
+    def test_prefetch_keys_cache_by_deliverable(self, local_http_server, tmp_path: Path):
+        """Library sources are fetched and cached under their deliverable name."""
+        releases = tmp_path / "releases"
+        deliverables = releases / "deliverables" / "2025.1"
+        deliverables.mkdir(parents=True)
+        (deliverables / "oslo.config.yaml").write_text("type: library\n")
+        local_http_server.files["/oslo.config-1.0.0.tar.gz"] = b"oslo tarball"
+        upstream = self._upstream(local_http_server.url, "oslo.config")
+        projects: list[str] = []
+
+        def select(_repo, _series, project, _bt):
+            projects.append(project)
+            return upstream
+
+        with patch("packastack.build.tarball.select_upstream_source", side_effect=select), patch(
+            "packastack.build.tarball.activity"
+        ):
+            summary = prefetch_release_tarballs(
+                packages=["python-oslo.config"],
+                releases_repo=releases,
+                openstack_target="2025.1",
+                cache_base=tmp_path / "cache",
+            )
+
+        assert projects == ["oslo.config"]
+        assert summary.downloaded == ["python-oslo.config"]
+        # The child build looks the tarball up by its deliverable
+        path, meta = find_prefetched_tarball(upstream, "oslo.config", BuildType.RELEASE, tmp_path / "cache")
+        assert path is not None and path.read_bytes() == b"oslo tarball"
+        assert meta is not None and meta.package_name == "python-oslo.config"
+
+    def test_prefetch_without_releases_repo_skips(self, tmp_path: Path):
+        summary = prefetch_release_tarballs(
+            packages=["nova"],
+            releases_repo=None,
+            openstack_target="2025.1",
+            cache_base=tmp_path,
+        )
+        assert summary.skipped == ["nova"]
+
+    def test_find_prefetched_ignores_other_sources(self, tmp_path: Path):
+        """Only official entries with a recorded sha256 are reused."""
+        upstream = self._upstream("https://example.com", "nova")
+        tarball = tmp_path / "nova-1.0.0.tar.gz"
+        tarball.write_bytes(b"x")
+        cache_tarball(
+            tarball,
+            TarballCacheEntry(
+                project="nova",
+                package_name="nova",
+                version="1.0.0",
+                build_type="release",
+                source_method="uscan",
+            ),
+            cache_base=tmp_path / "cache",
+        )
+
+        path, meta = find_prefetched_tarball(upstream, "nova", BuildType.RELEASE, tmp_path / "cache")
+        assert path is None and meta is None
+
+    def test_fetch_release_tarball_uses_prefetched(self, tmp_path: Path):
+        """A prefetched tarball is used before uscan is tried."""
+        upstream = self._upstream("https://example.com", "nova")
+        cache_base = tmp_path / "cache"
+        cached = tmp_path / "nova-1.0.0.tar.gz"
+        cached.write_bytes(b"nova")
+        cache_tarball(
+            cached,
+            TarballCacheEntry(
+                project="nova",
+                package_name="nova",
+                version="1.0.0",
+                build_type="release",
+                source_method="official",
+                source_url=upstream.tarball_url,
+                sha256="f" * 64,
+            ),
+            cache_base=cache_base,
+        )
+        cached_path, _meta = find_prefetched_tarball(upstream, "nova", BuildType.RELEASE, cache_base)
+        cached_path.with_name("nova-1.0.0.tar.gz.asc").write_bytes(b"sig")
+        workspace = tmp_path / "ws"
+        tarball_result = MagicMock(
+            success=True,
+            path=workspace / "nova-1.0.0.tar.gz",
+            signature_verified=True,
+            signature_warning="",
+            sha256="f" * 64,
+        )
+        provenance = MagicMock()
+        config = MagicMock()
+        config.signatures.mode.value = "auto"
+
+        with patch("packastack.build.tarball.run_uscan") as mock_uscan, patch(
+            "packastack.build.tarball.download_and_verify_tarball", return_value=tarball_result
+        ) as mock_dl, patch("packastack.build.tarball.activity"):
+            path, verified, _warn = fetch_release_tarball(
+                upstream=upstream,
+                upstream_config=config,
+                pkg_repo=tmp_path,
+                workspace=workspace,
+                provenance=provenance,
+                offline=False,
+                project_key="nova",
+                package_name="nova",
+                build_type=BuildType.RELEASE,
+                cache_base=cache_base,
+                force=False,
+                run=MagicMock(),
+            )
+
+        mock_uscan.assert_not_called()
+        assert mock_dl.call_args.kwargs["expected_sha256"] == "f" * 64
+        assert (workspace / "nova-1.0.0.tar.gz").exists()
+        assert (workspace / "nova-1.0.0.tar.gz.asc").read_bytes() == b"sig"
+        assert path == workspace / "nova-1.0.0.tar.gz"
+        assert verified is True
+        assert provenance.tarball.sha256 == "f" * 64
+
+
 class TestBackwardsCompatibilityAliases:
     """Tests for backwards compatibility aliases."""
 
@@ -565,6 +565,59 @@ class TestGenerateReports:
         assert "## Top 10 Longest Builds" in md_content
         assert "slow" in md_content
 
+    def test_report_includes_prefetch_timing(self, tmp_path: Path) -> None:
+        """Test that prefetch stage timing is reported."""
+        state = create_initial_state(
+            run_id="test-prefetch",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["nova"],
+            build_order=["nova"],
+        )
+        state.prefetch = {
+            "packages": 1,
+            "duration_seconds": 12.5,
+            "stage_seconds": {"packaging": 4.0, "tarballs": 8.5},
+            "mirrors": {"cloned": 1, "updated": 0, "failed": {}},
+            "tarballs": {"downloaded": 1, "cached": 0, "signatures": 1, "failed": {}, "bytes": 2097152},
+        }
+
+        json_path, md_path = _generate_reports(state, tmp_path)
+
+        assert json.loads(json_path.read_text())["prefetch"]["duration_seconds"] == 12.5
+        md_content = md_path.read_text()
+        assert "## Prefetch" in md_content
+        assert "| tarballs | 8.5s |" in md_content
+        assert "2.0 MiB" in md_content
+
+    def test_report_includes_apt_proxy_stats(self, tmp_path: Path) -> None:
+        """Test that apt proxy hit/miss statistics are reported."""
+        state = create_initial_state(
+            run_id="test-apt-proxy",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["nova"],
+            build_order=["nova"],
+        )
+        state.apt_proxy = {
+            "hits": 30,
+            "misses": 10,
+            "passthrough": 12,
+            "errors": 0,
+            "bytes_from_cache": 31457280,
+            "bytes_from_upstream": 10485760,
+            "hit_ratio": 0.75,
+        }
+
+        json_path, md_path = _generate_reports(state, tmp_path)
+
+        assert json.loads(json_path.read_text())["apt_proxy"]["hits"] == 30
+        md_content = md_path.read_text()
+        assert "## APT Proxy" in md_content
+        assert "| 30 | 10 | 75% | 30.0 MiB | 10.0 MiB |" in md_content
+
 
 class TestOptionalDepsForCycle:
     """Tests for OPTIONAL_DEPS_FOR_CYCLE constant."""
@@ -840,6 +893,31 @@ class TestRunSingleBuild:
         assert "--no-binary" in cmd
         assert "--force" in cmd
         assert captured["env"]["PACKASTACK_BUILD_DEPTH"] == "10"
+        assert "--no-build-cache" not in cmd
+
+    def test_no_build_cache_is_forwarded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should pass --no-build-cache to the child build when disabled."""
+        captured: dict[str, object] = {}
+
+        def fake_run(cmd: list[str], **_kwargs: object) -> SimpleNamespace:
+            captured["cmd"] = cmd
+            return SimpleNamespace(returncode=0)
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        _run_single_build(
+            package="nova",
+            target="dalmatian",
+            ubuntu_series="noble",
+            cloud_archive="",
+            build_type="release",
+            binary=True,
+            force=False,
+            run_dir=tmp_path,
+            build_cache=False,
+        )
+
+        assert "--no-build-cache" in captured["cmd"]
 
     @pytest.mark.parametrize(
         ("returncode", "expected", "expected_msg_fragment"),
@@ -1048,6 +1126,179 @@ class TestRunParallelBuilds:
         assert state.packages["a"].status == PackageStatus.SUCCESS
         assert state.packages["b"].status == PackageStatus.FAILED
 
+    def test_ppa_markers_come_from_progress_stream(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Should report PPA uploads from child markers, not build logs."""
+        import packastack.build.all_runner as all_runner
+        from packastack.build.progress import (
+            MARKER_PPA_UPLOAD,
+            PROGRESS_FILE,
+            ProgressStream,
+            load_progress,
+        )
+
+        state = create_initial_state(
+            run_id="run-1",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["a", "b"],
+            build_order=["a", "b"],
+            keep_going=True,
+            parallel=2,
+        )
+        graph = DependencyGraph()
+        graph.add_node("a")
+        graph.add_node("b")
+
+        def fake_run_single_build(package: str, run_dir: Path, **_kwargs: object) -> tuple:
+            if package == "a":
+                with ProgressStream(run_dir / PROGRESS_FILE, package=package) as child:
+                    child.emit("package.marker", marker=MARKER_PPA_UPLOAD, status="success")
+            return True, None, "", ""
+
+        messages: list[str] = []
+        monkeypatch.setattr(all_runner, "run_single_build", fake_run_single_build)
+        monkeypatch.setattr(all_runner, "save_state", lambda *_args, **_kwargs: None)
+        monkeypatch.setattr(all_runner, "activity", lambda _phase, msg: messages.append(msg))
+
+        _run_parallel_builds(
+            state=state,
+            graph=graph,
+            run_dir=tmp_path,
+            state_dir=tmp_path,
+            target="dalmatian",
+            ubuntu_series="noble",
+            cloud_archive="",
+            build_type="release",
+            binary=True,
+            force=False,
+            parallel=2,
+            local_repo=tmp_path / "repo",
+            run=SimpleNamespace(log_event=lambda *_args, **_kwargs: None),
+            ppa_upload=True,
+        )
+
+        assert "[ppa]   a: upload complete" in messages
+        assert "[ppa]   b: no upload detected (see log)" in messages
+        progress = load_progress(tmp_path / PROGRESS_FILE)
+        assert progress.status == "success"
+        assert progress.count("success") == 2
+
+    def test_admission_sets_jobs_and_records_usage(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Should share CPUs between a wave's builds and record reported usage."""
+        import packastack.build.all_runner as all_runner
+        from packastack.build.admission import (
+            AdmissionController,
+            ResourceBudget,
+            ResourceHistory,
+        )
+        from packastack.build.progress import MARKER_RESOURCES, PROGRESS_FILE, ProgressStream
+
+        state = create_initial_state(
+            run_id="run-1",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["a", "b"],
+            build_order=["a", "b"],
+            keep_going=True,
+            parallel=2,
+        )
+        graph = DependencyGraph()
+        graph.add_node("a")
+        graph.add_node("b")
+
+        shares: dict[str, int] = {}
+
+        def fake_run_single_build(package: str, run_dir: Path, jobs: int = 0, **_kwargs: object) -> tuple:
+            shares[package] = jobs
+            with ProgressStream(run_dir / PROGRESS_FILE, package=package) as child:
+                child.emit("package.marker", marker=MARKER_RESOURCES, status="recorded", memory=100, disk=200)
+            return True, None, "", ""
+
+        monkeypatch.setattr(all_runner, "run_single_build", fake_run_single_build)
+        monkeypatch.setattr(all_runner, "save_state", lambda *_args, **_kwargs: None)
+        monkeypatch.setattr(all_runner, "activity", lambda *_args, **_kwargs: None)
+
+        history = ResourceHistory(tmp_path / "history.json")
+        admission = AdmissionController(ResourceBudget(cpus=8, memory=10**9, disk=10**9), history)
+        _run_parallel_builds(
+            state=state,
+            graph=graph,
+            run_dir=tmp_path,
+            state_dir=tmp_path,
+            target="dalmatian",
+            ubuntu_series="noble",
+            cloud_archive="",
+            build_type="release",
+            binary=True,
+            force=False,
+            parallel=2,
+            local_repo=tmp_path / "repo",
+            run=SimpleNamespace(log_event=lambda *_args, **_kwargs: None),
+            admission=admission,
+        )
+
+        assert shares == {"a": 4, "b": 4}
+        assert ResourceHistory.load(tmp_path / "history.json").estimate("a") is not None
+        assert history.estimate("b").disk == 200
+
+    def test_writes_published_versions_manifest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should record the versions children published for clean --local-repo."""
+        import json
+
+        import packastack.build.all_runner as all_runner
+        from packastack.build.progress import MARKER_PUBLISHED, PROGRESS_FILE, ProgressStream
+        from packastack.planning.build_manifest import RUN_MANIFEST_FILE
+
+        state = create_initial_state(
+            run_id="run-1",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["a", "b"],
+            build_order=["a", "b"],
+            keep_going=True,
+            parallel=2,
+        )
+        graph = DependencyGraph()
+        graph.add_node("a")
+        graph.add_node("b")
+
+        def fake_run_single_build(package: str, run_dir: Path, **_kwargs: object) -> tuple:
+            if package == "b":
+                return False, FailureType.BUILD_FAILED, "sbuild failed", ""
+            with ProgressStream(run_dir / PROGRESS_FILE, package=package) as child:
+                child.emit("package.marker", marker=MARKER_PUBLISHED, status="success", version="1.0-0ubuntu1")
+            return True, None, "", ""
+
+        monkeypatch.setattr(all_runner, "run_single_build", fake_run_single_build)
+        monkeypatch.setattr(all_runner, "save_state", lambda *_args, **_kwargs: None)
+        monkeypatch.setattr(all_runner, "activity", lambda *_args, **_kwargs: None)
+
+        _run_parallel_builds(
+            state=state,
+            graph=graph,
+            run_dir=tmp_path,
+            state_dir=tmp_path,
+            target="dalmatian",
+            ubuntu_series="noble",
+            cloud_archive="",
+            build_type="release",
+            binary=True,
+            force=False,
+            parallel=2,
+            local_repo=tmp_path / "repo",
+            run=SimpleNamespace(log_event=lambda *_args, **_kwargs: None),
+        )
+
+        manifest = json.loads((tmp_path / RUN_MANIFEST_FILE).read_text())
+        assert manifest["packages"] == {"a": {"source_package": "a", "full_version": "1.0-0ubuntu1"}}
+
 
 class TestRunBuildAllResume:
     """Tests for resume behavior in _run_build_all."""
@@ -1639,3 +1890,47 @@ class TestBuildAllCli:
         )
 
         assert exit_code == EXIT_SUCCESS
+
+
+class TestTimeBreakdownReport:
+    """Tests for the per-phase timing section of build-all reports."""
+
+    def test_aggregates_package_traces(self, tmp_path: Path) -> None:
+        from packastack.build.all_reports import generate_build_all_reports
+        from packastack.core.spans import (
+            Span,
+            chrome_trace_events,
+            load_chrome_trace,
+            write_chrome_trace,
+        )
+
+        state = create_initial_state(
+            run_id="test",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+            packages=["nova", "glance", "keystone"],
+            build_order=["nova", "glance", "keystone"],
+        )
+        for name, seconds in (("nova", 30.0), ("glance", 10.0)):
+            trace = [
+                Span("build", start=1.0, duration=seconds, span_id=1),
+                Span("sbuild", "subprocess", start=1.0, duration=seconds - 1, span_id=2, parent_id=1),
+                Span("fetch", start=0.0, duration=1.0, span_id=3),
+            ]
+            write_chrome_trace(tmp_path / "logs" / name / "trace.json", chrome_trace_events(trace))
+
+        json_path, md_path = generate_build_all_reports(state, tmp_path)
+
+        breakdown = json.loads(json_path.read_text())["time_breakdown"]
+        assert breakdown["phase"][0] == {
+            "category": "phase",
+            "name": "build",
+            "count": 2,
+            "total_seconds": 40.0,
+            "mean_seconds": 20.0,
+            "max_seconds": 30.0,
+        }
+        assert breakdown["subprocess"][0]["total_seconds"] == 38.0
+        assert "## Where Did the Time Go" in md_path.read_text()
+        assert len(load_chrome_trace(tmp_path / "reports" / "trace.json")) == 6
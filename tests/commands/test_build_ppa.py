@@ -146,6 +146,40 @@ class TestPpaUpload:
             assert mock_ctx.normalize_to_prev_lts_floor is True
             assert mock_ctx.dry_run_control_edit is False
 
+    @pytest.mark.parametrize(
+        "ppa_build, error",
+        [
+            ((False, [], "dpkg-source failed"), "source build failed"),
+            ((True, [Path("nova_ppa1.dsc")], ""), "no source .changes"),
+        ],
+    )
+    def test_ppa_source_failure_reports_marker(self, mock_run, mock_context_setup, ppa_build, error):
+        """A failed PPA source build is reported to build --all as a failed upload."""
+        with (
+            patch("packastack.build.single_build.build_single_package") as mock_build,
+            patch("packastack.commands.build._append_ppa_suffix_to_changelog", return_value="1.0.0~ppa1"),
+            patch("packastack.commands.build.git_commit"),
+            patch("packastack.commands.build.subprocess.run") as mock_subprocess,
+            patch("packastack.commands.build._build_ppa_source", return_value=ppa_build),
+            patch("packastack.commands.build._upload_to_ppa") as mock_upload,
+            patch("packastack.commands.build.report_progress") as mock_report,
+        ):
+            outcome1 = MagicMock()
+            outcome1.success = True
+            outcome1.artifacts = [Path("nova.dsc"), Path("nova.changes")]
+            outcome1.new_version = "1.0.0"
+            outcome1.build_type = "release"
+            mock_build.return_value = outcome1
+            mock_subprocess.return_value.stdout = ""
+
+            result = _call_run_build(mock_run, package="nova", ppa_upload=True)
+
+            assert result == 0
+            mock_upload.assert_not_called()
+            mock_report.assert_called_once_with(
+                "package.marker", marker=build.MARKER_PPA_UPLOAD, status="failed", error=error
+            )
+
     def test_ppa_upload_not_configured(self, mock_run, mock_context_setup):
         """Test warning when PPA upload is requested but not configured."""
         mock_conf, _, _, _ = mock_context_setup
@@ -20,9 +20,14 @@
 
 from __future__ import annotations
 
+import json
+import subprocess
+import sys
+
+import pytest
 from typer.testing import CliRunner
 
-from packastack.cli import app
+from packastack.cli import COMMANDS, app
 
 runner = CliRunner()
 
@@ -98,3 +103,42 @@ class TestCliOptions:
     def test_init_accepts_prime(self) -> None:
         result = runner.invoke(app, ["init", "--help"])
         assert "--prime" in result.output
+
+
+def _modules_after(code: str) -> set[str]:
+    """Return the modules loaded by a fresh interpreter running code."""
+    script = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+_RESOLVE = "from typer.main import get_command\nfrom packastack.cli import app\nget_command(app).get_command(None, {!r})"
+
+# Modules no lightweight command should pay for at start-up
+_HEAVY = {"packastack.build.single_build", "packastack.build.all_runner", "launchpadlib", "git"}
+
+
+class TestCliStartup:
+    """Regression tests for lazy command loading."""
+
+    def test_all_commands_listed(self) -> None:
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+    def test_import_loads_no_commands(self) -> None:
+        loaded = _modules_after("import packastack.cli")
+        assert not {m for m in loaded if m.startswith("packastack.commands.")}
+        assert not loaded & _HEAVY
+
+    @pytest.mark.parametrize("command", ["completion", "search", "clean"])
+    def test_light_commands_skip_build_stack(self, command: str) -> None:
+        loaded = _modules_after(_RESOLVE.format(command))
+        assert f"packastack.commands.{command}" in loaded
+        assert not loaded & _HEAVY
+
+    def test_build_package_is_lazy(self) -> None:
+        loaded = _modules_after("from packastack.build import EXIT_BUILD_FAILED")
+        assert "packastack.build.errors" in loaded
+        assert "packastack.build.single_build" not in loaded
@@ -0,0 +1,129 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack status command."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+import packastack.commands.status as status_cmd
+from packastack.build.progress import (
+    MARKER_PPA_UPLOAD,
+    PROGRESS_FILE,
+    BuildAllProgress,
+    ProgressStream,
+)
+from packastack.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def runs_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "runs"
+    root.mkdir()
+    monkeypatch.setattr(status_cmd, "load_config", lambda: {})
+    monkeypatch.setattr(status_cmd, "resolve_paths", lambda _cfg: {"runs_root": root})
+    return root
+
+
+def _record_run(runs_root: Path, run_id: str) -> Path:
+    path = runs_root / run_id / PROGRESS_FILE
+    coordinator = BuildAllProgress(path, total=3, pending=3, workers=2)
+    coordinator.package_started("glance")
+    coordinator.package_started("nova")
+    with ProgressStream(path, package="glance") as child:
+        child.emit("package.marker", marker=MARKER_PPA_UPLOAD, status="success")
+    with ProgressStream(path, package="nova") as child:
+        child.emit("package.phase", phase="build")
+    coordinator.package_finished("glance", True)
+    return path
+
+
+def test_shows_running_and_finished(runs_root: Path) -> None:
+    _record_run(runs_root, "run-1")
+
+    result = runner.invoke(app, ["status", "run-1"])
+
+    assert result.exit_code == 0
+    assert "Run run-1: running" in result.output
+    assert "1/3 done (1 ok, 0 failed), 1 building, 1 queued" in result.output
+    assert "nova" in result.output and "build" in result.output
+    assert f"{MARKER_PPA_UPLOAD}=success" in result.output
+
+
+def test_latest_and_json(runs_root: Path) -> None:
+    old = _record_run(runs_root, "run-1")
+    os.utime(old, (1, 1))
+    _record_run(runs_root, "run-2")
+
+    result = runner.invoke(app, ["status", "--format", "json"])
+
+    data = json.loads(result.output)
+    assert data["run_id"] == "run-2"
+    assert data["packages"]["nova"]["phase"] == "build"
+
+
+def test_follow_stops_at_run_end(runs_root: Path) -> None:
+    path = _record_run(runs_root, "run-1")
+    with ProgressStream(path) as stream:
+        stream.emit("run.end", status="success")
+
+    result = runner.invoke(app, ["status", "run-1", "--follow", "--interval", "0"])
+
+    assert result.exit_code == 0
+    assert "Run run-1: success" in result.output
+
+
+def test_unknown_run(runs_root: Path) -> None:
+    result = runner.invoke(app, ["status", "missing"])
+    assert result.exit_code == status_cmd.EXIT_NOT_FOUND
+
+
+def test_format_duration() -> None:
+    assert status_cmd.format_duration(5) == "5s"
+    assert status_cmd.format_duration(245) == "4m05s"
+    assert status_cmd.format_duration(3720) == "1h02m"
+
+
+def test_slots_show_holders(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from packastack.apt.localrepo import repo_lock
+    from packastack.core.slots import SLOT_SBUILD, create_host_slots
+
+    paths = {"cache_root": tmp_path / "cache", "local_apt_repo": tmp_path / "repo", "runs_root": tmp_path}
+    cfg = {"host_slots": {"sbuild": 2}}
+    monkeypatch.setattr(status_cmd, "load_config", lambda: cfg)
+    monkeypatch.setattr(status_cmd, "resolve_paths", lambda _cfg: paths)
+
+    with create_host_slots(cfg, paths).slot(SLOT_SBUILD, "nova amd64"), repo_lock(paths["local_apt_repo"]):
+        result = runner.invoke(app, ["status", "--slots"])
+        as_json = json.loads(runner.invoke(app, ["status", "--slots", "--format", "json"]).output)
+    idle = runner.invoke(app, ["status", "--slots"])
+
+    assert result.exit_code == 0
+    assert "sbuild   1/2 busy" in result.output
+    assert f"pid {os.getpid()}" in result.output and "nova amd64" in result.output
+    assert "publish" in result.output and str(paths["local_apt_repo"]) in result.output
+    assert as_json["slots"][1]["holders"][0]["label"] == "nova amd64"
+    assert "sbuild   0/2 busy" in idle.output and "none held" in idle.output
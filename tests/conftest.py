@@ -22,7 +22,10 @@ from __future__ import annotations
 
 import gzip
 import tempfile
+import threading
 from collections.abc import Generator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest import mock
 
@@ -122,6 +125,86 @@ def mock_responses() -> Generator[responses.RequestsMock, None, None]:
         yield rsps
 
 
+@dataclass
+class LocalHTTPServer:
+    """State for the local_http_server fixture.
+
+    Attributes:
+        url: Base URL of the server (no trailing slash).
+        files: Mapping of request path (e.g. "/nova-1.0.tar.gz") to content.
+        requests: Recorded (path, Range header) tuples, in arrival order.
+        truncate_next: If set, the next response body is cut to this many bytes.
+        honour_range: Whether Range requests get 206 partial responses.
+    """
+
+    url: str = ""
+    files: dict[str, bytes] = field(default_factory=dict)
+    requests: list[tuple[str, str]] = field(default_factory=list)
+    truncate_next: int | None = None
+    honour_range: bool = True
+
+
+@pytest.fixture
+def local_http_server() -> Generator[LocalHTTPServer, None, None]:
+    """Serve in-memory files over HTTP/1.1 with Range support on localhost."""
+    state = LocalHTTPServer()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+        def do_GET(self) -> None:
+            range_header = self.headers.get("Range", "")
+            state.requests.append((self.path, range_header))
+            content = state.files.get(self.path)
+            if content is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            status = 200
+            body = content
+            if range_header and state.honour_range:
+                start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+                if start >= len(content):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(content)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+                body = content[start:]
+
+            self.send_response(status)
+            if status == 206:
+                self.send_header(
+                    "Content-Range", f"bytes {len(content) - len(body)}-{len(content) - 1}/{len(content)}"
+                )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+
+            if state.truncate_next is not None:
+                body = body[: state.truncate_next]
+                state.truncate_next = None
+                self.wfile.write(body)
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 @pytest.fixture
 def non_tty_stdout(monkeypatch: pytest.MonkeyPatch) -> None:
     """Mock sys.__stdout__.isatty() to return False."""
@@ -0,0 +1,155 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests for packastack.core.events module."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import yaml
+
+from packastack.core import run
+from packastack.core.events import EventSink
+
+
+def _read(path: Path) -> list[dict]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestEventSink:
+    """Tests for EventSink."""
+
+    def test_close_writes_all_events_in_order(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path, flush_interval=60, max_batch=7)
+        for i in range(100):
+            sink.emit({"event": "tick", "i": i})
+        sink.close()
+
+        events = _read(path)
+        assert [e["i"] for e in events] == list(range(100))
+        assert all("timestamp" in e for e in events)
+
+    def test_event_is_captured_at_emit(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path, flush_interval=60)
+        event = {"event": "build", "packages": ["nova"]}
+        sink.emit(event)
+        event["event"] = "changed"
+        event["packages"].append("glance")
+        sink.close()
+
+        assert _read(path)[0]["event"] == "build"
+        assert _read(path)[0]["packages"] == ["nova"]
+
+    def test_own_timestamp_and_empty_event(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path)
+        sink.emit({"event": "replayed", "timestamp": "2025-01-01T00:00:00+00:00"})
+        sink.emit({})
+        sink.close()
+
+        events = _read(path)
+        assert events[0] == {"event": "replayed", "timestamp": "2025-01-01T00:00:00+00:00"}
+        assert list(events[1]) == ["timestamp"]
+
+    def test_flush_makes_events_visible(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path, flush_interval=60)
+        sink.emit({"event": "a"})
+        sink.flush(timeout=5)
+
+        assert [e["event"] for e in _read(path)] == ["a"]
+        sink.close()
+
+    def test_emit_after_close_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path)
+        sink.close()
+        sink.emit({"event": "late"})
+        sink.close()
+
+        assert _read(path) == []
+
+    def test_compressed(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl.gz"
+        sink = EventSink(path, compress=True)
+        sink.emit({"event": "a"})
+        sink.flush(timeout=5)
+        sink.emit({"event": "b"})
+        sink.close()
+
+        assert [e["event"] for e in _read(path)] == ["a", "b"]
+
+    def test_sampling_keeps_one_in_n(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.jsonl"
+        sink = EventSink(path, sample={"fetch.*": 10})
+        for i in range(25):
+            sink.emit({"event": "fetch.progress", "i": i})
+        sink.emit({"event": "build.start"})
+        sink.close()
+
+        events = _read(path)
+        assert [e["i"] for e in events if e["event"] == "fetch.progress"] == [0, 10, 20]
+        assert events[-1]["event"] == "events.sampled"
+        assert events[-1]["dropped"] == {"fetch.*": 22}
+        assert any(e["event"] == "build.start" for e in events)
+
+    def test_additional_file(self, tmp_path: Path) -> None:
+        main, mirror = tmp_path / "main.jsonl", tmp_path / "mirror.jsonl"
+        sink = EventSink(main)
+        sink.emit({"event": "before"})
+        sink.flush(timeout=5)
+        sink.add_file(mirror)
+        sink.emit({"event": "after"})
+        sink.close()
+
+        assert [e["event"] for e in _read(main)] == ["before", "after"]
+        assert [e["event"] for e in _read(mirror)] == ["after"]
+
+
+class TestRunContextEvents:
+    """Tests for RunContext event configuration."""
+
+    def test_mirror_receives_events(self, temp_home: Path, mock_config: Path, tmp_path: Path) -> None:
+        mirror = tmp_path / "mirror"
+        with run.RunContext("test") as ctx:
+            ctx.add_log_mirror(mirror)
+            ctx.log_event({"event": "custom"})
+
+        names = [e["event"] for e in _read(mirror / "events.jsonl")]
+        assert names == ["custom", "run.end"]
+        assert (mirror / "summary.json").exists()
+
+    def test_compressed_events(self, temp_home: Path, mock_config: Path) -> None:
+        cfg = yaml.safe_load(mock_config.read_text())
+        cfg["events"] = {"compress": True}
+        mock_config.write_text(yaml.safe_dump(cfg))
+
+        with run.RunContext("test") as ctx:
+            ctx.log_event({"event": "custom"})
+
+        names = [e["event"] for e in _read(ctx.run_path / "events.jsonl.gz")]
+        assert names == ["run.start", "custom", "run.end"]
+        assert not (ctx.logs_path / "events.jsonl").exists()
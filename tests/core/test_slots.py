@@ -0,0 +1,89 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.core.slots module."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from packastack.core import slots
+from packastack.core.slots import SLOT_FETCH, SLOT_SBUILD, HostSlots
+
+
+def _slots(tmp_path: Path, limit: int = 1) -> HostSlots:
+    return HostSlots(tmp_path / slots.SLOTS_DIR, {SLOT_SBUILD: limit}, poll_interval=0.01)
+
+
+class TestHostSlots:
+    """Tests for HostSlots."""
+
+    def test_limit_is_enforced(self, tmp_path: Path) -> None:
+        """A waiter gets the slot only once the holder releases it."""
+        host = _slots(tmp_path)
+        acquired = threading.Event()
+
+        def waiter() -> None:
+            with host.slot(SLOT_SBUILD, "glance"):
+                acquired.set()
+
+        with host.slot(SLOT_SBUILD, "nova") as index:
+            assert index == 0
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            assert not acquired.wait(0.2)
+            usage = host.usage()[0]
+            assert [h.label for h in usage.holders] == ["nova"]
+            assert usage.waiting == 1
+        assert acquired.wait(5)
+        thread.join()
+        assert host.usage()[0].holders == []
+
+    def test_slots_are_numbered(self, tmp_path: Path) -> None:
+        """Concurrent holders take distinct slots."""
+        host = _slots(tmp_path, limit=2)
+        with host.slot(SLOT_SBUILD) as first, host.slot(SLOT_SBUILD) as second:
+            assert {first, second} == {0, 1}
+            assert all(h.pid == os.getpid() for h in host.usage()[0].holders)
+
+    def test_dead_waiter_does_not_block(self, tmp_path: Path) -> None:
+        """An unlocked ticket left by a crashed waiter is removed."""
+        host = _slots(tmp_path)
+        queue = host.root / f"{SLOT_SBUILD}.queue"
+        queue.mkdir(parents=True)
+        (queue / "00000000000000000001-1-1").touch()
+        with host.slot(SLOT_SBUILD) as index:
+            assert index == 0
+        assert list(queue.iterdir()) == []
+
+    def test_unlimited_kind(self, tmp_path: Path) -> None:
+        """Kinds without a limit are not queued."""
+        with _slots(tmp_path).slot(SLOT_FETCH) as index:
+            assert index == -1
+
+
+def test_create_host_slots(tmp_path: Path) -> None:
+    """Limits come from config; disabled or without a cache root gives None."""
+    host = slots.create_host_slots({"host_slots": {"sbuild": 3}}, {"cache_root": tmp_path})
+    assert host is not None
+    assert host.root == tmp_path / slots.SLOTS_DIR
+    assert host.limits == {SLOT_SBUILD: 3, SLOT_FETCH: slots.DEFAULT_FETCH_SLOTS}
+    assert slots.create_host_slots({"host_slots": {"enabled": False}}, {"cache_root": tmp_path}) is None
+    assert slots.create_host_slots({}, {}) is None
@@ -0,0 +1,186 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests for packastack.core.spans module."""
+
+from __future__ import annotations
+
+import json
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+
+from packastack.core import run, spans
+from packastack.core.spans import (
+    Span,
+    Tracer,
+    aggregate_spans,
+    chrome_trace_events,
+    command_name,
+    load_chrome_trace,
+    set_tracer,
+    span,
+    write_chrome_trace,
+)
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    tracer = Tracer()
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+
+class TestTracer:
+    """Tests for Tracer and span."""
+
+    def test_nested_spans(self, tracer: Tracer) -> None:
+        with span("build", package="nova") as outer, span("sbuild", "subprocess") as inner:
+            pass
+
+        assert [s.name for s in tracer.spans] == ["sbuild", "build"]
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id == 0
+        assert outer.attrs == {"package": "nova"}
+        assert outer.duration >= inner.duration >= 0
+
+    def test_threads_have_separate_stacks(self, tracer: Tracer) -> None:
+        def work() -> None:
+            with span("worker"):
+                pass
+
+        with span("outer"):
+            worker = threading.Thread(target=work)
+            worker.start()
+            worker.join()
+
+        by_name = {s.name: s for s in tracer.spans}
+        assert by_name["worker"].parent_id == 0
+        assert by_name["worker"].thread_id != by_name["outer"].thread_id
+
+    def test_error_recorded(self, tracer: Tracer) -> None:
+        with pytest.raises(RuntimeError), span("fetch"):
+            raise RuntimeError("boom")
+
+        assert tracer.spans[0].attrs["error"] == "RuntimeError"
+
+    def test_emits_events(self) -> None:
+        events: list[dict] = []
+        tracer = Tracer(emit=events.append)
+        with tracer.span("prepare"):
+            pass
+
+        assert events[0]["event"] == "span"
+        assert events[0]["name"] == "prepare"
+        assert events[0]["cat"] == "phase"
+
+    def test_no_tracer_is_a_no_op(self) -> None:
+        previous = set_tracer(None)
+        try:
+            with span("fetch") as current:
+                assert current is None
+        finally:
+            set_tracer(previous)
+
+    def test_profile_per_phase(self, tmp_path: Path) -> None:
+        tracer = Tracer(profile_dir=tmp_path / "profile")
+        with tracer.span("fetch"), tracer.span("nested"), tracer.span("git fetch", "subprocess"):
+            sum(range(1000))
+        with tracer.span("build"):
+            pass
+
+        assert [p.name for p in tracer.profiles] == ["01-fetch.pstats", "02-build.pstats"]
+        combined = tracer.write_combined_profile()
+        assert combined is not None
+        assert pstats.Stats(str(combined)).total_calls > 0
+
+
+@pytest.mark.parametrize(
+    ("cmd", "expected"),
+    [
+        (["git", "-C", "/repo", "fetch", "origin"], "git fetch"),
+        (["gbp", "import-orig", "--no-interactive"], "gbp import-orig"),
+        (["/usr/bin/sbuild", "-d", "noble"], "sbuild"),
+        (["dpkg-deb", "--info", "x.deb"], "dpkg-deb"),
+        ([], "command"),
+    ],
+)
+def test_command_name(cmd: list[str], expected: str) -> None:
+    assert command_name(cmd) == expected
+
+
+class TestChromeTrace:
+    """Tests for Chrome trace export and aggregation."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        original = [
+            Span("build", start=100.0, duration=2.5, span_id=1, thread_id=7, attrs={"package": "nova"}),
+            Span("sbuild", "subprocess", start=100.5, duration=2.0, span_id=2, parent_id=1, thread_id=7),
+        ]
+        path = write_chrome_trace(tmp_path / "trace.json", chrome_trace_events(original, pid=3, process_name="nova"))
+
+        data = json.loads(path.read_text())
+        assert data["traceEvents"][0] == {"name": "process_name", "ph": "M", "pid": 3, "args": {"name": "nova"}}
+        assert data["traceEvents"][1]["ts"] == 100_000_000
+        assert data["traceEvents"][1]["dur"] == 2_500_000
+        assert load_chrome_trace(path) == original
+
+    def test_load_missing(self, tmp_path: Path) -> None:
+        assert load_chrome_trace(tmp_path / "missing.json") == []
+
+    def test_aggregate(self) -> None:
+        stats = aggregate_spans([
+            Span("build", duration=3.0),
+            Span("build", duration=1.0),
+            Span("fetch", duration=0.5),
+            Span("git fetch", "subprocess", duration=0.4),
+        ])
+
+        assert [(s.category, s.name) for s in stats][:2] == [("phase", "build"), ("phase", "fetch")]
+        assert stats[0].count == 2
+        assert stats[0].mean_seconds == 2.0
+        assert stats[0].max_seconds == 3.0
+
+
+class TestRunContextTrace:
+    """Tests for trace export from RunContext."""
+
+    def test_writes_trace(self, temp_home: Path, mock_config: Path) -> None:
+        with run.RunContext("test") as ctx, span("fetch"):
+            pass
+
+        names = [s.name for s in load_chrome_trace(ctx.run_path / "trace.json")]
+        assert names == ["fetch"]
+        events = [json.loads(line) for line in (ctx.run_path / "events.jsonl").read_text().splitlines()]
+        assert any(e["event"] == "span" and e["name"] == "fetch" for e in events)
+        assert spans.get_tracer() is None
+
+    def test_trace_dir_and_profile(
+        self, temp_home: Path, mock_config: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(spans.TRACE_DIR_ENV, str(tmp_path / "logs"))
+        with run.RunContext("test", profile=True) as ctx, span("build"):
+            pass
+
+        assert load_chrome_trace(tmp_path / "logs" / "trace.json")
+        assert (ctx.run_path / "profile" / "01-build.pstats").exists()
+        assert (ctx.run_path / "profile" / "combined.pstats").exists()
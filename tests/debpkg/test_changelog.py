@@ -175,9 +175,9 @@ class TestUpdateChangelogGbp:
         assert "--maintmaint" in append_cmd
         assert "--append" in append_cmd
 
-    @patch("packastack.debpkg.changelog._update_changelog_python_debian", return_value=True)
+    @patch("packastack.debpkg.changelog._update_changelog_native", return_value=(True, ""))
     @patch("packastack.debpkg.changelog.subprocess.run")
-    def test_falls_back_when_gbp_fails(self, mock_run: MagicMock, mock_python: MagicMock, tmp_path: Path) -> None:
+    def test_falls_back_when_gbp_fails(self, mock_run: MagicMock, mock_native: MagicMock, tmp_path: Path) -> None:
         mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="boom")
 
         debian_dir = tmp_path / "pkg" / "debian"
@@ -194,8 +194,9 @@ class TestUpdateChangelogGbp:
             prefer_gbp=True,
         )
 
-        assert result is True
-        assert mock_python.called
+        assert result == (True, "")
+        mock_native.assert_called_once()
+        assert mock_native.call_args.args[:2] == (changelog_path, "pkg")
 
     def test_snapshot_custom_revision(self) -> None:
         """Test snapshot with custom revision."""
@@ -699,3 +700,156 @@ class TestUpdateChangelogPythonDebian:
         assert "UNRELEASED" not in content
         assert "d/gbp.conf: sync from cloud-archive-tools" in content
         assert "New upstream release" in content
+
+
+class TestUpdateChangelogNative:
+    """Tests for the in-process changelog writer."""
+
+    PREVIOUS = (
+        "nova (1:28.0.0-0ubuntu1) noble; urgency=medium\n\n  * Previous release\n\n"
+        " -- Old Maintainer <old@example.com>  Mon, 01 Jan 2024 00:00:00 +0000\n\n"
+        "nova (1:27.0.0-0ubuntu1) mantic; urgency=medium\n\n  * Older release\n\n"
+        " -- Old Maintainer <old@example.com>  Mon, 01 Jan 2023 00:00:00 +0000\n"
+    )
+
+    def test_prepends_entry_and_keeps_history(self, tmp_path: Path) -> None:
+        """The new entry is prepended and the rest is copied verbatim."""
+        path = tmp_path / "changelog"
+        path.write_text(self.PREVIOUS)
+
+        with patch("packastack.debpkg.changelog.subprocess.run") as mock_run:
+            ok, error = changelog.update_changelog(path, "nova", "1:29.0.0-0ubuntu1", "noble", ["New upstream release"])
+
+        assert (ok, error) == (True, "")
+        mock_run.assert_not_called()
+        text = path.read_text()
+        assert text.startswith("nova (1:29.0.0-0ubuntu1) noble; urgency=medium\n\n  * New upstream release\n\n")
+        assert text.endswith("\n\n" + self.PREVIOUS)
+        assert changelog.get_current_version(path) == "1:29.0.0-0ubuntu1"
+
+    def test_uses_maintainer_of_top_entry(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The maintainer of the top entry wins over the environment."""
+        monkeypatch.setenv("DEBFULLNAME", "Env User")
+        monkeypatch.setenv("DEBEMAIL", "env@example.com")
+        path = tmp_path / "changelog"
+        path.write_text(self.PREVIOUS)
+
+        changelog.update_changelog(path, "nova", "1:29.0.0-0ubuntu1", "noble", ["New upstream release"])
+
+        top = changelog.read_changelog_top(path.read_text())
+        assert top is not None
+        assert top.author == "Old Maintainer <old@example.com>"
+
+    def test_merges_unreleased_entry_and_dedupes(self, tmp_path: Path) -> None:
+        """An UNRELEASED top entry is folded into the new one."""
+        path = tmp_path / "changelog"
+        path.write_text(
+            "nova (1:29.0.0~b1-0ubuntu1) UNRELEASED; urgency=medium\n\n"
+            "  * New upstream version 29.0.0~b1\n  * d/control: Bump standards\n\n"
+            " -- Old Maintainer <old@example.com>  Mon, 01 Feb 2024 00:00:00 +0000\n\n" + self.PREVIOUS
+        )
+
+        ok, _ = changelog.update_changelog(
+            path,
+            "nova",
+            "1:29.0.0-0ubuntu1",
+            "noble",
+            ["New upstream version 29.0.0", "d/control: Bump standards"],
+        )
+
+        assert ok
+        text = path.read_text()
+        assert "UNRELEASED" not in text
+        top = changelog.read_changelog_top(text)
+        assert top is not None
+        assert top.changes == ["  * New upstream version 29.0.0~b1", "  * d/control: Bump standards"]
+        assert text.endswith(self.PREVIOUS)
+
+    def test_merges_multiline_unreleased_entry(self, tmp_path: Path) -> None:
+        """Wrapped bullets, sub-bullets and attributions are carried over whole.
+
+        Bullets are compared whole, so a new change matching only the first
+        lines of a merged bullet is still added.
+        """
+        path = tmp_path / "changelog"
+        path.write_text(
+            "nova (1:29.0.0~b1-0ubuntu1) UNRELEASED; urgency=medium\n\n"
+            "  [ Jane Dev ]\n"
+            "  * d/control: Align dependencies with\n"
+            "    upstream requirements.\n"
+            "    - Refreshed patches.\n"
+            "  * New upstream version 29.0.0~b1\n\n"
+            " -- Old Maintainer <old@example.com>  Mon, 01 Feb 2024 00:00:00 +0000\n\n" + self.PREVIOUS
+        )
+
+        ok, _ = changelog.update_changelog(
+            path,
+            "nova",
+            "1:29.0.0-0ubuntu1",
+            "noble",
+            ["New upstream version 29.0.0", "d/control: Align dependencies with upstream requirements."],
+            maintainer="Bob Packager <bob@example.com>",
+        )
+
+        assert ok
+        text = path.read_text()
+        assert text.startswith(
+            "nova (1:29.0.0-0ubuntu1) noble; urgency=medium\n\n"
+            "  [ Jane Dev ]\n"
+            "  * d/control: Align dependencies with\n"
+            "    upstream requirements.\n"
+            "    - Refreshed patches.\n"
+            "  * New upstream version 29.0.0~b1\n\n"
+            "  [ Bob Packager ]\n"
+            "  * d/control: Align dependencies with upstream requirements.\n\n"
+            " -- Bob Packager <bob@example.com>  "
+        )
+        top = changelog.read_changelog_top(text)
+        assert top is not None
+        assert top.changes[0] == "  [ Jane Dev ]"
+        assert len(top.changes) == 5
+        assert text.endswith(self.PREVIOUS)
+
+    def test_new_changes_get_own_attribution(self, tmp_path: Path) -> None:
+        """New changes are not credited to the last attributed maintainer."""
+        path = tmp_path / "changelog"
+        path.write_text(
+            "nova (1:29.0.0~b1-0ubuntu1) UNRELEASED; urgency=medium\n\n"
+            "  [ Jane Dev ]\n  * Fix tests\n\n"
+            " -- Jane Dev <jane@example.com>  Mon, 01 Feb 2024 00:00:00 +0000\n"
+        )
+
+        changelog.update_changelog(
+            path, "nova", "1:29.0.0-0ubuntu1", "noble", ["New upstream release"], maintainer="Bob <bob@example.com>"
+        )
+
+        assert "  [ Jane Dev ]\n  * Fix tests\n\n  [ Bob ]\n  * New upstream release\n\n" in path.read_text()
+
+    def test_new_changelog(self, tmp_path: Path) -> None:
+        """A missing changelog is created with a single entry."""
+        path = tmp_path / "changelog"
+
+        ok, _ = changelog.update_changelog(path, "nova", "1:29.0.0-0ubuntu1", "noble", ["Initial release"], "A <a@b.c>")
+
+        assert ok
+        text = path.read_text()
+        assert text.count(" -- A <a@b.c>  ") == 1
+        assert text.endswith("\n") and not text.endswith("\n\n")
+
+    def test_unknown_tool(self, tmp_path: Path) -> None:
+        """Unknown tools are rejected."""
+        ok, error = changelog.update_changelog(tmp_path / "changelog", "nova", "1.0-1", "noble", ["x"], tool="bogus")
+        assert not ok
+        assert "bogus" in error
+
+    def test_dch_only_when_configured(self, tmp_path: Path) -> None:
+        """tool='dch' runs dch, falling back to the native writer if it fails."""
+        path = tmp_path / "changelog"
+        path.write_text(self.PREVIOUS)
+
+        with patch.object(changelog, "_update_changelog_dch", return_value=(False, "no dch")) as mock_dch:
+            ok, _ = changelog.update_changelog(path, "nova", "1:29.0.0-0ubuntu1", "noble", ["x"], tool="dch")
+
+        mock_dch.assert_called_once()
+        assert ok
+        assert changelog.get_current_version(path) == "1:29.0.0-0ubuntu1"
@@ -629,3 +629,84 @@ Description: Test package
             result = ensure_misc_pre_depends(control_path)
             assert result is False
 
+
+
+class TestControlDocument:
+    """Tests for ControlDocument."""
+
+    CONTROL = """\
+Source: test-package
+Priority: extra
+Build-Depends: debhelper-compat (= 13),
+ python3-all
+
+Package: python3-test
+Architecture: all
+Depends: python3-pbr,
+ ${misc:Depends}
+Description: Test package
+"""
+
+    def test_parsed_once_per_content(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that identical content is parsed only once."""
+        import packastack.debpkg.control as control_module
+        from packastack.debpkg.control import ControlDocument
+
+        calls: list[str] = []
+        real_parse = control_module.parse_control_text
+
+        def counting_parse(text: str, origin: str = "debian/control") -> SourcePackage:
+            calls.append(origin)
+            return real_parse(text, origin)
+
+        monkeypatch.setattr(control_module, "parse_control_text", counting_parse)
+        monkeypatch.setattr(control_module, "_parsed", control_module.OrderedDict())
+        for name in ("a", "b"):
+            (tmp_path / name).write_text(self.CONTROL)
+
+        first = ControlDocument.load(tmp_path / "a").source
+        second = parse_control(tmp_path / "b")
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_batched_edits_written_once(self, tmp_path: Path) -> None:
+        """Test that several edits are kept in memory until save()."""
+        from packastack.debpkg.control import ControlDocument
+
+        control_path = tmp_path / "control"
+        control_path.write_text(self.CONTROL)
+        doc = ControlDocument.load(control_path)
+
+        assert doc.fix_priority_extra()
+        assert doc.ensure_misc_pre_depends()
+        assert doc.update_dependencies([ParsedDependency(name="python3-six")])
+        assert doc.replace_field("Build-Depends", "debhelper-compat (= 13),\n python3-all,\n python3-pbr")
+        assert control_path.read_text() == self.CONTROL
+        assert doc.dirty
+
+        assert doc.save()
+        assert not doc.dirty
+        content = control_path.read_text()
+        assert "Priority: optional" in content
+        assert "Pre-Depends: ${misc:Pre-Depends}" in content
+        assert "python3-six" in content
+        assert "Description: Test package" in content
+        assert [d.name for d in doc.source.build_depends] == ["debhelper-compat", "python3-all", "python3-pbr"]
+        assert not doc.save()
+
+    def test_refresh_picks_up_changes(self, tmp_path: Path) -> None:
+        """Test that refresh() re-reads a file changed on disk."""
+        from packastack.debpkg.control import ControlDocument
+
+        control_path = tmp_path / "control"
+        control_path.write_text(self.CONTROL)
+        doc = ControlDocument.load(control_path)
+        digest = doc.digest
+
+        assert not doc.refresh()
+        control_path.write_text(self.CONTROL.replace("python3-pbr", "python3-oslo.config"))
+
+        assert doc.refresh()
+        assert doc.digest != digest
+        assert doc.source.binaries[0].depends[0].name == "python3-oslo.config"
@@ -24,6 +24,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import git
+import pytest
 
 from packastack.debpkg import gbp
 
@@ -241,6 +242,11 @@ class TestImportOrigResult:
         assert result.upstream_version == ""
 
 
+def _gbp_call(mock_run) -> list[str]:
+    """Return the gbp command among the mocked run_command calls."""
+    return next(c[0][0] for c in mock_run.call_args_list if c[0][0][0] == "gbp")
+
+
 class TestImportOrig:
     """Tests for import_orig function."""
 
@@ -254,7 +260,7 @@ class TestImportOrig:
             result = gbp.import_orig(tmp_path, tarball, upstream_version="1.0.0")
 
             assert result.success is True
-            cmd = mock_run.call_args[0][0]
+            cmd = _gbp_call(mock_run)
             assert "gbp" in cmd
             assert "import-orig" in cmd
             assert "--pristine-tar" in cmd
@@ -270,7 +276,7 @@ class TestImportOrig:
             mock_run.return_value = (0, "Imported", "")
             gbp.import_orig(tmp_path, tarball, pristine_tar=False)
 
-            cmd = mock_run.call_args[0][0]
+            cmd = _gbp_call(mock_run)
             assert "--no-pristine-tar" in cmd
             assert "--pristine-tar" not in cmd
 
@@ -283,7 +289,7 @@ class TestImportOrig:
             mock_run.return_value = (0, "Imported", "")
             gbp.import_orig(tmp_path, tarball, merge=False)
 
-            cmd = mock_run.call_args[0][0]
+            cmd = _gbp_call(mock_run)
             assert "--no-merge" in cmd
 
     def test_import_failure(self, tmp_path: Path) -> None:
@@ -307,10 +313,210 @@ class TestImportOrig:
             mock_run.return_value = (0, "Imported", "")
             gbp.import_orig(tmp_path, tarball, upstream_branch="upstream-gazpacho")
 
-            cmd = mock_run.call_args[0][0]
+            cmd = _gbp_call(mock_run)
             assert "--upstream-branch=upstream-gazpacho" in cmd
 
 
+class TestUpstreamImports:
+    """Tests for recording upstream imports and skipping repeated ones."""
+
+    def _repo(self, path: Path, *files: str) -> git.Repo:
+        repo = git.Repo.init(path)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        for n, content in enumerate(files or ("packaging",)):
+            (path / "file").write_text(content)
+            repo.index.add(["file"])
+            repo.index.commit(f"commit {n}")
+        return repo
+
+    def _clone(self, origin: Path, path: Path) -> git.Repo:
+        repo = git.Repo.clone_from(origin, path)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        return repo
+
+    def test_record_and_find(self, tmp_path: Path) -> None:
+        """Recorded imports are found by tarball sha256 or upstream commit."""
+        repo = self._repo(tmp_path, "one", "two")
+        first = repo.head.commit.parents[0].hexsha
+
+        assert gbp.record_upstream_import(tmp_path, first, "1.0", sha256="aa" * 32)
+        assert gbp.record_upstream_import(tmp_path, "HEAD", "2.0~git1", upstream_commit="f" * 40)
+
+        records = {r.version: r for r in gbp.list_upstream_imports(tmp_path)}
+        assert records["1.0"].commit == first
+        assert records["1.0"].sha256 == "aa" * 32
+        assert records["2.0~git1"].upstream_commit == "f" * 40
+        assert gbp.find_upstream_import(tmp_path, sha256="aa" * 32).version == "1.0"
+        assert gbp.find_upstream_import(tmp_path, upstream_commit="f" * 40).version == "2.0~git1"
+        assert gbp.find_upstream_import(tmp_path, sha256="bb" * 32) is None
+
+    def test_no_notes(self, tmp_path: Path) -> None:
+        """A repository without notes has no recorded imports."""
+        self._repo(tmp_path)
+        assert gbp.list_upstream_imports(tmp_path) == []
+
+    def test_import_orig_skips_known_tarball(self, tmp_path: Path) -> None:
+        """A tarball imported before is not imported again."""
+        repo_path = tmp_path / "pkg"
+        repo_path.mkdir()
+        self._repo(repo_path)
+        tarball = tmp_path / "foo_1.0.orig.tar.gz"
+        tarball.write_bytes(b"tarball contents")
+        gbp.record_upstream_import(repo_path, "HEAD", "1.0", sha256=gbp._sha256_file(tarball))
+
+        with patch.object(gbp, "run_command", wraps=gbp.run_command) as mock_run:
+            result = gbp.import_orig(repo_path, tarball, upstream_version="1.0")
+
+        assert result.success and result.skipped
+        assert result.upstream_version == "1.0"
+        assert result.upstream_tag == git.Repo(repo_path).head.commit.hexsha
+        assert all(c[0][0][0] != "gbp" for c in mock_run.call_args_list)
+
+    def test_import_orig_records_tarball(self, tmp_path: Path) -> None:
+        """A successful import records the tarball sha256 on the tag."""
+        tarball = tmp_path / "foo_1.0.orig.tar.gz"
+        tarball.write_bytes(b"tarball contents")
+
+        with (
+            patch.object(gbp, "run_command", return_value=(0, "", "")),
+            patch.object(gbp, "record_upstream_import") as mock_record,
+        ):
+            gbp.import_orig(tmp_path, tarball, upstream_version="1.0", tarball_sha256="cc" * 32)
+
+        mock_record.assert_called_once_with(tmp_path, "1.0", "1.0", sha256="cc" * 32)
+
+    def test_import_orig_records_mangled_tag(self, tmp_path: Path) -> None:
+        """A ~ version is recorded on its mangled tag, which is the ref to merge."""
+        repo = self._repo(tmp_path, "upstream", "packaging")
+        upstream = repo.head.commit.parents[0]
+        repo.create_tag("2.0_rc1", ref=upstream)
+        tarball = tmp_path / "foo_2.0~rc1.orig.tar.gz"
+        tarball.write_bytes(b"tarball contents")
+        real_run = gbp.run_command
+
+        def run_command(cmd: list[str], **kwargs: object) -> tuple[int, str, str]:
+            if cmd[0] == "gbp":
+                return 0, "", ""
+            # The tag only exists once gbp has imported the tarball
+            if cmd[:3] == ["git", "tag", "-l"]:
+                return 0, "", ""
+            return real_run(cmd, **kwargs)
+
+        with patch.object(gbp, "run_command", side_effect=run_command):
+            result = gbp.import_orig(tmp_path, tarball, upstream_version="2.0~rc1", tarball_sha256="dd" * 32)
+
+        assert result.success and not result.skipped
+        assert result.upstream_tag == "2.0_rc1"
+        assert gbp.find_upstream_import(tmp_path, sha256="dd" * 32).commit == upstream.hexsha
+
+    def test_import_store_outlives_clone(self, tmp_path: Path) -> None:
+        """Imports saved to the store are found from a fresh clone."""
+        origin = tmp_path / "origin"
+        origin.mkdir()
+        self._repo(origin)
+        store = gbp.upstream_import_store(tmp_path / "cache", "foo")
+        tarball = tmp_path / "foo_1.0.orig.tar.gz"
+        tarball.write_bytes(b"tarball contents")
+
+        first = self._clone(origin, tmp_path / "run1")
+        # Stands in for the upstream commit gbp import-orig would create
+        upstream = first.git.commit_tree("HEAD^{tree}", "-m", "upstream 1.0")
+        first.create_tag("1.0", ref=upstream)
+        real_run = gbp.run_command
+
+        def run_command(cmd: list[str], **kwargs: object) -> tuple[int, str, str]:
+            if cmd[0] == "gbp":
+                return 0, "", ""
+            if cmd[:3] == ["git", "tag", "-l"]:
+                return 0, "", ""
+            return real_run(cmd, **kwargs)
+
+        with patch.object(gbp, "run_command", side_effect=run_command):
+            result = gbp.import_orig(tmp_path / "run1", tarball, upstream_version="1.0", import_store=store)
+        assert result.success and not result.skipped
+
+        second = self._clone(origin, tmp_path / "run2")
+        with pytest.raises(git.GitCommandError):
+            second.git.cat_file("-e", upstream)
+
+        real_run = gbp.run_command
+        with patch.object(
+            gbp, "run_command", side_effect=lambda cmd, **kw: (1, "", "") if cmd[0] == "gbp" else real_run(cmd, **kw)
+        ) as mock_run:
+            result = gbp.import_orig(tmp_path / "run2", tarball, upstream_version="1.0.1", import_store=store)
+
+        assert result.success and result.skipped
+        assert result.upstream_tag == upstream
+        assert not any(call.args[0][0] == "gbp" for call in mock_run.call_args_list)
+        second.git.cat_file("-e", upstream)
+
+    def test_import_store_keeps_concurrent_imports(self, tmp_path: Path) -> None:
+        """Imports saved from different clones are all kept."""
+        origin = tmp_path / "origin"
+        origin.mkdir()
+        self._repo(origin)
+        store = gbp.upstream_import_store(tmp_path / "cache", "foo")
+        clones = [self._clone(origin, tmp_path / name) for name in ("run1", "run2")]
+        for clone in clones:
+            gbp.load_upstream_imports(Path(clone.working_tree_dir), store)
+        for n, clone in enumerate(clones):
+            path = Path(clone.working_tree_dir)
+            upstream = clone.git.commit_tree("HEAD^{tree}", "-m", f"upstream {n}.0")
+            commit = gbp.record_upstream_import(path, upstream, f"{n}.0", sha256=f"{n}" * 64)
+            assert gbp.save_upstream_import(path, store, commit)
+
+        fresh = tmp_path / "run3"
+        self._clone(origin, fresh)
+        gbp.load_upstream_imports(fresh, store)
+        assert {r.version for r in gbp.list_upstream_imports(fresh)} == {"0.0", "1.0"}
+
+    def test_import_upstream_commit(self, tmp_path: Path) -> None:
+        """Snapshots are imported from the mirror commit without a tarball."""
+        mirror_path = tmp_path / "mirror"
+        mirror_path.mkdir()
+        mirror = self._repo(mirror_path, "upstream 1", "upstream 2")
+        commit = mirror.head.commit.parents[0]
+        pkg_path = tmp_path / "pkg"
+        pkg_path.mkdir()
+        pkg = self._repo(pkg_path)
+
+        result = gbp.import_upstream_commit(pkg_path, mirror_path, commit.hexsha, "2.0~git1", "upstream-x")
+
+        assert result.success and not result.skipped
+        imported = pkg.commit("upstream-x")
+        assert imported.tree.hexsha == commit.tree.hexsha
+        assert pkg.commit("2.0_git1") == imported
+        assert gbp.find_upstream_import(pkg_path, upstream_commit=commit.hexsha).commit == imported.hexsha
+
+        # Same commit under a new version: already imported
+        again = gbp.import_upstream_commit(pkg_path, mirror_path, commit.hexsha, "2.0~git2", "upstream-x")
+        assert again.skipped
+        assert again.upstream_version == "2.0~git1"
+
+        # A newer commit continues the upstream branch
+        newer = gbp.import_upstream_commit(pkg_path, mirror_path, mirror.head.commit.hexsha, "2.0~git3", "upstream-x")
+        assert newer.success
+        assert pkg.commit("upstream-x").parents == (imported,)
+
+    def test_import_upstream_commit_missing(self, tmp_path: Path) -> None:
+        """An unknown upstream commit fails the import."""
+        mirror_path = tmp_path / "mirror"
+        mirror_path.mkdir()
+        self._repo(mirror_path)
+        pkg_path = tmp_path / "pkg"
+        pkg_path.mkdir()
+        self._repo(pkg_path)
+
+        result = gbp.import_upstream_commit(pkg_path, mirror_path, "0" * 40, "2.0~git1", "upstream-x")
+
+        assert not result.success
+        assert "Fetching upstream commit" in result.output
+
+
 class TestEnsureUpstreamBranchResult:
     """Tests for EnsureUpstreamBranchResult dataclass."""
 
@@ -479,6 +685,120 @@ class TestCheckUpstreamedPatches:
         assert reports == []
 
 
+def _lines(*changes: tuple[int, str], prepend: int = 0) -> str:
+    lines = [str(n) for n in range(1, 31)]
+    for lineno, text in changes:
+        lines[lineno - 1] = text
+    return "\n".join([f"new {n}" for n in range(prepend)] + lines) + "\n"
+
+
+class TestAnalyzePatchSeries:
+    """Tests for analyze_patch_series function."""
+
+    def _repo(self, tmp_path: Path) -> tuple[Path, git.Repo]:
+        repo_path = tmp_path / "pkg"
+        repo = git.Repo.init(repo_path)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        for name in ("a", "b", "c", "d", "e", "f"):
+            (repo_path / name).write_text(_lines())
+        repo.index.add(["a", "b", "c", "d", "e", "f"])
+        repo.index.commit("original")
+        return repo_path, repo
+
+    def _patch(self, repo: git.Repo, name: str, content: str) -> str:
+        path = Path(repo.working_tree_dir) / name
+        path.write_text(content)
+        diff = repo.git.diff(name) + "\n"
+        repo.git.checkout("--", name)
+        return diff
+
+    def test_classifies_every_patch(self, tmp_path: Path) -> None:
+        """Each outcome is detected in one pass over the series."""
+        repo_path, repo = self._repo(tmp_path)
+        patches = {
+            "clean.patch": self._patch(repo, "a", _lines((15, "fifteen"))),
+            "offset.patch": self._patch(repo, "b", _lines((15, "fifteen"))),
+            "fuzz.patch": self._patch(repo, "c", _lines((15, "fifteen"))),
+            "upstreamed.patch": self._patch(repo, "d", _lines((15, "fifteen"))),
+            "conflict.patch": self._patch(repo, "e", _lines((15, "fifteen"))),
+            "missing.patch": self._patch(repo, "f", _lines((15, "fifteen"))),
+        }
+
+        # Upstream moves on
+        (repo_path / "b").write_text(_lines(prepend=2))
+        (repo_path / "c").write_text(_lines((12, "twelve")))
+        (repo_path / "d").write_text(_lines((15, "fifteen")))
+        (repo_path / "e").write_text(_lines((15, "FIFTEEN")))
+        repo.index.remove(["f"], working_tree=True)
+        patches_dir = repo_path / "debian" / "patches"
+        patches_dir.mkdir(parents=True)
+        for name, text in patches.items():
+            (patches_dir / name).write_text(text)
+        (patches_dir / "series").write_text("# comment\n" + "\n".join(patches) + " -p1\nabsent.patch\n")
+        repo.git.add("-A")
+        repo.index.commit("upstream")
+
+        analysis = gbp.analyze_patch_series(repo_path)
+
+        assert analysis.available
+        reasons = {r.patch_name: r.failure_reason for r in analysis.patches}
+        assert reasons == {
+            "clean.patch": None,
+            "offset.patch": gbp.PatchFailureReason.OFFSET,
+            "fuzz.patch": gbp.PatchFailureReason.FUZZ,
+            "upstreamed.patch": gbp.PatchFailureReason.UPSTREAMED,
+            "conflict.patch": gbp.PatchFailureReason.CONFLICT,
+            "missing.patch": gbp.PatchFailureReason.MISSING_FILE,
+            "absent.patch": gbp.PatchFailureReason.MISSING_FILE,
+        }
+        assert analysis.needs_refresh and analysis.needs_fuzz
+        assert [r.patch_name for r in analysis.upstreamed] == ["upstreamed.patch"]
+        assert {r.patch_name for r in analysis.blocking} == {"conflict.patch", "missing.patch", "absent.patch"}
+        assert analysis.counts()["clean"] == 1
+        # Neither the working tree nor the real index were touched
+        assert not repo.is_dirty(untracked_files=True)
+
+    def test_patches_apply_cumulatively(self, tmp_path: Path) -> None:
+        """Later patches are checked against the tree earlier ones produce."""
+        repo_path, repo = self._repo(tmp_path)
+        first = self._patch(repo, "a", _lines((15, "fifteen")))
+        # Stage the first patch so the second is diffed against it
+        (repo_path / "a").write_text(_lines((15, "fifteen")))
+        repo.index.add(["a"])
+        second = self._patch(repo, "a", _lines((15, "fifteen"), (16, "sixteen")))
+        repo.git.checkout("HEAD", "--", "a")
+        patches_dir = repo_path / "debian" / "patches"
+        patches_dir.mkdir(parents=True)
+        (patches_dir / "first.patch").write_text(first)
+        (patches_dir / "second.patch").write_text(second)
+        (patches_dir / "series").write_text("first.patch\nsecond.patch\n")
+
+        analysis = gbp.analyze_patch_series(repo_path)
+
+        assert [r.failure_reason for r in analysis.patches] == [None, None]
+        assert not analysis.needs_refresh
+
+    def test_unavailable_without_series(self, tmp_path: Path) -> None:
+        """Without a series file the analysis is not available."""
+        assert not gbp.analyze_patch_series(tmp_path).available
+
+    def test_unavailable_outside_git(self, tmp_path: Path) -> None:
+        """A series outside a git checkout cannot be analysed."""
+        patches_dir = tmp_path / "debian" / "patches"
+        patches_dir.mkdir(parents=True)
+        (patches_dir / "series").write_text("")
+        with patch.dict("os.environ", {"GIT_CEILING_DIRECTORIES": str(tmp_path.parent)}):
+            analysis = gbp.analyze_patch_series(tmp_path)
+        assert not analysis.available
+
+    def test_read_patch_series_strip_level(self, tmp_path: Path) -> None:
+        """Strip levels from series options are honoured."""
+        (tmp_path / "series").write_text("a.patch\nb.patch -p0\n\n# c.patch\n")
+        assert gbp.read_patch_series(tmp_path) == [("a.patch", 1), ("b.patch", 0)]
+
+
 class TestBuildSource:
     """Tests for build_source function."""
 
@@ -9,8 +9,15 @@
 from __future__ import annotations
 
 import json
+import signal
+import subprocess
+import sys
+import time
 from pathlib import Path
 
+import pytest
+
+import packastack.planning.build_all_state as build_all_state
 from packastack.planning.build_all_state import (
     BuildAllState,
     FailureType,
@@ -19,6 +26,7 @@ from packastack.planning.build_all_state import (
     PackageStatus,
     create_initial_state,
     load_state,
+    record_transition,
     save_state,
 )
 
@@ -321,6 +329,20 @@ class TestBuildAllState:
         assert state.packages["nova"].log_path == "/tmp/nova.log"
         assert state.packages["nova"].end_time != ""
 
+    def test_mark_success_records_version(self) -> None:
+        """Test mark_success keeps the published version across a round trip."""
+        state = BuildAllState(
+            run_id="test",
+            target="dalmatian",
+            ubuntu_series="noble",
+            build_type="release",
+        )
+        state.packages["nova"] = PackageState(name="nova")
+        state.mark_success("nova", "/tmp/nova.log", "2:31.0.0-0ubuntu1")
+
+        restored = PackageState.from_dict(state.packages["nova"].to_dict())
+        assert restored.version == "2:31.0.0-0ubuntu1"
+
     def test_mark_failed(self) -> None:
         """Test marking a package as failed."""
         state = BuildAllState(
@@ -500,6 +522,8 @@ class TestSaveAndLoadState:
             build_type="snapshot",
         )
         state.packages["glance"] = PackageState(name="glance", status=PackageStatus.FAILED)
+        state.prefetch = {"duration_seconds": 3.5}
+        state.apt_proxy = {"hits": 4, "misses": 1}
 
         save_state(state, tmp_path)
         loaded = load_state(tmp_path)
@@ -509,6 +533,8 @@ class TestSaveAndLoadState:
         assert loaded.target == "caracal"
         assert "glance" in loaded.packages
         assert loaded.packages["glance"].status == PackageStatus.FAILED
+        assert loaded.prefetch == {"duration_seconds": 3.5}
+        assert loaded.apt_proxy == {"hits": 4, "misses": 1}
 
     def test_load_state_missing(self, tmp_path: Path) -> None:
         """Test loading from nonexistent file."""
@@ -524,6 +550,95 @@ class TestSaveAndLoadState:
         assert loaded is None
 
 
+class TestStateJournal:
+    """Tests for the append-only state journal."""
+
+    @pytest.fixture
+    def state(self, tmp_path: Path) -> BuildAllState:
+        state = create_initial_state(
+            run_id="run-j",
+            target="gazpacho",
+            ubuntu_series="resolute",
+            build_type="release",
+            packages=["nova", "glance", "keystone"],
+            build_order=["keystone", "glance", "nova"],
+        )
+        save_state(state, tmp_path)
+        return state
+
+    def test_transitions_replay_over_snapshot(self, tmp_path: Path, state: BuildAllState) -> None:
+        snapshot = (tmp_path / build_all_state.STATE_FILE).read_text()
+        state.mark_started("keystone")
+        record_transition(state, tmp_path, "keystone")
+        state.mark_success("keystone", "/logs/keystone.log")
+        record_transition(state, tmp_path, "keystone")
+        state.mark_failed("glance", FailureType.PATCH_FAILED, "conflict")
+        record_transition(state, tmp_path, "glance")
+
+        loaded = load_state(tmp_path)
+
+        assert (tmp_path / build_all_state.STATE_FILE).read_text() == snapshot
+        assert loaded is not None
+        assert loaded.packages["keystone"].status == PackageStatus.SUCCESS
+        assert loaded.packages["keystone"].log_path == "/logs/keystone.log"
+        assert loaded.packages["glance"].failure_type == FailureType.PATCH_FAILED
+        assert loaded.packages["nova"].status == PackageStatus.PENDING
+
+    def test_torn_record_is_dropped(self, tmp_path: Path, state: BuildAllState) -> None:
+        state.mark_success("keystone")
+        record_transition(state, tmp_path, "keystone")
+        with (tmp_path / build_all_state.JOURNAL_FILE).open("ab") as f:
+            f.write(b'{"updated_at": "x", "package": {"name": "gla')
+
+        loaded = load_state(tmp_path)
+        assert loaded is not None
+        loaded.mark_success("glance")
+        record_transition(loaded, tmp_path, "glance")
+        reloaded = load_state(tmp_path)
+
+        assert reloaded is not None
+        assert set(reloaded.get_success_packages()) == {"keystone", "glance"}
+
+    def test_compaction(self, tmp_path: Path, state: BuildAllState, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(build_all_state, "JOURNAL_COMPACT_BYTES", 1)
+        state.mark_success("nova")
+
+        record_transition(state, tmp_path, "nova")
+
+        assert (tmp_path / build_all_state.JOURNAL_FILE).stat().st_size == 0
+        data = json.loads((tmp_path / build_all_state.STATE_FILE).read_text())
+        assert data["packages"]["nova"]["status"] == "success"
+
+    def test_survives_sigkill(self, tmp_path: Path) -> None:
+        script = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "import packastack.planning.build_all_state as s\n"
+            "s.JOURNAL_COMPACT_BYTES = 4096\n"
+            "d = Path(sys.argv[1])\n"
+            "names = [f'pkg{i:05d}' for i in range(5000)]\n"
+            "st = s.create_initial_state('r', 't', 'u', 'release', names, names)\n"
+            "s.save_state(st, d)\n"
+            "print('ready', flush=True)\n"
+            "for n in names:\n"
+            "    st.mark_success(n)\n"
+            "    s.record_transition(st, d, n)\n"
+        )
+        proc = subprocess.Popen([sys.executable, "-c", script, str(tmp_path)], stdout=subprocess.PIPE)
+        assert proc.stdout is not None
+        assert proc.stdout.readline().strip() == b"ready"
+        time.sleep(0.3)
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+
+        loaded = load_state(tmp_path)
+
+        assert loaded is not None
+        done = loaded.get_success_packages()
+        assert done
+        assert done == loaded.build_order[: len(done)]
+
+
 class TestCreateInitialState:
     """Tests for create_initial_state function."""
 
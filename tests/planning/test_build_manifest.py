@@ -18,13 +18,18 @@
 
 """Tests for build manifest module."""
 
+import json
+import os
 
 from packastack.planning.build_manifest import (
+    RUN_MANIFEST_FILE,
     BuildManifest,
     PackageVersion,
     compute_build_order,
     create_manifest,
+    find_latest_run_manifest,
     resolve_version_for_package,
+    write_run_manifest,
 )
 from packastack.planning.graph import DependencyGraph
 from packastack.planning.type_selection import (
@@ -477,3 +482,29 @@ class TestCreateManifest:
 
         assert "nova" in manifest.type_selections
         assert manifest.type_selections["nova"].chosen_type == BuildType.RELEASE
+
+
+class TestRunManifest:
+    """Tests for the manifests runs write for clean --local-repo."""
+
+    def test_write_run_manifest(self, tmp_path):
+        """The manifest has the BuildManifest package shape."""
+        path = write_run_manifest(tmp_path / "run", "dalmatian", {"nova": "2:31.0.0-0ubuntu1", "glance": ""})
+
+        assert path == tmp_path / "run" / RUN_MANIFEST_FILE
+        data = json.loads(path.read_text())
+        assert data["series"] == "dalmatian"
+        assert data["packages"] == {"nova": {"source_package": "nova", "full_version": "2:31.0.0-0ubuntu1"}}
+
+    def test_find_latest_run_manifest(self, tmp_path):
+        """The most recently written manifest wins."""
+        old = write_run_manifest(tmp_path / "run-1", "dalmatian", {"nova": "1"})
+        new = write_run_manifest(tmp_path / "run-2", "dalmatian", {"nova": "2"})
+        os.utime(old, (1000, 1000))
+        (tmp_path / "run-3").mkdir()
+
+        assert find_latest_run_manifest(tmp_path) == new
+
+    def test_find_latest_run_manifest_none(self, tmp_path):
+        """No runs means no manifest."""
+        assert find_latest_run_manifest(tmp_path) is None
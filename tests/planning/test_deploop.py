@@ -20,18 +20,34 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
 
+import pytest
+
+import packastack.planning.deploop as deploop_module
+from packastack.apt.packages import BinaryPackage, PackageIndex
 from packastack.planning.deploop import (
     DependencyBuildPlan,
     DependencyBuildResult,
     DependencyCheckResult,
+    check_availability,
+    check_dependencies,
+    compute_topological_order,
+    create_build_plan,
     normalize_python_package_name,
     parse_pyproject_toml_deps,
     parse_requirements_txt,
 )
 
 
+def _index(**versions: str) -> PackageIndex:
+    index = PackageIndex()
+    for name, version in versions.items():
+        index.add_package(BinaryPackage(name=name, version=version, architecture="all"), "main", "release")
+    return index
+
+
 class TestDependencyCheckResult:
     """Tests for DependencyCheckResult dataclass."""
 
@@ -228,3 +244,93 @@ dependencies = ["pbr>=1.0", "oslo.config>=2.0,<3.0"]
         result = parse_pyproject_toml_deps(pyproject)
         assert ("pbr", ">=1.0") in result
         assert ("oslo.config", ">=2.0,<3.0") in result
+
+
+class TestCheckAvailability:
+    """Tests for batch availability checks."""
+
+    def test_uses_indexes_without_subprocesses(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should answer from the indexes without running apt-cache."""
+        def fail(*_args: object, **_kwargs: object) -> None:
+            raise AssertionError("apt-cache should not run")
+
+        monkeypatch.setattr(deploop_module.subprocess, "run", fail)
+
+        results = check_availability(
+            ["python3-pbr", "python3-oslo-config", "python3-missing"],
+            archive_index=_index(**{"python3-pbr": "6.0.0-1"}),
+            local_index=_index(**{"python3-oslo-config": "9.0.0-0ubuntu1"}),
+        )
+
+        assert results["python3-pbr"].available_in_archive
+        assert results["python3-pbr"].archive_version == "6.0.0-1"
+        assert results["python3-oslo-config"].available_in_local
+        assert not results["python3-oslo-config"].available_in_archive
+        assert not results["python3-missing"].available_in_archive
+        assert not results["python3-missing"].available_in_local
+
+    def test_apt_policy_fallback_is_one_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should query all packages with a single apt-cache policy call."""
+        calls: list[list[str]] = []
+        output = (
+            "python3-pbr:\n  Installed: (none)\n  Candidate: 6.0.0-1\n"
+            "python3-missing:\n  Installed: (none)\n  Candidate: (none)\n"
+        )
+
+        def fake_run(cmd: list[str], **_kwargs: object) -> subprocess.CompletedProcess[str]:
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout=output, stderr="")
+
+        monkeypatch.setattr(deploop_module.subprocess, "run", fake_run)
+
+        results = check_availability(["python3-pbr", "python3-missing"])
+
+        assert calls == [["apt-cache", "policy", "python3-pbr", "python3-missing"]]
+        assert results["python3-pbr"].archive_version == "6.0.0-1"
+        assert not results["python3-missing"].available_in_archive
+
+    def test_check_dependencies_uses_indexes(self, tmp_path: Path) -> None:
+        """Should classify requirements using the given indexes."""
+        (tmp_path / "requirements.txt").write_text("pbr>=2.0\noslo.config\nnew-lib\n")
+
+        plan = check_dependencies(
+            tmp_path,
+            archive_index=_index(**{"python3-pbr": "6.0.0-1"}),
+            local_index=_index(**{"python3-oslo-config": "9.0.0-0ubuntu1"}),
+        )
+
+        assert plan.from_archive == ["python3-pbr"]
+        assert plan.from_local == ["python3-oslo-config"]
+        assert plan.to_build == ["new-lib"]
+        assert plan.check_results["python3-pbr"].version_constraint == ">=2.0"
+
+
+class TestComputeTopologicalOrder:
+    """Tests for compute_topological_order."""
+
+    def test_dependencies_first(self) -> None:
+        """Should order dependencies before their dependents."""
+        order = compute_topological_order(["a", "b", "c"], {"a": ["b"], "b": ["c"]})
+        assert order == ["c", "b", "a"]
+
+    def test_keeps_input_order_when_independent(self) -> None:
+        """Should keep input order and ignore dependencies outside the set."""
+        order = compute_topological_order(["x", "a", "b"], {"a": ["external"], "x": ["b"]})
+        assert order == ["a", "b", "x"]
+
+    def test_cycle_appended_in_input_order(self) -> None:
+        """Should still return every package when there is a cycle."""
+        order = compute_topological_order(["a", "b", "c"], {"a": ["b"], "b": ["a"]})
+        assert order == ["c", "a", "b"]
+
+    def test_create_build_plan_orders_to_build(self) -> None:
+        """Should order the packages to build by the dependency graph."""
+        plan = create_build_plan(
+            ["oslo.config", "pbr", "debtcollector"],
+            archive_index=_index(**{"python3-pbr": "6.0.0-1"}),
+            local_index=PackageIndex(),
+            dep_graph={"oslo.config": ["debtcollector", "pbr"]},
+        )
+
+        assert plan.already_available == ["pbr"]
+        assert plan.to_build == ["debtcollector", "oslo.config"]
@@ -26,9 +26,14 @@ from unittest.mock import MagicMock
 
 from packastack.planning.graph import DependencyGraph
 from packastack.reports.plan_graph import (
+    PLAN_GRAPH_DATA,
+    PLAN_GRAPH_HTML,
+    PLAN_GRAPH_RUN,
     GraphEdge,
     GraphNode,
     PlanGraph,
+    iter_graph_chunks,
+    iter_json,
     render_ascii,
     render_build_order_list,
     render_dot,
@@ -948,3 +953,119 @@ class TestWritePlanGraphReports:
 
         html_content = paths["html"].read_text()
         assert "my-unique-pkg-name" in html_content
+
+
+def _waved_graph(run_id: str = "run-1") -> PlanGraph:
+    graph = PlanGraph(
+        run_id=run_id,
+        generated_at_utc="2026-01-01T00:00:00Z",
+        target="gazpacho",
+        ubuntu_series="resolute",
+    )
+    graph.nodes["oslo"] = GraphNode(id="oslo", build_type="release", order=0, wave=0, dependents=["nova"])
+    graph.nodes["nova"] = GraphNode(id="nova", order=1, wave=1, dependencies=["oslo"])
+    graph.edges.append(GraphEdge("nova", "oslo"))
+    graph.topo_order = ["oslo", "nova"]
+    graph.waves = {0: ["oslo"], 1: ["nova"]}
+    return graph
+
+
+class TestStreamingReports:
+    """Tests for the streaming writers and graph data sidecar."""
+
+    def test_json_stream_matches_to_dict(self) -> None:
+        graph = _waved_graph()
+
+        data = json.loads("".join(iter_json(graph)))
+
+        assert data.pop("graph_hash") == graph.content_hash()
+        assert data == graph.to_dict()
+
+    def test_empty_graph_json_stream(self) -> None:
+        graph = PlanGraph(run_id="r", generated_at_utc="t", target="g", ubuntu_series="r")
+        assert json.loads("".join(iter_json(graph)))["nodes"] == []
+
+    def test_content_hash_ignores_run_metadata(self) -> None:
+        graph = _waved_graph()
+        other = _waved_graph(run_id="run-2")
+        other.generated_at_utc = "2026-02-01T00:00:00Z"
+
+        assert graph.content_hash() == other.content_hash()
+        other.edges.append(GraphEdge("nova", "keystone"))
+        assert graph.content_hash() != other.content_hash()
+
+    def test_chunks_per_wave(self) -> None:
+        graph = _waved_graph()
+        graph.nodes["loose"] = GraphNode(id="loose")
+
+        chunks = list(iter_graph_chunks(graph))
+
+        assert [c["wave"] for c in chunks] == [-1, 0, 1]
+        assert chunks[1]["nodes"] == [["oslo", "release", "ok", 0, 0, 1]]
+        assert chunks[2]["edges"] == [["nova", "oslo"]]
+
+    def test_report_loads_sidecar(self, tmp_path: Path) -> None:
+        paths = write_plan_graph_reports(_waved_graph(), tmp_path)
+
+        page = paths["html"].read_text()
+        sidecar = paths["data"].read_text().splitlines()
+        assert paths["data"].name == PLAN_GRAPH_DATA
+        assert json.dumps(PLAN_GRAPH_DATA) in page
+        assert "packastackPlanGraph.push(" not in page
+        assert len(sidecar) == 3
+        assert sidecar[-1].startswith("packastackPlanGraph.end(")
+
+    def test_self_contained_html_embeds_chunks(self) -> None:
+        graph = _waved_graph()
+        graph.nodes["<pkg>"] = GraphNode(id="<pkg>", wave=1)
+
+        page = render_html(graph)
+
+        assert page.count("<script>packastackPlanGraph.push(") == 2
+        assert "\\u003cpkg>" in page
+
+    def test_unchanged_graph_is_not_rendered_again(self, tmp_path: Path) -> None:
+        reuse = tmp_path / "reuse"
+        first = write_plan_graph_reports(_waved_graph(), tmp_path / "run-1", reuse)
+
+        second = write_plan_graph_reports(_waved_graph(run_id="run-2"), tmp_path / "run-2", reuse)
+
+        assert "reused" not in first
+        assert second["reused"] == reuse
+        assert second["html"].read_text() == first["html"].read_text()
+        assert json.loads(second["json"].read_text())["run_id"] == "run-2"
+        assert '"run_id":"run-2"' in second["run"].read_text()
+
+    def test_reusable_html_has_no_run_metadata(self, tmp_path: Path) -> None:
+        paths = write_plan_graph_reports(_waved_graph(run_id="run-1"), tmp_path, tmp_path / "reuse")
+
+        page = paths["html"].read_text()
+        assert "run-1" not in page
+        assert "2026-01-01" not in page
+        assert f'<script src="{PLAN_GRAPH_RUN}">' in page
+        assert "run-1" in render_html(_waved_graph(run_id="run-1"))
+
+    def test_rerender_does_not_touch_earlier_runs(self, tmp_path: Path) -> None:
+        reuse = tmp_path / "reuse"
+        write_plan_graph_reports(_waved_graph(), tmp_path / "run-1", reuse)
+        second = write_plan_graph_reports(_waved_graph(run_id="run-2"), tmp_path / "run-2", reuse)
+        kept = second["html"].read_text()
+        graph = _waved_graph(run_id="run-3")
+        graph.nodes["nova"].build_type = "release"
+
+        write_plan_graph_reports(graph, tmp_path / "run-3", reuse)
+
+        assert second["html"].read_text() == kept
+        assert (reuse / PLAN_GRAPH_HTML).read_text() != kept
+
+    def test_changed_graph_is_rendered(self, tmp_path: Path) -> None:
+        reuse = tmp_path / "reuse"
+        write_plan_graph_reports(_waved_graph(), tmp_path / "run-1", reuse)
+        graph = _waved_graph(run_id="run-2")
+        graph.nodes["nova"].build_type = "release"
+
+        paths = write_plan_graph_reports(graph, tmp_path / "run-2", reuse)
+
+        assert "reused" not in paths
+        assert "run-2" in paths["run"].read_text()
+        assert (reuse / "graph-hash").read_text().strip() == graph.content_hash()
@@ -0,0 +1,102 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.upstream.compress module."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+import random
+import shutil
+
+import pytest
+
+from packastack.upstream import compress
+
+
+def _payload(size: int) -> bytes:
+    rng = random.Random(42)
+    words = [b"nova", b"neutron", b"oslo", b"config", b"\n", b"def ", b"return "]
+    data = b"".join(rng.choice(words) for _ in range(size // 4))
+    return data[:size]
+
+
+def _gzip(data: bytes, **kwargs: int) -> bytes:
+    out = io.BytesIO()
+    compress.ParallelGzip(**kwargs).compress(io.BytesIO(data), out)
+    return out.getvalue()
+
+
+class TestParallelGzip:
+    """Tests for ParallelGzip."""
+
+    @pytest.mark.parametrize("size", [0, 1, 4096, 64 * 1024 + 17])
+    def test_round_trip(self, size: int) -> None:
+        """Output is a single gzip member that decompresses to the input."""
+        data = _payload(size)
+        blob = _gzip(data, chunk_size=16 * 1024)
+        assert gzip.decompress(blob) == data
+        assert blob[4:8] == b"\0\0\0\0"  # No timestamp
+
+    def test_independent_of_threads(self) -> None:
+        """The same input gives the same bytes for any thread count."""
+        data = _payload(200 * 1024)
+        outputs = {_gzip(data, threads=n, chunk_size=8 * 1024) for n in (1, 2, 8)}
+        assert len(outputs) == 1
+
+    def test_key_covers_output_settings(self) -> None:
+        """Settings that change the bytes change the key."""
+        assert compress.ParallelGzip(level=6).key != compress.ParallelGzip(level=9).key
+        assert compress.ParallelGzip(chunk_size=1).key != compress.ParallelGzip().key
+        assert compress.ParallelGzip(threads=1).key == compress.ParallelGzip(threads=4).key
+
+
+@pytest.mark.skipif(shutil.which("xz") is None, reason="xz not installed")
+class TestParallelXz:
+    """Tests for ParallelXz."""
+
+    def test_round_trip_and_reproducible(self, tmp_path) -> None:
+        """Output decompresses to the input and ignores the thread count."""
+        data = _payload(100 * 1024)
+        outputs = []
+        for threads in (1, 3):
+            src = tmp_path / "in"
+            src.write_bytes(data)
+            dest = tmp_path / f"out{threads}.xz"
+            with src.open("rb") as fin, dest.open("wb") as fout:
+                compress.ParallelXz(threads=threads, block_size=32 * 1024).compress(fin, fout)
+            outputs.append(dest.read_bytes())
+        assert lzma.decompress(outputs[0]) == data
+        assert outputs[0] == outputs[1]
+
+
+class TestGetCompressor:
+    """Tests for get_compressor."""
+
+    def test_default_gzip(self) -> None:
+        """gzip is the default."""
+        assert isinstance(compress.get_compressor(), compress.ParallelGzip)
+
+    def test_xz_falls_back_without_executable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """xz is only used when installed."""
+        monkeypatch.setattr(compress.shutil, "which", lambda _name: None)
+        assert isinstance(compress.get_compressor("xz", threads=2), compress.ParallelGzip)
+        monkeypatch.setattr(compress.shutil, "which", lambda _name: "/usr/bin/xz")
+        assert compress.get_compressor("xz", threads=2) == compress.ParallelXz(threads=2)
@@ -0,0 +1,162 @@
+# This file is part of Packastack, a tool for building OpenStack packages for Ubuntu.
+#
+# Copyright 2025 Canonical Ltd.
+#
+# SPDX-License-Identifier: GPL-3.0-only
+#
+# Packastack is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3, as published by the
+# Free Software Foundation.
+#
+# Packastack is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+# SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Packastack. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for packastack.upstream.download module."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from packastack.upstream.download import (
+    DownloadManager,
+    DownloadRequest,
+    get_download_manager,
+    partial_path,
+)
+
+PAYLOAD = bytes(range(256)) * 1024  # 256 KiB
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestDownload:
+    """Tests for DownloadManager.download."""
+
+    def test_downloads_and_hashes(self, local_http_server, tmp_path: Path) -> None:
+        local_http_server.files["/nova-1.0.tar.gz"] = PAYLOAD
+        manager = DownloadManager(chunk_size=4096)
+
+        dest = tmp_path / "nova-1.0.tar.gz"
+        result = manager.download(f"{local_http_server.url}/nova-1.0.tar.gz", dest)
+
+        assert result.success is True
+        assert dest.read_bytes() == PAYLOAD
+        assert result.sha256 == _sha256(PAYLOAD)
+        assert result.size == len(PAYLOAD)
+        assert result.resumed is False
+        assert not partial_path(dest).exists()
+
+    def test_missing_file_reports_error(self, local_http_server, tmp_path: Path) -> None:
+        manager = DownloadManager()
+
+        dest = tmp_path / "missing.tar.gz"
+        result = manager.download(f"{local_http_server.url}/missing.tar.gz", dest)
+
+        assert result.success is False
+        assert "404" in result.error
+        assert not dest.exists()
+
+    def test_resumes_interrupted_download(self, local_http_server, tmp_path: Path) -> None:
+        local_http_server.files["/nova-1.0.tar.gz"] = PAYLOAD
+        local_http_server.truncate_next = 100_000
+        manager = DownloadManager(chunk_size=4096)
+        url = f"{local_http_server.url}/nova-1.0.tar.gz"
+        dest = tmp_path / "nova-1.0.tar.gz"
+
+        first = manager.download(url, dest)
+        assert first.success is False
+        kept = partial_path(dest).stat().st_size
+        assert 0 < kept <= 100_000
+
+        second = manager.download(url, dest)
+        assert second.success is True
+        assert second.resumed is True
+        assert second.sha256 == _sha256(PAYLOAD)
+        assert dest.read_bytes() == PAYLOAD
+        assert local_http_server.requests[-1] == ("/nova-1.0.tar.gz", f"bytes={kept}-")
+
+    def test_restarts_when_server_ignores_range(self, local_http_server, tmp_path: Path) -> None:
+        local_http_server.files["/f.tar.gz"] = PAYLOAD
+        local_http_server.honour_range = False
+        dest = tmp_path / "f.tar.gz"
+        partial_path(dest).write_bytes(b"stale partial data")
+
+        result = DownloadManager().download(f"{local_http_server.url}/f.tar.gz", dest)
+
+        assert result.success is True
+        assert result.resumed is False
+        assert dest.read_bytes() == PAYLOAD
+
+    def test_unsatisfiable_range_restarts(self, local_http_server, tmp_path: Path) -> None:
+        local_http_server.files["/f.tar.gz"] = b"short"
+        dest = tmp_path / "f.tar.gz"
+        partial_path(dest).write_bytes(b"a much longer stale partial")
+
+        result = DownloadManager().download(f"{local_http_server.url}/f.tar.gz", dest)
+
+        assert result.success is True
+        assert dest.read_bytes() == b"short"
+
+    def test_checksum_mismatch_discards_partial(self, local_http_server, tmp_path: Path) -> None:
+        local_http_server.files["/f.tar.gz"] = PAYLOAD
+        dest = tmp_path / "f.tar.gz"
+
+        result = DownloadManager().download(
+            f"{local_http_server.url}/f.tar.gz", dest, expected_sha256="0" * 64
+        )
+
+        assert result.success is False
+        assert "sha256 mismatch" in result.error
+        assert not dest.exists()
+        assert not partial_path(dest).exists()
+
+    def test_existing_file_with_matching_hash_skips_request(
+        self, local_http_server, tmp_path: Path
+    ) -> None:
+        dest = tmp_path / "f.tar.gz"
+        dest.write_bytes(PAYLOAD)
+
+        result = DownloadManager().download(
+            f"{local_http_server.url}/f.tar.gz", dest, expected_sha256=_sha256(PAYLOAD)
+        )
+
+        assert result.success is True
+        assert result.from_existing is True
+        assert local_http_server.requests == []
+
+
+class TestPrefetch:
+    """Tests for DownloadManager.prefetch."""
+
+    def test_prefetch_preserves_order(self, local_http_server, tmp_path: Path) -> None:
+        for i in range(6):
+            local_http_server.files[f"/pkg{i}.tar.gz"] = bytes([i]) * (1000 + i)
+        local_http_server.files.pop("/pkg3.tar.gz")
+        manager = DownloadManager(pool_size=4)
+        completed: list[str] = []
+
+        items = [
+            DownloadRequest(url=f"{local_http_server.url}/pkg{i}.tar.gz", dest=tmp_path / f"pkg{i}.tar.gz")
+            for i in range(6)
+        ]
+        results = manager.prefetch(items, max_workers=4, on_complete=lambda r: completed.append(r.url))
+
+        assert [r.url for r in results] == [item.url for item in items]
+        assert [r.success for r in results] == [True, True, True, False, True, True]
+        assert results[5].sha256 == _sha256(bytes([5]) * 1005)
+        assert sorted(completed) == sorted(item.url for item in items)
+
+    def test_prefetch_empty(self) -> None:
+        assert DownloadManager().prefetch([]) == []
+
+
+def test_shared_manager_is_singleton() -> None:
+    assert get_download_manager() is get_download_manager()
@@ -605,3 +605,82 @@ class TestFetchPackageWithBranch:
 
         assert result.error is not None
         assert "Checkout failed" in result.error
+
+
+def _make_upstream(base: Path, package: str) -> Path:
+    """Create a local packaging repository with a series branch."""
+    import git
+
+    path = base / package
+    repo = git.Repo.init(path, initial_branch="master")
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", "Test")
+        cw.set_value("user", "email", "test@example.com")
+    (path / "README").write_text("one\n")
+    repo.index.add(["README"])
+    repo.index.commit("initial")
+    repo.create_head("ubuntu/noble")
+    return path
+
+
+class TestMirrors:
+    """Tests for bare packaging mirrors."""
+
+    def test_update_mirror_clones_then_updates(self, tmp_path: Path) -> None:
+        """First call creates the bare mirror, later calls fetch into it."""
+        _make_upstream(tmp_path / "remote", "nova")
+        fetcher = GitFetcher(base_url=str(tmp_path / "remote"), mirror_dir=tmp_path / "mirrors")
+
+        first = fetcher.update_mirror("nova")
+        second = fetcher.update_mirror("nova")
+
+        assert first.error is None and first.cloned is True
+        assert first.path == tmp_path / "mirrors" / "nova.git"
+        assert first.branches == ["master", "ubuntu/noble"]
+        assert second.error is None and second.updated is True
+
+    def test_update_mirror_without_mirror_dir(self) -> None:
+        """A fetcher without mirror_dir reports an error."""
+        assert GitFetcher().update_mirror("nova").error == "No mirror directory configured"
+
+    def test_clone_comes_from_mirror(self, tmp_path: Path) -> None:
+        """Working clones are made from the mirror with origin pointing upstream."""
+        import git
+
+        _make_upstream(tmp_path / "remote", "nova")
+        fetcher = GitFetcher(base_url=str(tmp_path / "remote"), mirror_dir=tmp_path / "mirrors")
+
+        result = fetcher.fetch_and_checkout("nova", tmp_path / "work", "noble", "caracal")
+
+        assert result.error is None and result.cloned is True
+        assert (tmp_path / "mirrors" / "nova.git" / "HEAD").exists()
+        repo = git.Repo(tmp_path / "work" / "nova")
+        assert next(iter(repo.remotes.origin.urls)) == str(tmp_path / "remote" / "nova")
+        assert repo.active_branch.name == "ubuntu/noble"
+
+    def test_prefetched_mirror_is_not_refreshed(self, tmp_path: Path) -> None:
+        """With refresh_mirror=False the existing mirror is cloned as-is."""
+        import git
+
+        upstream_path = _make_upstream(tmp_path / "remote", "nova")
+        base_url = str(tmp_path / "remote")
+        GitFetcher(base_url=base_url, mirror_dir=tmp_path / "mirrors").update_mirror("nova")
+        git.Repo(upstream_path).create_head("ubuntu/oracular")
+
+        fetcher = GitFetcher(base_url=base_url, mirror_dir=tmp_path / "mirrors", refresh_mirror=False)
+        result = fetcher.fetch_package("nova", tmp_path / "work")
+
+        assert result.error is None
+        assert "ubuntu/oracular" not in result.branches
+
+    def test_offline_clone_from_mirror(self, tmp_path: Path) -> None:
+        """Offline mode can still clone from an existing mirror."""
+        _make_upstream(tmp_path / "remote", "nova")
+        fetcher = GitFetcher(base_url=str(tmp_path / "remote"), mirror_dir=tmp_path / "mirrors")
+        fetcher.update_mirror("nova")
+
+        result = fetcher.fetch_package("nova", tmp_path / "work", offline=True)
+
+        assert result.error is None
+        assert result.cloned is True
+        assert "ubuntu/noble" in result.branches
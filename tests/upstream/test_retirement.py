@@ -8,13 +8,17 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
+import packastack.upstream.retirement as retirement_module
 from packastack.upstream.retirement import (
     MappingConfidence,
+    ReleasesIndex,
     RetirementChecker,
     RetirementInfo,
     RetirementStatus,
@@ -22,6 +26,7 @@ from packastack.upstream.retirement import (
     find_last_seen_series,
     get_series_order,
     load_project_config,
+    load_retirement_snapshot,
     map_package_to_upstream,
 )
 
@@ -33,6 +38,26 @@ def _write_projects_yaml(root: Path, content: str) -> Path:
     return projects_yaml
 
 
+def _git_commit(repo: Path) -> None:
+    for args in (["init", "-q"], ["add", "."], ["commit", "-q", "--allow-empty", "-m", "update"]):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+        )
+
+
+def _write_releases(root: Path, present: dict[str, list[str]]) -> Path:
+    deliverables = root / "deliverables"
+    for series in ["yoga", "zed", "antelope", "bobcat", "caracal", "dalmatian"]:
+        (deliverables / series).mkdir(parents=True, exist_ok=True)
+    for name, series_list in present.items():
+        for series in series_list:
+            (deliverables / series / f"{name}.yaml").write_text(f"name: {name}\n")
+    return root
+
+
 class TestLoadProjectConfig:
     """Tests for load_project_config."""
 
@@ -270,3 +295,113 @@ class TestRetirementChecker:
         assert batch["a"].status == RetirementStatus.RETIRED
         assert checker.get_retired_packages(["a", "b", "c"]) == ["a"]
         assert checker.get_possibly_retired_packages(["a", "b", "c"]) == ["b"]
+
+
+class TestRetirementSnapshot:
+    """Tests for the compiled retirement snapshot."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_process(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(retirement_module, "_loaded_snapshots", {})
+
+    @pytest.fixture
+    def clones(self, tmp_path: Path) -> tuple[Path, Path]:
+        project_config = tmp_path / "project-config"
+        _write_projects_yaml(
+            project_config,
+            "- project: openstack/murano\n  description: \"RETIRED: gone\"\n"
+            "- project: openstack/nova\n  description: Active\n",
+        )
+        releases = _write_releases(
+            tmp_path / "releases", {"nova": ["zed", "dalmatian"], "murano": ["yoga"]}
+        )
+        _git_commit(project_config)
+        _git_commit(releases)
+        return project_config, releases
+
+    def test_releases_index_matches_scan(self, tmp_path: Path) -> None:
+        """Should give the same answers as find_last_seen_series."""
+        releases = _write_releases(tmp_path, {"nova": ["zed", "caracal"], "murano": ["yoga"]})
+        index = ReleasesIndex.scan(releases)
+
+        for deliverable in ["nova", "murano", "missing"]:
+            for target in ["zed", "bobcat", "dalmatian", "unknown"]:
+                assert index.last_seen(deliverable, target) == find_last_seen_series(
+                    deliverable, releases, target
+                )
+
+    def test_compiled_then_loaded_from_cache(self, clones: tuple[Path, Path], tmp_path: Path) -> None:
+        """Should store the snapshot and reuse it in a later process."""
+        project_config, releases = clones
+        snapshot_dir = tmp_path / "snapshots"
+
+        _, cold = load_retirement_snapshot(project_config, releases, snapshot_dir)
+        assert cold.source == "compiled"
+        assert (snapshot_dir / f"{cold.key}.pickle").is_file()
+
+        # Same process: served from memory
+        _, again = load_retirement_snapshot(project_config, releases, snapshot_dir)
+        assert again.source == "memory"
+
+        retirement_module._loaded_snapshots.clear()
+        second, warm = load_retirement_snapshot(project_config, releases, snapshot_dir)
+        assert warm.source == "cache"
+        assert warm.key == cold.key
+        assert second.project_config.find_project("openstack/murano").is_retired
+        assert second.releases.last_seen("nova", "dalmatian") == ("dalmatian", 0)
+        assert warm.to_dict()["projects"] == 2
+
+    def test_new_commit_changes_key(self, clones: tuple[Path, Path], tmp_path: Path) -> None:
+        """Should compile a new snapshot when project-config moves."""
+        project_config, releases = clones
+        _, before = load_retirement_snapshot(project_config, releases, tmp_path / "snapshots")
+
+        _git_commit(project_config)
+        _, after = load_retirement_snapshot(project_config, releases, tmp_path / "snapshots")
+
+        assert after.key != before.key
+        assert after.source == "compiled"
+
+    def test_corrupt_snapshot_is_recompiled(self, clones: tuple[Path, Path], tmp_path: Path) -> None:
+        """Should ignore an unreadable snapshot file."""
+        project_config, releases = clones
+        snapshot_dir = tmp_path / "snapshots"
+        _, cold = load_retirement_snapshot(project_config, releases, snapshot_dir)
+        (snapshot_dir / f"{cold.key}.pickle").write_bytes(b"not a pickle")
+        retirement_module._loaded_snapshots.clear()
+
+        snapshot, load = load_retirement_snapshot(project_config, releases, snapshot_dir)
+
+        assert load.source == "compiled"
+        assert snapshot.project_config.find_project("openstack/nova") is not None
+
+    def test_not_cached_without_git(self, tmp_path: Path) -> None:
+        """Should compile but not store data that is not a git checkout."""
+        _write_projects_yaml(tmp_path, "- project: openstack/nova\n  description: Active\n")
+
+        snapshot, load = load_retirement_snapshot(tmp_path, None, tmp_path / "snapshots")
+
+        assert load.key == ""
+        assert load.source == "compiled"
+        assert snapshot.project_config.find_project("openstack/nova") is not None
+        assert not (tmp_path / "snapshots").exists()
+
+    def test_checker_uses_snapshot_and_logs_load(self, clones: tuple[Path, Path]) -> None:
+        """Should check against the snapshot and report the load time."""
+        project_config, releases = clones
+        run = MagicMock()
+
+        checker = RetirementChecker(
+            project_config_path=project_config,
+            releases_path=releases,
+            target_series="dalmatian",
+            run=run,
+        )
+
+        assert checker.check("murano").status == RetirementStatus.RETIRED
+        assert checker.check("nova").status == RetirementStatus.ACTIVE
+        assert (project_config.parent / "retirement-snapshots").is_dir()
+        event = run.log_event.call_args.args[0]
+        assert event["event"] == "retirement.snapshot"
+        assert event["source"] == "compiled"
+        assert "load_ms" in event
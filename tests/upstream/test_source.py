@@ -215,46 +215,27 @@ class TestSelectUpstreamSource:
 class TestDownloadFile:
     """Tests for download_file function."""
 
-    def test_successful_download(self, tmp_path: Path) -> None:
+    def test_successful_download(self, local_http_server, tmp_path: Path) -> None:
         """Test successful file download."""
-        import io
-
-        # Create a real file-like object for the response
         content = b"test content"
-        mock_response = io.BytesIO(content)
-
-        # Wrap in context manager support
-        class MockURLResponse:
-            def __enter__(self):
-                return mock_response
+        local_http_server.files["/test.tar.gz"] = content
 
-            def __exit__(self, *args):
-                return False
+        dest = tmp_path / "test.tar.gz"
+        success, error = upstream.download_file(f"{local_http_server.url}/test.tar.gz", dest)
 
-        with patch.object(upstream.urllib.request, "urlopen") as mock_urlopen:
-            mock_urlopen.return_value = MockURLResponse()
+        assert success is True
+        assert error == ""
+        assert dest.exists()
+        assert dest.read_bytes() == content
 
-            dest = tmp_path / "test.tar.gz"
-            success, error = upstream.download_file("http://example.com/test.tar.gz", dest)
-
-            assert success is True
-            assert error == ""
-            assert dest.exists()
-            assert dest.read_bytes() == content
-
-    def test_failed_download(self, tmp_path: Path) -> None:
+    def test_failed_download(self, local_http_server, tmp_path: Path) -> None:
         """Test failed file download."""
-        with patch.object(upstream.urllib.request, "urlopen") as mock_urlopen:
-            mock_urlopen.side_effect = Exception("Connection failed")
-
-            dest = tmp_path / "test.tar.gz"
-            success, error = upstream.download_file("http://example.com/test.tar.gz", dest)
-
-            assert success is False
-            assert "Connection failed" in error
+        dest = tmp_path / "test.tar.gz"
+        success, error = upstream.download_file(f"{local_http_server.url}/test.tar.gz", dest)
 
-            assert success is False
-            assert "Connection failed" in error
+        assert success is False
+        assert "404" in error
+        assert not dest.exists()
 
 
 class TestVerifySignature:
@@ -337,8 +318,10 @@ class TestDownloadAndVerifyTarball:
             build_type=upstream.BuildType.RELEASE,
         )
 
-        with patch.object(upstream, "download_file") as mock_download:
-            mock_download.return_value = (False, "Network error")
+        with patch.object(upstream, "fetch_file") as mock_download:
+            mock_download.return_value = upstream.DownloadResult(
+                url=source.tarball_url, path=tmp_path, success=False, error="Network error"
+            )
             result = upstream.download_and_verify_tarball(source, tmp_path)
 
             assert result.success is False
@@ -352,12 +335,15 @@ class TestDownloadAndVerifyTarball:
             build_type=upstream.BuildType.RELEASE,
         )
 
-        with patch.object(upstream, "download_file") as mock_download:
-            mock_download.return_value = (True, "")
+        with patch.object(upstream, "fetch_file") as mock_download:
+            mock_download.return_value = upstream.DownloadResult(
+                url=source.tarball_url, path=tmp_path, success=True, sha256="abc123"
+            )
             result = upstream.download_and_verify_tarball(source, tmp_path)
 
             assert result.success is True
             assert result.signature_verified is False
+            assert result.sha256 == "abc123"
 
     def test_successful_download_with_verified_signature(self, tmp_path: Path) -> None:
         """Test successful download with signature verification."""
@@ -368,7 +354,13 @@ class TestDownloadAndVerifyTarball:
             build_type=upstream.BuildType.RELEASE,
         )
 
-        with patch.object(upstream, "download_file") as mock_download:
+        with (
+            patch.object(upstream, "fetch_file") as mock_fetch,
+            patch.object(upstream, "download_file") as mock_download,
+        ):
+            mock_fetch.return_value = upstream.DownloadResult(
+                url=source.tarball_url, path=tmp_path, success=True
+            )
             mock_download.return_value = (True, "")
             with patch.object(upstream, "verify_signature") as mock_verify:
                 mock_verify.return_value = (True, "OK")
@@ -377,59 +369,102 @@ class TestDownloadAndVerifyTarball:
                 assert result.success is True
                 assert result.signature_verified is True
 
+    def test_staged_signature_is_reused(self, tmp_path: Path) -> None:
+        """A signature staged next to a prefetched tarball is not downloaded again."""
+        source = upstream.UpstreamSource(
+            version="1.0",
+            tarball_url="http://example.com/foo-1.0.tar.gz",
+            signature_url="http://example.com/foo-1.0.tar.gz.asc",
+            build_type=upstream.BuildType.RELEASE,
+        )
+        (tmp_path / "foo-1.0.tar.gz.asc").write_text("signature")
+
+        with (
+            patch.object(upstream, "fetch_file") as mock_fetch,
+            patch.object(upstream, "download_file") as mock_download,
+            patch.object(upstream, "verify_signature", return_value=(True, "OK")),
+        ):
+            mock_fetch.return_value = upstream.DownloadResult(
+                url=source.tarball_url, path=tmp_path, success=True
+            )
+            result = upstream.download_and_verify_tarball(source, tmp_path)
+
+        mock_download.assert_not_called()
+        assert result.signature_verified is True
+
+
+def _git_repo(path: Path) -> Path:
+    import git
+
+    path.mkdir()
+    repo = git.Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    (path / "setup.py").write_text("print('nova')\n" * 100)
+    repo.index.add(["setup.py"])
+    repo.index.commit("init")
+    return path
+
 
 class TestGenerateSnapshotTarball:
     """Tests for generate_snapshot_tarball function."""
 
     def test_successful_generation(self, tmp_path: Path) -> None:
         """Test successful tarball generation."""
-        repo = tmp_path / "repo"
-        repo.mkdir()
+        import tarfile
+
+        repo = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-            result = upstream.generate_snapshot_tarball(
-                repo_path=repo,
-                ref="HEAD",
-                package="nova",
-                version="30.0.0~git20241227.abc1234",
-                output_dir=output_dir,
-            )
+        result = upstream.generate_snapshot_tarball(
+            repo_path=repo,
+            ref="HEAD",
+            package="nova",
+            version="30.0.0~git20241227.abc1234",
+            output_dir=output_dir,
+        )
 
-            assert result.success is True
-            assert result.signature_warning == "Snapshot build - no signature verification"
-            mock_run.assert_called_once()
+        assert result.success is True
+        assert result.signature_warning == "Snapshot build - no signature verification"
+        assert result.path == output_dir / "nova_30.0.0~git20241227.abc1234.orig.tar.gz"
+        with tarfile.open(result.path) as tar:
+            assert tar.getnames() == ["nova-30.0.0~git20241227.abc1234", "nova-30.0.0~git20241227.abc1234/setup.py"]
+
+    def test_reproducible(self, tmp_path: Path) -> None:
+        """Test that the same commit always gives the same bytes."""
+        repo = _git_repo(tmp_path / "repo")
+        first = upstream.generate_snapshot_tarball(repo, "HEAD", "nova", "30.0.0", tmp_path / "a")
+        second = upstream.generate_snapshot_tarball(
+            repo, "HEAD", "nova", "30.0.0", tmp_path / "b", compressor=upstream.ParallelGzip(threads=1)
+        )
+        assert first.path.read_bytes() == second.path.read_bytes()
 
     def test_generation_failure(self, tmp_path: Path) -> None:
         """Test tarball generation failure."""
-        repo = tmp_path / "repo"
-        repo.mkdir()
+        repo = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stderr="fatal: not a tree")
-            result = upstream.generate_snapshot_tarball(
-                repo_path=repo,
-                ref="nonexistent",
-                package="nova",
-                version="30.0.0",
-                output_dir=output_dir,
-            )
+        result = upstream.generate_snapshot_tarball(
+            repo_path=repo,
+            ref="nonexistent",
+            package="nova",
+            version="30.0.0",
+            output_dir=output_dir,
+        )
 
-            assert result.success is False
-            assert "git archive failed" in result.error
+        assert result.success is False
+        assert "git archive failed" in result.error
+        assert list(output_dir.iterdir()) == []
 
     def test_generation_timeout(self, tmp_path: Path) -> None:
         """Test tarball generation timeout."""
         import subprocess as sp
 
-        repo = tmp_path / "repo"
-        repo.mkdir()
+        repo = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = sp.TimeoutExpired(cmd=["git"], timeout=300)
+        with patch("subprocess.Popen.communicate", side_effect=sp.TimeoutExpired(cmd=["git"], timeout=300)):
             result = upstream.generate_snapshot_tarball(
                 repo_path=repo,
                 ref="HEAD",
@@ -438,29 +473,65 @@ class TestGenerateSnapshotTarball:
                 output_dir=output_dir,
             )
 
-            assert result.success is False
-            assert "timed out" in result.error
+        assert result.success is False
+        assert "timed out" in result.error
 
     def test_epoch_in_version(self, tmp_path: Path) -> None:
         """Test version with epoch is cleaned."""
-        repo = tmp_path / "repo"
-        repo.mkdir()
+        repo = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-            result = upstream.generate_snapshot_tarball(
-                repo_path=repo,
-                ref="HEAD",
-                package="nova",
-                version="2:30.0.0",  # With epoch
-                output_dir=output_dir,
-            )
+        result = upstream.generate_snapshot_tarball(
+            repo_path=repo,
+            ref="HEAD",
+            package="nova",
+            version="2:30.0.0",  # With epoch
+            output_dir=output_dir,
+        )
 
-            assert result.success is True
-            # The filename should not contain the epoch
-            expected_path = output_dir / "nova_30.0.0.orig.tar.gz"
-            assert result.path == expected_path
+        assert result.success is True
+        # The filename should not contain the epoch
+        expected_path = output_dir / "nova_30.0.0.orig.tar.gz"
+        assert result.path == expected_path
+
+    def test_cached_by_commit(self, tmp_path: Path) -> None:
+        """Test that a rebuild of the same commit reuses the cached tarball."""
+        repo = _git_repo(tmp_path / "repo")
+        cache_base = tmp_path / "cache"
+
+        first = upstream.generate_snapshot_tarball(repo, "HEAD", "nova", "30.0.0", tmp_path / "a", cache_base=cache_base)
+        cached = list((cache_base / "artifacts" / "snapshots" / "nova").glob("*/nova_30.0.0.orig.tar.gz"))
+        assert len(cached) == 1
+
+        with patch.object(upstream, "_write_snapshot_archive") as mock_write:
+            second = upstream.generate_snapshot_tarball(
+                repo, "HEAD", "nova", "30.0.0", tmp_path / "b", cache_base=cache_base
+            )
+        mock_write.assert_not_called()
+        assert second.success
+        assert second.path.read_bytes() == first.path.read_bytes()
+
+        # Another prefix is another tarball
+        with patch.object(upstream, "_write_snapshot_archive", return_value="") as mock_write:
+            upstream.generate_snapshot_tarball(repo, "HEAD", "nova", "30.0.1", tmp_path / "c", cache_base=cache_base)
+        mock_write.assert_called_once()
+
+    def test_cache_copy_uses_own_temp_file(self, tmp_path: Path) -> None:
+        """Test that concurrent writers of the cached tarball do not share a temp file."""
+        repo = _git_repo(tmp_path / "repo")
+        cache_base = tmp_path / "cache"
+        upstream.generate_snapshot_tarball(repo, "HEAD", "nova", "30.0.0", tmp_path / "a", cache_base=cache_base)
+        (cached,) = (cache_base / "artifacts" / "snapshots" / "nova").glob("*/nova_30.0.0.orig.tar.gz")
+        output_dir = tmp_path / "b"
+        output_dir.mkdir()
+        # Left behind by another writer
+        (output_dir / ".nova_30.0.0.orig.tar.gz.tmp").mkdir()
+
+        result = upstream.generate_snapshot_tarball(repo, "HEAD", "nova", "30.0.0", output_dir, cache_base=cache_base)
+
+        assert result.success
+        assert result.path.read_bytes() == cached.read_bytes()
+        assert sorted(p.name for p in output_dir.iterdir()) == [".nova_30.0.0.orig.tar.gz.tmp", "nova_30.0.0.orig.tar.gz"]
 
 
 class TestGetGitSnapshotInfo:
@@ -1371,47 +1442,39 @@ class TestGenerateSnapshotTarballEdgeCases:
 
     def test_tarball_naming_convention(self, tmp_path: Path) -> None:
         """Test that tarball follows Debian naming convention."""
-        repo_path = tmp_path / "repo"
-        repo_path.mkdir()
+        repo_path = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
         output_dir.mkdir()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-
-            result = upstream.generate_snapshot_tarball(
-                repo_path=repo_path,
-                ref="HEAD",
-                package="python3-nova",
-                version="29.0.0~git20241227.abc1234",
-                output_dir=output_dir,
-            )
+        result = upstream.generate_snapshot_tarball(
+            repo_path=repo_path,
+            ref="HEAD",
+            package="python3-nova",
+            version="29.0.0~git20241227.abc1234",
+            output_dir=output_dir,
+        )
 
-            # Verify the tarball path uses correct naming
-            expected_name = "python3-nova_29.0.0~git20241227.abc1234.orig.tar.gz"
-            assert result.path.name == expected_name
+        # Verify the tarball path uses correct naming
+        expected_name = "python3-nova_29.0.0~git20241227.abc1234.orig.tar.gz"
+        assert result.path.name == expected_name
 
     def test_version_with_epoch(self, tmp_path: Path) -> None:
         """Test that epoch is stripped from tarball name."""
-        repo_path = tmp_path / "repo"
-        repo_path.mkdir()
+        repo_path = _git_repo(tmp_path / "repo")
         output_dir = tmp_path / "output"
         output_dir.mkdir()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-
-            result = upstream.generate_snapshot_tarball(
-                repo_path=repo_path,
-                ref="HEAD",
-                package="test",
-                version="2:1.0.0",
-                output_dir=output_dir,
-            )
+        result = upstream.generate_snapshot_tarball(
+            repo_path=repo_path,
+            ref="HEAD",
+            package="test",
+            version="2:1.0.0",
+            output_dir=output_dir,
+        )
 
-            # Epoch should be stripped from filename
-            assert "2:" not in result.path.name
-            assert "1.0.0" in result.path.name
+        # Epoch should be stripped from filename
+        assert "2:" not in result.path.name
+        assert "1.0.0" in result.path.name
 
 class TestUpstreamVersionFormats:
     """Test various upstream version formats."""